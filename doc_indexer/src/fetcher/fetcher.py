@@ -1,11 +1,14 @@
 import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
+from fetcher.matcher import sparse_checkout_paths
 from fetcher.scroller import Scroller
 from fetcher.source import DocumentsSource, SourceType, get_documents_sources
 
 from utils.logging import get_logger
+from utils.settings import DOCS_FETCH_CONCURRENCY, DOCS_FETCH_SPARSE_CHECKOUT
 from utils.utils import clone_repo
 
 logger = get_logger(__name__)
@@ -17,11 +20,22 @@ class DocumentsFetcher:
     output_dir: str
     tmp_dir: str
     sources: list[DocumentsSource]
-
-    def __init__(self, source_file: str, output_dir: str, tmp_dir: str) -> None:
+    concurrency: int
+    sparse_checkout: bool
+
+    def __init__(
+        self,
+        source_file: str,
+        output_dir: str,
+        tmp_dir: str,
+        concurrency: int = DOCS_FETCH_CONCURRENCY,
+        sparse_checkout: bool = DOCS_FETCH_SPARSE_CHECKOUT,
+    ) -> None:
         """Initializes the DocumentsFetcher class."""
         self.output_dir = output_dir
         self.tmp_dir = tmp_dir
+        self.concurrency = concurrency
+        self.sparse_checkout = sparse_checkout
 
         # delete the directories if they exist
         shutil.rmtree(self.output_dir, ignore_errors=True)
@@ -41,13 +55,18 @@ class DocumentsFetcher:
         if not re.fullmatch(r"[A-Za-z0-9_-]+", source.name):
             raise ValueError(f"Invalid source name: {source.name}")
 
-        if source.source_type == SourceType.GITHUB:
-            logger.debug(f"Cloning repository: {source.url}")
-            # clone the git repository.
-            repo_dir = clone_repo(source.url, self.tmp_dir)
-        else:
+        if source.source_type != SourceType.GITHUB:
             raise ValueError(f"unsupported source_type: {source.source_type}")
 
+        # every source is cloned into its own temporary directory, because several sources can
+        # refer to the same repository, e.g. with different include files.
+        source_tmp_dir = os.path.join(self.tmp_dir, source.name)
+        os.makedirs(source_tmp_dir, exist_ok=True)
+        logger.debug(f"Cloning repository: {source.url}")
+        # clone the git repository, only with the files that can be included.
+        sparse_paths = sparse_checkout_paths(source.include_files) if self.sparse_checkout else None
+        repo_dir = clone_repo(source.url, source_tmp_dir, sparse_paths=sparse_paths)
+
         module_output_dir = os.path.join(self.output_dir, source.name)
         logger.debug(f"Creating a temporary directory: {module_output_dir}")
         os.makedirs(module_output_dir, exist_ok=True)
@@ -61,13 +80,19 @@ class DocumentsFetcher:
             raise
         finally:
             # delete the directories if they exist
-            logger.debug(f"Deleting the temporary directory: {repo_dir}")
-            shutil.rmtree(repo_dir, ignore_errors=False)
+            logger.debug(f"Deleting the temporary directory: {source_tmp_dir}")
+            shutil.rmtree(source_tmp_dir, ignore_errors=False)
 
     def run(self) -> None:
         """Fetch the documents from all the sources."""
-        for source in self.sources:
-            self.fetch_documents(source)
+        if self.concurrency > 1:
+            # every source is cloned into its own directory under tmp_dir, so they can be fetched in parallel.
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                # consume the results to raise the first error.
+                list(executor.map(self.fetch_documents, self.sources))
+        else:
+            for source in self.sources:
+                self.fetch_documents(source)
         logger.info("Documents fetched successfully from all sources!")
 
         # clean the temporary files.
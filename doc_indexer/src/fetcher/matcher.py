@@ -0,0 +1,54 @@
+import fnmatch
+import re
+
+_WILDCARD_PATTERN = re.compile(r"[*?\[]")
+
+
+def literal_prefix(pattern: str) -> str:
+    """Return the part of the pattern before its first wildcard. Every matching path starts with it."""
+    match = _WILDCARD_PATTERN.search(pattern)
+    return pattern if match is None else pattern[: match.start()]
+
+
+class PathMatcher:
+    """Matches relative file paths against fnmatch patterns with a single precompiled regex."""
+
+    patterns: list[str]
+
+    def __init__(self, patterns: list[str]) -> None:
+        """Compiles the patterns into one regex alternation."""
+        self.patterns = patterns
+        self._regex = re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns)) if patterns else None
+        self._prefixes = [literal_prefix(pattern) for pattern in patterns]
+
+    def matches(self, path: str) -> bool:
+        """Check if the path matches any of the patterns, like fnmatch.fnmatch does."""
+        return self._regex is not None and self._regex.match(path) is not None
+
+    def may_match_in(self, dir_path: str) -> bool:
+        """Check if any path below the directory can match, so that other directories can be skipped."""
+        dir_prefix = f"{dir_path}/" if dir_path else ""
+        return any(prefix.startswith(dir_prefix) or dir_prefix.startswith(prefix) for prefix in self._prefixes)
+
+
+def sparse_checkout_paths(include_files: list[str] | None) -> list[str] | None:
+    """
+    Return the sparse-checkout patterns that cover all files matching the include patterns.
+
+    Each include pattern is widened to the directory of its literal prefix, because git and fnmatch
+    treat wildcards differently. Returns None if a full checkout is needed, i.e. if there are no
+    include patterns or a pattern has a wildcard in its first path segment.
+    """
+    if not include_files:
+        return None
+    paths = []
+    for pattern in include_files:
+        prefix = literal_prefix(pattern)
+        if prefix == pattern:
+            paths.append(f"/{pattern}")
+            continue
+        directory = prefix[: prefix.rfind("/") + 1]
+        if not directory:
+            return None
+        paths.append(f"/{directory}")
+    return list(dict.fromkeys(paths))
@@ -1,7 +1,7 @@
-import fnmatch
 import os
 import shutil
 
+from fetcher.matcher import PathMatcher
 from fetcher.source import DocumentsSource
 
 from utils.logging import get_logger
@@ -21,6 +21,10 @@ class Scroller:
         self.dir_path = dir_path
         self.output_dir = output_dir
         self.source = source
+        # compile the patterns once instead of matching every pattern for every file.
+        self._include_matcher = PathMatcher(source.include_files) if source.include_files is not None else None
+        self._exclude_matcher = PathMatcher(source.exclude_files) if source.exclude_files is not None else None
+        self._file_types = set(source.filter_file_types)
 
     def _save_file(self, file_dir: str, file_name: str) -> None:
         """Saves the file to the output directory."""
@@ -34,25 +38,28 @@ class Scroller:
 
     def _should_exclude_file(self, file_path: str) -> bool:
         """Check if the file should be excluded."""
-        if self.source.exclude_files is None:
+        if self._exclude_matcher is None:
             raise ValueError("exclude_files is None.")
-        return any(fnmatch.fnmatch(file_path, pattern) for pattern in self.source.exclude_files)
+        return bool(self._exclude_matcher.matches(file_path))
 
     def _should_include_file(self, file_path: str) -> bool:
         """Check if the file should be included."""
-        if self.source.include_files is None:
+        if self._include_matcher is None:
             raise ValueError("include_files is None.")
-        return any(fnmatch.fnmatch(file_path, pattern) for pattern in self.source.include_files)
+        return bool(self._include_matcher.matches(file_path))
 
     def scroll(self) -> None:
         """Scroll through the files and save the required files."""
-        for file_dir, _, files in os.walk(self.dir_path):
+        for file_dir, dirs, files in os.walk(self.dir_path):
             relative_dir = file_dir.removeprefix(self.dir_path).lstrip("/")
+            # skip the directories which cannot contain any included file.
+            if self._include_matcher is not None:
+                dirs[:] = [d for d in dirs if self._include_matcher.may_match_in(os.path.join(relative_dir, d))]
             for file_name in files:
                 file_path = os.path.join(relative_dir, file_name)
 
                 # skip if file type is not allowed.
-                if file_name.split(".")[-1] not in self.source.filter_file_types:
+                if file_name.split(".")[-1] not in self._file_types:
                     logger.debug(f"skipping file {file_path} because file type not allowed.")
                     continue
 
@@ -2,11 +2,16 @@ import json
 import re
 import time
 import uuid
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
+from functools import partial
 
 import tiktoken
 from hdbcli import dbapi
 from indexing.constants import HEADER1, HEADER2, HEADER3
+from indexing.embedding_cache import EmbeddingCache
+from indexing.markdown_tree import MarkdownSection, TokenCounter
+from indexing.publisher import PublishMode, TablePublisher
+from indexing.uploader import EmbeddingUploader
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_hana import HanaDB
@@ -14,11 +19,17 @@ from langchain_text_splitters import MarkdownHeaderTextSplitter
 from utils.documents import load_documents
 
 from utils.logging import get_logger
-from utils.settings import CHUNKS_BATCH_SIZE, INDEX_TO_FILE
+from utils.settings import DATABASE_USER, DOCS_PUBLISH_MIN_ROW_RATIO, DOCS_PUBLISH_MODE, INDEX_TO_FILE
 from utils.utils import sanitize_table_name
 
 encoding = tiktoken.encoding_for_model("gpt-4o")
 
+
+def count_tokens(text: str) -> int:
+    """Count the gpt-4o tokens of a text."""
+    return len(encoding.encode(text))
+
+
 logger = get_logger(__name__)
 
 HEADER_LEVELS = [[HEADER1], [HEADER1, HEADER2], [HEADER1, HEADER2, HEADER3]]
@@ -111,6 +122,9 @@ class AdaptiveSplitMarkdownIndexer:
         headers_to_split_on: list[tuple[str, str]] | None = None,
         min_chunk_token_count: int = 20,
         max_chunk_token_count: int = 1000,
+        publish_mode: PublishMode | str = DOCS_PUBLISH_MODE,
+        db_user: str = DATABASE_USER,
+        embedding_cache: EmbeddingCache | None = None,
     ):
         self.headers_to_split_on = headers_to_split_on or [HEADER1, HEADER2, HEADER3]
         if not table_name:
@@ -120,6 +134,10 @@ class AdaptiveSplitMarkdownIndexer:
         self.docs_path = docs_path
         self.table_name = table_name
         self.embedding = embedding
+        self.connection = connection
+        self.embedding_cache = embedding_cache
+        self.publish_mode = PublishMode(publish_mode)
+        self.publisher = TablePublisher(connection, db_user, table_name)
         self.min_chunk_token_count = min_chunk_token_count
         self.max_chunk_token_count = max_chunk_token_count
 
@@ -135,11 +153,14 @@ class AdaptiveSplitMarkdownIndexer:
 
         self.markdown_splitter_h3 = MarkdownHeaderTextSplitter(headers_to_split_on=[HEADER1, HEADER2, HEADER3])
 
-    def _build_title(self, doc: Document) -> str:
+        # shared by all documents, so that lines which occur in many documents are tokenized once.
+        self.token_counter = TokenCounter(count_tokens)
+
+    def _build_title(self, metadata: dict[str, str]) -> str:
         # the following lines build the combined title from the headers H1, H2, H3
-        header1 = remove_header_brackets(doc.metadata.get("Header1", "")).strip()
-        header2 = remove_header_brackets(doc.metadata.get("Header2", "")).strip()
-        header3 = remove_header_brackets(doc.metadata.get("Header3", "")).strip()
+        header1 = remove_header_brackets(metadata.get("Header1", "")).strip()
+        header2 = remove_header_brackets(metadata.get("Header2", "")).strip()
+        header3 = remove_header_brackets(metadata.get("Header3", "")).strip()
 
         # Join non-empty headers with " - "
         title_parts = [part for part in [header1, header2, header3] if part]
@@ -150,57 +171,71 @@ class AdaptiveSplitMarkdownIndexer:
     def _process_doc(
         self,
         doc: Document,
-        level: int = 0,
-        parent_title: str = "",
         module: str | None = "kyma",
         module_version: str | None = "latest",
     ) -> Generator[Document]:
-        tokens = len(encoding.encode(doc.page_content))
+        section = MarkdownSection.from_text(doc.page_content, self.token_counter)
+        yield from self._process_section(
+            section,
+            source=doc.metadata.get("source", ""),
+            title=doc.metadata.get("title"),
+            module=module,
+            module_version=module_version,
+        )
+
+    def _process_section(
+        self,
+        section: MarkdownSection,
+        source: str,
+        title: str | None,
+        module: str | None,
+        module_version: str | None,
+        level: int = 0,
+        parent_title: str = "",
+    ) -> Generator[Document]:
+        tokens = section.token_count
 
         if tokens <= self.min_chunk_token_count:
             return
 
-        # If the document is smaller than the max chunk token count or the H3 level is reached, yield the document
+        # If the section is smaller than the max chunk token count or the H3 level is reached, yield the section
         if tokens <= self.max_chunk_token_count or level >= len(HEADER_LEVELS):
+            text = section.text
             yield Document(
-                page_content=doc.page_content,
+                page_content=text,
                 metadata={
-                    "source": doc.metadata.get("source", ""),
-                    "title": doc.metadata.get("title") or extract_first_title(doc.page_content),
+                    "source": source,
+                    "title": title or extract_first_title(text),
                     "module": module,
                     "version": module_version,
                 },
             )
             return
-        # Split document using current header level
-        markdown_splitter = MarkdownHeaderTextSplitter(headers_to_split_on=HEADER_LEVELS[level], strip_headers=False)
-        splitted_docs = markdown_splitter.split_text(doc.page_content)
 
-        for sub_doc in splitted_docs:
-            if not sub_doc.metadata:
+        # Split section using current header level
+        for sub_section in section.split(HEADER_LEVELS[level]):
+            if not sub_section.metadata:
                 logger.warning("skip chunk - no metadata")
                 continue
 
-            title = self._build_title(sub_doc)
-            if not title:
+            sub_title = self._build_title(sub_section.metadata)
+            if not sub_title:
                 logger.warning("skip chunk - no title")
                 continue
 
-            if parent_title != title and (parent_title + " - ") not in title:
-                title = parent_title + " - " + title if parent_title else title
-
-            chunk = Document(
-                page_content=sub_doc.page_content,
-                metadata={
-                    "source": doc.metadata.get("source", ""),
-                    "title": title,
-                    "module": module,
-                    "version": module_version,
-                },
-            )
+            if parent_title != sub_title and (parent_title + " - ") not in sub_title:
+                sub_title = parent_title + " - " + sub_title if parent_title else sub_title
 
             # Recursively process this chunk with next header level
-            yield from self._process_doc(chunk, level + 1, parent_title=title if level == 0 else parent_title)
+            yield from self._process_section(
+                sub_section,
+                source=source,
+                title=sub_title,
+                module=module,
+                module_version=module_version,
+                level=level + 1,
+                parent_title=sub_title if level == 0 else parent_title,
+            )
 
     def get_document_chunks(self, docs_to_chunk: list[Document]) -> Generator[Document]:
         """
@@ -231,6 +266,70 @@ class AdaptiveSplitMarkdownIndexer:
                     metadata=chunk.metadata,
                 )
 
+    def _store_chunks(self, db: HanaDB, chunks: list[Document], embeddings: list[list[float]]) -> None:
+        """Store embedded chunks in HanaDB."""
+        db.add_texts(
+            [chunk.page_content for chunk in chunks],
+            [chunk.metadata for chunk in chunks],
+            embeddings=embeddings,
+        )
+
+    def _upload(self, db: HanaDB, chunks: Iterable[Document]) -> int:
+        """Embed and store the chunks in the table of db, and return the number of stored chunks."""
+        uploader = EmbeddingUploader(
+            embedding=self.embedding,
+            store=partial(self._store_chunks, db),
+            count_tokens=count_tokens,
+            cache=self.embedding_cache,
+        )
+        try:
+            stored_chunks: int = uploader.upload(chunks)
+        except Exception:
+            logger.exception("Error while storing documents in HanaDB")
+            raise
+        if self.embedding_cache is not None:
+            stats = self.embedding_cache.stats
+            logger.info(
+                f"Embedding cache: {stats.hits} hits, {stats.misses} misses ({stats.hit_ratio:.0%} hit ratio), "
+                f"{stats.added} embeddings added to {self.embedding_cache.path}."
+            )
+        return stored_chunks
+
+    def _index_in_place(self, chunks: Iterable[Document]) -> None:
+        """Replace the content of the table. The table is incomplete until all chunks are stored."""
+        logger.info("Deleting existing index in HanaDB...")
+        try:
+            self.db.delete(filter={})
+        except Exception:
+            logger.exception("Error while deleting existing documents in HanaDB.")
+            raise
+        logger.info("Successfully deleted existing documents in HanaDB.")
+
+        logger.info("Indexing and storing indexes to HanaDB...")
+        total_chunk_number = self._upload(self.db, chunks)
+        logger.info(f"Successfully indexed {total_chunk_number} markdown files chunks in table {self.table_name}.")
+
+    def _index_blue_green(self, chunks: Iterable[Document]) -> None:
+        """
+        Store the chunks in a new generation table and publish it, if it is valid. The active table
+        serves the retrievers unchanged until the pointer is switched.
+        """
+        generation_table = self.publisher.new_generation_table()
+        logger.info(f"Indexing and storing indexes to the new HanaDB table {generation_table}...")
+        try:
+            db = HanaDB(connection=self.connection, embedding=self.embedding, table_name=generation_table)
+            total_chunk_number = self._upload(db, chunks)
+            self.publisher.validate(generation_table, total_chunk_number, DOCS_PUBLISH_MIN_ROW_RATIO)
+        except Exception:
+            logger.exception(f"Failed to build table {generation_table}, the active table is not changed.")
+            self.publisher.drop(generation_table)
+            raise
+        pointer = self.publisher.activate(generation_table)
+        logger.info(
+            f"Successfully indexed {total_chunk_number} markdown files chunks in table {generation_table}, "
+            f"published as {self.table_name}. Previous table: {pointer.previous_table}."
+        )
+
     def index(self) -> None:
         """Indexes the markdown files in the given directory."""
 
@@ -250,45 +349,7 @@ class AdaptiveSplitMarkdownIndexer:
                 json.dump({"kyma_docs": serializable_chunks}, fp=out, indent=2)
             logger.info(f"Indexed {len(serializable_chunks)} chunks.")
             logger.info(f"Chunks are stored in the file: {output_file_path}")
+        elif self.publish_mode == PublishMode.BLUE_GREEN:
+            self._index_blue_green(all_chunks)
         else:
-            logger.info("Deleting existing index in HanaDB...")
-            try:
-                self.db.delete(filter={})
-            except Exception:
-                logger.exception("Error while deleting existing documents in HanaDB.")
-                raise
-            logger.info("Successfully deleted existing documents in HanaDB.")
-
-            logger.info("Indexing and storing indexes to HanaDB...")
-            batch = []
-            batch_count = 0
-            total_chunk_number = 0
-            try:
-                for chunk in all_chunks:
-                    batch.append(chunk)
-                    if len(batch) >= CHUNKS_BATCH_SIZE:
-                        # Process the current batch
-                        self.db.add_documents(batch)
-                        batch_count += 1
-                        total_chunk_number += len(batch)
-                        logger.info(f"Indexed batch {batch_count} with {len(batch)} chunks")
-
-                        # Clear the batch
-                        batch = []
-
-                        # Wait before processing next batch
-                        logger.debug("Rate limiting: sleeping 3s before next batch")
-                        time.sleep(3)
-
-                # Process any remaining documents in the final batch
-                if batch:
-                    self.db.add_documents(batch)
-                    batch_count += 1
-                    total_chunk_number += len(batch)
-                    logger.info(f"Indexed final batch {batch_count} with {len(batch)} chunks")
-
-            except Exception:
-                logger.exception(f"Error while storing documents batch {batch_count + 1} in HanaDB")
-                raise
-
-            logger.info(f"Successfully indexed {total_chunk_number} markdown files chunks in table {self.table_name}.")
+            self._index_in_place(all_chunks)
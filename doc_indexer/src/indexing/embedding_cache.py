@@ -0,0 +1,128 @@
+"""
+Persistent cache of chunk embeddings.
+
+Most chunks do not change between two index runs. The cache stores the embedding of every chunk in
+a local SQLite file, keyed by the embedding model name and the SHA-256 hash of the chunk text, so
+that a rerun only embeds new and changed chunks. The embeddings are stored as arrays of doubles,
+so cached embeddings are identical to the embeddings returned by the model.
+
+Every lookup refreshes the last use of an entry. Entries that were not used for a while, i.e. of
+chunks that were removed from the documentation, are deleted with the prune task.
+"""
+
+import hashlib
+import sqlite3
+import time
+from array import array
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from pydantic import BaseModel
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class EmbeddingCacheStats(BaseModel):
+    """Cache statistics of an index run."""
+
+    hits: int = 0
+    misses: int = 0
+    added: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio of chunks whose embedding was taken from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def text_hash(text: str) -> str:
+    """Return the cache key of a chunk text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    SQLite cache of the embeddings of one embedding model.
+
+    The cache file is opened on first use. The cache must be used from the thread that opened it.
+    """
+
+    def __init__(self, path: str, model_name: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.model_name = model_name
+        self.stats = EmbeddingCacheStats()
+        self._clock = clock
+        self._db: sqlite3.Connection | None = None
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, embedding BLOB NOT NULL, last_used_at REAL NOT NULL, "
+                "PRIMARY KEY (model, text_hash))"
+            )
+            self._db.commit()
+        return self._db
+
+    def get(self, text: str) -> list[float] | None:
+        """Return the cached embedding of the text, or None."""
+        key = text_hash(text)
+        row = self._connection.execute(
+            "SELECT embedding FROM embeddings WHERE model = ? AND text_hash = ?", (self.model_name, key)
+        ).fetchone()
+        if row is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self._connection.execute(
+            "UPDATE embeddings SET last_used_at = ? WHERE model = ? AND text_hash = ?",
+            (self._clock(), self.model_name, key),
+        )
+        return array("d", row[0]).tolist()
+
+    def put_many(self, texts: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """Add the embeddings of the texts to the cache."""
+        now = self._clock()
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, text_hash, embedding, last_used_at) VALUES (?, ?, ?, ?)",
+            [
+                (self.model_name, text_hash(text), array("d", embedding).tobytes(), now)
+                for text, embedding in zip(texts, embeddings, strict=True)
+            ],
+        )
+        self._connection.commit()
+        self.stats.added += len(texts)
+
+    def prune(self, max_age_days: float, all_models: bool = False) -> int:
+        """
+        Delete the entries of the model that were not used for max_age_days, and return their
+        number. With all_models, the entries of all models are pruned.
+        """
+        threshold = self._clock() - max_age_days * SECONDS_PER_DAY
+        if all_models:
+            cursor = self._connection.execute("DELETE FROM embeddings WHERE last_used_at < ?", (threshold,))
+        else:
+            cursor = self._connection.execute(
+                "DELETE FROM embeddings WHERE model = ? AND last_used_at < ?", (self.model_name, threshold)
+            )
+        self._connection.commit()
+        # release the space of the deleted entries.
+        self._connection.execute("VACUUM")
+        return cursor.rowcount
+
+    def count(self) -> int:
+        """Return the number of cached embeddings of the model."""
+        row = self._connection.execute("SELECT COUNT(*) FROM embeddings WHERE model = ?", (self.model_name,)).fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        """Commit the last uses of the entries and close the cache."""
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
@@ -0,0 +1,215 @@
+"""
+Heading tree of a markdown document for the adaptive splitting of the AdaptiveSplitMarkdownIndexer.
+
+The indexer splits a document by H1 headers, then splits too large chunks by H1 and H2 headers,
+and the remaining too large ones by H1, H2 and H3 headers. Each split used to run a new
+MarkdownHeaderTextSplitter over the text of the chunk and tokenize the resulting chunks again.
+
+A MarkdownSection produces the same chunks from the lines of the document, which are split and
+normalized only once. The sections of a split keep the lines of their parent, so that a split of a
+section is a single pass over its lines. The token count of a section is the sum of the token counts
+of its lines, which are counted once and cached.
+"""
+
+from collections.abc import Callable, Iterator
+from functools import lru_cache
+
+# separators of the lines of a section, as the MarkdownHeaderTextSplitter joins them.
+LINE_SEPARATOR = "\n"
+SEGMENT_SEPARATOR = "  \n"
+
+CODE_FENCE = "```"
+TILDE_CODE_FENCE = "~~~"
+
+TOKEN_CACHE_SIZE = 100_000
+
+
+def normalize_line(line: str) -> str:
+    """Strip a line and remove its non-printable characters, like the MarkdownHeaderTextSplitter."""
+    stripped_line = line.strip()
+    if stripped_line.isprintable():
+        return stripped_line
+    return "".join(filter(str.isprintable, stripped_line))
+
+
+class TokenCounter:
+    """
+    Counts the tokens of texts that consist of lines.
+
+    The tokenizers of OpenAI split a text into pieces with a regex first, and encode each piece on
+    its own. A piece ends at a line break, unless the next line is empty or starts with a space, or
+    the line break follows punctuation and the next line starts with a slash. A text is therefore
+    counted as the sum of its lines, including their separators, and lines that a piece can span are
+    counted together.
+    """
+
+    def __init__(self, count_tokens: Callable[[str], int], cache_size: int = TOKEN_CACHE_SIZE):
+        self.count_tokens = count_tokens
+        self._count_cached = lru_cache(maxsize=cache_size)(count_tokens)
+
+    def count(self, text: str) -> int:
+        """Count the tokens of a text."""
+        return self.count_tokens(text)
+
+    def count_lines(self, lines: Iterator[tuple[str, str]]) -> int:
+        """Count the tokens of lines with their separators, joined in the given order."""
+        total = 0
+        unit = ""
+        for line, separator in lines:
+            if unit and line and line[0] not in " /":
+                total += self._count_cached(unit)
+                unit = ""
+            unit += line + separator
+        if unit:
+            total += self._count_cached(unit)
+        return total
+
+
+class MarkdownSection:
+    """
+    A markdown document or a chunk of it, as split by the MarkdownHeaderTextSplitter.
+
+    A chunk consists of segments of lines. The lines of a segment are joined with a line break and
+    the segments with two spaces and a line break.
+    """
+
+    __slots__ = ("metadata", "segments", "_raw_text", "_counter", "_token_count")
+
+    def __init__(
+        self,
+        metadata: dict[str, str],
+        segments: list[list[str]],
+        counter: TokenCounter,
+        raw_text: str | None = None,
+    ):
+        self.metadata = metadata
+        self.segments = segments
+        self._raw_text = raw_text
+        self._counter = counter
+        self._token_count: int | None = None
+
+    @classmethod
+    def from_text(cls, text: str, counter: TokenCounter) -> "MarkdownSection":
+        """Create the section of a whole document. Its text is kept as it is."""
+        return cls(metadata={}, segments=[], counter=counter, raw_text=text)
+
+    @property
+    def text(self) -> str:
+        """Text of the section."""
+        if self._raw_text is not None:
+            return self._raw_text
+        return SEGMENT_SEPARATOR.join(LINE_SEPARATOR.join(segment) for segment in self.segments)
+
+    @property
+    def token_count(self) -> int:
+        """Number of tokens of the text of the section."""
+        if self._token_count is None:
+            if self._raw_text is not None:
+                self._token_count = self._counter.count(self._raw_text)
+            else:
+                self._token_count = self._counter.count_lines(self._lines_with_separators())
+        return self._token_count
+
+    def split(self, headers_to_split_on: list[tuple[str, str]]) -> list["MarkdownSection"]:
+        """Split the section by the headers, keeping the headers in the chunks."""
+        if self._raw_text is not None:
+            lines = [normalize_line(line) for line in self._raw_text.split(LINE_SEPARATOR)]
+        else:
+            # the text of a chunk is split again, so the two spaces before a line break are stripped.
+            lines = [line.strip() for segment in self.segments for line in segment]
+        return self._aggregate(_split_lines(lines, headers_to_split_on))
+
+    def _lines_with_separators(self) -> Iterator[tuple[str, str]]:
+        last_segment = len(self.segments) - 1
+        for segment_index, segment in enumerate(self.segments):
+            last_line = len(segment) - 1
+            for line_index, line in enumerate(segment):
+                if line_index < last_line:
+                    yield line, LINE_SEPARATOR
+                elif segment_index < last_segment:
+                    yield line, SEGMENT_SEPARATOR
+                else:
+                    yield line, ""
+
+    def _aggregate(self, segments: list[tuple[dict[str, str], list[str]]]) -> list["MarkdownSection"]:
+        """Combine segments with common metadata into chunks, like the MarkdownHeaderTextSplitter."""
+        chunks: list[MarkdownSection] = []
+        for metadata, lines in segments:
+            if chunks and chunks[-1].metadata == metadata:
+                chunks[-1].segments.append(lines)
+            elif (
+                chunks
+                and len(chunks[-1].metadata) < len(metadata)
+                # a header without content is joined with its first subsection.
+                and chunks[-1].segments[-1][-1][0] == "#"
+            ):
+                chunks[-1].segments.append(lines)
+                chunks[-1].metadata = metadata
+            else:
+                chunks.append(MarkdownSection(metadata=metadata, segments=[lines], counter=self._counter))
+        return chunks
+
+
+def _header_text(line: str, headers: list[tuple[str, str]]) -> tuple[str, str] | None:
+    """Return the metadata name and text of a header line, or None if the line is not a header."""
+    for separator, name in headers:
+        if line.startswith(separator) and (len(line) == len(separator) or line[len(separator)] == " "):
+            return name, line[len(separator) :].strip()
+    return None
+
+
+def _code_fence(line: str, in_code_block: bool, opening_fence: str) -> tuple[bool, str]:
+    """Return whether the line is in a code block, and the fence that opened the code block."""
+    if not in_code_block:
+        if line.startswith(CODE_FENCE) and line.count(CODE_FENCE) == 1:
+            return True, CODE_FENCE
+        if line.startswith(TILDE_CODE_FENCE):
+            return True, TILDE_CODE_FENCE
+        return False, ""
+    if line.startswith(opening_fence):
+        return False, ""
+    return True, opening_fence
+
+
+def _split_lines(
+    lines: list[str], headers_to_split_on: list[tuple[str, str]]
+) -> list[tuple[dict[str, str], list[str]]]:
+    """Split normalized lines into segments with their header metadata, like the MarkdownHeaderTextSplitter."""
+    headers = sorted(headers_to_split_on, key=lambda header: len(header[0]), reverse=True)
+    levels = {name: separator.count("#") for separator, name in headers}
+
+    segments: list[tuple[dict[str, str], list[str]]] = []
+    content: list[str] = []
+    metadata: dict[str, str] = {}
+    header_stack: list[str] = []
+    in_code_block = False
+    opening_fence = ""
+
+    for line in lines:
+        in_code_block, opening_fence = _code_fence(line, in_code_block, opening_fence)
+        if in_code_block:
+            content.append(line)
+            continue
+
+        header = _header_text(line, headers)
+        if header is not None:
+            name, text = header
+            level = levels[name]
+            previous_metadata = metadata
+            metadata = dict(metadata)
+            while header_stack and levels[header_stack[-1]] >= level:
+                metadata.pop(header_stack.pop(), None)
+            header_stack.append(name)
+            metadata[name] = text
+            if content:
+                segments.append((previous_metadata, content))
+            content = [line]
+        elif line:
+            content.append(line)
+        elif content:
+            segments.append((metadata, content))
+            content = []
+
+    if content:
+        segments.append((metadata, content))
+    return segments
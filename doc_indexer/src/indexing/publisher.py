@@ -0,0 +1,229 @@
+"""
+Blue/green publishing of the documentation table.
+
+In the blue/green publish mode, every index run builds a new generation table, named after the
+documentation table and the time of the run, e.g. kyma_docs_20260101120000. When the generation is
+complete and valid, a single update of the pointer table switches the retrievers to it. The
+previous generation is kept for an instant rollback, and older generations are dropped.
+
+The pointer table maps the name of the documentation table (the alias) to its active and previous
+generation. If there is no pointer for an alias, the table with the alias name is active, like in
+the in-place publish mode.
+"""
+
+import re
+import time
+from collections.abc import Callable, Sequence
+from enum import StrEnum
+from typing import Any
+
+from hdbcli import dbapi
+from pydantic import BaseModel
+
+from utils.logging import get_logger
+from utils.settings import DOCS_TABLE_POINTER_TABLE
+
+logger = get_logger(__name__)
+
+ERR_SQL_INV_TABLE = 259  # HANA error code for invalid/missing table name
+GENERATION_TIME_FORMAT = "%Y%m%d%H%M%S"
+
+
+class PublishMode(StrEnum):
+    """How the indexer publishes a new index."""
+
+    # replace the content of the documentation table.
+    IN_PLACE = "in_place"
+    # build a new generation table and switch the pointer table to it.
+    BLUE_GREEN = "blue_green"
+
+
+class GenerationStatus(StrEnum):
+    """Status of a generation table of an alias."""
+
+    ACTIVE = "active"
+    PREVIOUS = "previous"
+    # a generation that is not referenced by the pointer, e.g. of a failed index run.
+    UNPUBLISHED = "unpublished"
+
+
+class TablePointer(BaseModel):
+    """Active and previous generation table of an alias."""
+
+    alias: str
+    active_table: str
+    previous_table: str | None = None
+
+
+class PublishValidationError(Exception):
+    """A generation table is not valid for publishing."""
+
+
+class TablePublisher:
+    """Publishes generation tables of an alias through the pointer table."""
+
+    def __init__(
+        self,
+        connection: dbapi.Connection,
+        db_user: str,
+        alias: str,
+        pointer_table: str = DOCS_TABLE_POINTER_TABLE,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.connection = connection
+        self.db_user = db_user
+        self.alias = alias
+        self.pointer_table = pointer_table
+        self._clock = clock
+        self._generation_pattern = re.compile(rf"{re.escape(alias)}_\d{{14}}")
+
+    def new_generation_table(self) -> str:
+        """Return the table name for a new generation."""
+        return f"{self.alias}_{time.strftime(GENERATION_TIME_FORMAT, time.gmtime(self._clock()))}"
+
+    def generation_status(self, table_name: str, pointer: TablePointer | None) -> GenerationStatus | None:
+        """Return the status of a table, or None if it is no generation of the alias."""
+        if pointer is not None and table_name == pointer.active_table:
+            return GenerationStatus.ACTIVE
+        if pointer is not None and table_name == pointer.previous_table:
+            return GenerationStatus.PREVIOUS
+        if self._generation_pattern.fullmatch(table_name):
+            return GenerationStatus.UNPUBLISHED
+        return None
+
+    def get_pointer(self) -> TablePointer | None:
+        """Return the pointer of the alias, or None if the alias was never published."""
+        try:
+            rows = self._query(
+                f"SELECT ACTIVE_TABLE, PREVIOUS_TABLE FROM {self._table_ref(self.pointer_table)} WHERE ALIAS = ?",
+                (self.alias,),
+            )
+        except Exception as error:
+            if self._is_missing_table(error):
+                return None
+            raise
+        if not rows:
+            return None
+        return TablePointer(alias=self.alias, active_table=rows[0][0], previous_table=rows[0][1])
+
+    def active_table(self) -> str:
+        """Return the name of the active table of the alias."""
+        pointer = self.get_pointer()
+        return pointer.active_table if pointer else self.alias
+
+    def count_rows(self, table_name: str) -> int | None:
+        """Return the number of rows of a table, or None if the table does not exist."""
+        try:
+            rows = self._query(f"SELECT COUNT(*) FROM {self._table_ref(table_name)}")
+        except Exception as error:
+            if self._is_missing_table(error):
+                return None
+            raise
+        return int(rows[0][0])
+
+    def validate(self, table_name: str, expected_rows: int, min_row_ratio: float) -> None:
+        """
+        Check that a generation table has all expected rows, and at least min_row_ratio of the rows
+        of the active table, so that e.g. a partially failed fetch is not published.
+        """
+        rows = self.count_rows(table_name) or 0
+        if rows == 0 or rows != expected_rows:
+            raise PublishValidationError(f"Table {table_name} has {rows} rows, expected {expected_rows}.")
+        active_rows = self.count_rows(self.active_table()) or 0
+        if rows < active_rows * min_row_ratio:
+            raise PublishValidationError(
+                f"Table {table_name} has {rows} rows, less than {min_row_ratio:.0%} of the {active_rows} active rows."
+            )
+
+    def activate(self, table_name: str) -> TablePointer:
+        """
+        Switch the alias to the generation table, keep the active table as the previous one, and
+        drop the generation that was previous before.
+        """
+        pointer = self.get_pointer()
+        if pointer is not None:
+            previous_table: str | None = pointer.active_table
+        else:
+            # the table of the in-place publish mode, if it has content.
+            previous_table = self.alias if self.count_rows(self.alias) else None
+        new_pointer = TablePointer(alias=self.alias, active_table=table_name, previous_table=previous_table)
+        self._write_pointer(new_pointer)
+        logger.info(f"Published table {table_name} as {self.alias}", extra={"previous": previous_table})
+
+        if pointer is not None and pointer.previous_table not in (None, table_name, previous_table):
+            self.drop(str(pointer.previous_table))
+        return new_pointer
+
+    def rollback(self) -> TablePointer:
+        """Switch the alias back to the previous generation, which becomes the next previous one."""
+        pointer = self.get_pointer()
+        if pointer is None or pointer.previous_table is None:
+            raise PublishValidationError(f"There is no previous table of {self.alias} to roll back to.")
+        if not self.count_rows(pointer.previous_table):
+            raise PublishValidationError(f"The previous table {pointer.previous_table} is missing or empty.")
+        new_pointer = TablePointer(
+            alias=self.alias, active_table=pointer.previous_table, previous_table=pointer.active_table
+        )
+        self._write_pointer(new_pointer)
+        logger.info(f"Rolled back {self.alias} to table {new_pointer.active_table}")
+        return new_pointer
+
+    def drop(self, table_name: str) -> None:
+        """Drop a generation table if it exists."""
+        try:
+            self._execute(f"DROP TABLE {self._table_ref(table_name)}")
+            self.connection.commit()
+            logger.info(f"Dropped table {table_name}.")
+        except Exception as error:
+            if not self._is_missing_table(error):
+                raise
+            logger.warning(f"Table {table_name} does not exist, nothing to drop.")
+
+    def _write_pointer(self, pointer: TablePointer) -> None:
+        """Update the pointer row of the alias in one statement, creating the pointer table if needed."""
+        pointer_ref = self._table_ref(self.pointer_table)
+        try:
+            updated = self._execute(
+                f"UPDATE {pointer_ref} SET ACTIVE_TABLE = ?, PREVIOUS_TABLE = ?, UPDATED_AT = CURRENT_TIMESTAMP "
+                "WHERE ALIAS = ?",
+                (pointer.active_table, pointer.previous_table, self.alias),
+            )
+        except Exception as error:
+            if not self._is_missing_table(error):
+                raise
+            self._execute(
+                f"CREATE TABLE {pointer_ref} (ALIAS NVARCHAR(256) PRIMARY KEY, ACTIVE_TABLE NVARCHAR(256) NOT NULL, "
+                "PREVIOUS_TABLE NVARCHAR(256), UPDATED_AT TIMESTAMP)"
+            )
+            updated = 0
+        if updated == 0:
+            self._execute(
+                f"INSERT INTO {pointer_ref} (ALIAS, ACTIVE_TABLE, PREVIOUS_TABLE, UPDATED_AT) "
+                "VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+                (self.alias, pointer.active_table, pointer.previous_table),
+            )
+        self.connection.commit()
+
+    def _table_ref(self, table_name: str) -> str:
+        return f'"{self.db_user}"."{table_name}"'
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Execute a statement and return the number of affected rows."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            return int(cursor.rowcount)
+        finally:
+            cursor.close()
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> list[Any]:
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            return list(cursor.fetchall())
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _is_missing_table(error: Exception) -> bool:
+        return isinstance(error, dbapi.ProgrammingError) and error.errorcode == ERR_SQL_INV_TABLE
@@ -0,0 +1,289 @@
+"""
+Adaptive upload of document chunks with their embeddings.
+
+The chunks are grouped into batches by their token count. The batches are embedded concurrently,
+paced by a token bucket that enforces the token budget of the embedding endpoint. The number of
+concurrent requests follows an AIMD (additive increase, multiplicative decrease) control: it grows
+while the requests succeed fast and halves when the endpoint rate limits (HTTP 429) or slows down.
+The embedded batches are stored by the calling thread, because the database connection must not
+be shared between threads. With an embedding cache, only the chunks without cached embedding are
+sent to the embedding endpoint.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from http import HTTPStatus
+
+from indexing.embedding_cache import EmbeddingCache
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from utils.logging import get_logger
+from utils.settings import (
+    CHUNKS_BATCH_SIZE,
+    EMBEDDING_BATCH_MAX_TOKENS,
+    EMBEDDING_INITIAL_CONCURRENCY,
+    EMBEDDING_LATENCY_TARGET_SECONDS,
+    EMBEDDING_MAX_CONCURRENCY,
+    EMBEDDING_MAX_RETRIES,
+    EMBEDDING_TOKENS_PER_MINUTE,
+)
+
+logger = get_logger(__name__)
+
+MAX_RETRY_DELAY_SECONDS = 60.0
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check if the error is an HTTP 429 response, e.g. an openai.RateLimitError."""
+    status_code = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return bool(status_code == HTTPStatus.TOO_MANY_REQUESTS)
+
+
+def retry_after(error: Exception) -> float | None:
+    """Return the delay in seconds of the Retry-After header of the error response, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    try:
+        return float(headers.get("retry-after")) if headers else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    The bucket refills at a constant rate up to its capacity. Acquiring more tokens than available
+    reserves them anyway and waits until the bucket has refilled, so waiting callers are served in
+    the order they arrived.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float) -> float:
+        """Take the tokens from the bucket, waiting until they are available. Returns the wait time."""
+        # a request larger than the bucket would wait forever, so it takes the whole bucket.
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            wait_time = max(0.0, -self._tokens / self.rate)
+        if wait_time > 0:
+            self._sleep(wait_time)
+        return wait_time
+
+
+class AIMDConcurrency:
+    """
+    Concurrency limit with additive increase and multiplicative decrease.
+
+    The limit grows by one after a round of successful requests, i.e. as many requests as the
+    limit, and is multiplied by the decrease factor when a request is rate limited or slower than
+    the latency target. Requests that started before the last decrease do not decrease the limit
+    again, because they were sent with the previous limit.
+    """
+
+    def __init__(
+        self,
+        initial: int = EMBEDDING_INITIAL_CONCURRENCY,
+        minimum: int = 1,
+        maximum: int = EMBEDDING_MAX_CONCURRENCY,
+        decrease_factor: float = 0.5,
+        latency_target: float | None = EMBEDDING_LATENCY_TARGET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self._clock = clock
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._decreased_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Current number of allowed concurrent requests."""
+        return int(self._limit)
+
+    def on_success(self, started_at: float, latency: float) -> None:
+        """Record a successful request."""
+        if self.latency_target is not None and latency > self.latency_target:
+            self._decrease(started_at, f"latency {latency:.1f}s above target")
+            return
+        with self._lock:
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+
+    def on_rate_limited(self, started_at: float) -> None:
+        """Record a rate limited request."""
+        self._decrease(started_at, "rate limited")
+
+    def _decrease(self, started_at: float, reason: str) -> None:
+        with self._lock:
+            if started_at < self._decreased_at:
+                return
+            self._limit = max(self.minimum, self._limit * self.decrease_factor)
+            self._decreased_at = self._clock()
+        logger.info(f"Embedding concurrency decreased to {self.limit}: {reason}")
+
+
+def batch_by_tokens(
+    chunks: Iterable[Document],
+    count_tokens: Callable[[str], int],
+    max_batch_tokens: int,
+    max_batch_size: int,
+) -> Generator[tuple[list[Document], int]]:
+    """
+    Group the chunks into batches of at most max_batch_tokens tokens and max_batch_size chunks.
+    Yields each batch with its token count. A chunk larger than max_batch_tokens is a batch on its own.
+    """
+    batch: list[Document] = []
+    batch_tokens = 0
+    for chunk in chunks:
+        tokens = count_tokens(chunk.page_content)
+        if batch and (batch_tokens + tokens > max_batch_tokens or len(batch) >= max_batch_size):
+            yield batch, batch_tokens
+            batch, batch_tokens = [], 0
+        batch.append(chunk)
+        batch_tokens += tokens
+    if batch:
+        yield batch, batch_tokens
+
+
+class EmbeddingUploader:
+    """Embeds batches of chunks concurrently within the rate limits, and stores them."""
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        store: Callable[[list[Document], list[list[float]]], object],
+        count_tokens: Callable[[str], int],
+        rate_limiter: TokenBucket | None = None,
+        concurrency: AIMDConcurrency | None = None,
+        max_batch_tokens: int = EMBEDDING_BATCH_MAX_TOKENS,
+        max_batch_size: int = CHUNKS_BATCH_SIZE,
+        max_retries: int = EMBEDDING_MAX_RETRIES,
+        retry_delay: float = 1.0,
+        cache: EmbeddingCache | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.embedding = embedding
+        self.cache = cache
+        self.store = store
+        self.count_tokens = count_tokens
+        self.rate_limiter = rate_limiter or TokenBucket(
+            rate=EMBEDDING_TOKENS_PER_MINUTE / 60, capacity=max(max_batch_tokens, EMBEDDING_TOKENS_PER_MINUTE / 60)
+        )
+        self.concurrency = concurrency or AIMDConcurrency()
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._clock = clock
+        self._sleep = sleep
+
+    def upload(self, chunks: Iterable[Document]) -> int:
+        """Embed and store the chunks, and return the number of stored chunks."""
+        stored = 0
+        batches = batch_by_tokens(chunks, self.count_tokens, self.max_batch_tokens, self.max_batch_size)
+        with ThreadPoolExecutor(max_workers=self.concurrency.maximum, thread_name_prefix="embedding") as executor:
+            in_flight: dict[Future[list[list[float]]], tuple[list[Document], list[bool]]] = {}
+            try:
+                for batch, tokens in batches:
+                    while len(in_flight) >= self.concurrency.limit:
+                        stored += self._store_completed(in_flight)
+                    future, embedded = self._submit(executor, batch, tokens)
+                    in_flight[future] = (batch, embedded)
+                while in_flight:
+                    stored += self._store_completed(in_flight)
+            except Exception:
+                for future in in_flight:
+                    future.cancel()
+                raise
+        return stored
+
+    def _submit(
+        self, executor: ThreadPoolExecutor, batch: list[Document], tokens: int
+    ) -> tuple[Future[list[list[float]]], list[bool]]:
+        """
+        Submit the embedding of the chunks of a batch that are not cached. Returns the future of the
+        embeddings of the batch, and which chunks are embedded.
+        """
+        if self.cache is None:
+            return executor.submit(self._embed, batch, tokens), [True] * len(batch)
+
+        cached = [self.cache.get(chunk.page_content) for chunk in batch]
+        embedded = [embedding is None for embedding in cached]
+        missing = [chunk for chunk, embed in zip(batch, embedded, strict=True) if embed]
+        if not missing:
+            future: Future[list[list[float]]] = Future()
+            future.set_result([embedding for embedding in cached if embedding is not None])
+            return future, embedded
+        if len(missing) < len(batch):
+            tokens = sum(self.count_tokens(chunk.page_content) for chunk in missing)
+        return executor.submit(self._embed_missing, cached, missing, tokens), embedded
+
+    def _embed_missing(
+        self, cached: list[list[float] | None], missing: list[Document], tokens: int
+    ) -> list[list[float]]:
+        """Embed the missing chunks, and merge their embeddings with the cached embeddings."""
+        embeddings = iter(self._embed(missing, tokens))
+        return [embedding if embedding is not None else next(embeddings) for embedding in cached]
+
+    def _store_completed(self, in_flight: dict[Future[list[list[float]]], tuple[list[Document], list[bool]]]) -> int:
+        """Wait for embedded batches and store them. Returns the number of stored chunks."""
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        stored = 0
+        for future in done:
+            batch, embedded = in_flight.pop(future)
+            embeddings = future.result()
+            self.store(batch, embeddings)
+            stored += len(batch)
+            if self.cache is not None and any(embedded):
+                new = [
+                    (chunk.page_content, embedding)
+                    for chunk, embedding, embed in zip(batch, embeddings, embedded, strict=True)
+                    if embed
+                ]
+                self.cache.put_many([text for text, _ in new], [embedding for _, embedding in new])
+            logger.info(f"Indexed batch with {len(batch)} chunks, concurrency {self.concurrency.limit}")
+        return stored
+
+    def _embed(self, batch: list[Document], tokens: int) -> list[list[float]]:
+        """Embed the texts of a batch, retrying rate limited requests."""
+        texts = [chunk.page_content for chunk in batch]
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(tokens)
+            started_at = self._clock()
+            try:
+                embeddings = self.embedding.embed_documents(texts)
+            except Exception as error:
+                if not is_rate_limit_error(error) or attempt >= self.max_retries:
+                    raise
+                self.concurrency.on_rate_limited(started_at)
+                delay = retry_after(error) or min(self.retry_delay * 2**attempt, MAX_RETRY_DELAY_SECONDS)
+                logger.warning(f"Embedding request rate limited, retrying in {delay:.1f}s")
+                self._sleep(delay)
+                attempt += 1
+                continue
+            self.concurrency.on_success(started_at, self._clock() - started_at)
+            return embeddings
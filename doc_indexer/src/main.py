@@ -5,6 +5,8 @@ import time
 from fetcher.fetcher import DocumentsFetcher
 from hdbcli import dbapi
 from indexing.adaptive_indexer import AdaptiveSplitMarkdownIndexer
+from indexing.embedding_cache import EmbeddingCache
+from indexing.publisher import TablePublisher
 from langchain_core.embeddings import Embeddings
 from utils.hana import create_hana_connection, drop_table, list_tables
 
@@ -21,6 +23,8 @@ from utils.settings import (
     DOCS_PATH,
     DOCS_SOURCES_FILE_PATH,
     DOCS_TABLE_NAME,
+    EMBEDDING_CACHE_MAX_AGE_DAYS,
+    EMBEDDING_CACHE_PATH,
     EMBEDDING_MODEL_NAME,
     TMP_DIR,
     get_embedding_model_config,
@@ -30,6 +34,8 @@ TASK_FETCH = "fetch"
 TASK_INDEX = "index"
 TASK_DROP = "drop"
 TASK_TABLES = "tables"
+TASK_ROLLBACK = "rollback"
+TASK_PRUNE_CACHE = "prune-cache"
 logger = get_logger(__name__)
 
 
@@ -55,6 +61,7 @@ def run_indexer(
     hana_conn: dbapi.Connection | None = None,
     docs_path: str = DOCS_PATH,
     table_name: str = DOCS_TABLE_NAME,
+    embedding_cache_path: str = EMBEDDING_CACHE_PATH,
 ) -> None:
     """Entry function to run the indexer.
 
@@ -63,6 +70,7 @@ def run_indexer(
         hana_conn: Hana DB connection to use. If None, created from config.
         docs_path: Path to the documents to index. Defaults to DOCS_PATH from config.
         table_name: Name of the table to index into. Defaults to DOCS_TABLE_NAME from config.
+        embedding_cache_path: Path of the embedding cache. Defaults to EMBEDDING_CACHE_PATH, empty disables it.
     """
     logger.info("Starting index task")
     start = time.monotonic()
@@ -78,11 +86,41 @@ def run_indexer(
             logger.error("Failed to connect to the database. Exiting.")
             raise RuntimeError("Failed to connect to the database.")
 
-    indexer = AdaptiveSplitMarkdownIndexer(docs_path, embeddings_model, hana_conn, table_name)
-    indexer.index()
+    embedding_cache = EmbeddingCache(embedding_cache_path, EMBEDDING_MODEL_NAME) if embedding_cache_path else None
+    indexer = AdaptiveSplitMarkdownIndexer(
+        docs_path, embeddings_model, hana_conn, table_name, db_user=DATABASE_USER, embedding_cache=embedding_cache
+    )
+    try:
+        indexer.index()
+    finally:
+        if embedding_cache is not None:
+            embedding_cache.close()
     logger.info(f"Index completed in {time.monotonic() - start:.1f}s")
 
 
+def run_prune_cache(
+    embedding_cache_path: str = EMBEDDING_CACHE_PATH,
+    max_age_days: float = EMBEDDING_CACHE_MAX_AGE_DAYS,
+) -> None:
+    """Entry function to delete the cached embeddings that were not used for max_age_days.
+
+    Args:
+        embedding_cache_path: Path of the embedding cache. Defaults to EMBEDDING_CACHE_PATH from config.
+        max_age_days: Age of the entries to delete. Defaults to EMBEDDING_CACHE_MAX_AGE_DAYS from config.
+    """
+    logger.info("Starting prune-cache task", extra={"path": embedding_cache_path, "max_age_days": max_age_days})
+    if not embedding_cache_path:
+        logger.info("The embedding cache is disabled, nothing to prune.")
+        return
+    # entries of all models, so that the entries of a replaced model are pruned as well.
+    embedding_cache = EmbeddingCache(embedding_cache_path, EMBEDDING_MODEL_NAME)
+    try:
+        pruned = embedding_cache.prune(max_age_days, all_models=True)
+        logger.info(f"Pruned {pruned} cached embeddings, {embedding_cache.count()} of {EMBEDDING_MODEL_NAME} left.")
+    finally:
+        embedding_cache.close()
+
+
 def run_drop(
     hana_conn: dbapi.Connection | None = None,
     table_name: str = DOCS_TABLE_NAME,
@@ -105,11 +143,13 @@ def run_drop(
 
 def run_list_tables(
     hana_conn: dbapi.Connection | None = None,
+    table_name: str = DOCS_TABLE_NAME,
 ) -> None:
     """Entry function to list all HANA tables owned by the configured user.
 
     Args:
         hana_conn: Hana DB connection to use. If None, created from config.
+        table_name: Name of the documentation table whose generations are shown. Defaults to DOCS_TABLE_NAME.
     """
     if hana_conn is None:
         hana_conn = create_hana_connection(DATABASE_URL, DATABASE_PORT, DATABASE_USER, DATABASE_PASSWORD)
@@ -121,17 +161,43 @@ def run_list_tables(
     if not rows:
         logger.info("No tables found.")
         return
-    header = f"{'TABLE_NAME':<60} {'ROWS':>10} {'SIZE (bytes)':>14}"
-    separator = "-" * 88
+    publisher = TablePublisher(hana_conn, DATABASE_USER, table_name)
+    pointer = publisher.get_pointer()
+    header = f"{'TABLE_NAME':<60} {'ROWS':>10} {'SIZE (bytes)':>14} {'GENERATION':<12}"
+    separator = "-" * 101
     logger.info(f"HANA tables:\n{header}\n{separator}")
     for name, records, size in rows:
-        logger.info(f"{name:<60} {records:>10} {size:>14}")
+        status = publisher.generation_status(name, pointer) or ""
+        logger.info(f"{name:<60} {records:>10} {size:>14} {status:<12}")
     logger.info(f"{len(rows)} table(s) total.")
+    if pointer:
+        logger.info(f"{table_name} is published from {pointer.active_table}, previous: {pointer.previous_table}.")
+
+
+def run_rollback(
+    hana_conn: dbapi.Connection | None = None,
+    table_name: str = DOCS_TABLE_NAME,
+) -> None:
+    """Entry function to switch the documentation table back to its previous generation.
+
+    Args:
+        hana_conn: Hana DB connection to use. If None, created from config.
+        table_name: Name of the documentation table to roll back. Defaults to DOCS_TABLE_NAME from config.
+    """
+    logger.info("Starting rollback task", extra={"table": table_name})
+    if hana_conn is None:
+        hana_conn = create_hana_connection(DATABASE_URL, DATABASE_PORT, DATABASE_USER, DATABASE_PASSWORD)
+        if not hana_conn:
+            logger.error("Failed to connect to the database. Exiting.")
+            raise RuntimeError("Failed to connect to the database.")
+
+    pointer = TablePublisher(hana_conn, DATABASE_USER, table_name).rollback()
+    logger.info(f"{table_name} is published from {pointer.active_table}, previous: {pointer.previous_table}.")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Kyma Documentation Fetcher and Indexer.")
-    parser.add_argument("task", choices=["index", "fetch", "drop", "tables"])
+    parser.add_argument("task", choices=["index", "fetch", "drop", "tables", "rollback", "prune-cache"])
     args = parser.parse_args()
 
     logger.info("Indexer job starting", extra={"task": args.task})
@@ -144,5 +210,9 @@ if __name__ == "__main__":
         run_drop()
     elif args.task == TASK_TABLES:
         run_list_tables()
+    elif args.task == TASK_ROLLBACK:
+        run_rollback()
+    elif args.task == TASK_PRUNE_CACHE:
+        run_prune_cache()
     else:
-        print("Invalid task. Valid tasks are: index, fetch, drop, tables.")
+        print("Invalid task. Valid tasks are: index, fetch, drop, tables, rollback, prune-cache.")
@@ -1,4 +1,3 @@
-import time
 from collections.abc import Callable
 from typing import cast
 
@@ -39,8 +38,6 @@ def openai_embedding_creator(model_name: str) -> Embeddings:
         ValueError: If model not found in config or missing deployment_id
     """
     try:
-        time.sleep(1)  # Sleep to avoid rate limiting
-
         # Look up deployment_id from settings
         model_config = get_embedding_model_config(model_name)
 
@@ -63,6 +63,35 @@ DOCS_PATH = str(config("DOCS_PATH", default="data"))
 DOCS_TABLE_NAME = str(config("DOCS_TABLE_NAME", default="kyma_docs"))
 CHUNKS_BATCH_SIZE = int(config("CHUNKS_BATCH_SIZE", default=200))
 
+# in_place replaces the content of DOCS_TABLE_NAME. blue_green builds a new generation table and
+# switches the retrievers to it through the pointer table, see indexing/publisher.py.
+DOCS_PUBLISH_MODE = str(config("DOCS_PUBLISH_MODE", default="in_place"))
+DOCS_TABLE_POINTER_TABLE = str(config("DOCS_TABLE_POINTER_TABLE", default="docs_table_pointers"))
+# A new generation is not published if it has less rows than this ratio of the active table.
+DOCS_PUBLISH_MIN_ROW_RATIO = float(config("DOCS_PUBLISH_MIN_ROW_RATIO", default=0.5))
+
+# Token budget of the embedding endpoint. The indexer never sends more tokens per minute.
+EMBEDDING_TOKENS_PER_MINUTE = int(config("EMBEDDING_TOKENS_PER_MINUTE", default=1_000_000))
+# Maximal number of tokens of the chunks embedded in one request. CHUNKS_BATCH_SIZE limits the number of chunks.
+EMBEDDING_BATCH_MAX_TOKENS = int(config("EMBEDDING_BATCH_MAX_TOKENS", default=50_000))
+# Number of concurrent embedding requests. It is adapted between 1 and the maximum while indexing.
+EMBEDDING_INITIAL_CONCURRENCY = int(config("EMBEDDING_INITIAL_CONCURRENCY", default=2))
+EMBEDDING_MAX_CONCURRENCY = int(config("EMBEDDING_MAX_CONCURRENCY", default=8))
+# Requests slower than this reduce the concurrency like rate limited (HTTP 429) requests.
+EMBEDDING_LATENCY_TARGET_SECONDS = float(config("EMBEDDING_LATENCY_TARGET_SECONDS", default=20.0))
+EMBEDDING_MAX_RETRIES = int(config("EMBEDDING_MAX_RETRIES", default=5))
+# Local SQLite cache of the chunk embeddings, so that reruns only embed changed chunks. Empty disables the cache.
+EMBEDDING_CACHE_PATH = str(
+    config("EMBEDDING_CACHE_PATH", default=os.path.join(project_root, "cache", "embeddings.sqlite"))
+)
+# The prune task deletes the cached embeddings that were not used for this number of days.
+EMBEDDING_CACHE_MAX_AGE_DAYS = float(config("EMBEDDING_CACHE_MAX_AGE_DAYS", default=30))
+
+# Number of documentation sources fetched in parallel. 1 fetches the sources one after the other.
+DOCS_FETCH_CONCURRENCY = int(config("DOCS_FETCH_CONCURRENCY", default=8))
+# Shallow clone the sources and check out only the directories of their include_files.
+DOCS_FETCH_SPARSE_CHECKOUT = config("DOCS_FETCH_SPARSE_CHECKOUT", default=True, cast=bool)
+
 DATABASE_URL = str(config("DATABASE_URL", default=""))
 DATABASE_PORT = int(config("DATABASE_PORT", default=443))
 DATABASE_USER = str(config("DATABASE_USER", ""))
@@ -8,16 +8,25 @@ from utils.logging import get_logger
 logger = get_logger(__name__)
 
 
-def clone_repo(repo_url: str, clone_dir: str) -> str:
-    """Clones the git repository and returns the path."""
+def clone_repo(repo_url: str, clone_dir: str, sparse_paths: list[str] | None = None) -> str:
+    """Clones the git repository and returns the path.
+
+    If sparse_paths is given, a shallow clone is made and only the given paths are checked out.
+    """
     repo_name = repo_url.split("/")[-1].replace(".git", "")
     repo_path = os.path.join(clone_dir, repo_name)
 
     if os.path.exists(repo_path):
         shutil.rmtree(repo_path, ignore_errors=True)
 
-    logger.info("Cloning repository", extra={"url": repo_url, "dest": repo_path})
-    result = subprocess.run(["git", "clone", repo_url, repo_path])
+    logger.info("Cloning repository", extra={"url": repo_url, "dest": repo_path, "sparse_paths": sparse_paths})
+    if sparse_paths is None:
+        result = subprocess.run(["git", "clone", repo_url, repo_path])
+    else:
+        # blobs outside the sparse paths are never downloaded.
+        result = subprocess.run(["git", "clone", "--depth", "1", "--filter=blob:none", "--sparse", repo_url, repo_path])
+        if result.returncode == 0:
+            result = subprocess.run(["git", "-C", repo_path, "sparse-checkout", "set", "--no-cone", *sparse_paths])
     if result.returncode != 0:
         raise RuntimeError(f"git clone failed for {repo_url} (exit {result.returncode})")
     logger.info("Repository cloned successfully", extra={"url": repo_url, "dest": repo_path})
@@ -1,8 +1,9 @@
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 import pytest
 from fetcher.fetcher import DocumentsFetcher
+from fetcher.matcher import sparse_checkout_paths
 
 pytestmark = pytest.mark.unit
 
@@ -86,6 +87,44 @@ class TestDocumentsFetcher:
         # clean should have been called.
         fetcher.clean.assert_called_once()
 
+    def test_run_concurrently(self, docs_sources_file_path):
+        # given
+        with patch("shutil.rmtree"), patch("os.makedirs"):
+            fetcher = DocumentsFetcher(
+                source_file=docs_sources_file_path,
+                output_dir="test/output_dir",
+                tmp_dir="test/tmp_dir",
+                concurrency=4,
+            )
+        fetched_sources = []
+        fetcher.fetch_documents = fetched_sources.append
+        fetcher.clean = Mock()
+
+        # when
+        fetcher.run()
+
+        # then
+        # every source should have been fetched exactly once.
+        assert sorted(source.name for source in fetched_sources) == sorted(source.name for source in fetcher.sources)
+        fetcher.clean.assert_called_once()
+
+    def test_run_concurrently_raises_source_errors(self, docs_sources_file_path):
+        # given
+        with patch("shutil.rmtree"), patch("os.makedirs"):
+            fetcher = DocumentsFetcher(
+                source_file=docs_sources_file_path,
+                output_dir="test/output_dir",
+                tmp_dir="test/tmp_dir",
+                concurrency=4,
+            )
+        fetcher.fetch_documents = Mock(side_effect=RuntimeError("git clone failed"))
+        fetcher.clean = Mock()
+
+        # when / then
+        with pytest.raises(RuntimeError, match="git clone failed"):
+            fetcher.run()
+        fetcher.clean.assert_not_called()
+
     def test_fetch_documents(self, docs_sources_file_path):
         # given
         given_output_dir = "test/output_dir"
@@ -108,15 +147,51 @@ class TestDocumentsFetcher:
             fetcher.fetch_documents(fetcher.sources[0])
 
         # then
-        # should have cloned the repo.
-        clone_repo_mock.assert_called_once_with(fetcher.sources[0].url, given_tmp_dir)
-        # should have created the module directory for output.
-        makedirs_mock.assert_called_once_with(os.path.join(given_output_dir, fetcher.sources[0].name), exist_ok=True)
+        # should have cloned the repo into the temporary directory of the source.
+        source_tmp_dir = os.path.join(given_tmp_dir, fetcher.sources[0].name)
+        clone_repo_mock.assert_called_once_with(
+            fetcher.sources[0].url,
+            source_tmp_dir,
+            sparse_paths=sparse_checkout_paths(fetcher.sources[0].include_files),
+        )
+        # should have created the temporary directory of the source and the module directory for output.
+        assert makedirs_mock.call_args_list == [
+            call(source_tmp_dir, exist_ok=True),
+            call(os.path.join(given_output_dir, fetcher.sources[0].name), exist_ok=True),
+        ]
         # should have created the scroller object and called the scroll method.
         assert scroller_mock.call_count == 1
         scroller_mock.return_value.scroll.assert_called_once()
-        # should have deleted the temporary repo directory.
-        rmtree_mock.assert_called_once()
+        # should have deleted the temporary directory of the source.
+        rmtree_mock.assert_called_once_with(source_tmp_dir, ignore_errors=False)
+
+    def test_fetch_documents_clones_sources_of_the_same_repository_separately(self, docs_sources_file_path):
+        # given
+        given_tmp_dir = "test/tmp_dir"
+        with patch("shutil.rmtree"), patch("os.makedirs"):
+            fetcher = DocumentsFetcher(
+                source_file=docs_sources_file_path,
+                output_dir="test/output_dir",
+                tmp_dir=given_tmp_dir,
+            )
+        sources = [fetcher.sources[0].model_copy(update={"name": name}) for name in ("docs-a", "docs-b")]
+
+        # when
+        with (
+            patch("shutil.rmtree"),
+            patch("os.makedirs"),
+            patch("fetcher.fetcher.clone_repo") as clone_repo_mock,
+            patch("fetcher.fetcher.Scroller"),
+        ):
+            for source in sources:
+                fetcher.fetch_documents(source)
+
+        # then
+        # the same repository should have been cloned into a directory per source.
+        assert [clone.args for clone in clone_repo_mock.call_args_list] == [
+            (sources[0].url, os.path.join(given_tmp_dir, "docs-a")),
+            (sources[0].url, os.path.join(given_tmp_dir, "docs-b")),
+        ]
 
     @pytest.mark.parametrize(
         "invalid_name",
@@ -191,6 +266,7 @@ class TestDocumentsFetcher:
         valid_source.name = valid_name
         valid_source.source_type = fetcher.sources[0].source_type
         valid_source.url = "https://example.com/repo.git"
+        valid_source.include_files = None
 
         # when / then - should not raise ValueError
         with (
@@ -201,6 +277,8 @@ class TestDocumentsFetcher:
         ):
             fetcher.fetch_documents(valid_source)
 
-        clone_repo_mock.assert_called_once_with(valid_source.url, given_tmp_dir)
+        clone_repo_mock.assert_called_once_with(
+            valid_source.url, os.path.join(given_tmp_dir, valid_name), sparse_paths=None
+        )
         scroller_mock.assert_called_once()
         scroller_mock.return_value.scroll.assert_called_once()
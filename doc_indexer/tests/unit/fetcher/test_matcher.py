@@ -0,0 +1,64 @@
+import fnmatch
+
+import pytest
+from fetcher.matcher import PathMatcher, sparse_checkout_paths
+
+pytestmark = pytest.mark.unit
+
+PATTERNS = ["README.md", "docs/user/*", "*/_sidebar.md", "tutorials/cp-*/*.md"]
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "README.md",
+        "docs/README.md",
+        "docs/user/01-overview.md",
+        "docs/user/nested/deep/file.md",
+        "docs/_sidebar.md",
+        "_sidebar.md",
+        "tutorials/cp-kyma/a.md",
+        "tutorials/cp-kyma/nested/a.md",
+        "tutorials/other/a.md",
+        "src/main.go",
+    ],
+)
+def test_path_matcher_matches_like_fnmatch(path):
+    # the precompiled matcher should give the same result as matching every pattern with fnmatch.
+    expected = any(fnmatch.fnmatch(path, pattern) for pattern in PATTERNS)
+
+    assert PathMatcher(PATTERNS).matches(path) == expected
+
+
+def test_path_matcher_without_patterns_matches_nothing():
+    assert not PathMatcher([]).matches("README.md")
+
+
+@pytest.mark.parametrize(
+    "test_description, patterns, dir_path, expected",
+    [
+        ("should walk into the directory of a pattern", ["docs/user/*"], "docs", True),
+        ("should walk below the directory of a pattern", ["docs/user/*"], "docs/user/nested", True),
+        ("should walk into directories of a partial prefix", ["docs/us*"], "docs/user", True),
+        ("should skip unrelated directories", ["README.md", "docs/user/*"], "src", False),
+        ("should walk everywhere for leading wildcards", ["*.md"], "src/nested", True),
+    ],
+)
+def test_path_matcher_may_match_in(test_description, patterns, dir_path, expected):
+    assert PathMatcher(patterns).may_match_in(dir_path) == expected, test_description
+
+
+@pytest.mark.parametrize(
+    "test_description, include_files, expected",
+    [
+        ("should check out everything without include files", None, None),
+        (
+            "should check out files and the directories of wildcard patterns",
+            ["README.md", "docs/user/*", "docs/user/*.md", "tutorials/cp-*/*"],
+            ["/README.md", "/docs/user/", "/tutorials/"],
+        ),
+        ("should check out everything for wildcards in the first segment", ["docs/*", "*/README.md"], None),
+    ],
+)
+def test_sparse_checkout_paths(test_description, include_files, expected):
+    assert sparse_checkout_paths(include_files) == expected, test_description
@@ -9,6 +9,7 @@ from indexing.adaptive_indexer import (
     remove_header_brackets,
     remove_parentheses,
 )
+from indexing.publisher import PublishMode, PublishValidationError
 from langchain_core.documents import Document
 
 from utils.utils import sanitize_table_name
@@ -729,3 +730,67 @@ class TestAdaptiveSplitMarkdownIndexer:
         # Then:
         # Compare the actual chunks with expected results
         assert chunks == wanted_results
+
+    @pytest.mark.parametrize(
+        "test_description, upload_error, validation_error, expect_published",
+        [
+            ("should publish a valid generation", None, None, True),
+            ("should drop the generation if the upload fails", RuntimeError("upload failed"), None, False),
+            (
+                "should drop the generation if it is not valid",
+                None,
+                PublishValidationError("too few rows"),
+                False,
+            ),
+        ],
+    )
+    def test_index_blue_green(
+        self,
+        mock_embedding,
+        mock_connection,
+        mock_hana_db,
+        test_description,
+        upload_error,
+        validation_error,
+        expect_published,
+    ):
+        # Given
+        indexer = AdaptiveSplitMarkdownIndexer(
+            docs_path="",
+            embedding=mock_embedding,
+            connection=mock_connection,
+            table_name="test_table",
+            publish_mode=PublishMode.BLUE_GREEN,
+        )
+        indexer.publisher = Mock()
+        indexer.publisher.new_generation_table.return_value = "test_table_20260101120000"
+        indexer.publisher.validate.side_effect = validation_error
+
+        with (
+            patch("indexing.adaptive_indexer.load_documents", return_value=[]),
+            patch("indexing.adaptive_indexer.EmbeddingUploader") as mock_uploader,
+        ):
+            mock_uploader.return_value.upload.side_effect = upload_error
+            mock_uploader.return_value.upload.return_value = 10
+
+            # When
+            if expect_published:
+                indexer.index()
+            else:
+                with pytest.raises(Exception):  # noqa: B017
+                    indexer.index()
+
+        # Then
+        # the active table is never emptied.
+        mock_hana_db.return_value.delete.assert_not_called()
+        mock_hana_db.assert_called_with(
+            connection=mock_connection, embedding=mock_embedding, table_name="test_table_20260101120000"
+        )
+        if expect_published:
+            indexer.publisher.validate.assert_called_once_with("test_table_20260101120000", 10, 0.5)
+            indexer.publisher.activate.assert_called_once_with("test_table_20260101120000")
+            indexer.publisher.drop.assert_not_called()
+        else:
+            indexer.publisher.activate.assert_not_called()
+            indexer.publisher.drop.assert_called_once_with("test_table_20260101120000")
+        assert indexer.table_name == "test_table", test_description
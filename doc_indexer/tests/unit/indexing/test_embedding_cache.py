@@ -0,0 +1,90 @@
+import pytest
+from indexing.embedding_cache import SECONDS_PER_DAY, EmbeddingCache, EmbeddingCacheStats
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+pytestmark = pytest.mark.unit
+
+MODEL_NAME = "text-embedding-3-large"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache" / "embeddings.sqlite")
+
+
+def test_get_returns_identical_embeddings_after_reopening(cache_path):
+    # given
+    texts = ["# Title\nfirst chunk", "# Title\nsecond chunk"]
+    embeddings = DeterministicFakeEmbedding(size=8).embed_documents(texts)
+    cache = EmbeddingCache(cache_path, MODEL_NAME)
+    cache.put_many(texts, embeddings)
+    cache.close()
+
+    # when
+    reopened = EmbeddingCache(cache_path, MODEL_NAME)
+
+    # then
+    assert [reopened.get(text) for text in texts] == embeddings
+    assert reopened.get("# Title\nchanged chunk") is None
+    assert reopened.stats == EmbeddingCacheStats(hits=2, misses=1, added=0)
+    assert reopened.stats.hit_ratio == pytest.approx(2 / 3)
+    reopened.close()
+
+
+def test_entries_are_separated_by_model(cache_path):
+    cache = EmbeddingCache(cache_path, MODEL_NAME)
+    cache.put_many(["chunk"], [[1.0, 2.0]])
+
+    other_model = EmbeddingCache(cache_path, "text-embedding-3-small")
+
+    assert other_model.get("chunk") is None
+    assert other_model.count() == 0
+    assert cache.count() == 1
+
+
+@pytest.mark.parametrize(
+    "test_description, all_models, expected_left",
+    [
+        ("should prune unused entries of the model", False, {MODEL_NAME: ["used"], "old-model": ["old"]}),
+        ("should prune unused entries of all models", True, {MODEL_NAME: ["used"], "old-model": []}),
+    ],
+)
+def test_prune(cache_path, clock, test_description, all_models, expected_left):
+    # given
+    caches = {model: EmbeddingCache(cache_path, model, clock=clock) for model in (MODEL_NAME, "old-model")}
+    caches[MODEL_NAME].put_many(["used", "unused"], [[1.0], [2.0]])
+    caches["old-model"].put_many(["old"], [[3.0]])
+    clock.now += 10 * SECONDS_PER_DAY
+    # a lookup refreshes the entry.
+    caches[MODEL_NAME].get("used")
+    clock.now += 25 * SECONDS_PER_DAY
+
+    # when
+    pruned = caches[MODEL_NAME].prune(max_age_days=30, all_models=all_models)
+
+    # then
+    assert pruned == 3 - sum(len(texts) for texts in expected_left.values()), test_description
+    for model, texts in expected_left.items():
+        caches[model].close()
+        assert [text for text in ("used", "unused", "old") if caches[model].get(text)] == texts, test_description
+        caches[model].close()
+
+
+def test_cache_is_opened_on_first_use(cache_path):
+    cache = EmbeddingCache(cache_path, MODEL_NAME)
+    cache.close()
+
+    assert cache.count() == 0
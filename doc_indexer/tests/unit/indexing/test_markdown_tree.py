@@ -0,0 +1,102 @@
+import re
+
+import pytest
+from indexing.constants import HEADER1, HEADER2, HEADER3
+from indexing.markdown_tree import MarkdownSection, TokenCounter, normalize_line
+from langchain_text_splitters import MarkdownHeaderTextSplitter
+
+pytestmark = pytest.mark.unit
+
+HEADER_LEVELS = [[HEADER1], [HEADER1, HEADER2], [HEADER1, HEADER2, HEADER3]]
+
+# pieces like the pre-tokenization of the OpenAI tokenizers, including the pieces that span line breaks.
+PIECE_PATTERN = re.compile(r"[^\r\n\w]?[^\W\d_]+|\d{1,3}| ?[^\s\w]+[\r\n/]*|\s*[\r\n]+|\s+(?!\S)|\s+")
+
+DOCUMENTS = [
+    "# Title\nTitle content\n\n## Subtitle\nSubtitle content\n\n### Subsubtitle\nSubsubtitle content",
+    "Intro without header\n\n# Title 1\nContent 1\n\n\n# Title 2\n\nContent 2.\n/usr/bin/env\n",
+    "# Title\n## Subtitle\n### Subsubtitle\ncontent\n#### Deep header\n\n## Subtitle 2\n",
+    "# Title\n\n```bash\n# comment, not a header\n\n  echo done.\n/bin/sh\n```\n\n"
+    "## Subtitle\n~~~\n## no header\n~~~\n",
+    "# Title\n\n  indented line  \n​ leading zero width space\nno\xa0break space\n\n# Title\nrepeated title\n",
+    "# Title\n```python\nunclosed code block\n\n# not a header\n",
+    "#NoHeader\n##\n## \ncontent\n### C\n#### D\n\n## B\ncontent\n### C\ncontent\n",
+]
+
+
+def count_pieces(text: str) -> int:
+    return sum(1 + len(piece) // 4 for piece in PIECE_PATTERN.findall(text))
+
+
+def split_with_splitter(text: str, level: int) -> list[tuple[str, dict]]:
+    splitter = MarkdownHeaderTextSplitter(headers_to_split_on=HEADER_LEVELS[level], strip_headers=False)
+    return [(doc.page_content, doc.metadata) for doc in splitter.split_text(text)]
+
+
+def all_sections(section: MarkdownSection, level: int = 0):
+    yield section, level
+    if level < len(HEADER_LEVELS):
+        for sub_section in section.split(HEADER_LEVELS[level]):
+            yield from all_sections(sub_section, level + 1)
+
+
+@pytest.mark.parametrize(
+    "test_description, line, expected",
+    [
+        ("should strip whitespace", "  # Title  \r", "# Title"),
+        ("should remove non-printable characters", "no\xa0break\tspace", "nobreakspace"),
+        ("should keep spaces next to removed characters", "​ leading", " leading"),
+    ],
+)
+def test_normalize_line(test_description, line, expected):
+    assert normalize_line(line) == expected, test_description
+
+
+class TestMarkdownSection:
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_split_is_equal_to_markdown_header_text_splitter(self, document):
+        # given
+        root = MarkdownSection.from_text(document, TokenCounter(count_pieces))
+
+        for section, level in all_sections(root):
+            if level == len(HEADER_LEVELS):
+                continue
+
+            # when
+            sub_sections = section.split(HEADER_LEVELS[level])
+
+            # then
+            assert [(sub_section.text, sub_section.metadata) for sub_section in sub_sections] == split_with_splitter(
+                section.text, level
+            )
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_token_count_is_equal_to_count_of_text(self, document):
+        # given
+        root = MarkdownSection.from_text(document, TokenCounter(count_pieces))
+
+        # when
+        token_counts = [(section.text, section.token_count) for section, _ in all_sections(root)]
+
+        # then
+        assert token_counts == [(text, count_pieces(text)) for text, _ in token_counts]
+
+
+def test_token_counter_tokenizes_repeated_lines_once():
+    # given
+    counted_texts = []
+
+    def count_tokens(text: str) -> int:
+        counted_texts.append(text)
+        return count_pieces(text)
+
+    counter = TokenCounter(count_tokens)
+    lines = [("repeated line", "\n"), ("", "\n"), ("/path", "\n"), ("repeated line", "")]
+
+    # when
+    first = counter.count_lines(iter(lines))
+    second = counter.count_lines(iter(lines))
+
+    # then
+    assert first == second == count_pieces("repeated line\n\n/path\nrepeated line")
+    assert counted_texts == ["repeated line\n\n/path\n", "repeated line"]
@@ -0,0 +1,202 @@
+import sqlite3
+from datetime import UTC, datetime
+
+import pytest
+from indexing.publisher import (
+    GenerationStatus,
+    PublishValidationError,
+    TablePointer,
+    TablePublisher,
+)
+
+pytestmark = pytest.mark.unit
+
+DB_USER = "DOCS_USER"
+ALIAS = "kyma_docs"
+START_TIME = datetime(2026, 1, 1, 12, 0, 0, tzinfo=UTC).timestamp()
+
+
+class SQLiteTablePublisher(TablePublisher):
+    """TablePublisher on SQLite, which reports missing tables with an OperationalError."""
+
+    @staticmethod
+    def _is_missing_table(error: Exception) -> bool:
+        return isinstance(error, sqlite3.OperationalError) and "no such table" in str(error)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = START_TIME
+
+    def __call__(self) -> float:
+        self.now += 60
+        return self.now
+
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(":memory:")
+    # the schema of the database user, like in HANA.
+    connection.execute(f"ATTACH DATABASE ':memory:' AS {DB_USER}")
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def publisher(connection):
+    return SQLiteTablePublisher(connection, DB_USER, ALIAS, clock=FakeClock())
+
+
+def create_table(connection: sqlite3.Connection, table_name: str, rows: int) -> None:
+    connection.execute(f'CREATE TABLE "{DB_USER}"."{table_name}" (VEC_TEXT TEXT)')
+    connection.executemany(
+        f'INSERT INTO "{DB_USER}"."{table_name}" VALUES (?)', [(f"chunk {index}",) for index in range(rows)]
+    )
+    connection.commit()
+
+
+def build_generation(publisher: TablePublisher, connection: sqlite3.Connection, rows: int) -> str:
+    table_name = publisher.new_generation_table()
+    create_table(connection, table_name, rows)
+    return table_name
+
+
+def table_names(connection: sqlite3.Connection) -> set[str]:
+    return {row[0] for row in connection.execute(f"SELECT name FROM {DB_USER}.sqlite_master WHERE type = 'table'")}
+
+
+def test_new_generation_table(publisher):
+    assert publisher.new_generation_table() == "kyma_docs_20260101120100"
+    assert publisher.new_generation_table() == "kyma_docs_20260101120200"
+
+
+def test_alias_is_active_without_pointer(publisher):
+    assert publisher.get_pointer() is None
+    assert publisher.active_table() == ALIAS
+
+
+def test_activate_switches_pointer_and_keeps_previous_generation(publisher, connection):
+    # given
+    create_table(connection, ALIAS, rows=3)
+    first = build_generation(publisher, connection, rows=4)
+    second = build_generation(publisher, connection, rows=5)
+    third = build_generation(publisher, connection, rows=6)
+
+    # when
+    pointers = [publisher.activate(first), publisher.activate(second), publisher.activate(third)]
+
+    # then
+    # the in-place table is the first previous table.
+    assert pointers == [
+        TablePointer(alias=ALIAS, active_table=first, previous_table=ALIAS),
+        TablePointer(alias=ALIAS, active_table=second, previous_table=first),
+        TablePointer(alias=ALIAS, active_table=third, previous_table=second),
+    ]
+    assert publisher.get_pointer() == pointers[-1]
+    assert publisher.active_table() == third
+    # only the active and the previous generation are kept.
+    assert table_names(connection) == {"docs_table_pointers", second, third}
+
+
+def test_activate_without_in_place_table(publisher, connection):
+    generation = build_generation(publisher, connection, rows=4)
+
+    pointer = publisher.activate(generation)
+
+    assert pointer == TablePointer(alias=ALIAS, active_table=generation, previous_table=None)
+
+
+def test_activate_is_visible_to_other_connections(tmp_path):
+    # given
+    database = str(tmp_path / "docs.db")
+    writer, reader = sqlite3.connect(database), sqlite3.connect(database)
+    for connection in (writer, reader):
+        connection.execute(f"ATTACH DATABASE '{database}' AS {DB_USER}")
+    publisher = SQLiteTablePublisher(writer, DB_USER, ALIAS, clock=FakeClock())
+    generation = build_generation(publisher, writer, rows=2)
+
+    # when
+    publisher.activate(generation)
+
+    # then
+    assert SQLiteTablePublisher(reader, DB_USER, ALIAS).active_table() == generation
+    writer.close()
+    reader.close()
+
+
+def test_rollback_swaps_active_and_previous_generation(publisher, connection):
+    # given
+    first = build_generation(publisher, connection, rows=4)
+    second = build_generation(publisher, connection, rows=5)
+    publisher.activate(first)
+    publisher.activate(second)
+
+    # when
+    rolled_back = publisher.rollback()
+
+    # then
+    assert rolled_back == TablePointer(alias=ALIAS, active_table=first, previous_table=second)
+    # a second rollback restores the rolled back generation.
+    assert publisher.rollback() == TablePointer(alias=ALIAS, active_table=second, previous_table=first)
+
+
+@pytest.mark.parametrize(
+    "test_description, drop_previous",
+    [
+        ("should fail without previous generation", False),
+        ("should fail if the previous generation was dropped", True),
+    ],
+)
+def test_rollback_fails(publisher, connection, test_description, drop_previous):
+    first = build_generation(publisher, connection, rows=4)
+    publisher.activate(first)
+    if drop_previous:
+        publisher.activate(build_generation(publisher, connection, rows=4))
+        publisher.drop(first)
+    pointer = publisher.get_pointer()
+
+    with pytest.raises(PublishValidationError):
+        publisher.rollback()
+
+    assert publisher.get_pointer() == pointer, test_description
+
+
+@pytest.mark.parametrize(
+    "test_description, active_rows, generation_rows, expected_rows, expected_error",
+    [
+        ("should accept a complete generation", 10, 8, 8, None),
+        ("should accept the first generation", None, 8, 8, None),
+        ("should reject an empty generation", 10, 0, 0, "has 0 rows"),
+        ("should reject missing chunks", 10, 8, 9, "expected 9"),
+        ("should reject a much smaller generation", 10, 4, 4, "less than 50%"),
+    ],
+)
+def test_validate(publisher, connection, test_description, active_rows, generation_rows, expected_rows, expected_error):
+    # given
+    if active_rows is not None:
+        publisher.activate(build_generation(publisher, connection, rows=active_rows))
+    generation = build_generation(publisher, connection, rows=generation_rows)
+
+    # when/then
+    if expected_error:
+        with pytest.raises(PublishValidationError, match=expected_error):
+            publisher.validate(generation, expected_rows, min_row_ratio=0.5)
+    else:
+        publisher.validate(generation, expected_rows, min_row_ratio=0.5)
+
+
+def test_drop_ignores_missing_table(publisher, connection):
+    publisher.drop("kyma_docs_20250101000000")
+
+    assert table_names(connection) == set()
+
+
+def test_generation_status(publisher):
+    pointer = TablePointer(alias=ALIAS, active_table="kyma_docs_20260102000000", previous_table=ALIAS)
+
+    assert publisher.generation_status("kyma_docs_20260102000000", pointer) == GenerationStatus.ACTIVE
+    assert publisher.generation_status(ALIAS, pointer) == GenerationStatus.PREVIOUS
+    assert publisher.generation_status("kyma_docs_20260101000000", pointer) == GenerationStatus.UNPUBLISHED
+    assert publisher.generation_status("kyma_docs_20260101000000", None) == GenerationStatus.UNPUBLISHED
+    assert publisher.generation_status("other_table", pointer) is None
+    assert publisher.generation_status(ALIAS, None) is None
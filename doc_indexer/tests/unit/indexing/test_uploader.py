@@ -0,0 +1,343 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from indexing.embedding_cache import EmbeddingCache, EmbeddingCacheStats
+from indexing.uploader import (
+    AIMDConcurrency,
+    EmbeddingUploader,
+    TokenBucket,
+    batch_by_tokens,
+    is_rate_limit_error,
+    retry_after,
+)
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+
+pytestmark = pytest.mark.unit
+
+TOO_MANY_REQUESTS = 429
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class RateLimitError(Exception):
+    status_code = TOO_MANY_REQUESTS
+
+    def __init__(self, retry_after_seconds: float | None = None):
+        super().__init__("Too Many Requests")
+        headers = {"retry-after": str(retry_after_seconds)} if retry_after_seconds is not None else {}
+        self.response = SimpleNamespace(status_code=TOO_MANY_REQUESTS, headers=headers)
+
+
+class HTTPError(Exception):
+    def __init__(self, response: SimpleNamespace):
+        super().__init__("HTTP error")
+        self.response = response
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+class FakeEmbeddingServer(Embeddings):
+    """Embedding endpoint that rate limits requests above its concurrency or its token budget per window."""
+
+    def __init__(self, max_concurrency: int, tokens_per_window: int, window: float = 0.1, latency: float = 0.01):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_window = tokens_per_window
+        self.window = window
+        self.latency = latency
+        self.active = 0
+        self.rejected = {"concurrency": 0, "tokens": 0}
+        self._requests: list[tuple[float, int]] = []
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        tokens = sum(count_words(text) for text in texts)
+        with self._lock:
+            now = time.monotonic()
+            self._requests = [(at, used) for at, used in self._requests if at > now - self.window]
+            if self.active >= self.max_concurrency:
+                self.rejected["concurrency"] += 1
+                raise RateLimitError()
+            if sum(used for _, used in self._requests) + tokens > self.tokens_per_window:
+                self.rejected["tokens"] += 1
+                raise RateLimitError(retry_after_seconds=self.window)
+            self._requests.append((now, tokens))
+            self.active += 1
+        try:
+            time.sleep(self.latency)
+            return [[float(len(text))] for text in texts]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+def chunks(count: int, words: int = 10) -> list[Document]:
+    return [
+        Document(page_content=" ".join([f"chunk{index}"] * words), metadata={"index": index}) for index in range(count)
+    ]
+
+
+class TestTokenBucket:
+    def test_acquire_waits_for_refill(self):
+        # given
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=20, clock=clock, sleep=clock.sleep)
+
+        # when
+        waits = [bucket.acquire(15), bucket.acquire(15), bucket.acquire(50)]
+
+        # then
+        # the third request is larger than the bucket and takes the whole refilled bucket.
+        assert waits == [0.0, 1.0, 2.0]
+        assert clock.now == pytest.approx(3.0)
+
+    def test_acquire_does_not_refill_above_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=20, clock=clock, sleep=clock.sleep)
+
+        clock.now = 100
+        bucket.acquire(20)
+
+        assert bucket.acquire(10) == pytest.approx(1.0)
+
+
+class TestAIMDConcurrency:
+    def test_limit_increases_up_to_maximum(self):
+        maximum = 3
+        concurrency = AIMDConcurrency(initial=1, maximum=maximum, latency_target=None)
+
+        concurrency.on_success(started_at=0, latency=1)
+        assert concurrency.limit == maximum - 1
+
+        for _ in range(10):
+            concurrency.on_success(started_at=0, latency=1)
+        assert concurrency.limit == maximum
+
+    @pytest.mark.parametrize(
+        "test_description, signal, expected_limit",
+        [
+            ("should halve on rate limiting", lambda c: c.on_rate_limited(started_at=5), 4),
+            ("should halve on slow requests", lambda c: c.on_success(started_at=5, latency=30), 4),
+            ("should increase on fast requests", lambda c: c.on_success(started_at=5, latency=1), 8),
+        ],
+    )
+    def test_signals(self, test_description, signal, expected_limit):
+        concurrency = AIMDConcurrency(initial=8, maximum=16, latency_target=10)
+
+        signal(concurrency)
+
+        assert concurrency.limit == expected_limit, test_description
+
+    def test_requests_sent_before_a_decrease_do_not_decrease_again(self):
+        # given
+        clock = FakeClock()
+        concurrency = AIMDConcurrency(initial=8, maximum=16, clock=clock)
+        clock.now = 10
+        concurrency.on_rate_limited(started_at=5)
+
+        # when
+        concurrency.on_rate_limited(started_at=6)
+        concurrency.on_rate_limited(started_at=11)
+        concurrency.on_rate_limited(started_at=12)
+
+        # then
+        assert concurrency.limit == 1
+
+
+@pytest.mark.parametrize(
+    "test_description, words, max_batch_tokens, max_batch_size, expected_batches",
+    [
+        ("should split by tokens", [4, 4, 4, 4], 8, 10, [([0, 1], 8), ([2, 3], 8)]),
+        ("should split by size", [1, 1, 1], 100, 2, [([0, 1], 2), ([2], 1)]),
+        ("should keep large chunks in their own batch", [2, 20, 2], 10, 10, [([0], 2), ([1], 20), ([2], 2)]),
+        ("should yield nothing for no chunks", [], 10, 10, []),
+    ],
+)
+def test_batch_by_tokens(test_description, words, max_batch_tokens, max_batch_size, expected_batches):
+    docs = [Document(page_content="word " * count, metadata={"index": index}) for index, count in enumerate(words)]
+
+    batches = list(batch_by_tokens(docs, count_words, max_batch_tokens, max_batch_size))
+
+    assert [([doc.metadata["index"] for doc in batch], tokens) for batch, tokens in batches] == expected_batches, (
+        test_description
+    )
+
+
+@pytest.mark.parametrize(
+    "test_description, error, expected_rate_limit, expected_retry_after",
+    [
+        ("should detect a 429 error with retry-after", RateLimitError(retry_after_seconds=2), True, 2.0),
+        ("should detect a 429 error without retry-after", RateLimitError(), True, None),
+        (
+            "should detect a 429 response",
+            HTTPError(SimpleNamespace(status_code=TOO_MANY_REQUESTS, headers={})),
+            True,
+            None,
+        ),
+        ("should not detect other errors", ValueError("invalid input"), False, None),
+    ],
+)
+def test_rate_limit_error(test_description, error, expected_rate_limit, expected_retry_after):
+    assert is_rate_limit_error(error) == expected_rate_limit, test_description
+    assert retry_after(error) == expected_retry_after, test_description
+
+
+class TestEmbeddingUploader:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def uploader(
+        self,
+        embedding: Embeddings,
+        store: Mock,
+        clock: FakeClock,
+        max_retries: int = 2,
+        cache: EmbeddingCache | None = None,
+    ) -> EmbeddingUploader:
+        return EmbeddingUploader(
+            embedding=embedding,
+            store=store,
+            count_tokens=count_words,
+            rate_limiter=TokenBucket(rate=1000, capacity=1000, clock=clock, sleep=clock.sleep),
+            concurrency=AIMDConcurrency(initial=1, maximum=4, clock=clock),
+            max_batch_tokens=20,
+            max_batch_size=10,
+            max_retries=max_retries,
+            cache=cache,
+            clock=clock,
+            sleep=clock.sleep,
+        )
+
+    def test_upload_retries_rate_limited_requests(self, clock):
+        # given
+        embedding = Mock(spec=Embeddings)
+        embedding.embed_documents.side_effect = [RateLimitError(), RateLimitError(retry_after_seconds=5), [[1.0]]]
+        store = Mock()
+
+        # when
+        stored = self.uploader(embedding, store, clock).upload(chunks(1))
+
+        # then
+        assert stored == 1
+        store.assert_called_once_with(chunks(1), [[1.0]])
+        # exponential backoff, then the delay of the retry-after header.
+        assert clock.now == pytest.approx(1 + 5)
+
+    @pytest.mark.parametrize(
+        "test_description, errors",
+        [
+            ("should raise other errors", [ValueError("invalid input")]),
+            ("should give up after the maximal retries", [RateLimitError()] * 3),
+        ],
+    )
+    def test_upload_raises(self, clock, test_description, errors):
+        embedding = Mock(spec=Embeddings)
+        embedding.embed_documents.side_effect = errors
+        store = Mock()
+
+        with pytest.raises(type(errors[-1])):
+            self.uploader(embedding, store, clock).upload(chunks(1))
+
+        store.assert_not_called()
+
+    def test_upload_adapts_to_fake_embedding_server(self):
+        # given
+        server = FakeEmbeddingServer(max_concurrency=3, tokens_per_window=1000, window=0.1, latency=0.05)
+        stored_chunks: dict[int, list[float]] = {}
+
+        def store(batch: list[Document], embeddings: list[list[float]]) -> None:
+            for chunk, embedding in zip(batch, embeddings, strict=True):
+                assert chunk.metadata["index"] not in stored_chunks
+                stored_chunks[chunk.metadata["index"]] = embedding
+
+        uploader = EmbeddingUploader(
+            embedding=server,
+            store=store,
+            count_tokens=count_words,
+            rate_limiter=TokenBucket(rate=1000 / 0.1, capacity=1000),
+            concurrency=AIMDConcurrency(initial=2, maximum=8),
+            max_batch_tokens=50,
+            max_batch_size=100,
+            retry_delay=0.01,
+            max_retries=20,
+        )
+        given_chunks = chunks(120)
+
+        # when
+        stored = uploader.upload(given_chunks)
+
+        # then
+        assert stored == len(given_chunks)
+        assert stored_chunks == {chunk.metadata["index"]: [float(len(chunk.page_content))] for chunk in given_chunks}
+        # the concurrency was probed above the limit of the server, and the rejected batches were retried.
+        assert server.rejected["concurrency"] > 0
+
+    def test_upload_embeds_only_uncached_chunks(self, clock, tmp_path):
+        # given
+        embedding = Mock(wraps=DeterministicFakeEmbedding(size=8))
+        cache_path = str(tmp_path / "embeddings.sqlite")
+        first_run = chunks(6, words=3)
+        # the second run has two changed chunks.
+        second_run = [*first_run[:2], *chunks(2, words=4), *first_run[4:]]
+
+        def run(given_chunks: list[Document]) -> tuple[Mock, EmbeddingCacheStats]:
+            cache = EmbeddingCache(cache_path, "fake-model")
+            uploader = self.uploader(embedding, Mock(), clock, cache=cache)
+            uploader.upload(given_chunks)
+            cache.close()
+            return uploader.store, cache.stats
+
+        first_store, first_stats = run(first_run)
+        embedding.reset_mock()
+
+        # when
+        second_store, second_stats = run(second_run)
+
+        # then
+        embedded_texts = [text for call in embedding.embed_documents.call_args_list for text in call.args[0]]
+        assert embedded_texts == [chunk.page_content for chunk in second_run[2:4]]
+        assert first_stats == EmbeddingCacheStats(hits=0, misses=6, added=6)
+        assert second_stats == EmbeddingCacheStats(hits=4, misses=2, added=2)
+        stored = [
+            (chunk, embedding)
+            for call in second_store.call_args_list
+            for chunk, embedding in zip(*call.args, strict=True)
+        ]
+        assert stored == [
+            (chunk, DeterministicFakeEmbedding(size=8).embed_query(chunk.page_content)) for chunk in second_run
+        ]
+
+    def test_upload_stores_fully_cached_batches_without_embedding(self, clock):
+        # given
+        embedding = Mock(spec=Embeddings)
+        cache = EmbeddingCache(":memory:", "fake-model")
+        given_chunks = chunks(3, words=2)
+        cache.put_many([chunk.page_content for chunk in given_chunks], [[1.0], [2.0], [3.0]])
+        store = Mock()
+        uploader = self.uploader(embedding, store, clock, cache=cache)
+
+        # when
+        stored = uploader.upload(given_chunks)
+
+        # then
+        assert stored == len(given_chunks)
+        embedding.embed_documents.assert_not_called()
+        store.assert_called_once_with(given_chunks, [[1.0], [2.0], [3.0]])
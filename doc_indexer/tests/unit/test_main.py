@@ -1,6 +1,8 @@
 from unittest.mock import Mock, patch
 
 import pytest
+from indexing.embedding_cache import EmbeddingCache
+from indexing.publisher import TablePointer
 
 pytestmark = pytest.mark.unit
 
@@ -153,3 +155,74 @@ def test_run_list_tables_raises_when_connection_fails():
         run_list_tables()
 
     mock_list.assert_not_called()
+
+
+def test_run_rollback_rolls_back_injected_table(mock_hana_conn):
+    """run_rollback switches the documentation table of the injected connection back to its previous table."""
+    from main import run_rollback
+
+    with (
+        patch("main.TablePublisher") as mock_publisher_cls,
+        patch("main.DATABASE_USER", "test_user"),
+    ):
+        run_rollback(hana_conn=mock_hana_conn, table_name="test_table")
+
+    mock_publisher_cls.assert_called_once_with(mock_hana_conn, "test_user", "test_table")
+    mock_publisher_cls.return_value.rollback.assert_called_once()
+
+
+def test_run_list_tables_shows_generations(mock_hana_conn):
+    """run_list_tables marks the active and previous generation of the documentation table."""
+    from main import run_list_tables
+
+    with (
+        patch(
+            "main.list_tables",
+            return_value=[("test_table_20260101000000", 10, 100), ("test_table_20260102000000", 12, 120)],
+        ),
+        patch("main.DATABASE_USER", "test_user"),
+        patch("main.logger") as mock_logger,
+        patch("indexing.publisher.TablePublisher.get_pointer") as mock_get_pointer,
+    ):
+        mock_get_pointer.return_value = TablePointer(
+            alias="test_table",
+            active_table="test_table_20260102000000",
+            previous_table="test_table_20260101000000",
+        )
+        run_list_tables(hana_conn=mock_hana_conn, table_name="test_table")
+
+    lines = [call.args[0] for call in mock_logger.info.call_args_list]
+    assert any("test_table_20260101000000" in line and "previous" in line for line in lines)
+    assert any("test_table_20260102000000" in line and "active" in line for line in lines)
+
+
+def test_run_prune_cache_prunes_all_models(tmp_path):
+    """run_prune_cache deletes the cached embeddings of all models that were not used for max_age_days."""
+    from main import run_prune_cache
+
+    cache_path = str(tmp_path / "embeddings.sqlite")
+    cache = EmbeddingCache(cache_path, "old-model", clock=lambda: 0.0)
+    cache.put_many(["chunk"], [[1.0]])
+    cache.close()
+
+    run_prune_cache(embedding_cache_path=cache_path, max_age_days=30)
+
+    assert EmbeddingCache(cache_path, "old-model").count() == 0
+
+
+def test_run_indexer_closes_embedding_cache(mock_embeddings, mock_hana_conn, tmp_path):
+    """run_indexer passes the embedding cache to the indexer and closes it after the run."""
+    from main import run_indexer
+
+    with (
+        patch("main.AdaptiveSplitMarkdownIndexer") as mock_indexer_cls,
+        patch("main.EmbeddingCache") as mock_cache_cls,
+    ):
+        run_indexer(
+            embeddings_model=mock_embeddings,
+            hana_conn=mock_hana_conn,
+            embedding_cache_path=str(tmp_path / "embeddings.sqlite"),
+        )
+
+    assert mock_indexer_cls.call_args.kwargs["embedding_cache"] == mock_cache_cls.return_value
+    mock_cache_cls.return_value.close.assert_called_once()
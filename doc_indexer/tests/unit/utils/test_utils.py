@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import call, patch
 
 import pytest
 
@@ -58,3 +58,21 @@ def test_clone_repo(
         mock_os_path_exists.assert_called_once_with(expected_repo_path)
     mock_subprocess_run.assert_called_once_with(["git", "clone", given_repo_url, expected_repo_path])
     assert repo_path == expected_repo_path
+
+
+def test_clone_repo_with_sparse_paths(mock_subprocess_run, mock_os_path_exists):
+    # Given
+    mock_os_path_exists.return_value = False
+    mock_subprocess_run.return_value.returncode = 0
+    repo_url = "https://github.com/kyma-project/eventing-manager.git"
+    expected_repo_path = "tmp/test_clone_repo/eventing-manager"
+
+    # When
+    repo_path = clone_repo(repo_url, "tmp/test_clone_repo", sparse_paths=["/README.md", "/docs/user/"])
+
+    # Then
+    assert repo_path == expected_repo_path
+    assert mock_subprocess_run.call_args_list == [
+        call(["git", "clone", "--depth", "1", "--filter=blob:none", "--sparse", repo_url, expected_repo_path]),
+        call(["git", "-C", expected_repo_path, "sparse-checkout", "set", "--no-cone", "/README.md", "/docs/user/"]),
+    ]
@@ -0,0 +1,212 @@
+"""
+This script measures the bytes written and the serialization time per conversation turn of the
+AsyncRedisSaver, with and without checkpoint compaction.
+
+A conversation turn of the companion graph stores several checkpoints, and every checkpoint contains the
+whole message history of the conversation. The benchmark saves synthetic conversations of 10 to 200 turns
+into an in-memory Redis (fakeredis), with messages of realistic sizes, in the following modes:
+- plain: every checkpoint stores all channel values.
+- compaction: checkpoints store the deltas to their parent checkpoint (CHECKPOINT_COMPACTION_ENABLED).
+- compaction+zlib: the compacted checkpoints are compressed (CHECKPOINT_COMPRESSION_ENABLED).
+
+Every compacted conversation is read back and compared with the saved channel values, so the benchmark
+fails if the compaction is not lossless.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_checkpoint_compaction.py
+    or
+    python scripts/python/benchmarks/benchmark_checkpoint_compaction.py --turns 10,100 --output compaction.json
+
+Environment Variables:
+    CHECKPOINT_FULL_INTERVAL: Number of delta checkpoints after a full checkpoint (default: 20)
+    CHECKPOINT_KEEP_FULL: Number of full checkpoints kept per thread, 0 keeps all (default: 2)
+
+Output:
+    A table with the mean bytes written and the mean aput time per turn, the bytes written by the last turn,
+    the stored bytes of the conversation and the latency of aget_tuple, per number of turns and mode.
+    With --output, the results as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any
+
+import fakeredis
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.base import Checkpoint, empty_checkpoint
+from langgraph.checkpoint.base.id import uuid6
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
+
+from agents.memory.async_redis_checkpointer import (  # noqa: E402
+    AsyncRedisSaver,
+    _make_redis_checkpoint_key,
+)
+from utils.settings import CHECKPOINT_FULL_INTERVAL, CHECKPOINT_KEEP_FULL  # noqa: E402
+
+MODES = {
+    "plain": {"compaction": False, "compression": False},
+    "compaction": {"compaction": True, "compression": False},
+    "compaction+zlib": {"compaction": True, "compression": True},
+}
+QUESTION = "Why is the pod nginx-{turn} in the namespace default in CrashLoopBackOff? "
+TOOL_RESULT = (
+    '{{"kind": "Pod", "metadata": {{"name": "nginx-{turn}", "labels": {{"app": "nginx"}}}}, "status": "{status}"}}'
+)
+ANSWER = "The container of the pod nginx-{turn} exits with code 1, because the configuration file is missing. "
+
+
+def conversation_steps(turn: int) -> list[tuple[dict[str, Any], list[BaseMessage]]]:
+    """Return the channel updates and the new messages of the checkpoints of a conversation turn."""
+    tool_call_id = f"call-{turn}"
+    return [
+        # the question of the user.
+        ({}, [HumanMessage(content=QUESTION.format(turn=turn) * 2, id=f"question-{turn}")]),
+        # the supervisor plans the subtasks.
+        ({"next": "KubernetesAgent", "subtasks": [{"description": f"check nginx-{turn}", "status": "pending"}]}, []),
+        # the agent calls a tool.
+        (
+            {},
+            [
+                AIMessage(
+                    content="",
+                    id=f"tool-call-{turn}",
+                    tool_calls=[
+                        {"name": "k8s_query_tool", "args": {"uri": f"/api/v1/pods/nginx-{turn}"}, "id": tool_call_id}
+                    ],
+                ),
+                ToolMessage(
+                    content=TOOL_RESULT.format(turn=turn, status="CrashLoopBackOff " * 150),
+                    tool_call_id=tool_call_id,
+                    id=f"tool-result-{turn}",
+                ),
+            ],
+        ),
+        # the finalizer answers.
+        ({"next": "__end__", "subtasks": []}, [AIMessage(content=ANSWER.format(turn=turn) * 10, id=f"answer-{turn}")]),
+    ]
+
+
+def stored_size(data: dict[bytes, bytes]) -> int:
+    """Return the stored size of the fields of a Redis hash in bytes."""
+    return sum(len(field) + len(value) for field, value in data.items())
+
+
+async def run_conversation(saver: AsyncRedisSaver, redis: fakeredis.FakeAsyncRedis, turns: int) -> dict[str, Any]:
+    """Save the checkpoints of a conversation, and return the bytes written and the aput time per turn."""
+    thread_id = f"thread-{turns}"
+    config: dict[str, Any] = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    checkpoint: Checkpoint = empty_checkpoint()
+    saved_values: dict[str, dict[str, Any]] = {}
+    bytes_per_turn: list[int] = []
+    seconds_per_turn: list[float] = []
+    version = 0
+    for turn in range(turns):
+        turn_bytes = 0
+        turn_seconds = 0.0
+        for updates, new_messages in conversation_steps(turn):
+            version += 1
+            channel_values = dict(checkpoint["channel_values"])
+            channel_values.update(updates)
+            new_versions: dict[str, Any] = dict.fromkeys(updates, version)
+            if new_messages:
+                channel_values["messages"] = [*channel_values.get("messages", []), *new_messages]
+                new_versions["messages"] = version
+            checkpoint = {
+                **checkpoint,
+                "id": str(uuid6(clock_seq=version)),
+                "channel_values": channel_values,
+                "channel_versions": {**checkpoint["channel_versions"], **new_versions},
+            }
+
+            start = time.perf_counter()
+            config = await saver.aput(config, checkpoint, {"source": "loop", "step": version}, new_versions)
+            turn_seconds += time.perf_counter() - start
+            key = _make_redis_checkpoint_key(thread_id, "", checkpoint["id"])
+            turn_bytes += stored_size(await redis.hgetall(key))
+            saved_values[checkpoint["id"]] = channel_values
+        bytes_per_turn.append(turn_bytes)
+        seconds_per_turn.append(turn_seconds)
+
+    start = time.perf_counter()
+    latest = await saver.aget_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+    get_seconds = time.perf_counter() - start
+    # the compaction must be lossless.
+    async for checkpoint_tuple in saver.alist({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}):
+        if checkpoint_tuple.checkpoint["channel_values"] != saved_values[checkpoint_tuple.checkpoint["id"]]:
+            raise RuntimeError(f"checkpoint {checkpoint_tuple.checkpoint['id']} is not reconstructed losslessly")
+    if latest is None or latest.checkpoint["id"] != checkpoint["id"]:
+        raise RuntimeError("the latest checkpoint cannot be read")
+
+    total_bytes = 0
+    for key in await redis.keys(_make_redis_checkpoint_key(thread_id, "", "*")):
+        total_bytes += stored_size(await redis.hgetall(key))
+    return {
+        "bytes_per_turn": round(statistics.mean(bytes_per_turn)),
+        "last_turn_bytes": bytes_per_turn[-1],
+        "aput_ms_per_turn": round(statistics.mean(seconds_per_turn) * 1000, 3),
+        "stored_bytes": total_bytes,
+        "aget_tuple_ms": round(get_seconds * 1000, 3),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Run the conversations of every number of turns in every mode."""
+    results = []
+    for turns in args.turns:
+        for mode, options in MODES.items():
+            async with fakeredis.FakeAsyncRedis() as redis:
+                saver = AsyncRedisSaver(
+                    conn=redis, full_interval=args.full_interval, keep_full=args.keep_full, **options
+                )
+                result = await run_conversation(saver, redis, turns)
+            results.append({"turns": turns, "mode": mode, **result})
+    return results
+
+
+def print_results(results: list[dict[str, Any]]) -> None:
+    """Print the results per number of turns and mode."""
+    print(
+        f"\n{'turns':>6}  {'mode':<17}{'KB/turn':>9}{'last turn KB':>14}{'aput ms/turn':>14}"
+        f"{'stored KB':>11}{'get ms':>8}"
+    )
+    for result in results:
+        print(
+            f"{result['turns']:>6}  {result['mode']:<17}{result['bytes_per_turn'] / 1024:>9.1f}"
+            f"{result['last_turn_bytes'] / 1024:>14.1f}{result['aput_ms_per_turn']:>14.2f}"
+            f"{result['stored_bytes'] / 1024:>11.1f}{result['aget_tuple_ms']:>8.2f}"
+        )
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--turns",
+        type=lambda value: [int(turns) for turns in value.split(",")],
+        default=[10, 50, 100, 200],
+        help="Comma separated numbers of conversation turns.",
+    )
+    parser.add_argument(
+        "--full-interval", type=int, default=CHECKPOINT_FULL_INTERVAL, help="Delta checkpoints after a full one."
+    )
+    parser.add_argument("--keep-full", type=int, default=CHECKPOINT_KEEP_FULL, help="Full checkpoints kept per thread.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args))
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
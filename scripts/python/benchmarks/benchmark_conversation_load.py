@@ -0,0 +1,759 @@
+"""
+This script measures the throughput and latency of the conversation API under concurrent load.
+
+The blackbox test scenarios (tests/blackbox/data/test-cases) are replayed against the FastAPI app,
+which runs in-process in a uvicorn server on localhost. Every replay starts a new conversation and
+sends the queries of a scenario to /api/conversations/{id}/messages, like the Companion web UI.
+The requests go through the real routers, conversation service, companion graph, checkpointer and
+usage tracker, with local stand-ins for the external systems:
+
+- a scripted LLM, which answers the gatekeeper, the planner, the agents and the finalizer of the
+  scenario after a fixed latency: the agent queries the resource of the scenario once with its
+  query tool and then answers with the expectations of the scenario,
+- fakeredis as the Redis of the checkpointer and the usage tracker,
+- a fake Kubernetes API, which serves the manifests of the scenario (deployment.yml).
+
+For every concurrency level, the benchmark reports the throughput, the p50/p95/p99 latency of the
+requests, the time to the first streamed chunk (TTFB), the lag of the event loop of the server,
+and the time per graph node. The time of a node is the time between its update and the previous
+update of the graph, which is the duration of the node for the sequential graph.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_conversation_load.py
+    or
+    python scripts/python/benchmarks/benchmark_conversation_load.py --concurrency 1 8 32 --llm-latency 0.2
+
+Environment Variables:
+    LOG_LEVEL: Log level of the app (default: "ERROR", to keep the output readable)
+
+Output:
+    A table with the throughput, latency, TTFB and event loop lag per concurrency level, and a table
+    with the time per graph node. With --output, the results as JSON with sorted keys and rounded
+    values, which can be compared across commits.
+"""
+
+import argparse
+import asyncio
+import glob
+import itertools
+import json
+import math
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncGenerator, Sequence
+from typing import Any, cast
+from unittest.mock import patch
+
+import httpx
+import jwt
+import uvicorn
+import yaml
+from fakeredis import FakeAsyncRedis
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
+
+import agents.kyma.tools.search as search_module  # noqa: E402
+from agents.common.constants import COMMON, K8S_AGENT, KYMA_AGENT  # noqa: E402
+from agents.common.data import Message  # noqa: E402
+from main import app  # noqa: E402
+from rag.system import RAGSystem  # noqa: E402
+from routers.conversations import init_config, init_conversation_service  # noqa: E402
+from services.conversation import ConversationService, IService  # noqa: E402
+from services.data_sanitizer import IDataSanitizer  # noqa: E402
+from services.k8s import IK8sClient, K8sAuthHeaders, K8sClient  # noqa: E402
+from services.redis import Redis  # noqa: E402
+from utils.config import Config  # noqa: E402
+from utils.logging import logging_stats  # noqa: E402
+from utils.models.factory import IModel  # noqa: E402
+from utils.settings import MAIN_EMBEDDING_MODEL_NAME, MAIN_MODEL_MINI_NAME, MAIN_MODEL_NAME  # noqa: E402
+
+SCENARIOS_DIR = os.path.join(os.path.dirname(__file__), "../../../tests/blackbox/data/test-cases")
+DEFAULT_SCENARIOS = ["15_nginx_oom", "02_bitnami_wrong_rbac_permissions"]
+CERTIFICATE_AUTHORITY_DATA = "LS0tLS1CRUdJTiBDRVJUSUZJQ0FURS0tLS0tCg=="
+EVENT_LOOP_PROBE_INTERVAL = 0.01
+SERVER_START_TIMEOUT = 30.0
+
+
+def plural(kind: str) -> str:
+    """Return the resource name of a kind, e.g. deployments for Deployment."""
+    name = kind.lower()
+    return f"{name}es" if name.endswith("s") else f"{name}s"
+
+
+class LoadCase:
+    """A query of a scenario, with the resource it is about and the scripted answer."""
+
+    def __init__(self, scenario: str, query: dict[str, Any]) -> None:
+        self.scenario = scenario
+        self.query: str = query["user_query"]
+        resource = query.get("resource", {})
+        self.kind: str = resource.get("kind", "Cluster")
+        self.api_version: str = resource.get("api_version", "")
+        self.name: str = resource.get("name", "")
+        self.namespace: str = resource.get("namespace", "")
+        statements = [expectation["statement"] for expectation in query.get("expectations", [])]
+        self.answer = "The analysis of the resource " + "; ".join(statements) + "."
+
+    @property
+    def agent(self) -> str:
+        """The agent that the scripted planner assigns the query to."""
+        if "kyma-project.io" in self.api_version:
+            return KYMA_AGENT
+        return K8S_AGENT if self.api_version else COMMON
+
+    @property
+    def uri(self) -> str:
+        """The URI that the scripted agent queries."""
+        group_version = f"/api/{self.api_version}" if "/" not in self.api_version else f"/apis/{self.api_version}"
+        namespace = f"/namespaces/{self.namespace}" if self.namespace else ""
+        return f"{group_version}{namespace}/{plural(self.kind)}/{self.name}"
+
+    def message(self) -> dict[str, Any]:
+        """Return the request body of the query."""
+        return Message(
+            query=self.query,
+            resource_kind=self.kind,
+            resource_api_version=self.api_version,
+            resource_name=self.name,
+            namespace=self.namespace,
+        ).model_dump(exclude={"user_identifier", "resource_scope", "resource_related_to"})
+
+
+class Scenario:
+    """A blackbox test scenario: its queries and the manifests of its resources."""
+
+    def __init__(self, directory: str) -> None:
+        self.name = os.path.basename(directory)
+        with open(os.path.join(directory, "scenario.yml"), encoding="utf-8") as file:
+            definition = yaml.safe_load(file)
+        self.cases = [LoadCase(self.name, query) for query in definition["queries"]]
+        self.objects: list[dict[str, Any]] = []
+        for path in sorted(glob.glob(os.path.join(directory, "*.yml")) + glob.glob(os.path.join(directory, "*.yaml"))):
+            if os.path.basename(path) == "scenario.yml":
+                continue
+            with open(path, encoding="utf-8") as file:
+                self.objects.extend(document for document in yaml.safe_load_all(file) if document)
+        # the manifests are applied to the namespace of the scenario.
+        default_namespace = self.cases[0].namespace if self.cases else ""
+        for obj in self.objects:
+            obj.setdefault("metadata", {}).setdefault("namespace", default_namespace)
+
+
+def load_scenarios(names: Sequence[str]) -> list[Scenario]:
+    """Load the scenarios by directory name, or all scenarios with a manifest for 'all'."""
+    if list(names) == ["all"]:
+        directories = sorted(
+            os.path.dirname(path) for path in glob.glob(os.path.join(SCENARIOS_DIR, "*", "deployment.yml"))
+        )
+    else:
+        directories = [os.path.join(SCENARIOS_DIR, name) for name in names]
+    return [Scenario(directory) for directory in directories]
+
+
+class FakeK8sClient:
+    """Kubernetes client that serves the manifests of a scenario, with a fixed latency per API request."""
+
+    def __init__(self, cluster_url: str, objects: list[dict[str, Any]], latency: float) -> None:
+        self._cluster_url = cluster_url
+        self._objects = objects
+        self._latency = latency
+
+    def get_api_server(self) -> str:
+        """Return the URL of the fake cluster."""
+        return self._cluster_url
+
+    def model_dump(self) -> None:
+        """The fake client has no state to dump."""
+
+    def _select(self, api_version: str, kind_plural: str, namespace: str, name: str = "") -> list[dict]:
+        return [
+            obj
+            for obj in self._objects
+            if obj.get("apiVersion") == api_version
+            and plural(obj.get("kind", "")) == kind_plural
+            and (not namespace or obj["metadata"].get("namespace") == namespace)
+            and (not name or obj["metadata"].get("name") == name)
+        ]
+
+    async def execute_get_api_request(self, uri: str) -> dict | list[dict]:
+        """Return the manifest or the list of manifests of the URI."""
+        await asyncio.sleep(self._latency)
+        match = re.fullmatch(
+            r"/(?:api/(?P<core>[^/]+)|apis/(?P<group>[^/]+/[^/]+))"
+            r"(?:/namespaces/(?P<namespace>[^/]+))?/(?P<plural>[^/]+)(?:/(?P<name>[^/]+))?",
+            uri.split("?")[0].rstrip("/"),
+        )
+        if match is None:
+            raise ValueError(f"Unsupported URI: {uri}")
+        api_version = match["core"] or match["group"]
+        objects = self._select(api_version, match["plural"], match["namespace"] or "", match["name"] or "")
+        if match["name"] is None:
+            return objects
+        if not objects:
+            raise ValueError(f"{match['plural']} {match['name']} not found")
+        return objects[0]
+
+    def list_resources(self, api_version: str, kind: str, namespace: str) -> list:
+        """Return the manifests of a kind."""
+        return self._select(api_version, plural(kind), namespace)
+
+    def get_resource(self, api_version: str, kind: str, name: str, namespace: str) -> dict:
+        """Return the manifest of a resource."""
+        objects = self._select(api_version, plural(kind), namespace, name)
+        if not objects:
+            raise ValueError(f"{kind} {name} not found")
+        return objects[0]
+
+    def get_resource_version(self, kind: str) -> str:
+        """Return the API version of a kind."""
+        return next((obj["apiVersion"] for obj in self._objects if obj.get("kind") == kind), "v1")
+
+    def describe_resource(self, api_version: str, kind: str, name: str, namespace: str) -> dict:
+        """Return the manifest of a resource without events."""
+        return {**self.get_resource(api_version, kind, name, namespace), "events": []}
+
+    def list_not_running_pods(self, namespace: str) -> list[dict]:
+        """The fake cluster has no pod status."""
+        return []
+
+    async def list_nodes_metrics(self) -> list[dict]:
+        """The fake cluster has no node metrics."""
+        await asyncio.sleep(self._latency)
+        return []
+
+    def list_k8s_events(self, namespace: str) -> list[dict]:
+        """The fake cluster has no events."""
+        return []
+
+    def list_k8s_warning_events(self, namespace: str) -> list[dict]:
+        """The fake cluster has no events."""
+        return []
+
+    def list_k8s_events_for_resource(self, kind: str, name: str, namespace: str) -> list[dict]:
+        """The fake cluster has no events."""
+        return []
+
+    async def fetch_pod_logs(
+        self, name: str, namespace: str, container_name: str, is_terminated: bool, tail_limit: int
+    ) -> list[str]:
+        """Return a log line of the pod."""
+        await asyncio.sleep(self._latency)
+        return [f"log line of {name}"]
+
+    async def get_namespace(self, name: str) -> dict:
+        """Return the manifest of a namespace."""
+        await asyncio.sleep(self._latency)
+        return {"apiVersion": "v1", "kind": "Namespace", "metadata": {"name": name}}
+
+    async def get_group_version(self, group_version: str) -> dict:
+        """Return the resources of the kinds of the manifests in the group version."""
+        await asyncio.sleep(self._latency)
+        kinds = {obj["kind"] for obj in self._objects if obj.get("apiVersion") == group_version}
+        return {
+            "resources": [
+                {"name": plural(kind), "kind": kind, "namespaced": True, "verbs": ["get", "list"]}
+                for kind in sorted(kinds)
+            ]
+        }
+
+    def get_data_sanitizer(self) -> IDataSanitizer | None:
+        """The manifests are not sanitized."""
+        return None
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model that answers the queries of the scenarios after a fixed latency.
+
+    The response depends on the bound tools: the structured outputs of the gatekeeper and the
+    planner, a query tool call of an agent that has not queried the cluster yet, and otherwise the
+    scripted answer of the query.
+    """
+
+    cases: list[LoadCase]
+    latency: float = 0.0
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(
+        self, tools: Sequence[Any], *, tool_choice: str | None = None, **kwargs: Any
+    ) -> Runnable[LanguageModelInput, AIMessage]:
+        """Bind the tools as OpenAI tool schemas, like the OpenAI chat model."""
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _find_case(self, messages: list[BaseMessage]) -> LoadCase:
+        text = "\n".join(str(message.content) for message in messages)
+        matches = [case for case in self.cases if case.query in text] or self.cases
+        # the resource context names the namespace, which tells queries with the same text apart.
+        return next((case for case in matches if case.namespace and case.namespace in text), matches[0])
+
+    def _respond(self, messages: list[BaseMessage], tools: list[dict[str, Any]]) -> AIMessage:
+        case = self._find_case(messages)
+        tool_names = [tool["function"]["name"] for tool in tools]
+        if "GatekeeperResponse" in tool_names:
+            return self._tool_call(
+                "GatekeeperResponse",
+                {
+                    "is_prompt_injection": False,
+                    "is_security_threat": False,
+                    "user_intent": case.query,
+                    "category": "Kyma" if case.agent == KYMA_AGENT else "Kubernetes",
+                    "direct_response": "",
+                    "is_user_query_in_past_tense": False,
+                    "answer_from_history": "",
+                },
+            )
+        if "Plan" in tool_names:
+            subtask = {"description": case.query, "task_title": "Checking the resource", "assigned_to": case.agent}
+            return self._tool_call("Plan", {"subtasks": [subtask]})
+        query_tool = next((name for name in tool_names if name in ("k8s_query_tool", "kyma_query_tool")), None)
+        if query_tool and not any(isinstance(message, ToolMessage) for message in messages):
+            return self._tool_call(query_tool, {"uri": case.uri})
+        return AIMessage(content=case.answer)
+
+    @staticmethod
+    def _tool_call(name: str, args: dict[str, Any]) -> AIMessage:
+        return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"call_{uuid.uuid4().hex}"}])
+
+    def _result(self, messages: list[BaseMessage], **kwargs: Any) -> ChatResult:
+        message = self._respond(messages, kwargs.get("tools", []))
+        prompt_tokens = sum(len(str(item.content)) for item in messages) // 4
+        completion_tokens = len(str(message.content) + json.dumps(message.tool_calls)) // 4
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)], llm_output={"token_usage": usage})
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result(messages, **kwargs)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result(messages, **kwargs)
+
+
+class ScriptedModel:
+    """IModel of the scripted chat model."""
+
+    def __init__(self, name: str, llm: ScriptedChatModel) -> None:
+        self._name = name
+        self._llm = llm
+
+    def invoke(self, content: str) -> Any:
+        """Invoke the scripted chat model."""
+        return self._llm.invoke(content)
+
+    @property
+    def name(self) -> str:
+        """The name of the model."""
+        return self._name
+
+    @property
+    def llm(self) -> ScriptedChatModel:
+        """The scripted chat model."""
+        return self._llm
+
+
+class ScriptedModelFactory:
+    """Model factory of the scripted models and fake embeddings."""
+
+    def __init__(self, llm: ScriptedChatModel) -> None:
+        self._models: dict[str, IModel | Embeddings] = {
+            MAIN_MODEL_NAME: cast(IModel, ScriptedModel(MAIN_MODEL_NAME, llm)),
+            MAIN_MODEL_MINI_NAME: cast(IModel, ScriptedModel(MAIN_MODEL_MINI_NAME, llm)),
+            MAIN_EMBEDDING_MODEL_NAME: DeterministicFakeEmbedding(size=16),
+        }
+
+    def create_model(self, name: str) -> IModel | Embeddings:
+        """Return the model of the name."""
+        return self._models[name]
+
+    def create_models(self) -> dict[str, IModel | Embeddings]:
+        """Return all models."""
+        return dict(self._models)
+
+
+class NoDocsRetriever:
+    """Retriever of the Kyma documentation search, which is not used by the scripted agents."""
+
+    async def aretrieve(self, query: str, top_k: int = 5) -> list[Document]:
+        """Return no documents."""
+        return []
+
+
+class TimedConversationService:
+    """Conversation service that records the time until each update of the graph."""
+
+    def __init__(self, service: IService) -> None:
+        self._service = service
+        # (time of the update, node, seconds since the previous update)
+        self.node_samples: list[tuple[float, str, float]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._service, name)
+
+    async def handle_request(
+        self, conversation_id: str, message: Message, k8s_client: IK8sClient
+    ) -> AsyncGenerator[bytes]:
+        """Handle the request and record the time of every update of the graph."""
+        previous = time.perf_counter()
+        async for chunk in self._service.handle_request(conversation_id, message, k8s_client):
+            now = time.perf_counter()
+            node = next(iter(json.loads(chunk)), "unknown")
+            self.node_samples.append((now, node, now - previous))
+            previous = now
+            yield chunk
+
+
+class AppServer:
+    """Runs the app with the local stand-ins in a uvicorn server with its own event loop and thread."""
+
+    def __init__(self, llm: ScriptedChatModel) -> None:
+        self._llm = llm
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", access_log=False)
+        )
+        self._thread = threading.Thread(target=asyncio.run, args=(self._serve(),), daemon=True)
+        self.service: TimedConversationService | None = None
+        # (time of the probe, lag in seconds)
+        self.lag_samples: list[tuple[float, float]] = []
+
+    @property
+    def base_url(self) -> str:
+        """The URL of the server."""
+        return f"http://127.0.0.1:{self.port}"
+
+    async def _probe_event_loop_lag(self) -> None:
+        """Measure how late a sleep of the server event loop wakes up."""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(EVENT_LOOP_PROBE_INTERVAL)
+            now = time.perf_counter()
+            self.lag_samples.append((now, max(0.0, now - start - EVENT_LOOP_PROBE_INTERVAL)))
+
+    async def _serve(self) -> None:
+        # the fake Redis connection is bound to the event loop of the server.
+        Redis(connection_factory=FakeAsyncRedis)
+        service = TimedConversationService(
+            cast(IService, ConversationService(config=Config(models=[]), model_factory=ScriptedModelFactory(self._llm)))
+        )
+        app.dependency_overrides[init_config] = lambda: Config(models=[])
+        app.dependency_overrides[init_conversation_service] = lambda: service
+        self.service = service
+        probe = asyncio.create_task(self._probe_event_loop_lag())
+        try:
+            await self._server.serve()
+        finally:
+            probe.cancel()
+
+    def start(self) -> None:
+        """Start the server and wait until it accepts requests."""
+        self._thread.start()
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("The app server did not start.")
+            time.sleep(0.05)
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.should_exit = True
+        self._thread.join()
+
+
+class RequestResult:
+    """Latency and outcome of one message request."""
+
+    def __init__(self, latency: float, ttfb: float | None, chunks: int, error: str | None) -> None:
+        self.latency = latency
+        self.ttfb = ttfb
+        self.chunks = chunks
+        self.error = error
+
+
+def request_headers(cluster_url: str, user: str) -> dict[str, str]:
+    """Return the K8s headers of a user of the cluster."""
+    return {
+        "x-cluster-url": cluster_url,
+        "x-cluster-certificate-authority-data": CERTIFICATE_AUTHORITY_DATA,
+        "x-k8s-authorization": jwt.encode({"sub": user}, "load-test-secret-of-the-scripted-cluster", algorithm="HS256"),
+    }
+
+
+async def send_message(client: httpx.AsyncClient, conversation_id: str, case: LoadCase, headers: dict) -> RequestResult:
+    """Send a query of a conversation and read the streamed response."""
+    start = time.perf_counter()
+    ttfb: float | None = None
+    chunks = 0
+    error: str | None = None
+    try:
+        async with client.stream(
+            "POST", f"/api/conversations/{conversation_id}/messages", json=case.message(), headers=headers
+        ) as response:
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                if ttfb is None:
+                    ttfb = time.perf_counter() - start
+                chunks += 1
+                data = json.loads(line).get("data") or {}
+                if data.get("error"):
+                    error = str(data["error"])
+            if response.status_code != httpx.codes.OK:
+                error = f"HTTP {response.status_code}"
+    except httpx.HTTPError as e:
+        error = f"{type(e).__name__}: {e}"
+    return RequestResult(time.perf_counter() - start, ttfb, chunks, error)
+
+
+async def replay(
+    client: httpx.AsyncClient, scenario: Scenario, session: int, k8s_latency: float
+) -> list[RequestResult]:
+    """Replay the queries of a scenario in a new conversation of a new cluster."""
+    cluster_url = f"https://api.c-{session:05d}.load.local"
+    headers = request_headers(cluster_url, f"load-user-{session}")
+    conversation_id = str(uuid.uuid4())
+    k8s_client = FakeK8sClient(cluster_url, scenario.objects, k8s_latency)
+    results = []
+    with k8s_clients_lock:
+        k8s_clients[cluster_url] = k8s_client
+    try:
+        for case in scenario.cases:
+            results.append(await send_message(client, conversation_id, case, headers))
+    finally:
+        with k8s_clients_lock:
+            del k8s_clients[cluster_url]
+    return results
+
+
+# the fake K8s clients of the running sessions, by cluster URL.
+k8s_clients: dict[str, FakeK8sClient] = {}
+k8s_clients_lock = threading.Lock()
+# every session uses a new cluster, so that the token usage of a level does not limit the next one.
+session_ids = itertools.count()
+
+
+def new_k8s_client(k8s_auth_headers: K8sAuthHeaders, **kwargs: Any) -> IK8sClient:
+    """Replacement of K8sClient.new, which returns the fake client of the session."""
+    with k8s_clients_lock:
+        return cast(IK8sClient, k8s_clients[k8s_auth_headers.x_cluster_url])
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of the values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def distribution_ms(values: list[float]) -> dict[str, float]:
+    """Return the percentiles of durations in seconds, in milliseconds."""
+    return {
+        "p50": percentile(values, 0.5) * 1000,
+        "p95": percentile(values, 0.95) * 1000,
+        "p99": percentile(values, 0.99) * 1000,
+        "max": max(values, default=0.0) * 1000,
+    }
+
+
+async def run_level(
+    server: AppServer, scenarios: list[Scenario], concurrency: int, sessions: int, k8s_latency: float
+) -> dict[str, Any]:
+    """Replay the scenarios in the given number of sessions, with the given number of concurrent sessions."""
+    queue: asyncio.Queue[Scenario] = asyncio.Queue()
+    for index in range(sessions):
+        queue.put_nowait(scenarios[index % len(scenarios)])
+    results: list[RequestResult] = []
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while not queue.empty():
+            scenario = queue.get_nowait()
+            results.extend(await replay(client, scenario, next(session_ids), k8s_latency))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    dropped_before = dict(logging_stats.dropped_records)
+    async with httpx.AsyncClient(base_url=server.base_url, timeout=None, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        end = time.perf_counter()
+
+    service = cast(TimedConversationService, server.service)
+    node_seconds: dict[str, list[float]] = defaultdict(list)
+    for timestamp, node, seconds in service.node_samples:
+        if start <= timestamp <= end:
+            node_seconds[node].append(seconds)
+    lags = [lag for timestamp, lag in server.lag_samples if start <= timestamp <= end]
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "requests": len(results),
+        "errors": sum(1 for result in results if result.error),
+        "error_samples": sorted({result.error for result in results if result.error})[:5],
+        "throughput_rps": len(results) / (end - start),
+        "latency_ms": distribution_ms([result.latency for result in results]),
+        "ttfb_ms": distribution_ms([result.ttfb for result in results if result.ttfb is not None]),
+        "event_loop_lag_ms": distribution_ms(lags),
+        "log_records_dropped": {
+            reason: count - dropped_before[reason] for reason, count in logging_stats.dropped_records.items()
+        },
+        "nodes_ms": {
+            node: {
+                "count": len(values),
+                "mean": statistics.fmean(values) * 1000,
+                "p95": percentile(values, 0.95) * 1000,
+            }
+            for node, values in sorted(node_seconds.items())
+        },
+    }
+
+
+def git_commit() -> str | None:
+    """Return the current commit, to label the results."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace, server: AppServer, scenarios: list[Scenario]) -> dict[str, Any]:
+    """Run the benchmark at every concurrency level and return the results."""
+    if args.warmup:
+        await run_level(server, scenarios, 1, len(scenarios), args.k8s_latency)
+    levels = [
+        await run_level(server, scenarios, concurrency, concurrency * args.sessions_per_worker, args.k8s_latency)
+        for concurrency in args.concurrency
+    ]
+    return {
+        "config": {
+            "commit": git_commit(),
+            "k8s_latency_s": args.k8s_latency,
+            "llm_latency_s": args.llm_latency,
+            "scenarios": [scenario.name for scenario in scenarios],
+            "sessions_per_worker": args.sessions_per_worker,
+        },
+        "levels": levels,
+    }
+
+
+def rounded(value: Any, digits: int = 2) -> Any:
+    """Round all floats of the results, so that the JSON output is stable."""
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {key: rounded(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        return [rounded(item, digits) for item in value]
+    return value
+
+
+def print_results(results: dict[str, Any]) -> None:
+    """Print the results per concurrency level and per graph node."""
+    print(f"scenarios: {', '.join(results['config']['scenarios'])}")
+    print(
+        f"\n{'conc':>5}{'reqs':>6}{'errors':>7}{'req/s':>8}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'ttfb p50':>10}{'ttfb p95':>10}{'lag p99':>9}{'lag max':>9}"
+    )
+    for level in results["levels"]:
+        latency, ttfb, lag = level["latency_ms"], level["ttfb_ms"], level["event_loop_lag_ms"]
+        print(
+            f"{level['concurrency']:>5}{level['requests']:>6}{level['errors']:>7}{level['throughput_rps']:>8.2f}"
+            f"{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}"
+            f"{ttfb['p50']:>10.1f}{ttfb['p95']:>10.1f}{lag['p99']:>9.1f}{lag['max']:>9.1f}"
+        )
+    for level in results["levels"]:
+        print(f"\nconcurrency {level['concurrency']}: {'node':<24}{'count':>7}{'mean ms':>10}{'p95 ms':>10}")
+        for node, timing in level["nodes_ms"].items():
+            print(f"{'':>15}{node:<24}{timing['count']:>7}{timing['mean']:>10.1f}{timing['p95']:>10.1f}")
+        for error in level["error_samples"]:
+            print(f"{'':>15}error: {error}")
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=DEFAULT_SCENARIOS,
+        help="Scenario directories of tests/blackbox/data/test-cases, or 'all' for all scenarios with a manifest.",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Numbers of concurrent sessions."
+    )
+    parser.add_argument(
+        "--sessions-per-worker", type=int, default=4, help="Number of scenario replays per concurrent session."
+    )
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Latency of a scripted LLM call in seconds.")
+    parser.add_argument(
+        "--k8s-latency", type=float, default=0.01, help="Latency of a fake Kubernetes API request in seconds."
+    )
+    parser.add_argument(
+        "--no-warmup", dest="warmup", action="store_false", help="Do not replay every scenario once before measuring."
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    scenarios = load_scenarios(args.scenarios)
+    cases = [case for scenario in scenarios for case in scenario.cases]
+    server = AppServer(ScriptedChatModel(cases=cases, latency=args.llm_latency))
+    with (
+        patch.object(K8sClient, "new", new_k8s_client),
+        patch.object(search_module, "RAGSystem", lambda models: RAGSystem(models, retriever=NoDocsRetriever())),
+    ):
+        server.start()
+        try:
+            results = rounded(asyncio.run(run(args, server, scenarios)))
+        finally:
+            server.stop()
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+This script compares the CPU time and the peak memory of the two describe_resource modes
+of the K8sClient on synthetic objects:
+- a large custom resource with a big spec and status.
+- a Deployment with many managedFields entries and a last-applied-configuration annotation.
+
+The Kubernetes API is replaced by an in-memory fake, so only the client-side processing
+(copying, projection and sanitization) is measured.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_describe_resource.py
+    or
+    python scripts/python/benchmarks/benchmark_describe_resource.py --iterations 200
+
+Output:
+    A table with the mean wall time, the mean CPU time and the peak traced memory per mode.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import Mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
+
+from services.data_sanitizer import DataSanitizer  # noqa: E402
+from services.k8s import DescribeMode, K8sClient  # noqa: E402
+from services.k8s_projection import DescribeProjector  # noqa: E402
+
+
+def large_custom_resource() -> dict[str, Any]:
+    """Return a custom resource with a large spec and status."""
+    return {
+        "apiVersion": "example.kyma-project.io/v1alpha1",
+        "kind": "BigResource",
+        "metadata": {
+            "name": "big",
+            "namespace": "default",
+            "uid": "00000000-0000-0000-0000-000000000000",
+            "resourceVersion": "1",
+            "managedFields": [
+                {"manager": f"controller-{i}", "operation": "Update", "fieldsV1": {"f:spec": {f"f:item{i}": {}}}}
+                for i in range(50)
+            ],
+        },
+        "spec": {"items": [{"name": f"item-{i}", "value": "x" * 64, "labels": {"a": "b"}} for i in range(2000)]},
+        "status": {"conditions": [{"type": f"Cond{i}", "status": "True"} for i in range(100)]},
+    }
+
+
+def deployment_with_managed_fields() -> dict[str, Any]:
+    """Return a Deployment with many managedFields entries and a last-applied-configuration annotation."""
+    container = {"name": "app", "image": "nginx", "env": [{"name": f"ENV_{i}", "value": str(i)} for i in range(20)]}
+    spec = {
+        "replicas": 3,
+        "selector": {"matchLabels": {"app": "web"}},
+        "template": {"metadata": {"labels": {"app": "web"}}, "spec": {"containers": [container]}},
+    }
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {
+            "name": "web",
+            "namespace": "default",
+            "uid": "00000000-0000-0000-0000-000000000001",
+            "resourceVersion": "1",
+            "annotations": {"kubectl.kubernetes.io/last-applied-configuration": json.dumps({"spec": spec})},
+            "managedFields": [
+                {
+                    "manager": f"manager-{i}",
+                    "operation": "Apply",
+                    "fieldsV1": {"f:spec": {"f:template": {"f:spec": {f"f:field{j}": {} for j in range(50)}}}},
+                }
+                for i in range(200)
+            ],
+        },
+        "spec": spec,
+        "status": {"replicas": 3, "readyReplicas": 3},
+    }
+
+
+def new_client(raw_resource: dict[str, Any], mode: DescribeMode) -> K8sClient:
+    """Create a K8sClient backed by an in-memory fake of the Kubernetes API."""
+    events = [
+        {
+            "type": "Normal",
+            "reason": "ScalingReplicaSet",
+            "message": f"Scaled up replica set to {i}",
+            "involvedObject": {"kind": raw_resource["kind"], "name": raw_resource["metadata"]["name"]},
+            "metadata": {"name": f"event-{i}", "managedFields": []},
+        }
+        for i in range(20)
+    ]
+    dynamic_client = Mock()
+    dynamic_client.resources.get.return_value.get.return_value.to_dict.side_effect = lambda: json.loads(
+        json.dumps(raw_resource)
+    )
+
+    k8s_client = K8sClient.__new__(K8sClient)
+    k8s_client._dynamic_client = dynamic_client
+    k8s_client.data_sanitizer = DataSanitizer()
+    k8s_client.read_cache = None
+    k8s_client.describe_mode = mode
+    k8s_client.describe_projector = DescribeProjector()
+    k8s_client.list_k8s_events_for_resource = lambda kind, name, namespace: json.loads(  # type: ignore
+        json.dumps(events)
+    )
+    return k8s_client
+
+
+def measure(describe: Callable[[], dict], iterations: int) -> tuple[float, float, int]:
+    """Return the mean wall time, the mean CPU time (both in ms) and the peak traced memory in bytes."""
+    describe()  # warm up.
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for _ in range(iterations):
+        describe()
+    wall_ms = (time.perf_counter() - wall_start) * 1000 / iterations
+    cpu_ms = (time.process_time() - cpu_start) * 1000 / iterations
+
+    tracemalloc.start()
+    describe()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return wall_ms, cpu_ms, peak
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50, help="Number of describe calls per mode.")
+    args = parser.parse_args()
+
+    fixtures = {
+        "large custom resource": large_custom_resource(),
+        "deployment with managedFields": deployment_with_managed_fields(),
+    }
+    print(f"{'object':<32}{'mode':<12}{'wall ms':>10}{'cpu ms':>10}{'peak KiB':>12}{'output KiB':>12}")
+    for label, raw_resource in fixtures.items():
+        for mode in DescribeMode:
+            k8s_client = new_client(raw_resource, mode)
+
+            def describe(client: K8sClient = k8s_client, obj: dict[str, Any] = raw_resource) -> dict:
+                return client.describe_resource(obj["apiVersion"], obj["kind"], obj["metadata"]["name"], "default")
+
+            wall_ms, cpu_ms, peak = measure(describe, args.iterations)
+            output_kib = len(json.dumps(describe())) / 1024
+            print(f"{label:<32}{mode:<12}{wall_ms:>10.2f}{cpu_ms:>10.2f}{peak / 1024:>12.1f}{output_kib:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
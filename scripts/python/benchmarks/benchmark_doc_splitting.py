@@ -0,0 +1,126 @@
+"""
+This script measures the index preparation time of the AdaptiveSplitMarkdownIndexer of the
+doc_indexer, i.e. loading the fetched documents and splitting them into titled chunks, without
+creating embeddings or writing to HanaDB.
+
+It compares the heading tree splitting of the indexer with the previous recursive splitting, which
+ran a new MarkdownHeaderTextSplitter and tokenized the chunk text again at every header level. Both
+must produce identical chunks.
+
+The doc_indexer settings are loaded on import, so the config file must exist at the default
+location or be set with the CONFIG_PATH environment variable. The documents must be fetched
+before, e.g. with the fetch task of the doc_indexer.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_doc_splitting.py
+    or
+    python scripts/python/benchmarks/benchmark_doc_splitting.py --docs-path doc_indexer/data --runs 3
+
+Output:
+    A table with the mean index preparation time per splitting mode, the number of documents and
+    chunks, and whether the chunks of both modes are identical.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from collections.abc import Generator
+from unittest.mock import Mock, patch
+
+from langchain_core.documents import Document
+from langchain_text_splitters import MarkdownHeaderTextSplitter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../doc_indexer/src"))
+
+from indexing.adaptive_indexer import (  # noqa: E402
+    HEADER_LEVELS,
+    AdaptiveSplitMarkdownIndexer,
+    count_tokens,
+    extract_first_title,
+)
+from utils.documents import load_documents  # noqa: E402
+
+from utils.settings import DOCS_PATH  # noqa: E402
+
+
+class RecursiveSplitMarkdownIndexer(AdaptiveSplitMarkdownIndexer):
+    """The indexer with the previous recursive splitting."""
+
+    def _process_doc(
+        self,
+        doc: Document,
+        module: str | None = "kyma",
+        module_version: str | None = "latest",
+        level: int = 0,
+        parent_title: str = "",
+    ) -> Generator[Document]:
+        tokens = count_tokens(doc.page_content)
+        if tokens <= self.min_chunk_token_count:
+            return
+        if tokens <= self.max_chunk_token_count or level >= len(HEADER_LEVELS):
+            yield Document(
+                page_content=doc.page_content,
+                metadata={
+                    "source": doc.metadata.get("source", ""),
+                    "title": doc.metadata.get("title") or extract_first_title(doc.page_content),
+                    "module": module,
+                    "version": module_version,
+                },
+            )
+            return
+        markdown_splitter = MarkdownHeaderTextSplitter(headers_to_split_on=HEADER_LEVELS[level], strip_headers=False)
+        for sub_doc in markdown_splitter.split_text(doc.page_content):
+            title = self._build_title(sub_doc.metadata) if sub_doc.metadata else ""
+            if not title:
+                continue
+            if parent_title != title and (parent_title + " - ") not in title:
+                title = parent_title + " - " + title if parent_title else title
+            chunk = Document(
+                page_content=sub_doc.page_content,
+                metadata={"source": doc.metadata.get("source", ""), "title": title},
+            )
+            yield from self._process_doc(
+                chunk, module, module_version, level + 1, parent_title=title if level == 0 else parent_title
+            )
+
+
+INDEXERS = [
+    ("recursive", RecursiveSplitMarkdownIndexer),
+    ("heading-tree", AdaptiveSplitMarkdownIndexer),
+]
+
+
+def prepare(indexer_class: type[AdaptiveSplitMarkdownIndexer], docs_path: str) -> tuple[float, int, list[Document]]:
+    """Load and split the documents, and return the time, the number of documents and the chunks."""
+    with patch("indexing.adaptive_indexer.HanaDB"):
+        indexer = indexer_class(docs_path=docs_path, embedding=Mock(), connection=Mock(), table_name="benchmark")
+    start = time.perf_counter()
+    docs = load_documents(docs_path)
+    chunks = list(indexer.process_document_titles(docs))
+    return time.perf_counter() - start, len(docs), chunks
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs-path", default=DOCS_PATH, help="Directory of the fetched documents.")
+    parser.add_argument("--runs", type=int, default=3, help="Number of runs per splitting mode.")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = []
+    print(f"{'mode':<14}{'mean time':>11}{'documents':>11}{'chunks':>9}")
+    for mode, indexer_class in INDEXERS:
+        timings = []
+        for _ in range(args.runs):
+            elapsed, documents, chunks = prepare(indexer_class, args.docs_path)
+            timings.append(elapsed)
+        results.append([(chunk.page_content, chunk.metadata) for chunk in chunks])
+        print(f"{mode:<14}{sum(timings) / len(timings):>10.2f}s{documents:>11}{len(chunks):>9}")
+    print(f"identical chunks: {all(result == results[0] for result in results)}")
+
+
+if __name__ == "__main__":
+    main()
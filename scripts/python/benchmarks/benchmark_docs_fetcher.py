@@ -0,0 +1,160 @@
+"""
+This script compares the wall-clock time of the DocumentsFetcher of the doc_indexer in its fetch modes.
+
+It creates local bare git repositories as documentation sources. Each repository contains a few
+markdown documents under the include paths, plus source code files and a commit history outside
+them. The repositories are cloned through file:// URLs, so shallow clones work like for remote
+repositories. Local clones are bound by the CPU, so the network latency of a real git host can be
+simulated with --clone-latency, which delays every clone.
+
+The doc_indexer settings are loaded on import, so the config file must exist at the default
+location or be set with the CONFIG_PATH environment variable.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_docs_fetcher.py
+    or
+    python scripts/python/benchmarks/benchmark_docs_fetcher.py --sources 1 10 30 --clone-latency 0.5
+
+Output:
+    A table with the fetch time per number of sources and fetch mode, and the number of fetched
+    documents, which must be equal for all modes.
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../doc_indexer/src"))
+
+from fetcher.fetcher import DocumentsFetcher  # noqa: E402
+
+from utils.utils import clone_repo  # noqa: E402
+
+# (name, concurrency, sparse checkout)
+FETCH_MODES = [
+    ("sequential", 1, False),
+    ("sequential-sparse", 1, True),
+    ("parallel-sparse", 8, True),
+]
+GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "benchmark",
+    "GIT_AUTHOR_EMAIL": "benchmark@example.com",
+    "GIT_COMMITTER_NAME": "benchmark",
+    "GIT_COMMITTER_EMAIL": "benchmark@example.com",
+}
+
+
+def git(*args: str, cwd: str) -> None:
+    """Run a git command quietly."""
+    subprocess.run(["git", *args], cwd=cwd, env=GIT_ENV, check=True, capture_output=True)
+
+
+def write_file(path: str, content: str) -> None:
+    """Write a file, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(content)
+
+
+def create_bare_repository(base_dir: str, name: str, docs: int, code_files: int, commits: int) -> str:
+    """Create a bare repository with documents, code files and a history, and return its path."""
+    work_dir = os.path.join(base_dir, "work", name)
+    os.makedirs(work_dir)
+    git("init", "-q", cwd=work_dir)
+    write_file(os.path.join(work_dir, "README.md"), f"# {name}\n")
+    write_file(os.path.join(work_dir, "docs", "user", "_sidebar.md"), "- [Overview](README.md)\n")
+    for index in range(docs):
+        write_file(os.path.join(work_dir, "docs", "user", f"{index:03d}-doc.md"), f"# Doc {index}\n" + "text\n" * 200)
+    for commit in range(commits):
+        for index in range(code_files):
+            content = f"package main // revision {commit}\n" + f"var value{index} = {commit}\n" * 100
+            write_file(os.path.join(work_dir, "src", f"pkg{index % 20}", f"file{index}.go"), content)
+        git("add", "-A", cwd=work_dir)
+        git("commit", "-q", "-m", f"commit {commit}", cwd=work_dir)
+
+    bare_path = os.path.join(base_dir, "remote", f"{name}.git")
+    git("clone", "-q", "--bare", work_dir, bare_path, cwd=base_dir)
+    return bare_path
+
+
+def write_sources_file(path: str, repositories: list[str]) -> None:
+    """Write a documents sources file for the repositories."""
+    sources = [
+        {
+            "name": os.path.basename(repository).removesuffix(".git"),
+            "source_type": "Github",
+            "url": f"file://{repository}",
+            "include_files": ["README.md", "docs/user/*"],
+            "exclude_files": ["*/_sidebar.md"],
+        }
+        for repository in repositories
+    ]
+    with open(path, "w") as file:
+        json.dump(sources, file)
+
+
+def count_files(path: str) -> int:
+    """Count the files below a directory."""
+    return sum(len(files) for _, _, files in os.walk(path))
+
+
+def fetch(
+    base_dir: str, sources_file: str, concurrency: int, sparse_checkout: bool, clone_latency: float
+) -> tuple[float, int]:
+    """Fetch all sources and return the wall-clock time and the number of fetched documents."""
+
+    def delayed_clone_repo(*args: Any, **kwargs: Any) -> str:
+        time.sleep(clone_latency)
+        return clone_repo(*args, **kwargs)
+
+    output_dir = os.path.join(base_dir, "output")
+    fetcher = DocumentsFetcher(
+        source_file=sources_file,
+        output_dir=output_dir,
+        tmp_dir=os.path.join(base_dir, "tmp"),
+        concurrency=concurrency,
+        sparse_checkout=sparse_checkout,
+    )
+    start = time.perf_counter()
+    with patch("fetcher.fetcher.clone_repo", side_effect=delayed_clone_repo):
+        fetcher.run()
+    return time.perf_counter() - start, count_files(output_dir)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=int, nargs="+", default=[1, 5, 10, 30], help="Numbers of sources.")
+    parser.add_argument("--docs", type=int, default=30, help="Documents per repository.")
+    parser.add_argument("--code-files", type=int, default=500, help="Code files per repository.")
+    parser.add_argument("--commits", type=int, default=5, help="Commits per repository.")
+    parser.add_argument("--clone-latency", type=float, default=0.0, help="Simulated network latency per clone.")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        print(f"creating {max(args.sources)} repositories...")
+        repositories = [
+            create_bare_repository(base_dir, f"source-{index:02d}", args.docs, args.code_files, args.commits)
+            for index in range(max(args.sources))
+        ]
+
+        print(f"{'sources':>8}  {'mode':<20}{'time':>9}{'documents':>11}")
+        for count in args.sources:
+            sources_file = os.path.join(base_dir, f"sources-{count}.json")
+            write_sources_file(sources_file, repositories[:count])
+            for mode, concurrency, sparse_checkout in FETCH_MODES:
+                elapsed, documents = fetch(base_dir, sources_file, concurrency, sparse_checkout, args.clone_latency)
+                print(f"{count:>8}  {mode:<20}{elapsed:>8.2f}s{documents:>11}")
+
+
+if __name__ == "__main__":
+    main()
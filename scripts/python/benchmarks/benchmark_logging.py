@@ -0,0 +1,150 @@
+"""
+This script measures the request latency of the conversation API with synchronous and asynchronous logging,
+when stdout is slower than the logging.
+
+Every configuration runs the conversation load benchmark (benchmark_conversation_load.py) in a subprocess,
+whose stdout is a pipe that is read at a limited rate, like a slow log collector. The following logging
+modes are measured at the log levels INFO and DEBUG:
+- sync: the records are formatted and written by the logging call, on the event loop (LOG_ASYNC=false).
+- async: the records are put on a bounded queue and written by a background thread (LOG_ASYNC=true),
+  and long messages are truncated (LOG_MAX_MESSAGE_LENGTH).
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_logging.py
+    or
+    python scripts/python/benchmarks/benchmark_logging.py --pipe-rate-kb 16 --concurrency 32
+
+Environment Variables:
+    LOG_FORMAT: Log format of the app (default: "json")
+    LOG_QUEUE_SIZE: Size of the log queue of the async mode (default: 10000)
+
+Output:
+    A table with the throughput, the p50/p95/p99 latency, the TTFB, the event loop lag, the written log volume
+    and the dropped log records per log level and mode. With --output, the results as JSON.
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, cast
+
+LOAD_BENCHMARK = os.path.join(os.path.dirname(__file__), "benchmark_conversation_load.py")
+LOG_LEVELS = ["INFO", "DEBUG"]
+READ_CHUNK_BYTES = 4096
+
+
+class SlowPipeReader(threading.Thread):
+    """Reads a pipe at a limited rate, and counts the bytes read."""
+
+    def __init__(self, pipe: io.BufferedReader, rate_bytes_per_second: float):
+        super().__init__(daemon=True)
+        self.pipe = pipe
+        self.rate_bytes_per_second = rate_bytes_per_second
+        self.bytes_read = 0
+
+    def run(self) -> None:
+        """Read the pipe until it is closed."""
+        start = time.perf_counter()
+        while chunk := self.pipe.read1(READ_CHUNK_BYTES):
+            self.bytes_read += len(chunk)
+            # sleep until the bytes read so far match the rate.
+            delay = self.bytes_read / self.rate_bytes_per_second - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+
+def run_config(args: argparse.Namespace, log_level: str, mode: str) -> dict[str, Any]:
+    """Run the load benchmark with the given log level and mode, and return the results of its concurrency level."""
+    env = dict(
+        os.environ,
+        LOG_LEVEL=log_level,
+        LOG_FORMAT=os.environ.get("LOG_FORMAT", "json"),
+        LOG_ASYNC=str(mode == "async"),
+        LOG_MAX_MESSAGE_LENGTH=str(args.max_message_length if mode == "async" else 0),
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "results.json")
+        command = [
+            sys.executable,
+            LOAD_BENCHMARK,
+            "--concurrency",
+            str(args.concurrency),
+            "--sessions-per-worker",
+            str(args.sessions_per_worker),
+            "--llm-latency",
+            str(args.llm_latency),
+            "--output",
+            output,
+        ]
+        process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE)
+        reader = SlowPipeReader(cast(io.BufferedReader, process.stdout), args.pipe_rate_kb * 1024)
+        reader.start()
+        return_code = process.wait()
+        reader.join()
+        if return_code != 0:
+            raise RuntimeError(f"the load benchmark failed with log level {log_level} and mode {mode}")
+        with open(output, encoding="utf-8") as file:
+            level = json.load(file)["levels"][0]
+    return {
+        "log_level": log_level,
+        "mode": mode,
+        "log_kb": round(reader.bytes_read / 1024, 1),
+        **level,
+    }
+
+
+def print_results(results: list[dict[str, Any]]) -> None:
+    """Print the results per log level and mode."""
+    print(
+        f"\n{'level':<7}{'mode':<7}{'reqs':>6}{'errors':>7}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'ttfb p95':>10}{'lag p99':>9}{'log KB':>9}{'dropped':>9}"
+    )
+    for result in results:
+        latency = result["latency_ms"]
+        dropped = sum(result.get("log_records_dropped", {}).values())
+        print(
+            f"{result['log_level']:<7}{result['mode']:<7}{result['requests']:>6}{result['errors']:>7}"
+            f"{result['throughput_rps']:>8.2f}{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}"
+            f"{result['ttfb_ms']['p95']:>10.1f}{result['event_loop_lag_ms']['p99']:>9.1f}"
+            f"{result['log_kb']:>9.1f}{dropped:>9}"
+        )
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent sessions.")
+    parser.add_argument(
+        "--sessions-per-worker", type=int, default=4, help="Number of scenario replays per concurrent session."
+    )
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Latency of a scripted LLM call in seconds.")
+    parser.add_argument(
+        "--pipe-rate-kb", type=float, default=4, help="Rate in KB/s at which the stdout of the app is read."
+    )
+    parser.add_argument(
+        "--max-message-length", type=int, default=2048, help="LOG_MAX_MESSAGE_LENGTH of the async mode."
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = []
+    for log_level in LOG_LEVELS:
+        for mode in ["sync", "async"]:
+            print(f"running log level {log_level} in mode {mode}...", file=sys.stderr)
+            results.append(run_config(args, log_level, mode))
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
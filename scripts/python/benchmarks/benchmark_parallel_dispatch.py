@@ -0,0 +1,182 @@
+"""
+This script compares the latency of the sequential and the parallel agent dispatch modes of the
+CompanionGraph.
+
+The companion graph is built with fake agents that sleep for a fixed latency per subtask, with a
+random jitter per run, and a fake supervisor that plans a fixed set of subtasks and joins the agent
+responses in the finalizer. No LLM is called, so the benchmark runs offline. Every run must produce
+the same final response, independent of the order in which the agents finish.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_parallel_dispatch.py
+    or
+    python scripts/python/benchmarks/benchmark_parallel_dispatch.py --runs 10 --jitter 0.8
+
+Output:
+    A table with the mean and maximum latency per dispatch mode, and whether the final responses
+    of all runs are identical.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.constants import END
+from langgraph.graph import StateGraph
+from langgraph.graph.state import CompiledStateGraph
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
+
+from agents.common.constants import COMMON, K8S_AGENT, KYMA_AGENT, MESSAGES, NEXT, SUBTASKS  # noqa: E402
+from agents.common.state import BaseAgentState, CompanionState, GraphInput, SubTask, UserInput  # noqa: E402
+from agents.graph import AgentDispatchMode, CompanionGraph  # noqa: E402
+from agents.supervisor.agent import SUPERVISOR  # noqa: E402
+
+# (agent, subtask, latency in seconds) in the order of the plan.
+PLAN: list[tuple[str, str, float]] = [
+    (KYMA_AGENT, "Check the APIRule of the function", 0.4),
+    (K8S_AGENT, "Check the status of the pods", 0.2),
+    (COMMON, "Explain what a sidecar is", 0.1),
+    (KYMA_AGENT, "Check the subscriptions of the function", 0.3),
+    (K8S_AGENT, "Fetch the logs of the failing pod", 0.5),
+]
+
+
+class Latency:
+    """Latency of the subtasks, with a random jitter per run."""
+
+    def __init__(self, jitter: float) -> None:
+        self.jitter = jitter
+        self.factors: dict[str, float] = {}
+
+    def reset(self, seed: int) -> None:
+        """Draw new jitter factors for the next run."""
+        rng = random.Random(seed)
+        self.factors = {description: rng.uniform(1 - self.jitter, 1 + self.jitter) for _, description, _ in PLAN}
+
+    async def sleep(self, description: str) -> None:
+        """Simulate the work on a subtask."""
+        base = next(latency for _, task, latency in PLAN if task == description)
+        await asyncio.sleep(base * self.factors.get(description, 1.0))
+
+
+class FakeAgent:
+    """An agent subgraph that answers its first pending subtask after a delay."""
+
+    def __init__(self, name: str, latency: Latency) -> None:
+        self._name = name
+        self._latency = latency
+        workflow = StateGraph(BaseAgentState)
+        workflow.add_node("agent", self._agent_node)
+        workflow.set_entry_point("agent")
+        workflow.add_edge("agent", END)
+        self._graph = workflow.compile()
+
+    @property
+    def name(self) -> str:
+        """Agent name."""
+        return self._name
+
+    def agent_node(self) -> CompiledStateGraph:
+        """Get the agent subgraph."""
+        return self._graph
+
+    async def _agent_node(self, state: BaseAgentState) -> dict[str, Any]:
+        subtask = next(s for s in state.subtasks or [] if s.assigned_to == self._name and s.is_pending())
+        await self._latency.sleep(subtask.description)
+        subtask.complete()
+        return {
+            MESSAGES: [AIMessage(content=f"{self._name}: {subtask.description}", name=self._name)],
+            SUBTASKS: state.subtasks,
+        }
+
+
+class FakeSupervisor:
+    """Plans the fixed subtasks, routes to the first pending one, and joins the responses when done."""
+
+    def agent_node(self) -> Any:
+        """Get the supervisor node function."""
+        return self._supervisor_node
+
+    @staticmethod
+    async def _supervisor_node(state: CompanionState) -> dict[str, Any]:
+        if not state.subtasks:
+            plan = [SubTask(description=task, task_title=task, assigned_to=agent) for agent, task, _ in PLAN]
+            return {SUBTASKS: plan, NEXT: plan[0].assigned_to}
+        pending = [subtask for subtask in state.subtasks if subtask.is_pending()]
+        if pending:
+            return {NEXT: pending[0].assigned_to}
+        responses = [str(message.content) for message in state.messages if isinstance(message, AIMessage)]
+        return {MESSAGES: [AIMessage(content="\n".join(responses), name="Finalizer")], NEXT: END}
+
+
+class FakeSummarization:
+    """Summarization node that keeps all messages."""
+
+    @staticmethod
+    async def summarization_node(state: CompanionState) -> dict[str, Any]:
+        """Return no updates."""
+        return {}
+
+
+class BenchmarkGraph(CompanionGraph):
+    """CompanionGraph with fake agents, supervisor, gatekeeper and summarization."""
+
+    def __init__(self, dispatch_mode: AgentDispatchMode, latency: Latency) -> None:
+        self.memory = InMemorySaver()
+        self.dispatch_mode = dispatch_mode
+        self._latency = latency
+        self.kyma_agent = FakeAgent(KYMA_AGENT, latency)
+        self.k8s_agent = FakeAgent(K8S_AGENT, latency)
+        self.supervisor_agent = FakeSupervisor()  # type: ignore[assignment]
+        self.summarization = FakeSummarization()  # type: ignore[assignment]
+        self.members = [KYMA_AGENT, K8S_AGENT, COMMON]
+        self.graph = self._build_graph()
+
+    async def _gatekeeper_node(self, state: CompanionState) -> dict[str, Any]:
+        return {NEXT: SUPERVISOR, SUBTASKS: []}
+
+    async def _invoke_common_node(self, state: CompanionState, subtask: str) -> str:
+        await self._latency.sleep(subtask)
+        return f"{COMMON}: {subtask}"
+
+
+async def run(graph: BenchmarkGraph, run_id: int) -> tuple[float, str]:
+    """Run one query through the graph and return its latency and final response."""
+    query = "Why is my function failing?"
+    graph_input = GraphInput(messages=[HumanMessage(content=query)], input=UserInput(query=query), subtasks=[])
+    start = time.perf_counter()
+    result = await graph.graph.ainvoke(graph_input, config={"configurable": {"thread_id": str(run_id)}})
+    return time.perf_counter() - start, str(result[MESSAGES][-1].content)
+
+
+async def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per dispatch mode.")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Relative random jitter of the agent latency.")
+    args = parser.parse_args()
+
+    latency = Latency(args.jitter)
+    final_responses: set[str] = set()
+    print(f"{'mode':<12}{'mean latency':>14}{'max latency':>13}")
+    for mode in AgentDispatchMode:
+        graph = BenchmarkGraph(mode, latency)
+        latencies = []
+        for run_id in range(args.runs):
+            latency.reset(seed=run_id)
+            elapsed, final_response = await run(graph, run_id)
+            latencies.append(elapsed)
+            final_responses.add(final_response)
+        print(f"{mode:<12}{sum(latencies) / len(latencies):>13.2f}s{max(latencies):>12.2f}s")
+    print(f"identical final responses: {len(final_responses) == 1}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
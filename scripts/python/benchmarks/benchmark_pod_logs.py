@@ -0,0 +1,141 @@
+"""
+This script compares the latency and the peak memory of reading pod logs with and without a byte budget.
+
+A local fake Kubernetes API server streams a synthetic log (100 MB by default) with occasional
+errors and stack traces. The following read modes are measured:
+- unbounded: all lines are kept in memory, like the K8sClient did before the byte budget.
+- budgeted: the K8sClient keeps a byte-bounded tail and extracts an error-focused token budget.
+- budgeted + limitBytes: like budgeted, with limitBytes pushed down to the server.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_pod_logs.py
+    or
+    python scripts/python/benchmarks/benchmark_pod_logs.py --size-mb 20
+
+Output:
+    A table with the latency, the peak traced memory and the returned log size per mode.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
+
+from services.k8s import K8sAuthHeaders, K8sClient  # noqa: E402
+from services.k8s_logs import PodLogsBudget  # noqa: E402
+
+LOG_PATH = "/api/v1/namespaces/default/pods/app/log"
+CHUNK_LINES = 1000
+# tailLines large enough to select the whole log.
+ALL_LINES = 10**9
+
+
+def synthetic_log_chunk(chunk_index: int) -> bytes:
+    """Return CHUNK_LINES log lines. Every 50th chunk contains an error with a stack trace."""
+    lines = [
+        f"2025-01-01T00:00:00.{i:06d}Z INFO handled request id={chunk_index}-{i} path=/api/v1/items status=200"
+        for i in range(CHUNK_LINES)
+    ]
+    if chunk_index % 50 == 0:
+        lines[500:500] = [
+            f"2025-01-01T00:00:00Z ERROR request {chunk_index} failed",
+            "Traceback (most recent call last):",
+            '  File "/app/handler.py", line 42, in handle',
+            "ValueError: invalid item",
+        ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def new_fake_api_server(size_bytes: int) -> TestServer:
+    """Create a fake API server that streams size_bytes of logs and honors limitBytes."""
+
+    async def get_logs(request: web.Request) -> web.StreamResponse:
+        limit_bytes = int(request.query.get("limitBytes", size_bytes))
+        response = web.StreamResponse()
+        await response.prepare(request)
+        sent, chunk_index = 0, 0
+        while sent < min(size_bytes, limit_bytes):
+            chunk = synthetic_log_chunk(chunk_index)[: limit_bytes - sent]
+            await response.write(chunk)
+            sent += len(chunk)
+            chunk_index += 1
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get(LOG_PATH, get_logs)
+    return TestServer(app)
+
+
+def new_client(server: TestServer, budget: PodLogsBudget) -> K8sClient:
+    """Create a K8sClient for the fake API server."""
+    k8s_client = K8sClient.__new__(K8sClient)
+    k8s_client.k8s_auth_headers = K8sAuthHeaders(
+        x_cluster_url=str(server.make_url("")).rstrip("/"),
+        x_cluster_certificate_authority_data="abc",
+        x_k8s_authorization="token",
+    )
+    k8s_client.client_ssl_context = None
+    k8s_client.data_sanitizer = None
+    k8s_client.pod_logs_budget = budget
+    return k8s_client
+
+
+async def read_unbounded(server: TestServer) -> list[str]:
+    """Read all log lines into memory."""
+    async with aiohttp.ClientSession() as session, session.get(server.make_url(LOG_PATH)) as response:
+        return [line_bytes.decode("utf-8").strip() async for line_bytes in response.content]
+
+
+async def measure(read: Callable[[], Awaitable[list[str]]]) -> tuple[float, int, int]:
+    """Return the latency in seconds, the peak traced memory and the returned size in bytes."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    lines = await read()
+    latency = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return latency, peak, sum(len(line) + 1 for line in lines)
+
+
+async def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=100, help="Size of the synthetic log in MB.")
+    args = parser.parse_args()
+    logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+
+    server = new_fake_api_server(args.size_mb * 1024 * 1024)
+    await server.start_server()
+    try:
+        budgeted = new_client(server, PodLogsBudget(since_seconds=0, limit_bytes=0))
+        pushed_down = new_client(
+            server, PodLogsBudget(since_seconds=0, limit_bytes=4 * budgeted.pod_logs_budget.max_bytes)
+        )
+        modes: dict[str, Callable[[], Awaitable[list[str]]]] = {
+            "unbounded": lambda: read_unbounded(server),
+            "budgeted": lambda: budgeted._fetch_pod_logs_no_retry("app", "default", "app", False, ALL_LINES),
+            "budgeted + limitBytes": lambda: pushed_down._fetch_pod_logs_no_retry(
+                "app", "default", "app", False, ALL_LINES
+            ),
+        }
+        print(f"{'mode':<24}{'latency s':>12}{'peak MiB':>12}{'output KiB':>12}")
+        for label, read in modes.items():
+            latency, peak, output_bytes = await measure(read)
+            print(f"{label:<24}{latency:>12.2f}{peak / 1024**2:>12.1f}{output_bytes / 1024:>12.1f}")
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
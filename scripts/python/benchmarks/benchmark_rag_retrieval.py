@@ -0,0 +1,423 @@
+"""
+This script measures the retrieval quality and the latency per stage of the RAGSystem.
+
+The documents of the reranker datasets (tests/integration/rag/datasets/reranker) are indexed into a
+local in-memory vector store, and the labeled questions of
+tests/integration/rag/datasets/retrieval_questions.json are answered by the RAGSystem. For every
+question the relevant documents are known, so the benchmark reports recall@k and the mean
+reciprocal rank (MRR) of the fused candidates (before reranking) and of the reranked documents,
+and the latency of the query generation, retrieval, fusion and reranking stages.
+
+By default the benchmark runs offline and deterministically: the embeddings hash the words of a
+text, the query generator adds a keyword query, and the LLM of the LLMReranker is replaced by the
+lexical similarity of the documents to the queries, relative to the most similar document. The
+fusion, the relevancy threshold and the limits of the LLMReranker are the real ones. With --live,
+the query generator, the reranker and the embeddings use the models configuration.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_rag_retrieval.py
+    or
+    python scripts/python/benchmarks/benchmark_rag_retrieval.py --top-k 5 --threshold 0.3 --output rag.json
+
+Environment Variables:
+    CONFIG_PATH: Path to the models configuration file, only used with --live (default: "config/config.json")
+
+Output:
+    A table with recall@k and MRR, and the latency per stage. With --output, the results as JSON
+    with sorted keys and rounded values, which can be compared across commits.
+"""
+
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import math
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from typing import Any, cast
+from unittest.mock import patch
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables import RunnableLambda
+from langchain_core.vectorstores import InMemoryVectorStore
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
+
+import rag.reranker.reranker as reranker_module  # noqa: E402
+from rag.query_generator import IQueryGenerator, Queries, QueryGenerator  # noqa: E402
+from rag.reranker.reranker import (  # noqa: E402
+    DocumentRelevancyScore,
+    DocumentRelevancyScores,
+    IReranker,
+    LLMReranker,
+)
+from rag.retriever import IRetriever  # noqa: E402
+from rag.system import Query, RAGSystem  # noqa: E402
+
+DATASETS = os.path.join(os.path.dirname(__file__), "../../../tests/integration/rag/datasets")
+DOCS_SNAPSHOT = os.path.join(DATASETS, "reranker")
+QUESTIONS_FILE = os.path.join(DATASETS, "retrieval_questions.json")
+
+EMBEDDING_DIMENSIONS = 1024
+RECALL_AT = (1, 3, 5)
+STAGES = ("query_generation", "retrieval", "fusion", "reranking", "total")
+STOPWORDS = frozenset(
+    {"a", "an", "and", "are", "can", "do", "does", "for", "how", "i", "in", "into", "is", "it", "my", "not"}
+    | {"of", "on", "or", "the", "to", "what", "when", "why", "with"}
+)
+
+
+def words(text: str) -> list[str]:
+    """Return the lowercase words of a text without stopwords."""
+    return [word for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in STOPWORDS]
+
+
+def content_key(text: str) -> str:
+    """Return the key of a document, which identifies documents with the same content in several datasets."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic lexical embeddings: the words of a text hashed into a fixed number of dimensions."""
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for word, count in Counter(words(text)).items():
+            index = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest()) % self.dimensions
+            vector[index] += 1 + math.log(count)
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed documents."""
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed a query."""
+        return self._embed(text)
+
+
+def cosine(left: list[float], right: list[float]) -> float:
+    """Cosine similarity of two normalized vectors."""
+    return sum(a * b for a, b in zip(left, right, strict=True))
+
+
+class KeywordQueryGenerator:
+    """Offline query generator, which adds the keywords of the query as alternative query."""
+
+    async def agenerate_queries(self, query: str) -> Queries:
+        """Generate the keyword query."""
+        return Queries(queries=[" ".join(words(query))])
+
+
+class LexicalReranker(LLMReranker):
+    """
+    LLMReranker whose LLM scores the documents by their lexical similarity to the queries, relative
+    to the most similar document, so that the most similar document has the score 1.
+    """
+
+    def __init__(self, embedding: Embeddings):
+        self.embedding = embedding
+        self.chain = RunnableLambda(self._score)
+
+    def _score(self, inputs: dict[str, Any]) -> DocumentRelevancyScores:
+        documents = json.loads(inputs["documents"])
+        queries = self.embedding.embed_documents(json.loads(inputs["queries"]))
+        contents = self.embedding.embed_documents([f"{doc['title']}\n{doc['page_content']}" for doc in documents])
+        similarities = [max(cosine(query, content) for query in queries) for content in contents]
+        best = max(similarities, default=0.0) or 1.0
+        return DocumentRelevancyScores(
+            documents=[
+                DocumentRelevancyScore(id=doc["id"], score=similarity / best)
+                for doc, similarity in zip(documents, similarities, strict=True)
+            ]
+        )
+
+
+class LocalRetriever:
+    """Retriever over an in-memory vector store."""
+
+    def __init__(self, store: InMemoryVectorStore):
+        self.store = store
+
+    async def aretrieve(self, query: str, top_k: int = 5) -> list[Document]:
+        """Retrieve the most similar documents."""
+        return await self.store.asimilarity_search(query, k=top_k)
+
+
+class StageRecorder:
+    """Records the latency of the stages and the fused candidates of a question."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.retrieval_calls: list[tuple[float, float]] = []
+        self.fused: list[Document] = []
+
+    def reset(self) -> None:
+        """Start recording a new question."""
+        self.seconds.clear()
+        self.retrieval_calls.clear()
+        self.fused = []
+
+    def stage_seconds(self) -> dict[str, float]:
+        """Return the latency per stage. The concurrent retrieval calls count from the first start to the last end."""
+        seconds = dict(self.seconds)
+        if self.retrieval_calls:
+            seconds["retrieval"] = max(end for _, end in self.retrieval_calls) - min(
+                start for start, _ in self.retrieval_calls
+            )
+        # the fusion is part of the reranker call.
+        seconds["reranking"] = seconds.get("reranking", 0.0) - seconds.get("fusion", 0.0)
+        return seconds
+
+
+class TimedQueryGenerator:
+    """Query generator that records its latency."""
+
+    def __init__(self, inner: IQueryGenerator, recorder: StageRecorder):
+        self.inner = inner
+        self.recorder = recorder
+
+    async def agenerate_queries(self, query: str) -> Queries:
+        """Generate the queries of the inner query generator."""
+        start = time.perf_counter()
+        queries = await self.inner.agenerate_queries(query)
+        self.recorder.seconds["query_generation"] += time.perf_counter() - start
+        return queries
+
+
+class TimedRetriever:
+    """Retriever that records the start and end of every call."""
+
+    def __init__(self, inner: IRetriever, recorder: StageRecorder):
+        self.inner = inner
+        self.recorder = recorder
+
+    async def aretrieve(self, query: str, top_k: int = 5) -> list[Document]:
+        """Retrieve the documents of the inner retriever."""
+        start = time.perf_counter()
+        docs = await self.inner.aretrieve(query, top_k)
+        self.recorder.retrieval_calls.append((start, time.perf_counter()))
+        return docs
+
+
+class TimedReranker:
+    """Reranker that records its latency."""
+
+    def __init__(self, inner: IReranker, recorder: StageRecorder):
+        self.inner = inner
+        self.recorder = recorder
+
+    async def arerank(
+        self, docs_list: list[list[Document]], queries: list[str], input_limit: int = 10, output_limit: int = 4
+    ) -> list[Document]:
+        """Rerank the documents with the inner reranker."""
+        start = time.perf_counter()
+        docs = await self.inner.arerank(docs_list, queries, input_limit, output_limit)
+        self.recorder.seconds["reranking"] += time.perf_counter() - start
+        return docs
+
+
+def timed_fusion(recorder: StageRecorder) -> Callable[..., list[Document]]:
+    """Wrap the fusion of the reranker to record its latency and its candidates."""
+    fuse = reranker_module.get_relevant_documents
+
+    def wrapper(*args: Any, **kwargs: Any) -> list[Document]:
+        start = time.perf_counter()
+        recorder.fused = fuse(*args, **kwargs)
+        recorder.seconds["fusion"] += time.perf_counter() - start
+        return recorder.fused
+
+    return wrapper
+
+
+def load_snapshot() -> list[Document]:
+    """Load the unique documents of the docs snapshot."""
+    docs: dict[str, Document] = {}
+    for path in sorted(glob.glob(os.path.join(DOCS_SNAPSHOT, "*", "*.md"))):
+        with open(path, encoding="utf-8") as file:
+            content = file.read()
+        source = os.path.relpath(path, DOCS_SNAPSHOT)
+        docs.setdefault(
+            content_key(content),
+            Document(page_content=content, metadata={"source": source, "title": source.split("/")[-1]}),
+        )
+    return list(docs.values())
+
+
+def load_questions() -> list[tuple[str, set[str]]]:
+    """Return the labeled questions with the keys of their relevant documents."""
+    with open(QUESTIONS_FILE, encoding="utf-8") as file:
+        questions = json.load(file)
+    labeled = []
+    for question in questions:
+        relevant = set()
+        for path in question["relevant_documents"]:
+            with open(os.path.join(DOCS_SNAPSHOT, path), encoding="utf-8") as file:
+                relevant.add(content_key(file.read()))
+        labeled.append((question["question"], relevant))
+    return labeled
+
+
+def quality(rankings: list[tuple[list[Document], set[str]]]) -> dict[str, float]:
+    """Return the mean recall@k and MRR of the rankings of all questions."""
+    recalls: dict[int, list[float]] = {k: [] for k in RECALL_AT}
+    reciprocal_ranks = []
+    for docs, relevant in rankings:
+        keys = [content_key(doc.page_content) for doc in docs]
+        for k in RECALL_AT:
+            recalls[k].append(len(relevant.intersection(keys[:k])) / len(relevant))
+        rank = next((index + 1 for index, key in enumerate(keys) if key in relevant), None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+    metrics = {f"recall@{k}": statistics.fmean(values) for k, values in recalls.items()}
+    metrics["mrr"] = statistics.fmean(reciprocal_ranks)
+    return metrics
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of the values."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def git_commit() -> str | None:
+    """Return the current commit, to label the results."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def create_components(live: bool) -> tuple[Embeddings, IQueryGenerator, IReranker]:
+    """Create the embeddings, the query generator and the reranker, offline or from the models configuration."""
+    if not live:
+        embedding = HashingEmbeddings()
+        return embedding, KeywordQueryGenerator(), LexicalReranker(embedding)
+
+    from utils.config import get_config
+    from utils.models.factory import IModel, ModelFactory
+    from utils.settings import MAIN_EMBEDDING_MODEL_NAME, MAIN_MODEL_MINI_NAME
+
+    os.environ.setdefault("CONFIG_PATH", "config/config.json")
+    models = ModelFactory(config=get_config()).create_models()
+    model = cast(IModel, models[MAIN_MODEL_MINI_NAME])
+    return cast(Embeddings, models[MAIN_EMBEDDING_MODEL_NAME]), QueryGenerator(model), LLMReranker(model)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmark and return the results."""
+    embedding, query_generator, reranker = create_components(args.live)
+    docs = load_snapshot()
+    store = InMemoryVectorStore(embedding)
+    await store.aadd_documents(docs)
+
+    recorder = StageRecorder()
+    system = RAGSystem(
+        {},
+        query_generator=TimedQueryGenerator(query_generator, recorder),
+        retriever=TimedRetriever(LocalRetriever(store), recorder),
+        reranker=TimedReranker(reranker, recorder),
+    )
+    questions = load_questions()
+    fused: list[tuple[list[Document], set[str]]] = []
+    reranked: list[tuple[list[Document], set[str]]] = []
+    latencies: dict[str, list[float]] = defaultdict(list)
+    results = []
+    with (
+        patch.object(reranker_module, "get_relevant_documents", timed_fusion(recorder)),
+        patch.object(reranker_module, "RAG_RELEVANCY_SCORE_THRESHOLD", args.threshold),
+    ):
+        for run_index in range(args.runs):
+            for question, relevant in questions:
+                recorder.reset()
+                start = time.perf_counter()
+                ranked = await system.aretrieve(Query(text=question), args.top_k)
+                stage_seconds = recorder.stage_seconds()
+                stage_seconds["total"] = time.perf_counter() - start
+                for stage in STAGES:
+                    latencies[stage].append(stage_seconds.get(stage, 0.0) * 1000)
+                # the quality is measured on the first run, the later runs only add latency samples.
+                if run_index == 0:
+                    fused.append((recorder.fused, relevant))
+                    reranked.append((ranked, relevant))
+                    results.append({"question": question, "reranked": [doc.metadata["source"] for doc in ranked]})
+
+    return {
+        "config": {
+            "commit": git_commit(),
+            "documents": len(docs),
+            "mode": "live" if args.live else "offline",
+            "questions": len(questions),
+            "relevancy_score_threshold": args.threshold,
+            "runs": args.runs,
+            "top_k": args.top_k,
+        },
+        "quality": {"fusion": quality(fused), "reranked": quality(reranked)},
+        "latency_ms": {
+            stage: {
+                "mean": statistics.fmean(latencies[stage]),
+                "p50": percentile(latencies[stage], 0.5),
+                "p95": percentile(latencies[stage], 0.95),
+            }
+            for stage in STAGES
+        },
+        "questions": results,
+    }
+
+
+def rounded(value: Any, digits: int = 4) -> Any:
+    """Round all floats of the results, so that the JSON output is stable."""
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {key: rounded(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        return [rounded(item, digits) for item in value]
+    return value
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    from utils.settings import RAG_RELEVANCY_SCORE_THRESHOLD
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=5, help="Number of documents retrieved per question.")
+    parser.add_argument(
+        "--threshold", type=float, default=RAG_RELEVANCY_SCORE_THRESHOLD, help="Relevancy score threshold."
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Number of runs of all questions for the latency.")
+    parser.add_argument(
+        "--live", action="store_true", help="Use the models configuration instead of offline stand-ins."
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = rounded(asyncio.run(run(args)))
+    print(f"{results['config']['questions']} questions, {results['config']['documents']} documents, top {args.top_k}")
+    print(f"{'ranking':<10}" + "".join(f"{metric:>11}" for metric in results["quality"]["fusion"]))
+    for ranking, metrics in results["quality"].items():
+        print(f"{ranking:<10}" + "".join(f"{value:>11.3f}" for value in metrics.values()))
+    print(f"\n{'stage':<18}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for stage, latency in results["latency_ms"].items():
+        print(f"{stage:<18}{latency['mean']:>10.2f}{latency['p50']:>10.2f}{latency['p95']:>10.2f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
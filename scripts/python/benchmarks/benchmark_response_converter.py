@@ -0,0 +1,215 @@
+"""
+This script measures the latency of the ResponseConverter, which rewrites the YAML blocks of the finalizer
+response into blocks with resource links, with sequential and concurrent namespace checks.
+
+The converter runs against a fake Kubernetes API server, whose namespace requests take a fixed latency.
+Responses with 1 to 30 YAML blocks are converted in the following modes:
+- sequential: every block is parsed with yaml.safe_load and its namespace is requested one after another,
+  like the converter did before the namespace checks were made concurrent.
+- concurrent: the blocks are parsed with the libyaml loader, and every namespace is requested once,
+  concurrently, within RESPONSE_CONVERTER_TIMEOUT_SECONDS.
+
+The converted responses of both modes are compared, so the benchmark fails if the links differ.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_response_converter.py
+    or
+    python scripts/python/benchmarks/benchmark_response_converter.py --blocks 1,10,30 --api-latency 0.05
+
+Environment Variables:
+    RESPONSE_CONVERTER_TIMEOUT_SECONDS: Time budget of the namespace checks of a response (default: 5)
+
+Output:
+    A table with the mean conversion latency per number of YAML blocks and mode, the namespace requests
+    per response, and the YAML parse time per block of both loaders. With --output, the results as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any
+
+import yaml
+from langchain_core.messages import AIMessage
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
+
+from agents.common.constants import FINALIZER, MESSAGES, NEW_YAML, UPDATE_YAML  # noqa: E402
+from agents.common.response_converter import YAML_SAFE_LOADER, ResponseConverter  # noqa: E402
+
+NAMESPACES = ["default", "production", "staging", "monitoring", "kyma-system"]
+# every seventh block refers to a namespace that does not exist.
+MISSING_NAMESPACE_EVERY = 7
+YAML_BLOCK = """<YAML-{tag}>
+```yaml
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: app-{index}
+  namespace: {namespace}
+  labels:
+    app: app-{index}
+spec:
+  replicas: 2
+  selector:
+    matchLabels:
+      app: app-{index}
+  template:
+    metadata:
+      labels:
+        app: app-{index}
+    spec:
+      containers:
+      - name: app
+        image: nginx:1.27
+        resources:
+          requests:
+            cpu: 100m
+            memory: 128Mi
+          limits:
+            memory: 256Mi
+```
+</YAML-{tag}>"""
+
+
+class FakeApiServer:
+    """A fake Kubernetes client whose namespace requests take a fixed latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+
+    async def get_namespace(self, name: str) -> dict:
+        """Return the namespace if it exists, after the latency of the API server."""
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        if name not in NAMESPACES:
+            raise ValueError(f"Failed to fetch namespace '{name}'.")
+        return {"metadata": {"name": name}}
+
+
+def create_response(blocks: int) -> str:
+    """Return a finalizer response with the given number of new and update YAML blocks."""
+    parts = ["To fix the deployments, apply the following configurations:"]
+    for index in range(blocks):
+        tag = "NEW" if index % 2 == 0 else "UPDATE"
+        missing = index % MISSING_NAMESPACE_EVERY == MISSING_NAMESPACE_EVERY - 1
+        namespace = "missing" if missing else NAMESPACES[index % len(NAMESPACES)]
+        parts.append(f"Deployment {index}:\n" + YAML_BLOCK.format(tag=tag, index=index, namespace=namespace))
+    return "\n\n".join(parts)
+
+
+async def convert_sequentially(converter: ResponseConverter, response: str) -> str:
+    """Convert the response block by block, with a namespace request per block."""
+    new_yaml_list, update_yaml_list = converter._extract_yaml(response)
+    for yaml_list, yaml_type in ((new_yaml_list, NEW_YAML), (update_yaml_list, UPDATE_YAML)):
+        replacement_list = []
+        for yaml_config in yaml_list:
+            [metadata] = converter._parse_link_metadata([yaml_config])
+            if metadata is None:
+                replacement_list.append(yaml_config)
+                continue
+            namespace_exists = await converter._namespace_exists(metadata[0])
+            link = converter._format_resource_link(metadata, namespace_exists, yaml_type)
+            replacement_list.append(
+                converter._create_html_nested_yaml(yaml_config, link, yaml_type) if link else yaml_config
+            )
+        response = converter._replace_yaml_with_html(response, replacement_list, yaml_type)
+    return response
+
+
+async def convert_concurrently(converter: ResponseConverter, response: str) -> str:
+    """Convert the response with the ResponseConverter."""
+    result = await converter.convert_final_response({"messages": [AIMessage(content=response, name=FINALIZER)]})
+    return str(result[MESSAGES][0].content)
+
+
+async def measure(blocks: int, args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Convert a response with the given number of YAML blocks in both modes, and return the mean latency."""
+    response = create_response(blocks)
+    results = []
+    outputs = {}
+    for mode, convert in (("sequential", convert_sequentially), ("concurrent", convert_concurrently)):
+        api_server = FakeApiServer(args.api_latency)
+        converter = ResponseConverter(k8s_client=api_server)  # type: ignore[arg-type]
+        durations = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            outputs[mode] = await convert(converter, response)
+            durations.append(time.perf_counter() - start)
+        results.append(
+            {
+                "blocks": blocks,
+                "mode": mode,
+                "latency_ms": round(statistics.mean(durations) * 1000, 2),
+                "namespace_requests": api_server.requests // args.runs,
+            }
+        )
+    if outputs["sequential"] != outputs["concurrent"]:
+        raise RuntimeError(f"the converted responses with {blocks} blocks differ")
+    return results
+
+
+def measure_yaml_parsing(iterations: int) -> dict[str, float]:
+    """Return the parse time per YAML block in microseconds of the pure Python and the libyaml loader."""
+    yaml_config = YAML_BLOCK.format(tag="NEW", index=0, namespace="default").split("```yaml\n")[1].split("```")[0]
+    results = {}
+    for name, loader in (("SafeLoader", yaml.SafeLoader), (YAML_SAFE_LOADER.__name__, YAML_SAFE_LOADER)):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            yaml.load(yaml_config, Loader=loader)
+        results[name] = round((time.perf_counter() - start) / iterations * 1_000_000, 1)
+    return results
+
+
+def print_results(results: list[dict[str, Any]], parse_times: dict[str, float]) -> None:
+    """Print the results per number of YAML blocks and mode."""
+    print(f"\n{'blocks':>7}  {'mode':<12}{'latency ms':>12}{'ns requests':>13}")
+    for result in results:
+        print(
+            f"{result['blocks']:>7}  {result['mode']:<12}{result['latency_ms']:>12.2f}"
+            f"{result['namespace_requests']:>13}"
+        )
+    print("\nYAML parse time per block: " + ", ".join(f"{name} {us} us" for name, us in parse_times.items()))
+
+
+async def run_benchmark(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Run the conversions of every number of YAML blocks."""
+    results = []
+    for blocks in args.blocks:
+        results.extend(await measure(blocks, args))
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--blocks",
+        type=lambda value: [int(blocks) for blocks in value.split(",")],
+        default=[1, 5, 10, 20, 30],
+        help="Comma separated numbers of YAML blocks per response.",
+    )
+    parser.add_argument(
+        "--api-latency", type=float, default=0.02, help="Latency of a namespace request of the fake API server."
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Number of conversions per number of blocks and mode.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args))
+    parse_times = measure_yaml_parsing(iterations=500)
+
+    print_results(results, parse_times)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"conversions": results, "yaml_parse_us": parse_times}, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+This script compares the LLM input size of the summarization modes of the MessageSummarizer.
+
+It replays synthetic 100-turn conversations through the summarization node, using a fake LLM
+that counts its prompt tokens and returns a fixed-size summary. Tokens are approximated by
+whitespace-separated words, so the benchmark runs offline.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_summarization.py
+    or
+    python scripts/python/benchmarks/benchmark_summarization.py --turns 200 --message-tokens 300
+
+Output:
+    A table with the number of summarization calls, the total, mean and maximum prompt tokens
+    and the number of tokenizer calls per mode.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from unittest.mock import Mock, patch
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, RemoveMessage
+from langchain_core.prompt_values import ChatPromptValue
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
+
+from agents.summarization.summarization import MessageSummarizer, SummarizationMode  # noqa: E402
+from utils.settings import SUMMARIZATION_TOKEN_LOWER_LIMIT, SUMMARIZATION_TOKEN_UPPER_LIMIT  # noqa: E402
+
+SUMMARY_TOKENS = 200
+
+
+class ConversationState(BaseModel):
+    """The part of the graph state used by the summarization node."""
+
+    messages: list[BaseMessage] = []
+    messages_summary: str = ""
+
+
+class FakeLLM:
+    """Counts the prompt tokens of every call and returns a fixed-size summary."""
+
+    def __init__(self) -> None:
+        self.prompt_tokens: list[int] = []
+        self.llm = RunnableLambda(self._invoke)
+
+    def _invoke(self, prompt: ChatPromptValue) -> AIMessage:
+        self.prompt_tokens.append(sum(count_words(str(msg.content)) for msg in prompt.to_messages()))
+        return AIMessage(content=" ".join(["summary"] * SUMMARY_TOKENS))
+
+
+def count_words(text: str, model_type: str = "") -> int:
+    """Approximate the token count by the number of words."""
+    return len(text.split())
+
+
+def apply_update(state: ConversationState, update: dict) -> None:
+    """Apply the output of the summarization node to the state, like the LangGraph reducers do."""
+    removed_ids = {msg.id for msg in update.get("messages", []) if isinstance(msg, RemoveMessage)}
+    state.messages = [msg for msg in state.messages if msg.id not in removed_ids]
+    state.messages_summary = update.get("messages_summary", state.messages_summary)
+
+
+async def run_conversation(mode: SummarizationMode, turns: int, message_tokens: int) -> tuple[FakeLLM, int]:
+    """Replay a conversation and return the fake LLM and the number of tokenizer calls."""
+    fake_llm = FakeLLM()
+    with patch("agents.summarization.summarization.compute_string_token_count", side_effect=count_words) as tokenizer:
+        summarizer = MessageSummarizer(
+            model=Mock(llm=fake_llm.llm),
+            tokenizer_model_name="benchmark",
+            token_lower_limit=SUMMARIZATION_TOKEN_LOWER_LIMIT,
+            token_upper_limit=SUMMARIZATION_TOKEN_UPPER_LIMIT,
+            mode=mode,
+        )
+        state = ConversationState()
+        for turn in range(turns):
+            content = " ".join([f"word{turn}"] * message_tokens)
+            state.messages.append(HumanMessage(id=f"human-{turn}", content=content))
+            state.messages.append(AIMessage(id=f"ai-{turn}", content=content))
+            # the summarization node runs after every agent response.
+            apply_update(state, await summarizer.summarization_node(state, {}))
+        return fake_llm, tokenizer.call_count
+
+
+async def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=100, help="Number of conversation turns.")
+    parser.add_argument("--message-tokens", type=int, default=150, help="Tokens per message.")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'calls':>8}{'total tokens':>15}{'mean tokens':>13}{'max tokens':>12}{'tokenizer calls':>17}")
+    for mode in SummarizationMode:
+        fake_llm, tokenizer_calls = await run_conversation(mode, args.turns, args.message_tokens)
+        calls = len(fake_llm.prompt_tokens)
+        total = sum(fake_llm.prompt_tokens)
+        print(
+            f"{mode:<10}{calls:>8}{total:>15}{total / max(calls, 1):>13.0f}"
+            f"{max(fake_llm.prompt_tokens, default=0):>12}{tokenizer_calls:>17}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
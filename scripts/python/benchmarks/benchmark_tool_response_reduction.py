@@ -0,0 +1,225 @@
+"""
+This script measures the tokens saved by the structural reduction of the tool responses, and checks that the
+reduced responses keep what the answers of the blackbox scenarios depend on.
+
+For every blackbox scenario with a deployment, the tool response of a namespace overview is built from the
+resources of the scenario, as the K8s API returns them: with managed fields, annotations and timestamps, a
+failing status of the resource the scenario asks about, and a healthy workload of --noise-pods pods with
+their normal events in the same namespace. The response is tokenized before and after the reduction.
+
+Answer parity is checked structurally, because the agents need an LLM: the resource of every query of the
+scenario, and every anomalous item, must be kept in the reduced response with its spec and status. A
+scenario also reports whether its reduced response fits TOOL_RESPONSE_TOKEN_COUNT_LIMIT, i.e. whether the
+LLM summarization of the tool response is skipped.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_tool_response_reduction.py
+    or
+    python scripts/python/benchmarks/benchmark_tool_response_reduction.py --noise-pods 500 --output reduction.json
+
+Environment Variables:
+    TOOL_RESPONSE_TOKEN_COUNT_LIMIT: Token limit of the tool responses before they are summarized (default: 10000)
+    TOOL_RESPONSE_COLLAPSE_MIN_ITEMS: Minimum length of a list that is collapsed (default: 5)
+    TOOL_RESPONSE_EXEMPLARS: Healthy items kept per kind of a collapsed list (default: 2)
+
+Output:
+    A table with the tokens of the raw and the reduced response per scenario, the saved tokens, whether the
+    reduced response fits the token limit, and the answer parity. With --output, the results as JSON.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
+
+from agents.common.tool_response_reducer import (  # noqa: E402
+    is_anomalous,
+    reduce_tool_response,
+    strip_noisy_fields,
+)
+from agents.common.utils import compute_string_token_count  # noqa: E402
+from utils.settings import TOOL_RESPONSE_TOKEN_COUNT_LIMIT  # noqa: E402
+
+TEST_CASES_DIR = Path(__file__).parent.parent.parent.parent / "tests/blackbox/data/test-cases"
+TIMESTAMP = "2025-01-01T00:00:00Z"
+NORMAL_POD_EVENTS = ["Scheduled", "Pulled", "Created", "Started"]
+
+
+def add_api_fields(resource: dict, index: int) -> dict:
+    """Add the metadata fields of the K8s API to a resource of a deployment file."""
+    metadata = resource.setdefault("metadata", {})
+    metadata.update(
+        {
+            "uid": f"00000000-0000-0000-0000-{index:012d}",
+            "resourceVersion": str(1000 + index),
+            "creationTimestamp": TIMESTAMP,
+            "annotations": {
+                **metadata.get("annotations", {}),
+                "kubectl.kubernetes.io/last-applied-configuration": json.dumps(resource, default=str),
+            },
+            "managedFields": [
+                {
+                    "manager": manager,
+                    "operation": "Update",
+                    "apiVersion": resource.get("apiVersion", "v1"),
+                    "time": TIMESTAMP,
+                    "fieldsType": "FieldsV1",
+                    "fieldsV1": {"f:metadata": {"f:labels": {".": {}}}, "f:spec": {".": {}}, "f:status": {".": {}}},
+                }
+                for manager in ("kubectl-client-side-apply", "kube-controller-manager")
+            ],
+        }
+    )
+    return resource
+
+
+def status(kind: str, failing: bool) -> dict | None:
+    """Return the status of a resource, as the controllers of a cluster write it."""
+    if kind == "Service":
+        return None
+    condition = {
+        "type": "Ready",
+        "status": "False" if failing else "True",
+        "reason": "ScenarioFailure" if failing else "Ready",
+        "lastTransitionTime": TIMESTAMP,
+        "lastUpdateTime": TIMESTAMP,
+    }
+    if kind == "Pod":
+        state = {"waiting": {"reason": "CrashLoopBackOff"}} if failing else {"running": {"startedAt": TIMESTAMP}}
+        return {
+            "phase": "Pending" if failing else "Running",
+            "startTime": TIMESTAMP,
+            "conditions": [condition],
+            "containerStatuses": [
+                {"name": "app", "ready": not failing, "restartCount": 5 if failing else 0, "state": state}
+            ],
+        }
+    if kind == "Deployment":
+        return {"replicas": 1, "readyReplicas": 0 if failing else 1, "conditions": [condition]}
+    return {"state": "Error" if failing else "Ready", "conditions": [condition]}
+
+
+def noise(namespace: str, pods: int) -> list[dict]:
+    """Return the healthy pods of a workload and their normal events."""
+    items: list[dict] = []
+    for index in range(pods):
+        name = f"worker-7d9f8c6b5-{index:05d}"
+        pod = {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {"name": name, "namespace": namespace, "labels": {"app": "worker"}},
+            "spec": {"containers": [{"name": "app", "image": "europe-docker.pkg.dev/kyma/worker:1.4.2"}]},
+            "status": status("Pod", failing=False),
+        }
+        items.append(add_api_fields(pod, index))
+        items.extend(
+            {
+                "kind": "Event",
+                "type": "Normal",
+                "reason": reason,
+                "message": f"{reason} pod/{name}",
+                "involvedObject": {"kind": "Pod", "name": name, "namespace": namespace},
+                "firstTimestamp": TIMESTAMP,
+                "lastTimestamp": TIMESTAMP,
+            }
+            for reason in NORMAL_POD_EVENTS
+        )
+    return items
+
+
+def load_scenario(test_case: Path, noise_pods: int) -> tuple[list[dict], list[tuple[str, str]]]:
+    """Return the tool response of the scenario, and the kind and name of the resources of its queries."""
+    scenario = yaml.safe_load((test_case / "scenario.yml").read_text())
+    targets = {
+        (query["resource"]["kind"], query["resource"].get("name", ""))
+        for query in scenario.get("queries", [])
+        if query.get("resource")
+    }
+    resources = [
+        resource
+        for resource in yaml.safe_load_all((test_case / "deployment.yml").read_text())
+        if isinstance(resource, dict) and resource.get("kind") != "Namespace"
+    ]
+    namespace = next((resource["metadata"].get("namespace") for resource in resources), "default")
+    for index, resource in enumerate(resources):
+        kind, name = resource.get("kind", ""), resource.get("metadata", {}).get("name", "")
+        resource_status = status(kind, failing=(kind, name) in targets)
+        if resource_status is not None:
+            resource["status"] = resource_status
+        add_api_fields(resource, index)
+    return resources + noise(namespace, noise_pods), sorted(targets)
+
+
+def check_parity(response: list[dict], reduced: list[dict], targets: list[tuple[str, str]]) -> bool:
+    """Check that the resources of the queries and the anomalous items are kept with their spec and status."""
+    kept = {json.dumps(item, sort_keys=True) for item in reduced}
+    required = [
+        item
+        for item in response
+        if is_anomalous(item) or (item.get("kind"), item.get("metadata", {}).get("name")) in targets
+    ]
+    return all(json.dumps(strip_noisy_fields(item), sort_keys=True) in kept for item in required)
+
+
+def run_benchmark(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Reduce the tool response of every scenario and return the token counts and the parity."""
+    results = []
+    for test_case in sorted(TEST_CASES_DIR.iterdir()):
+        if not (test_case / "deployment.yml").exists():
+            continue
+        response, targets = load_scenario(test_case, args.noise_pods)
+        reduced = reduce_tool_response(response)
+        raw_tokens = compute_string_token_count(str(response), args.model)
+        reduced_tokens = compute_string_token_count(str(reduced), args.model)
+        results.append(
+            {
+                "scenario": test_case.name,
+                "items": len(response),
+                "raw_tokens": raw_tokens,
+                "reduced_tokens": reduced_tokens,
+                "saved_percent": round((1 - reduced_tokens / raw_tokens) * 100, 1),
+                "fits_limit": reduced_tokens <= TOOL_RESPONSE_TOKEN_COUNT_LIMIT,
+                "parity": check_parity(response, reduced, targets),
+            }
+        )
+    return results
+
+
+def print_results(results: list[dict[str, Any]]) -> None:
+    """Print the results per scenario."""
+    print(f"\n{'scenario':<42}{'items':>7}{'raw':>10}{'reduced':>10}{'saved':>8}{'fits':>6}{'parity':>8}")
+    for result in results:
+        print(
+            f"{result['scenario']:<42}{result['items']:>7}{result['raw_tokens']:>10}{result['reduced_tokens']:>10}"
+            f"{result['saved_percent']:>7.1f}%{'yes' if result['fits_limit'] else 'no':>6}"
+            f"{'ok' if result['parity'] else 'LOST':>8}"
+        )
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--noise-pods", type=int, default=200, help="Healthy pods in the namespace of a scenario.")
+    parser.add_argument("--model", default="gpt-4.1", help="Model whose tokenizer counts the tokens.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+    if not all(result["parity"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+This script measures the time to derive the user identifier from the K8s auth headers of a request,
+with and without the user identifier cache.
+
+Every request of a conversation derives the user identifier from its token or client certificate. The
+benchmark derives it from a JWT token and from a PEM client certificate, in the following modes:
+- uncached: the token is decoded, or the certificate is parsed, on every call (USER_IDENTIFIER_CACHE_TTL_SECONDS=0).
+- cached: the same credential is sent again, so the identifier is served from the cache.
+
+Usage:
+    poetry run python scripts/python/benchmarks/benchmark_user_identifier.py
+    or
+    python scripts/python/benchmarks/benchmark_user_identifier.py --iterations 50000 --output identifier.json
+
+Environment Variables:
+    USER_IDENTIFIER_CACHE_MAX_ENTRIES: Maximum number of cached user identifiers per credential type (default: 10000)
+
+Output:
+    A table with the mean and p99 time per call in microseconds, and the speedup of the cache, per credential
+    type. With --output, the results as JSON.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.serialization import Encoding
+from cryptography.x509.oid import NameOID
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../src"))
+
+from utils import utils  # noqa: E402
+from utils.user_identifier_cache import (  # noqa: E402
+    CREDENTIAL_CLIENT_CERTIFICATE,
+    CREDENTIAL_TOKEN,
+    UserIdentifierCache,
+)
+
+
+def create_token() -> str:
+    """Return a token like the service account tokens of Kubernetes."""
+    now = int(time.time())
+    payload = {
+        "aud": ["https://kubernetes.default.svc"],
+        "exp": now + 3600,
+        "iat": now,
+        "iss": "https://kubernetes.default.svc",
+        "kubernetes.io": {"namespace": "default", "serviceaccount": {"name": "companion", "uid": "1234"}},
+        "sub": "system:serviceaccount:default:companion",
+    }
+    return jwt.encode(payload, "secret", algorithm="HS256")
+
+
+def create_client_certificate() -> bytes:
+    """Return a self-signed PEM client certificate."""
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "companion-user")])
+    now = datetime.datetime.now(datetime.UTC)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(private_key, hashes.SHA256())
+    )
+    return cert.public_bytes(Encoding.PEM)
+
+
+def measure(function: Callable[[], Any], iterations: int) -> dict[str, float]:
+    """Call the function repeatedly, and return the mean and p99 time per call in microseconds."""
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1_000_000)
+    return {
+        "mean_us": round(statistics.mean(durations), 2),
+        "p99_us": round(statistics.quantiles(durations, n=100)[98], 2),
+    }
+
+
+def run_benchmark(iterations: int) -> list[dict[str, Any]]:
+    """Measure the user identifier of every credential type, uncached and cached."""
+    token = create_token()
+    client_certificate = create_client_certificate()
+    credentials: dict[str, tuple[str, Callable[[], str]]] = {
+        CREDENTIAL_TOKEN: ("token_identifier_cache", lambda: utils.get_user_identifier_from_token(token)),
+        CREDENTIAL_CLIENT_CERTIFICATE: (
+            "client_certificate_identifier_cache",
+            lambda: utils.get_user_identifier_from_client_certificate(client_certificate),
+        ),
+    }
+    results = []
+    for credential_type, (cache_name, function) in credentials.items():
+        result: dict[str, Any] = {"credential_type": credential_type}
+        for mode, ttl_seconds in (("uncached", 0), ("cached", 300)):
+            setattr(utils, cache_name, UserIdentifierCache(credential_type, ttl_seconds=ttl_seconds))
+            # warm up, which also fills the cache.
+            function()
+            result[mode] = measure(function, iterations)
+        result["speedup"] = round(result["uncached"]["mean_us"] / result["cached"]["mean_us"], 1)
+        results.append(result)
+    return results
+
+
+def print_results(results: list[dict[str, Any]]) -> None:
+    """Print the results per credential type."""
+    print(
+        f"\n{'credential':<20}{'uncached us':>13}{'uncached p99':>14}{'cached us':>11}{'cached p99':>12}{'speedup':>9}"
+    )
+    for result in results:
+        print(
+            f"{result['credential_type']:<20}{result['uncached']['mean_us']:>13.2f}{result['uncached']['p99_us']:>14.2f}"
+            f"{result['cached']['mean_us']:>11.2f}{result['cached']['p99_us']:>12.2f}{result['speedup']:>8.1f}x"
+        )
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="Number of calls per credential and mode.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.iterations)
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
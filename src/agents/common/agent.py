@@ -1,3 +1,4 @@
+import json
 from typing import Any, Literal, Protocol
 
 from langchain_core.embeddings import Embeddings
@@ -31,6 +32,8 @@ from agents.common.error_handler import (
 from agents.common.exceptions import TotalChunksLimitExceededError
 from agents.common.prompts import JOULE_CONTEXT_INFORMATION
 from agents.common.state import BaseAgentState, SubTaskStatus
+from agents.common.tool_memo import get_tool_result_memo
+from agents.common.tool_response_reducer import reduce_tool_response
 from agents.common.utils import (
     compute_string_token_count,
     convert_string_to_object,
@@ -39,13 +42,16 @@ from agents.common.utils import (
     should_continue,
 )
 from agents.summarization.summarization import MessageSummarizer
+from services.metrics import CustomMetrics
 from utils.chain import ainvoke_chain
+from utils.chain_registry import bound_tools_chain_id, get_chain_registry
 from utils.logging import get_logger
 from utils.models.factory import IModel
 from utils.settings import (
     GRAPH_STEP_TIMEOUT_SECONDS,
     SUMMARIZATION_TOKEN_LOWER_LIMIT,
     SUMMARIZATION_TOKEN_UPPER_LIMIT,
+    TOOL_RESPONSE_REDUCTION_ENABLED,
     TOOL_RESPONSE_TOKEN_COUNT_LIMIT,
     TOTAL_CHUNKS_LIMIT,
 )
@@ -120,7 +126,11 @@ class BaseAgent:
         return self.graph
 
     def _create_chain(self, agent_prompt: ChatPromptTemplate) -> Any:
-        return agent_prompt | self.model.llm.bind_tools(self.tools)
+        return get_chain_registry().get_or_create(
+            bound_tools_chain_id(f"{self.name}_agent", agent_prompt, self.tools),
+            self.model,
+            lambda: agent_prompt | self.model.llm.bind_tools(self.tools),
+        )
 
     def _subtask_selector_node(self, state: BaseAgentState) -> dict[str, Any]:
         if state.k8s_client is None:
@@ -195,6 +205,16 @@ class BaseAgent:
             nums_of_chunks=num_chunks,
         )
 
+    def _reduce_tool_responses(self, tool_responses: list[Any], token_count: int) -> tuple[list[Any], int]:
+        """Reduce the tool responses structurally, and return them with their token count."""
+        reduced_tool_responses = reduce_tool_response(tool_responses)
+        if reduced_tool_responses == tool_responses:
+            return tool_responses, token_count
+        reduced_token_count = self._compute_token_count(str(reduced_tool_responses))
+        logger.info(f"Reduced tool response token count from {token_count} to {reduced_token_count}")
+        CustomMetrics().record_tool_response_reduction(max(token_count - reduced_token_count, 0))
+        return reduced_tool_responses, reduced_token_count
+
     async def _summarize_tool_response(self, state: BaseAgentState, config: RunnableConfig) -> str:
         """
         Summarize tool responses if they exceed the token limit.
@@ -232,6 +252,13 @@ class BaseAgent:
             logger.debug("Tool response within token limit, no summarization needed")
             return ""
 
+        # Reduce the tool response structurally, before it is summarized by the LLM.
+        if TOOL_RESPONSE_REDUCTION_ENABLED:
+            tool_responses, token_count = self._reduce_tool_responses(tool_responses, token_count)
+            if token_count <= model_token_limit:
+                self._mark_tool_messages_as_summarized(state)
+                return json.dumps(tool_responses, default=str)
+
         # Calculate number of chunks needed
         num_chunks = (token_count // model_token_limit) + 1
         logger.info(f"Number of chunks for summarization: {num_chunks}")
@@ -426,7 +453,15 @@ class BaseAgent:
         # Define nodes with async awareness
         workflow.add_node("subtask_selector", self._subtask_selector_node)
         workflow.add_node("agent", self._model_node)
-        tool_node = ToolNode(tools=self.tools, messages_key=AGENT_MESSAGES, handle_tool_errors=True)
+        # identical tool calls of a conversation are served from the tool result memo.
+        tool_result_memo = get_tool_result_memo()
+        tool_node = ToolNode(
+            tools=self.tools,
+            messages_key=AGENT_MESSAGES,
+            handle_tool_errors=True,
+            wrap_tool_call=tool_result_memo.wrap_tool_call,
+            awrap_tool_call=tool_result_memo.awrap_tool_call,
+        )
         workflow.add_node("tools", tool_node)
         workflow.add_node("finalizer", self._finalizer_node)
         workflow.add_node(SUMMARIZATION, self.summarization.summarization_node)
@@ -8,12 +8,15 @@ from langchain_core.runnables.config import RunnableConfig
 
 from agents.common.prompts import CHUNK_SUMMARIZER_PROMPT
 from utils.chain import ainvoke_chain
+from utils.chain_registry import get_chain_registry
 from utils.logging import get_logger
 from utils.models.factory import IModel
 from utils.settings import TOTAL_CHUNKS_LIMIT
 
 logger = get_logger(__name__)
 
+TOOL_RESPONSE_SUMMARIZER_CHAIN_ID = "tool_response_summarizer"
+
 
 class IToolResponseSummarizer(Protocol):
     """Protocol for IResponseConverter."""
@@ -34,15 +37,17 @@ class ToolResponseSummarizer:
     def __init__(self, model: IModel | Embeddings):
         self.model = model
 
-    def _create_chain(self, user_query: str) -> Any:
-        """Summarize a single chunk with the query-focused prompt."""
-        agent_prompt = PromptTemplate(
-            template=CHUNK_SUMMARIZER_PROMPT,
-            input_variables=["tool_response_chunk"],
-            partial_variables={"query": user_query},
-        )
+    def _create_chain(self) -> Any:
+        """Summarize a single chunk with the query-focused prompt. The query is an input of the chain."""
+
+        def create() -> Any:
+            agent_prompt = PromptTemplate(
+                template=CHUNK_SUMMARIZER_PROMPT,
+                input_variables=["tool_response_chunk", "query"],
+            )
+            return agent_prompt | self.model.llm
 
-        return agent_prompt | self.model.llm
+        return get_chain_registry().get_or_create(TOOL_RESPONSE_SUMMARIZER_CHAIN_ID, self.model, create)
 
     def _create_chunks_from_list(self, tool_response: list[Any], nums_of_chunks: int) -> list[Document]:
         """Split a list of K8s items into a specific number of Document chunks"""
@@ -88,16 +93,17 @@ class ToolResponseSummarizer:
         # Store summaries for each chunk
         chunk_summary = []
 
+        # the summarization chain is shared by all chunks and requests.
+        chain = self._create_chain()
+
         # Process each chunk individually
         for i, chunk in enumerate(chunks):
-            # Create a summarization chain
-            chain = self._create_chain(user_query)
-
             # Process the chunk and generate a summary
             response = await ainvoke_chain(
                 chain,
                 {
                     "tool_response_chunk": chunk.page_content,
+                    "query": user_query,
                 },
                 config=config,
             )
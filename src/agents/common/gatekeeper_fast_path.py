@@ -0,0 +1,189 @@
+"""
+Local fast path in front of the LLM gatekeeper.
+
+Obvious greetings, clearly in-scope Kyma/Kubernetes questions and clearly off-topic questions are
+classified lexically, without the LLM gatekeeper. The fast path only decides the scope of a query: the
+prompt injection and security checks are still done by an LLM for every classified query. Every query
+that the classifier is not confident about, that shows prompt injection or security markers, or that
+could be answered from the conversation history, falls back to the LLM gatekeeper.
+"""
+
+import re
+from collections.abc import Iterable
+
+from pydantic import BaseModel
+
+from agents.common.state import CompanionState, GatekeeperResponse
+from services.metrics import CustomMetrics
+from utils.logging import get_logger
+from utils.settings import (
+    GATEKEEPER_FAST_PATH_CONFIDENCE_THRESHOLD,
+    GATEKEEPER_FAST_PATH_MAX_QUERY_LENGTH,
+)
+
+logger = get_logger(__name__)
+
+FAST_PATH_FALLBACK = "fallback"
+
+_WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9\-]*")
+
+_GREETING_PATTERN = re.compile(
+    r"(hi|hello|hey|hey there|hello there|hi there|howdy|greetings|good (morning|afternoon|evening)|"
+    r"how are you|how are you doing|what's up|whats up)"
+    r"( (companion|kyma companion|joule))?[\s!.?]*",
+)
+
+# Queries with these markers need the prompt injection and security checks of the LLM gatekeeper.
+_RISK_PATTERN = re.compile(
+    r"\b(ignore|forget|instruction|instructions|prompt|pretend|act as|you are now|role|system message|"
+    r"reveal|verbatim|bypass|override|exploit|payload|injection|xss|rce|malware|attack|hack|vulnerabilit\w*|"
+    r"password|passwords|credential|credentials|secret key|private key|execute|obey|follow the)\b"
+)
+
+# Queries about earlier messages may be answered from the conversation history by the LLM gatekeeper.
+_HISTORY_PATTERN = re.compile(
+    r"\b(what was|what were|what happened|what went wrong|what did|what caused|what led to|how did|"
+    r"why was|why did|why were|previous|previously|earlier|before|you said|you told|last time|again)\b"
+)
+
+# Term weights: the probability that a query containing the term is in the given category.
+KYMA_TERMS: dict[str, float] = {
+    "kyma": 0.95,
+    "apirule": 0.95,
+    "apirules": 0.95,
+    "serverless": 0.9,
+    "btp": 0.9,
+    "eventing": 0.85,
+    "istio": 0.85,
+    "subscription": 0.5,
+    "subscriptions": 0.5,
+    "function": 0.3,
+    "functions": 0.3,
+    "module": 0.3,
+    "modules": 0.3,
+}
+KUBERNETES_TERMS: dict[str, float] = {
+    "kubernetes": 0.95,
+    "k8s": 0.95,
+    "kubectl": 0.95,
+    "pod": 0.9,
+    "pods": 0.9,
+    "deployment": 0.85,
+    "deployments": 0.85,
+    "namespace": 0.9,
+    "namespaces": 0.9,
+    "statefulset": 0.95,
+    "daemonset": 0.95,
+    "replicaset": 0.95,
+    "configmap": 0.95,
+    "pvc": 0.9,
+    "persistentvolumeclaim": 0.95,
+    "crd": 0.85,
+    "ingress": 0.7,
+    "helm": 0.8,
+    "cluster": 0.6,
+    "container": 0.5,
+    "containers": 0.5,
+    "node": 0.3,
+    "nodes": 0.3,
+    "service": 0.3,
+    "secret": 0.3,
+}
+OFF_TOPIC_TERMS: dict[str, float] = {
+    "weather": 0.9,
+    "recipe": 0.9,
+    "cook": 0.8,
+    "football": 0.9,
+    "soccer": 0.9,
+    "movie": 0.85,
+    "movies": 0.85,
+    "song": 0.85,
+    "lyrics": 0.9,
+    "joke": 0.8,
+    "poem": 0.8,
+    "capital": 0.7,
+    "president": 0.8,
+    "stock": 0.7,
+    "bitcoin": 0.85,
+    "horoscope": 0.95,
+    "vacation": 0.8,
+    "restaurant": 0.85,
+}
+
+
+class FastPathClassification(BaseModel):
+    """Result of the lexical classification of a user query."""
+
+    category: str
+    confidence: float
+
+
+def _confidence(words: Iterable[str], weights: dict[str, float]) -> float:
+    """Combine the weights of the matched terms as independent evidence."""
+    miss_probability = 1.0
+    for word in set(words):
+        miss_probability *= 1.0 - weights.get(word, 0.0)
+    return 1.0 - miss_probability
+
+
+def classify_query(query: str) -> FastPathClassification | None:
+    """
+    Classify a user query lexically.
+
+    Returns None if the query must be handled by the LLM gatekeeper.
+    """
+    normalized = " ".join(query.lower().split())
+    if not normalized or len(normalized) > GATEKEEPER_FAST_PATH_MAX_QUERY_LENGTH:
+        return None
+    if _GREETING_PATTERN.fullmatch(normalized):
+        return FastPathClassification(category="Greeting", confidence=1.0)
+    if _RISK_PATTERN.search(normalized) or _HISTORY_PATTERN.search(normalized):
+        return None
+
+    words = _WORD_PATTERN.findall(normalized)
+    kyma_confidence = _confidence(words, KYMA_TERMS)
+    kubernetes_confidence = _confidence(words, KUBERNETES_TERMS)
+    off_topic_confidence = _confidence(words, OFF_TOPIC_TERMS)
+    domain_confidence = max(kyma_confidence, kubernetes_confidence)
+
+    # no known terms, or mixed signals like "write a poem about kubernetes", are left to the LLM gatekeeper.
+    if (domain_confidence > 0) == (off_topic_confidence > 0):
+        return None
+    if off_topic_confidence > 0:
+        return FastPathClassification(category="Irrelevant", confidence=off_topic_confidence)
+    if kyma_confidence >= kubernetes_confidence:
+        return FastPathClassification(category="Kyma", confidence=kyma_confidence)
+    return FastPathClassification(category="Kubernetes", confidence=kubernetes_confidence)
+
+
+class GatekeeperFastPath:
+    """
+    Decides the scope of the query locally when the lexical classifier is confident. The security flags
+    of the returned response are unset and must be set by the security check of the LLM.
+    """
+
+    def __init__(self, confidence_threshold: float = GATEKEEPER_FAST_PATH_CONFIDENCE_THRESHOLD):
+        self._confidence_threshold = confidence_threshold
+
+    def classify(self, state: CompanionState) -> GatekeeperResponse | None:
+        """Return the gatekeeper response for the user query, or None to fall back to the LLM gatekeeper."""
+        classification = classify_query(state.input.query)
+        if classification is None or classification.confidence < self._confidence_threshold:
+            CustomMetrics().record_gatekeeper_fast_path_decision(FAST_PATH_FALLBACK)
+            return None
+
+        logger.debug(
+            f"Gatekeeper fast path classified the query as {classification.category} "
+            f"with confidence {classification.confidence:.2f}"
+        )
+        CustomMetrics().record_gatekeeper_fast_path_decision(classification.category)
+        return GatekeeperResponse(
+            forward_query=False,
+            is_prompt_injection=False,
+            is_security_threat=False,
+            user_intent=state.input.query,
+            category=classification.category,  # type: ignore[arg-type]
+            direct_response="",
+            is_user_query_in_past_tense=False,
+            answer_from_history="",
+        )
@@ -1,3 +1,4 @@
+import asyncio
 import re
 from typing import Any, Protocol
 
@@ -14,9 +15,17 @@ from agents.common.constants import (
 )
 from services.k8s import IK8sClient
 from utils.logging import get_logger
+from utils.settings import RESPONSE_CONVERTER_TIMEOUT_SECONDS
 
 logger = get_logger(__name__)
 
+# Regular expression patterns to extract YAML blocks
+NEW_YAML_PATTERN = re.compile(r"<YAML-NEW>\s*([\s\S]*?)\s*</YAML-NEW>", re.DOTALL)
+UPDATE_YAML_PATTERN = re.compile(r"<YAML-UPDATE>\s*([\s\S]*?)\s*</YAML-UPDATE>", re.DOTALL)
+
+# the libyaml loader is several times faster than the pure Python loader.
+YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class IResponseConverter(Protocol):
     """Protocol for IResponseConverter."""
@@ -34,11 +43,12 @@ class ResponseConverter:
     resource links based on the YAML content.
     """
 
-    def __init__(self, k8s_client: IK8sClient):
-        # Regular expression patterns to extract YAML blocks
-        self.new_yaml_pattern = r"<YAML-NEW>\s*([\s\S]*?)\s*</YAML-NEW>"
-        self.update_yaml_pattern = r"<YAML-UPDATE>\s*([\s\S]*?)\s*</YAML-UPDATE>"
+    def __init__(self, k8s_client: IK8sClient, timeout_seconds: float = RESPONSE_CONVERTER_TIMEOUT_SECONDS):
+        self.new_yaml_pattern = NEW_YAML_PATTERN
+        self.update_yaml_pattern = UPDATE_YAML_PATTERN
         self.k8s_client = k8s_client
+        # time budget of the namespace checks of a response.
+        self.timeout_seconds = timeout_seconds
 
     def _extract_yaml(self, finalizer_response: str) -> tuple[list[str], list[str]]:
         """
@@ -52,10 +62,10 @@ class ResponseConverter:
         """
 
         # Find all YAML blocks marked for new resources
-        new_yaml_blocks = re.findall(self.new_yaml_pattern, finalizer_response, re.DOTALL)
+        new_yaml_blocks = self.new_yaml_pattern.findall(finalizer_response)
 
         # Find all YAML blocks marked for updating existing resources
-        update_yaml_blocks = re.findall(self.update_yaml_pattern, finalizer_response, re.DOTALL)
+        update_yaml_blocks = self.update_yaml_pattern.findall(finalizer_response)
 
         return new_yaml_blocks, update_yaml_blocks
 
@@ -78,10 +88,10 @@ class ResponseConverter:
             # First check: if yaml markers available
             if yaml_config[:7] == "```yaml":
                 # parsing after removing yaml markers
-                parsed_yaml = yaml.safe_load(yaml_config[8:-4])
+                parsed_yaml = yaml.load(yaml_config[8:-4], Loader=YAML_SAFE_LOADER)
             else:
                 # Parse raw string
-                parsed_yaml = yaml.safe_load(yaml_config)
+                parsed_yaml = yaml.load(yaml_config, Loader=YAML_SAFE_LOADER)
 
         except Exception:
             logger.exception(f"Error while parsing the yaml : {yaml_config}")
@@ -90,35 +100,82 @@ class ResponseConverter:
 
         return parsed_yaml
 
-    async def _generate_resource_link(self, yaml_config: dict[str, Any], link_type: str) -> str | None:
+    def _get_link_metadata(self, yaml_config: dict[str, Any]) -> tuple[str, str, str] | None:
         """
-        Generate resource link based on YAML metadata and link type.
+        Extract the metadata that is required for link generation.
 
         Args:
             yaml_config: Parsed YAML configuration
-            link_type: Type of link to generate ('NEW' or 'UPDATE')
 
         Returns:
-            Generated resource link or None if required metadata is missing
+            Tuple of namespace, name and kind, or None if required metadata is missing
         """
-        # Extract required metadata for link generation
-        logger.debug("Response conversion node - Generating resource link")
         try:
-            namespace = yaml_config["metadata"]["namespace"]
-            deployment_name = yaml_config["metadata"]["name"]
-            resource_type = yaml_config["kind"]
+            return (
+                str(yaml_config["metadata"]["namespace"]),
+                yaml_config["metadata"]["name"],
+                yaml_config["kind"],
+            )
         except Exception:
             logger.exception(f"Error in generating link, skipping generating link for yaml: {yaml_config}")
             return None
 
-        # check if namespace exists.
-        namespace_exists = False
+    async def _namespace_exists(self, namespace: str) -> bool:
+        """Check if the namespace exists in the cluster."""
         try:
             if await self.k8s_client.get_namespace(namespace):
-                namespace_exists = True
+                return True
         except Exception:
-            logger.warning(f"Namespace {namespace} does not exist, skipping generating link for yaml: {yaml_config}")
+            logger.warning(f"Namespace {namespace} does not exist, skipping generating link for it")
+        return False
+
+    def _parse_link_metadata(self, yaml_list: list[str]) -> list[tuple[str, str, str] | None]:
+        """
+        Parse the YAML configs and extract the metadata that is required for link generation.
+
+        Args:
+            yaml_list: List of YAML configurations
+
+        Returns:
+            List of the metadata of every YAML config, None if it cannot be parsed or misses metadata
+        """
+        metadata_list: list[tuple[str, str, str] | None] = []
+        for yaml_config_string in yaml_list:
+            parsed_yaml = self._parse_yamls(yaml_config_string)
+            metadata_list.append(self._get_link_metadata(parsed_yaml) if parsed_yaml else None)
+        return metadata_list
+
+    async def _resolve_namespaces(self, metadata_list: list[tuple[str, str, str] | None]) -> dict[str, bool]:
+        """
+        Check the namespaces of the YAML configs concurrently, every namespace once.
+        Namespaces that are not checked within the time budget are treated as not existing.
 
+        Args:
+            metadata_list: List of the metadata of the YAML configs
+
+        Returns:
+            Dictionary of namespace to whether it exists
+        """
+        namespaces = {metadata[0] for metadata in metadata_list if metadata is not None}
+        if not namespaces:
+            return {}
+
+        tasks = {namespace: asyncio.create_task(self._namespace_exists(namespace)) for namespace in namespaces}
+        _, pending = await asyncio.wait(tasks.values(), timeout=self.timeout_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(
+                f"Namespace checks of {len(pending)} namespaces exceeded the time budget of "
+                f"{self.timeout_seconds} seconds, skipping generating links for them"
+            )
+        return {namespace: task.result() for namespace, task in tasks.items() if task not in pending}
+
+    def _format_resource_link(
+        self, metadata: tuple[str, str, str], namespace_exists: bool, link_type: str
+    ) -> str | None:
+        """Format the resource link of the metadata based on the link type."""
+        namespace, deployment_name, resource_type = metadata
         # Generate appropriate link based on type
         if link_type == NEW_YAML:
             ns = namespace if namespace_exists else "default"
@@ -188,32 +245,36 @@ class ResponseConverter:
         yaml_pattern = self.new_yaml_pattern if yaml_type == NEW_YAML else self.update_yaml_pattern
 
         # Perform the replacement
-        converted_response = re.sub(yaml_pattern, replace_func, finalizer_response, flags=re.DOTALL)
+        converted_response = yaml_pattern.sub(replace_func, finalizer_response)
         return converted_response
 
-    async def _create_replacement_list(self, yaml_list: list[str], yaml_type: str) -> list[str]:
+    def _build_replacement_list(
+        self,
+        yaml_list: list[str],
+        metadata_list: list[tuple[str, str, str] | None],
+        yaml_type: str,
+        namespace_states: dict[str, bool],
+    ) -> list[str]:
         """
-        Process list of YAML configs and create corresponding HTML replacements.
+        Create the HTML replacements of YAML configs, with the resolved namespaces.
 
         Args:
             yaml_list: List of YAML configurations to process
+            metadata_list: List of the metadata of the YAML configs, in the same order
             yaml_type: Type of YAML blocks ('NEW' or 'UPDATE')
+            namespace_states: Dictionary of namespace to whether it exists
 
         Returns:
             List of HTML replacements for YAML blocks
         """
-        logger.debug("Response conversion node - Creating HTML replacements")
         replacement_list = []
-
-        for yaml_config_string in yaml_list:
-            # Parse YAML and generate replacement
-            parsed_yaml = self._parse_yamls(yaml_config_string)
-            if not parsed_yaml:
+        for yaml_config_string, metadata in zip(yaml_list, metadata_list, strict=True):
+            if metadata is None:
                 replacement_list.append(yaml_config_string)
                 continue
 
             # Generate resource link
-            generated_link = await self._generate_resource_link(parsed_yaml, yaml_type)
+            generated_link = self._format_resource_link(metadata, namespace_states.get(metadata[0], False), yaml_type)
 
             if generated_link:
                 # Create HTML if link generation successful
@@ -241,12 +302,21 @@ class ResponseConverter:
             new_yaml_list, update_yaml_list = self._extract_yaml(finalizer_response)
 
             if new_yaml_list or update_yaml_list:
+                # Parse all YAML configs, and check their namespaces concurrently
+                new_metadata_list = self._parse_link_metadata(new_yaml_list)
+                update_metadata_list = self._parse_link_metadata(update_yaml_list)
+                namespace_states = await self._resolve_namespaces(new_metadata_list + update_metadata_list)
+
                 # Process new resource YAML configs
-                replacement_list = await self._create_replacement_list(new_yaml_list, NEW_YAML)
+                replacement_list = self._build_replacement_list(
+                    new_yaml_list, new_metadata_list, NEW_YAML, namespace_states
+                )
                 finalizer_response = self._replace_yaml_with_html(finalizer_response, replacement_list, NEW_YAML)
 
                 # Process update resource YAML configs
-                replacement_list = await self._create_replacement_list(update_yaml_list, UPDATE_YAML)
+                replacement_list = self._build_replacement_list(
+                    update_yaml_list, update_metadata_list, UPDATE_YAML, namespace_states
+                )
                 finalizer_response = self._replace_yaml_with_html(finalizer_response, replacement_list, UPDATE_YAML)
 
         except Exception:
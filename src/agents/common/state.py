@@ -155,6 +155,20 @@ class GatekeeperResponse(BaseModel):
     ]
 
 
+class GatekeeperSecurityResponse(BaseModel):
+    """Security classification of the user query, used when the gatekeeper fast path decides the scope."""
+
+    is_prompt_injection: Annotated[
+        bool,
+        Field(description=GatekeeperResponse.model_fields["is_prompt_injection"].description),
+    ]
+
+    is_security_threat: Annotated[
+        bool,
+        Field(description=GatekeeperResponse.model_fields["is_security_threat"].description),
+    ]
+
+
 class SubTask(BaseModel):
     """Sub-task data model."""
 
@@ -189,6 +203,39 @@ class SubTask(BaseModel):
         return self.status == SubTaskStatus.ERROR
 
 
+_SUBTASK_STATUS_RANK: dict[str, int] = {
+    SubTaskStatus.PENDING: 0,
+    SubTaskStatus.COMPLETED: 1,
+    SubTaskStatus.ERROR: 1,
+}
+
+
+def merge_subtasks(current: list[SubTask] | None, update: list[SubTask] | None) -> list[SubTask] | None:
+    """
+    Reducer for the subtasks of the companion graph.
+
+    Agents that are dispatched in parallel each return the whole plan with their own subtasks
+    completed. Updates of the same plan are merged by keeping the most advanced status of every
+    subtask. Any other update, like a new plan or a reset, replaces the subtasks.
+    """
+    if not current or not update or len(current) != len(update):
+        return update
+    if any(
+        old.description != new.description or old.assigned_to != new.assigned_to
+        for old, new in zip(current, update, strict=True)
+    ):
+        return update
+    return [
+        new if _SUBTASK_STATUS_RANK.get(new.status, 0) >= _SUBTASK_STATUS_RANK.get(old.status, 0) else old
+        for old, new in zip(current, update, strict=True)
+    ]
+
+
+def keep_last_error(current: str | None, update: str | None) -> str | None:
+    """Reducer for the error of the companion graph, accepts errors of agents running in parallel."""
+    return update
+
+
 # After upgrading generative-ai-hub-sdk we can message that use pydantic v2
 # Currently, we are using pydantic v1.
 class UserInput(BaseModel):
@@ -277,8 +324,8 @@ class CompanionState(BaseModel):
     messages: Annotated[Sequence[BaseMessage], add_messages]
     messages_summary: str = ""
     next: str | None = None
-    subtasks: list[SubTask] | None = []
-    error: str | None = None
+    subtasks: Annotated[list[SubTask] | None, merge_subtasks] = []
+    error: Annotated[str | None, keep_last_error] = None
     k8s_client: Annotated[Any, Field(default=None, exclude=True)]
 
     # Model config for pydantic.
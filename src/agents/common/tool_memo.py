@@ -0,0 +1,240 @@
+"""
+Memo of the tool results of the ReAct loops.
+
+The agents often call the same read-only tool with identical arguments several times within a turn of a
+conversation, e.g. the same K8s query or the same documentation search. The memo wraps the tool
+invocation of the tool nodes and returns the memoized, already sanitized result of an identical call
+within TOOL_MEMO_TTL_SECONDS, instead of invoking the tool again. The results are scoped to the turn and
+the cluster, so a question after the user changed a resource, like "is it fixed now?", is answered with
+fresh tool results. A memoized result is marked in the response metadata of the tool message. Failed
+tool calls are not memoized.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+from typing import Any
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+from pydantic import BaseModel, ConfigDict
+
+from services.metrics import CustomMetrics
+from utils.logging import get_logger
+from utils.settings import TOOL_MEMO_ENABLED, TOOL_MEMO_MAX_ENTRIES, TOOL_MEMO_TOOLS, TOOL_MEMO_TTL_SECONDS
+from utils.singleton_meta import SingletonMeta
+
+logger = get_logger(__name__)
+
+# configurable key of the run config that scopes the memoized results to a turn, see new_tool_memo_scope.
+TOOL_MEMO_SCOPE = "tool_memo_scope"
+# response metadata key of the tool messages that are served from the memo.
+TOOL_MEMO_HIT = "tool_memo_hit"
+TOOL_MEMO_AGE_SECONDS = "tool_memo_age_seconds"
+
+
+class ToolMemoResult(StrEnum):
+    """Outcome of a memo lookup."""
+
+    HIT = "hit"
+    MISS = "miss"
+
+
+class ToolMemoKey(BaseModel):
+    """Identifies a tool call within a conversation."""
+
+    model_config = ConfigDict(frozen=True)
+
+    scope: str
+    cluster: str
+    tool: str
+    args: str
+
+
+class ToolMemoStats(BaseModel):
+    """Lookup statistics of a tool."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio of the tool calls served from the memo."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _MemoEntry:
+    """A memoized tool message content."""
+
+    __slots__ = ("content", "created_at")
+
+    def __init__(self, content: Any, created_at: float):
+        self.content = content
+        self.created_at = created_at
+
+
+def new_tool_memo_scope() -> str:
+    """Return a new memo scope for the run config of a turn."""
+    return str(uuid.uuid4())
+
+
+def _get_scope(request: ToolCallRequest) -> str | None:
+    """Return the turn of the tool call, or None if the run config of the turn has no memo scope."""
+    config = getattr(request.runtime, "config", None) or {}
+    configurable = config.get("configurable") or {}
+    scope = configurable.get(TOOL_MEMO_SCOPE)
+    return str(scope) if scope else None
+
+
+def _get_cluster(request: ToolCallRequest) -> str:
+    """Return the API server of the K8s client in the state of the tool call, if any."""
+    state = request.state
+    k8s_client = state.get("k8s_client") if isinstance(state, dict) else getattr(state, "k8s_client", None)
+    if k8s_client is None:
+        return ""
+    try:
+        return str(k8s_client.get_api_server())
+    except Exception:
+        return ""
+
+
+class ToolResultMemo(AgentMiddleware, metaclass=SingletonMeta):
+    """
+    Memo of the tool results, shared by the tool nodes of all agents.
+
+    It is a tool call wrapper of the ToolNode of the graph based agents, and a middleware of the
+    ReAct agents created with create_agent.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = TOOL_MEMO_ENABLED,
+        ttl_seconds: float = TOOL_MEMO_TTL_SECONDS,
+        max_entries: int = TOOL_MEMO_MAX_ENTRIES,
+        tools: list[str] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self._enabled = enabled and ttl_seconds > 0 and max_entries > 0
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._tools = frozenset(TOOL_MEMO_TOOLS if tools is None else tools)
+        self._clock = clock
+        self._entries: OrderedDict[ToolMemoKey, _MemoEntry] = OrderedDict()
+        self._stats: dict[str, ToolMemoStats] = {}
+        self._lock = threading.Lock()
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        """Return the memoized result of the tool call, or invoke the tool and memoize its result."""
+        key = self._get_key(request)
+        if key is None:
+            return handler(request)
+        memoized = self._lookup(key, request)
+        if memoized is not None:
+            return memoized
+        result = handler(request)
+        self._store(key, result)
+        return result
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        """Async variant of wrap_tool_call."""
+        key = self._get_key(request)
+        if key is None:
+            return await handler(request)
+        memoized = self._lookup(key, request)
+        if memoized is not None:
+            return memoized
+        result = await handler(request)
+        self._store(key, result)
+        return result
+
+    def get_hit_rates(self) -> dict[str, float]:
+        """Return the hit ratio per tool."""
+        with self._lock:
+            return {tool: stats.hit_ratio for tool, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        """Drop all memoized results."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_key(self, request: ToolCallRequest) -> ToolMemoKey | None:
+        """Return the memo key of the tool call, or None if the call is not memoized."""
+        tool_name = request.tool_call["name"]
+        if not self._enabled or tool_name not in self._tools:
+            return None
+        scope = _get_scope(request)
+        if scope is None:
+            return None
+        return ToolMemoKey(
+            scope=scope,
+            cluster=_get_cluster(request),
+            tool=tool_name,
+            args=json.dumps(request.tool_call["args"], sort_keys=True, default=str),
+        )
+
+    def _lookup(self, key: ToolMemoKey, request: ToolCallRequest) -> ToolMessage | None:
+        """Return a tool message with the memoized result of the key and record the lookup."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.created_at >= self._ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            stats = self._stats.setdefault(key.tool, ToolMemoStats())
+            if entry is None:
+                stats.misses += 1
+            else:
+                stats.hits += 1
+            hit_ratio = stats.hit_ratio
+        result = ToolMemoResult.MISS if entry is None else ToolMemoResult.HIT
+        CustomMetrics().record_tool_memo_lookup(key.tool, result, hit_ratio)
+        if entry is None:
+            return None
+        logger.debug(f"Serving the memoized result of tool {key.tool}")
+        return ToolMessage(
+            content=entry.content,
+            name=key.tool,
+            tool_call_id=request.tool_call["id"],
+            response_metadata={TOOL_MEMO_HIT: True, TOOL_MEMO_AGE_SECONDS: round(now - entry.created_at, 3)},
+        )
+
+    def _store(self, key: ToolMemoKey, result: ToolMessage | Command) -> None:
+        """Memoize the content of a successful tool message."""
+        if not isinstance(result, ToolMessage) or result.status == "error":
+            return
+        with self._lock:
+            self._entries[key] = _MemoEntry(content=result.content, created_at=self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    @classmethod
+    def _reset_for_tests(cls) -> None:
+        """Reset the singleton instance. Only use for testing purpose."""
+        SingletonMeta.reset_instance(cls)
+
+
+def get_tool_result_memo() -> ToolResultMemo:
+    """Return the tool result memo of the process."""
+    return ToolResultMemo()
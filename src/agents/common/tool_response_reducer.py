@@ -0,0 +1,170 @@
+"""
+Structural reduction of the tool responses before they are summarized by the LLM.
+
+The K8s tools often return long lists of near identical items, e.g. hundreds of healthy pods of the same
+deployment, and every item carries fields that do not help to answer a question, like the managed fields,
+the annotations and the timestamps of the status. The reduction removes these fields and collapses
+homogeneous lists into a few exemplars and the count and names of the remaining items. Anomalous items,
+like failing pods, unavailable deployments or warning events, are always kept in full, because they are
+usually what the question is about.
+"""
+
+from typing import Any
+
+from utils.settings import TOOL_RESPONSE_COLLAPSE_MIN_ITEMS, TOOL_RESPONSE_EXEMPLARS
+
+# key of the entries that replace the collapsed items of a list.
+COLLAPSED_ITEMS_KEY = "collapsed_items"
+# maximum number of names listed per collapsed group.
+COLLAPSED_NAMES_LIMIT = 100
+
+NOISY_METADATA_FIELDS = frozenset({"managedFields", "annotations"})
+NOISY_STATUS_FIELDS = frozenset(
+    {"lastTransitionTime", "lastUpdateTime", "lastProbeTime", "lastHeartbeatTime", "lastScaleTime", "startTime"}
+)
+
+HEALTHY_PHASES = frozenset({"Running", "Succeeded", "Active", "Bound", "Available"})
+UNHEALTHY_STATES = frozenset({"Error", "Failed", "Warning"})
+# condition types that are healthy if their status is "False".
+NEGATIVE_CONDITION_TYPES = frozenset(
+    {"MemoryPressure", "DiskPressure", "PIDPressure", "NetworkUnavailable", "ReplicaFailure", "Failed", "Stalled"}
+)
+CONTAINER_STATUS_FIELDS = ("containerStatuses", "initContainerStatuses")
+READY_REPLICAS_FIELDS = ("readyReplicas", "availableReplicas")
+
+
+def strip_noisy_fields(value: Any, parent_key: str = "") -> Any:
+    """Return a copy of the value without the noisy metadata and status fields."""
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if parent_key == "metadata" and key in NOISY_METADATA_FIELDS:
+                continue
+            if key in NOISY_STATUS_FIELDS:
+                continue
+            result[key] = strip_noisy_fields(item, key)
+        return result
+    if isinstance(value, list):
+        return [strip_noisy_fields(item, parent_key) for item in value]
+    return value
+
+
+def _has_unhealthy_condition(conditions: Any) -> bool:
+    if not isinstance(conditions, list):
+        return False
+    for condition in conditions:
+        if not isinstance(condition, dict):
+            continue
+        status = condition.get("status")
+        negative = condition.get("type") in NEGATIVE_CONDITION_TYPES
+        if status == "Unknown" or (status == "False" and not negative) or (status == "True" and negative):
+            return True
+    return False
+
+
+def _has_unhealthy_container(status: dict) -> bool:
+    for field in CONTAINER_STATUS_FIELDS:
+        for container in status.get(field) or []:
+            if not isinstance(container, dict):
+                continue
+            state = container.get("state") or {}
+            terminated = state.get("terminated") or {}
+            if container.get("restartCount", 0) > 0 or "waiting" in state or terminated.get("exitCode", 0) != 0:
+                return True
+            if field == "containerStatuses" and container.get("ready") is False and not terminated:
+                return True
+    return False
+
+
+def _has_missing_replicas(item: dict, status: dict) -> bool:
+    spec = item.get("spec")
+    replicas = spec.get("replicas") if isinstance(spec, dict) else None
+    if not isinstance(replicas, int):
+        return False
+    return any(status.get(field, 0) < replicas for field in READY_REPLICAS_FIELDS if field in status) or (
+        replicas > 0 and not any(field in status for field in READY_REPLICAS_FIELDS)
+    )
+
+
+def is_anomalous(item: Any) -> bool:
+    """Check if a K8s object or event indicates a problem."""
+    if not isinstance(item, dict):
+        return False
+    if item.get("type") == "Warning":
+        return True
+    status = item.get("status")
+    if not isinstance(status, dict):
+        return False
+    phase = status.get("phase")
+    if phase is not None and phase not in HEALTHY_PHASES:
+        return True
+    if status.get("state") in UNHEALTHY_STATES:
+        return True
+    return (
+        _has_unhealthy_condition(status.get("conditions"))
+        or _has_unhealthy_container(status)
+        or _has_missing_replicas(item, status)
+    )
+
+
+def _group_key(item: dict) -> tuple[str, ...]:
+    """Return the key of the items that are collapsed together: their kind, or their fields."""
+    kind = item.get("kind")
+    if kind == "Event" or ("reason" in item and "involvedObject" in item):
+        return ("Event", str(item.get("reason", "")))
+    if kind:
+        return (str(kind),)
+    return tuple(sorted(item.keys()))
+
+
+def _item_name(item: dict) -> str:
+    metadata = item.get("metadata")
+    if isinstance(metadata, dict):
+        name = str(metadata.get("name", ""))
+        namespace = metadata.get("namespace")
+        return f"{namespace}/{name}" if namespace else name
+    return str(item.get("name", ""))
+
+
+def _collapse_list(items: list[Any], min_items: int, exemplars: int) -> list[Any]:
+    """Collapse the healthy items of a homogeneous list into exemplars and a count per group."""
+    if len(items) < min_items or not all(isinstance(item, dict) for item in items):
+        return items
+    groups: dict[tuple[str, ...], list[int]] = {}
+    for index, item in enumerate(items):
+        if not is_anomalous(item):
+            groups.setdefault(_group_key(item), []).append(index)
+
+    collapsed: set[int] = set()
+    summaries = []
+    for key, indexes in groups.items():
+        if len(indexes) <= exemplars:
+            continue
+        omitted = indexes[exemplars:]
+        collapsed.update(omitted)
+        names = [name for name in (_item_name(items[index]) for index in omitted) if name]
+        summary: dict[str, Any] = {"kind": key[0] if len(key) == 1 else "/".join(key), "count": len(omitted)}
+        if names:
+            summary["names"] = names[:COLLAPSED_NAMES_LIMIT]
+        summaries.append({COLLAPSED_ITEMS_KEY: summary})
+    return [item for index, item in enumerate(items) if index not in collapsed] + summaries
+
+
+def _reduce(value: Any, min_items: int, exemplars: int) -> Any:
+    if isinstance(value, dict):
+        return {key: _reduce(item, min_items, exemplars) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_reduce(item, min_items, exemplars) for item in _collapse_list(value, min_items, exemplars)]
+    return value
+
+
+def reduce_tool_response(
+    tool_response: Any,
+    min_items: int = TOOL_RESPONSE_COLLAPSE_MIN_ITEMS,
+    exemplars: int = TOOL_RESPONSE_EXEMPLARS,
+) -> Any:
+    """
+    Return a reduced copy of a tool response. The anomalies are detected before the noisy fields are
+    removed, so the conditions and the container states are evaluated in full.
+    """
+    return strip_noisy_fields(_reduce(tool_response, min_items, exemplars))
@@ -1,5 +1,6 @@
 import json
-from collections.abc import AsyncIterator, Hashable
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from enum import StrEnum
 from typing import Any, Protocol, cast
 
 from langchain_core.callbacks import BaseCallbackHandler
@@ -19,11 +20,13 @@ from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.constants import END
 from langgraph.graph import StateGraph
 from langgraph.graph.state import CompiledStateGraph
+from langgraph.types import Send
 
 from agents.common.agent import IAgent
 from agents.common.constants import (
     COMMON,
     CONTINUE,
+    ERROR,
     GATEKEEPER,
     INITIAL_SUMMARIZATION,
     MESSAGES,
@@ -37,14 +40,17 @@ from agents.common.constants import (
     UNKNOWN,
 )
 from agents.common.data import Message
+from agents.common.gatekeeper_fast_path import GatekeeperFastPath
 from agents.common.state import (
     CompanionState,
     GatekeeperResponse,
+    GatekeeperSecurityResponse,
     GraphInput,
     Plan,
     SubTask,
     UserInput,
 )
+from agents.common.tool_memo import TOOL_MEMO_SCOPE, new_tool_memo_scope
 from agents.common.utils import (
     filter_valid_messages,
     get_resource_context_message,
@@ -57,16 +63,22 @@ from agents.prompts import (
     COMMON_QUESTION_PROMPT,
     GATEKEEPER_INSTRUCTIONS,
     GATEKEEPER_PROMPT,
+    GATEKEEPER_SECURITY_PROMPT,
 )
 from agents.summarization.summarization import MessageSummarizer
 from agents.supervisor.agent import SUPERVISOR, SupervisorAgent
+from services.graph_metrics import GraphMetricsCallback
 from services.k8s import IK8sClient
 from services.langfuse import LangfuseService, get_langfuse_metadata
 from services.usage import UsageTrackerCallback
 from utils.chain import ainvoke_chain
+from utils.chain_registry import get_chain_registry
 from utils.logging import get_logger
 from utils.models.factory import IModel
 from utils.settings import (
+    AGENT_DISPATCH_MODE,
+    GATEKEEPER_FAST_PATH_ENABLED,
+    GRAPH_METRICS_ENABLED,
     MAIN_MODEL_MINI_NAME,
     MAIN_MODEL_NAME,
     SUMMARIZATION_TOKEN_LOWER_LIMIT,
@@ -75,6 +87,17 @@ from utils.settings import (
 
 logger = get_logger(__name__)
 
+COMMON_CHAIN_ID = "common"
+GATEKEEPER_CHAIN_ID = "gatekeeper"
+GATEKEEPER_SECURITY_CHAIN_ID = "gatekeeper_security"
+
+
+class AgentDispatchMode(StrEnum):
+    """How the planned subtasks are dispatched to the agents."""
+
+    SEQUENTIAL = "sequential"
+    PARALLEL = "parallel"
+
 
 class CustomJSONEncoder(json.JSONEncoder):
     """
@@ -143,9 +166,11 @@ class CompanionGraph:
         self,
         models: dict[str, IModel | Embeddings],
         memory: BaseCheckpointSaver,
+        dispatch_mode: str = AGENT_DISPATCH_MODE,
     ):
         self.models = models
         self.memory = memory
+        self.dispatch_mode = AgentDispatchMode(dispatch_mode)
 
         main_model_mini = models[MAIN_MODEL_MINI_NAME]
         main_model = models[MAIN_MODEL_NAME]
@@ -170,20 +195,27 @@ class CompanionGraph:
         self.members = [self.kyma_agent.name, self.k8s_agent.name, COMMON]
         self._common_chain = self._create_common_chain(cast(IModel, main_model_mini))
         self._gatekeeper_chain = self._create_gatekeeper_chain(cast(IModel, main_model))
+        self._gatekeeper_fast_path = GatekeeperFastPath() if GATEKEEPER_FAST_PATH_ENABLED else None
+        self._gatekeeper_security_chain = (
+            self._create_gatekeeper_security_chain(cast(IModel, main_model)) if GATEKEEPER_FAST_PATH_ENABLED else None
+        )
         self.graph = self._build_graph()
 
     @staticmethod
     def _create_common_chain(model: IModel) -> RunnableSequence:
         """Common node chain to handle general queries."""
 
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", COMMON_QUESTION_PROMPT),
-                MessagesPlaceholder(variable_name="messages"),
-                ("human", "query: {query}"),
-            ]
-        )
-        return prompt | model.llm  # type: ignore
+        def create() -> RunnableSequence:
+            prompt = ChatPromptTemplate.from_messages(
+                [
+                    ("system", COMMON_QUESTION_PROMPT),
+                    MessagesPlaceholder(variable_name="messages"),
+                    ("human", "query: {query}"),
+                ]
+            )
+            return prompt | model.llm  # type: ignore
+
+        return get_chain_registry().get_or_create(COMMON_CHAIN_ID, model, create)
 
     async def _invoke_common_node(self, state: CompanionState, subtask: str) -> str:
         """Invoke the common node."""
@@ -239,26 +271,67 @@ class CompanionGraph:
         """Gatekeeper node chain to handle general queries
         and queries that can answered from conversation history."""
 
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", GATEKEEPER_PROMPT),
-                MessagesPlaceholder(variable_name="messages"),
-                ("system", GATEKEEPER_INSTRUCTIONS),
-            ]
-        )
-        return prompt | model.llm.with_structured_output(GatekeeperResponse, method="function_calling")  # type: ignore
+        def create() -> RunnableSequence:
+            prompt = ChatPromptTemplate.from_messages(
+                [
+                    ("system", GATEKEEPER_PROMPT),
+                    MessagesPlaceholder(variable_name="messages"),
+                    ("system", GATEKEEPER_INSTRUCTIONS),
+                ]
+            )
+            return prompt | model.llm.with_structured_output(GatekeeperResponse, method="function_calling")  # type: ignore
 
-    async def _invoke_gatekeeper_node(self, state: CompanionState) -> GatekeeperResponse:
-        """Invoke the Gatekeeper node."""
+        return get_chain_registry().get_or_create(GATEKEEPER_CHAIN_ID, model, create)
+
+    @staticmethod
+    def _create_gatekeeper_security_chain(model: IModel) -> RunnableSequence:
+        """Gatekeeper security chain to check the queries classified by the fast path."""
+
+        def create() -> RunnableSequence:
+            prompt = ChatPromptTemplate.from_messages(
+                [
+                    ("system", GATEKEEPER_SECURITY_PROMPT),
+                    MessagesPlaceholder(variable_name="messages"),
+                ]
+            )
+            return prompt | model.llm.with_structured_output(GatekeeperSecurityResponse, method="function_calling")  # type: ignore
+
+        return get_chain_registry().get_or_create(GATEKEEPER_SECURITY_CHAIN_ID, model, create)
+
+    async def _invoke_gatekeeper_fast_path(self, state: CompanionState) -> GatekeeperResponse | None:
+        """
+        Classify the scope of the query with the fast path. The query is still checked for prompt
+        injection and security threats by the LLM. Returns None if the fast path is not confident.
+        """
+        if self._gatekeeper_fast_path is None or self._gatekeeper_security_chain is None:
+            return None
+        gatekeeper_response = self._gatekeeper_fast_path.classify(state)
+        if gatekeeper_response is None:
+            return None
         response: Any = await ainvoke_chain(
-            self._gatekeeper_chain,
+            self._gatekeeper_security_chain,
             {
                 "messages": filter_valid_messages(state.get_messages_including_summary()),
             },
         )
+        security_response = cast(GatekeeperSecurityResponse, response)
+        gatekeeper_response.is_prompt_injection = security_response.is_prompt_injection
+        gatekeeper_response.is_security_threat = security_response.is_security_threat
+        return gatekeeper_response
 
-        # Cast the response to GatekeeperResponse.
-        gatekeeper_response = cast(GatekeeperResponse, response)
+    async def _invoke_gatekeeper_node(self, state: CompanionState) -> GatekeeperResponse:
+        """Invoke the Gatekeeper node."""
+        # try the local fast path first and only invoke the LLM gatekeeper when it is not confident.
+        gatekeeper_response = await self._invoke_gatekeeper_fast_path(state)
+        if gatekeeper_response is None:
+            response: Any = await ainvoke_chain(
+                self._gatekeeper_chain,
+                {
+                    "messages": filter_valid_messages(state.get_messages_including_summary()),
+                },
+            )
+            # Cast the response to GatekeeperResponse.
+            gatekeeper_response = cast(GatekeeperResponse, response)
 
         # set forward_query as false by default.
         gatekeeper_response.forward_query = False
@@ -329,6 +402,42 @@ class CompanionGraph:
                 SUBTASKS: [],
             }
 
+    @staticmethod
+    def _parallel_agent_node(agent: IAgent) -> Callable[..., Awaitable[dict[str, Any]]]:
+        """
+        Wrap an agent subgraph for the parallel dispatch mode.
+
+        A subgraph node writes all keys of its state, which conflicts with the agents running in the
+        same step. The wrapper returns only the new messages, the subtasks and a raised error.
+        """
+        agent_graph = agent.agent_node()
+
+        async def parallel_agent_node(state: CompanionState, config: RunnableConfig) -> dict[str, Any]:
+            result = await agent_graph.ainvoke(state, config)
+            known_message_ids = {message.id for message in state.messages}
+            update: dict[str, Any] = {
+                MESSAGES: [message for message in result[MESSAGES] if message.id not in known_message_ids],
+                SUBTASKS: result[SUBTASKS],
+            }
+            if result.get(ERROR):
+                update[ERROR] = result[ERROR]
+            return update
+
+        return parallel_agent_node
+
+    def _dispatch(self, state: CompanionState) -> str | list[Send]:
+        """Route the supervisor decision. In parallel mode, fan out to all agents with pending subtasks."""
+        if self.dispatch_mode != AgentDispatchMode.PARALLEL or state.next not in self.members:
+            return cast(str, state.next)
+
+        # one branch per agent in the order of the plan. LangGraph applies the updates of the branches
+        # in this order, so the merged messages do not depend on which agent finishes first.
+        agents = list(dict.fromkeys(subtask.assigned_to for subtask in state.subtasks or [] if subtask.is_pending()))
+        if not agents:
+            return cast(str, state.next)
+        logger.debug(f"Dispatching the subtasks to the agents in parallel: {agents}")
+        return [Send(agent, state) for agent in agents]
+
     def _build_graph(self) -> CompiledStateGraph:
         """Create the companion parent graph."""
 
@@ -337,8 +446,12 @@ class CompanionGraph:
 
         # Define the nodes of the graph.
         workflow.add_node(SUPERVISOR, self.supervisor_agent.agent_node())
-        workflow.add_node(KYMA_AGENT, self.kyma_agent.agent_node())
-        workflow.add_node(K8S_AGENT, self.k8s_agent.agent_node())
+        if self.dispatch_mode == AgentDispatchMode.PARALLEL:
+            workflow.add_node(KYMA_AGENT, self._parallel_agent_node(self.kyma_agent))
+            workflow.add_node(K8S_AGENT, self._parallel_agent_node(self.k8s_agent))
+        else:
+            workflow.add_node(KYMA_AGENT, self.kyma_agent.agent_node())
+            workflow.add_node(K8S_AGENT, self.k8s_agent.agent_node())
         workflow.add_node(COMMON, self._common_node)
         workflow.add_node(GATEKEEPER, self._gatekeeper_node)
         workflow.add_node(SUMMARIZATION, self.summarization.summarization_node)
@@ -368,7 +481,9 @@ class CompanionGraph:
         # The supervisor dynamically populates the "next" field in the graph.
         conditional_map: dict[Hashable, str] = {k: k for k in self.members + [END]}
         # Define the dynamic conditional edges: supervisor --> (KymaAgent | KubernetesAgent | Common | END)
-        workflow.add_conditional_edges(SUPERVISOR, lambda x: x.next, conditional_map)
+        # In parallel mode, the supervisor fans out to all agents with pending subtasks, and their
+        # results are merged before the summarization node.
+        workflow.add_conditional_edges(SUPERVISOR, self._dispatch, conditional_map)
 
         workflow.add_conditional_edges(
             SUMMARIZATION,
@@ -411,6 +526,8 @@ class CompanionGraph:
         callbacks: list[BaseCallbackHandler] = [
             UsageTrackerCallback(cluster_id, cast(IUsageMemory, self.memory)),
         ]
+        if GRAPH_METRICS_ENABLED:
+            callbacks.append(GraphMetricsCallback())
 
         # Add Langfuse callback handler if enabled
         try:
@@ -423,6 +540,7 @@ class CompanionGraph:
         run_config = RunnableConfig(
             configurable={
                 "thread_id": conversation_id,
+                TOOL_MEMO_SCOPE: new_tool_memo_scope(),
             },
             callbacks=callbacks,
             tags=[cluster_id],
@@ -25,9 +25,28 @@ from langgraph.checkpoint.serde.base import SerializerProtocol
 from redis.asyncio import Redis as AsyncRedis
 from redis.typing import EncodableT, FieldT
 
+from agents.memory.checkpoint_compaction import (
+    COMPRESSION_ZLIB,
+    CachedCheckpoint,
+    ChannelDeltas,
+    CompactionCache,
+    apply_channel_deltas,
+    compress,
+    compute_channel_deltas,
+    decompress,
+    snapshot_channel_values,
+)
 from services.redis import Redis
 from utils.logging import get_logger
-from utils.settings import REDIS_SSL_ENABLED, REDIS_TTL
+from utils.settings import (
+    CHECKPOINT_COMPACTION_CACHE_MAX_THREADS,
+    CHECKPOINT_COMPACTION_ENABLED,
+    CHECKPOINT_COMPRESSION_ENABLED,
+    CHECKPOINT_FULL_INTERVAL,
+    CHECKPOINT_KEEP_FULL,
+    REDIS_SSL_ENABLED,
+    REDIS_TTL,
+)
 
 logger = get_logger(__name__)
 
@@ -61,6 +80,23 @@ def _make_redis_checkpoint_key(thread_id: str, checkpoint_ns: str, checkpoint_id
     return REDIS_KEY_SEPARATOR.join(["checkpoint", thread_id, checkpoint_ns, checkpoint_id])
 
 
+def _make_redis_full_checkpoints_key(thread_id: str, checkpoint_ns: str) -> str:
+    """Create a Redis key for the list of the full checkpoints of a thread, when checkpoints are compacted.
+
+    Returns a Redis key string in the format "checkpoint_full$thread_id$namespace".
+    """
+    return REDIS_KEY_SEPARATOR.join(["checkpoint_full", thread_id, checkpoint_ns])
+
+
+def _make_redis_checkpoint_ids_key(thread_id: str, checkpoint_ns: str) -> str:
+    """Create a Redis key for the list of the checkpoints of a thread in the order they were stored, when
+    checkpoints are compacted.
+
+    Returns a Redis key string in the format "checkpoint_ids$thread_id$namespace".
+    """
+    return REDIS_KEY_SEPARATOR.join(["checkpoint_ids", thread_id, checkpoint_ns])
+
+
 def _make_redis_checkpoint_writes_key(
     thread_id: str,
     checkpoint_ns: str,
@@ -157,8 +193,9 @@ def _parse_redis_checkpoint_data(
     key: str,
     data: dict[bytes | str, bytes | str],
     pending_writes: list[PendingWrite] | None = None,
+    checkpoint: Checkpoint | None = None,
 ) -> CheckpointTuple | None:
-    """Parse checkpoint data retrieved from Redis."""
+    """Parse checkpoint data retrieved from Redis. The checkpoint is loaded from the data, unless it is given."""
     if not data:
         return None
 
@@ -174,7 +211,8 @@ def _parse_redis_checkpoint_data(
         }
     }
 
-    checkpoint = serde.loads_typed((data[b"type"].decode(), cast(bytes, data[b"checkpoint"])))
+    if checkpoint is None:
+        checkpoint = serde.loads_typed((data[b"type"].decode(), cast(bytes, data[b"checkpoint"])))
     # Handle backward compatibility: old checkpoints use JSON, new ones use typed serialization
     if b"metadata_type" in data:
         metadata = serde.loads_typed((data[b"metadata_type"].decode(), cast(bytes, data[b"metadata"])))
@@ -223,13 +261,29 @@ def _extract_time_from_llm_usage_key(key: str) -> float:
 
 
 class AsyncRedisSaver(BaseCheckpointSaver):
-    """Async redis-based checkpoint saver implementation."""
+    """Async redis-based checkpoint saver implementation.
+
+    With compaction, the checkpoints are stored as deltas to their parent checkpoints, see
+    agents.memory.checkpoint_compaction. Compacted checkpoints are read regardless of the compaction setting.
+    """
 
     conn: AsyncRedis
 
-    def __init__(self, conn: AsyncRedis):
+    def __init__(
+        self,
+        conn: AsyncRedis,
+        compaction: bool = CHECKPOINT_COMPACTION_ENABLED,
+        full_interval: int = CHECKPOINT_FULL_INTERVAL,
+        keep_full: int = CHECKPOINT_KEEP_FULL,
+        compression: bool = CHECKPOINT_COMPRESSION_ENABLED,
+    ):
         super().__init__()
         self.conn = conn
+        self.compaction = compaction
+        self.full_interval = full_interval
+        self.keep_full = keep_full
+        self.compression = compression
+        self._compaction_cache = CompactionCache(CHECKPOINT_COMPACTION_CACHE_MAX_THREADS)
 
     @classmethod
     def from_conn_info(cls, *, host: str, port: int, db: int, password: str) -> "AsyncRedisSaver":
@@ -282,6 +336,16 @@ class AsyncRedisSaver(BaseCheckpointSaver):
         parent_checkpoint_id = config["configurable"].get("checkpoint_id")
         key = _make_redis_checkpoint_key(thread_id, checkpoint_ns, checkpoint_id)
 
+        if self.compaction:
+            await self._aput_compacted(key, config, checkpoint, metadata, redis_ttl)
+            return {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            }
+
         type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
         metadata_type, serialized_metadata = self.serde.dumps_typed(metadata)
         data: Mapping[FieldT, EncodableT] = {
@@ -304,6 +368,147 @@ class AsyncRedisSaver(BaseCheckpointSaver):
             }
         }
 
+    async def _aput_compacted(
+        self,
+        key: str,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        redis_ttl: int,
+    ) -> None:
+        """Save a checkpoint as a delta to its parent checkpoint, or as a full checkpoint."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        checkpoint_id = checkpoint["id"]
+        parent_checkpoint_id = config["configurable"].get("checkpoint_id")
+
+        metadata_type, serialized_metadata = self.serde.dumps_typed(metadata)
+        data: dict[FieldT, EncodableT] = {
+            "checkpoint_id": checkpoint_id,
+            "metadata": serialized_metadata,
+            "metadata_type": metadata_type,
+            "parent_checkpoint_id": (parent_checkpoint_id if parent_checkpoint_id else ""),
+        }
+        if self.compression:
+            data["compression"] = COMPRESSION_ZLIB
+
+        stored_checkpoint: dict[str, Any] = dict(checkpoint)
+        snapshot = snapshot_channel_values(checkpoint["channel_values"], self.serde.dumps_typed)
+        parent = self._compaction_cache.get_parent(thread_id, checkpoint_ns, parent_checkpoint_id)
+        if parent is not None and len(parent.chain) < self.full_interval:
+            stored_checkpoint["channel_values"], deltas = compute_channel_deltas(
+                checkpoint["channel_values"], snapshot, parent.snapshot
+            )
+            deltas_type, serialized_deltas = self.serde.dumps_typed(
+                {"unchanged": deltas.unchanged, "appended": deltas.appended}
+            )
+            data["deltas"] = self._compress(serialized_deltas)
+            data["deltas_type"] = deltas_type
+            data["delta_chain"] = json.dumps(parent.chain)
+            chain = [*parent.chain, checkpoint_id]
+        else:
+            chain = [checkpoint_id]
+        type_, serialized_checkpoint = self.serde.dumps_typed(stored_checkpoint)
+        data["checkpoint"] = self._compress(serialized_checkpoint)
+        data["type"] = type_
+
+        checkpoint_ids_key = _make_redis_checkpoint_ids_key(thread_id, checkpoint_ns)
+        async with self.conn.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=data)
+            pipe.expire(key, redis_ttl)
+            pipe.rpush(checkpoint_ids_key, checkpoint_id)
+            pipe.expire(checkpoint_ids_key, redis_ttl)
+            # the checkpoints of the chain must live as long as the checkpoints based on them.
+            for chain_checkpoint_id in chain[:-1]:
+                pipe.expire(_make_redis_checkpoint_key(thread_id, checkpoint_ns, chain_checkpoint_id), redis_ttl)
+            await pipe.execute()
+        self._compaction_cache.put(
+            thread_id,
+            checkpoint_ns,
+            CachedCheckpoint(checkpoint_id=checkpoint_id, snapshot=snapshot, chain=chain),
+        )
+        if len(chain) == 1:
+            await self._aadd_full_checkpoint(thread_id, checkpoint_ns, checkpoint_id, redis_ttl)
+
+    async def _aadd_full_checkpoint(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, redis_ttl: int
+    ) -> None:
+        """
+        Add a full checkpoint to the list of the thread. If more than keep_full full checkpoints are stored,
+        the checkpoints that were stored before the oldest kept full checkpoint are deleted, with their writes.
+        """
+        full_checkpoints_key = _make_redis_full_checkpoints_key(thread_id, checkpoint_ns)
+        await self.conn.rpush(full_checkpoints_key, checkpoint_id)
+        await self.conn.expire(full_checkpoints_key, redis_ttl)
+        if self.keep_full <= 0:
+            return
+        full_checkpoint_ids = [_safe_decode(key) for key in await self.conn.lrange(full_checkpoints_key, 0, -1)]
+        if len(full_checkpoint_ids) <= self.keep_full:
+            return
+        oldest_kept_id = full_checkpoint_ids[-self.keep_full]
+        await self.conn.ltrim(full_checkpoints_key, -self.keep_full, -1)
+
+        checkpoint_ids_key = _make_redis_checkpoint_ids_key(thread_id, checkpoint_ns)
+        checkpoint_ids = [_safe_decode(key) for key in await self.conn.lrange(checkpoint_ids_key, 0, -1)]
+        if oldest_kept_id not in checkpoint_ids:
+            return
+        deleted_ids = set(checkpoint_ids[: checkpoint_ids.index(oldest_kept_id)])
+        if not deleted_ids:
+            return
+        await self.conn.ltrim(checkpoint_ids_key, len(deleted_ids), -1)
+
+        checkpoint_keys = [
+            _make_redis_checkpoint_key(thread_id, checkpoint_ns, deleted_id) for deleted_id in deleted_ids
+        ]
+        writes_keys = [
+            key
+            async for key in self.conn.scan_iter(
+                match=_make_redis_checkpoint_writes_key(thread_id, checkpoint_ns, "*", "*", None)
+            )
+            if _parse_redis_checkpoint_writes_key(_safe_decode(key))["checkpoint_id"] in deleted_ids
+        ]
+        await self.conn.delete(*checkpoint_keys, *writes_keys)
+
+    def _compress(self, data: bytes) -> bytes:
+        return compress(data) if self.compression else data
+
+    def _loads_field(self, data: dict[bytes | str, bytes | str], field: bytes, type_field: bytes) -> Any:
+        """Deserialize a field of checkpoint data, which might be compressed."""
+        value = cast(bytes, data[field])
+        if b"compression" in data:
+            value = decompress(value)
+        return self.serde.loads_typed((cast(bytes, data[type_field]).decode(), value))
+
+    def _loads_deltas(self, data: dict[bytes | str, bytes | str]) -> ChannelDeltas:
+        deltas = self._loads_field(data, b"deltas", b"deltas_type")
+        return ChannelDeltas(unchanged=deltas["unchanged"], appended=deltas["appended"])
+
+    async def _aload_checkpoint(
+        self, thread_id: str, checkpoint_ns: str, data: dict[bytes | str, bytes | str]
+    ) -> Checkpoint | None:
+        """Load the checkpoint of checkpoint data. A delta checkpoint is reconstructed from its chain."""
+        checkpoint = self._loads_field(data, b"checkpoint", b"type")
+        if b"deltas" not in data:
+            return cast(Checkpoint, checkpoint)
+
+        chain_ids: list[str] = json.loads(data[b"delta_chain"])
+        async with self.conn.pipeline(transaction=False) as pipe:
+            for chain_checkpoint_id in chain_ids:
+                pipe.hgetall(_make_redis_checkpoint_key(thread_id, checkpoint_ns, chain_checkpoint_id))
+            chain_data: list[dict[bytes | str, bytes | str]] = await pipe.execute()
+        if not all(chain_data):
+            logger.error(f"Cannot reconstruct checkpoint {checkpoint['id']}, a checkpoint of its chain is missing.")
+            return None
+
+        channel_values = self._loads_field(chain_data[0], b"checkpoint", b"type")["channel_values"]
+        for delta_data in chain_data[1:]:
+            stored_values = self._loads_field(delta_data, b"checkpoint", b"type")["channel_values"]
+            channel_values = apply_channel_deltas(channel_values, stored_values, self._loads_deltas(delta_data))
+        checkpoint["channel_values"] = apply_channel_deltas(
+            channel_values, checkpoint["channel_values"], self._loads_deltas(data)
+        )
+        return cast(Checkpoint, checkpoint)
+
     async def aput_writes(
         self,
         config: RunnableConfig,
@@ -368,11 +573,18 @@ class AsyncRedisSaver(BaseCheckpointSaver):
         if not checkpoint_key:
             return None
         checkpoint_data: dict[bytes | str, bytes | str] = await self.conn.hgetall(checkpoint_key)
+        if not checkpoint_data:
+            return None
+        checkpoint = await self._aload_checkpoint(thread_id, checkpoint_ns, checkpoint_data)
+        if checkpoint is None:
+            return None
 
         # load pending writes
         checkpoint_id = checkpoint_id or _parse_redis_checkpoint_key(checkpoint_key)["checkpoint_id"]
         pending_writes = await self._aload_pending_writes(thread_id, checkpoint_ns, checkpoint_id)
-        return _parse_redis_checkpoint_data(self.serde, checkpoint_key, checkpoint_data, pending_writes=pending_writes)
+        return _parse_redis_checkpoint_data(
+            self.serde, checkpoint_key, checkpoint_data, pending_writes=pending_writes, checkpoint=checkpoint
+        )
 
     async def alist(
         self,
@@ -406,10 +618,13 @@ class AsyncRedisSaver(BaseCheckpointSaver):
         for key in keys:
             data: dict[bytes | str, bytes | str] = await self.conn.hgetall(_safe_decode(key))
             if data and b"checkpoint" in data and b"metadata" in data:
+                checkpoint = await self._aload_checkpoint(thread_id, checkpoint_ns, data)
+                if checkpoint is None:
+                    continue
                 checkpoint_id = _parse_redis_checkpoint_key(_safe_decode(key))["checkpoint_id"]
                 pending_writes = await self._aload_pending_writes(thread_id, checkpoint_ns, checkpoint_id)
                 if result := _parse_redis_checkpoint_data(
-                    self.serde, _safe_decode(key), data, pending_writes=pending_writes
+                    self.serde, _safe_decode(key), data, pending_writes=pending_writes, checkpoint=checkpoint
                 ):
                     yield result
 
@@ -0,0 +1,153 @@
+"""
+Compaction of the checkpoints of a thread.
+
+Every step of the graph stores a checkpoint with all channel values, so the message history of a
+conversation is stored again with every step. A compacted checkpoint only stores the channels that
+changed since its parent checkpoint. Of a list channel like the messages, it only stores the items
+after the common prefix with the list of the parent, which is the delta of the step:
+
+- full checkpoint: all channel values, like a plain checkpoint.
+- delta checkpoint: the changed channel values and the deltas of the list channels. It refers to the
+  chain of checkpoints from the last full checkpoint to its parent, which are needed to reconstruct it.
+
+Every CHECKPOINT_FULL_INTERVAL checkpoints of a thread, a full checkpoint is stored, which bounds the
+length of the chains.
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel
+
+COMPRESSION_ZLIB = "zlib"
+# fast compression, the message history compresses well even at the lowest level.
+ZLIB_COMPRESSION_LEVEL = 1
+
+
+class ChannelDeltas(BaseModel):
+    """Delta of the channel values of a checkpoint to the values of its parent checkpoint."""
+
+    # channels whose value is the value of the parent.
+    unchanged: list[str] = []
+    # list channels whose value is the first prefix_length items of the parent value, followed by items.
+    appended: dict[str, tuple[int, list[Any]]] = {}
+
+
+class CachedCheckpoint(BaseModel):
+    """The serialized channel values of the last checkpoint that was stored for a thread."""
+
+    checkpoint_id: str
+    # serialized channel values, see snapshot_channel_values.
+    snapshot: dict[str, Any]
+    # IDs of the checkpoints from the last full checkpoint to this checkpoint.
+    chain: list[str]
+
+
+def snapshot_channel_values(channel_values: dict[str, Any], dumps: Callable[[Any], Any]) -> dict[str, Any]:
+    """
+    Serialize the channel values of a checkpoint, the items of the list channels one by one. The nodes of
+    the graph update the objects of the channels in place, e.g. the status of a sub-task or the content of
+    a message, so the channel values are compared by their serialized values, never by identity.
+    """
+    return {
+        channel: [dumps(item) for item in value] if isinstance(value, list) else dumps(value)
+        for channel, value in channel_values.items()
+    }
+
+
+def _common_prefix_length(items: list[Any], parent_items: list[Any]) -> int:
+    """Return the length of the common prefix of the lists."""
+    length = 0
+    for item, parent_item in zip(items, parent_items, strict=False):
+        if item != parent_item:
+            break
+        length += 1
+    return length
+
+
+def compute_channel_deltas(
+    channel_values: dict[str, Any],
+    snapshot: dict[str, Any],
+    parent_snapshot: dict[str, Any],
+) -> tuple[dict[str, Any], ChannelDeltas]:
+    """
+    Split the channel values of a checkpoint into the values that must be stored and the deltas to the
+    channel values of its parent, by comparing the snapshots of the checkpoint and its parent.
+    """
+    stored_values: dict[str, Any] = {}
+    deltas = ChannelDeltas()
+    for channel, value in channel_values.items():
+        if channel not in parent_snapshot:
+            stored_values[channel] = value
+            continue
+        serialized, parent_serialized = snapshot[channel], parent_snapshot[channel]
+        if serialized == parent_serialized:
+            deltas.unchanged.append(channel)
+        elif isinstance(serialized, list) and isinstance(parent_serialized, list):
+            prefix_length = _common_prefix_length(serialized, parent_serialized)
+            if prefix_length > 0:
+                deltas.appended[channel] = (prefix_length, value[prefix_length:])
+            else:
+                stored_values[channel] = value
+        else:
+            stored_values[channel] = value
+    return stored_values, deltas
+
+
+def apply_channel_deltas(
+    parent_channel_values: dict[str, Any],
+    stored_values: dict[str, Any],
+    deltas: ChannelDeltas,
+) -> dict[str, Any]:
+    """Reconstruct the channel values of a checkpoint from the channel values of its parent."""
+    channel_values = dict(stored_values)
+    for channel in deltas.unchanged:
+        channel_values[channel] = parent_channel_values[channel]
+    for channel, (prefix_length, items) in deltas.appended.items():
+        channel_values[channel] = list(parent_channel_values[channel][:prefix_length]) + list(items)
+    return channel_values
+
+
+def compress(data: bytes) -> bytes:
+    """Compress serialized checkpoint data."""
+    return zlib.compress(data, ZLIB_COMPRESSION_LEVEL)
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress serialized checkpoint data."""
+    return zlib.decompress(data)
+
+
+class CompactionCache:
+    """
+    LRU cache of the snapshot of the last stored checkpoint per thread and namespace, which is the parent
+    of the next checkpoint of the thread. Without a cached parent, e.g. after a restart or if the previous turn of
+    the conversation was handled by another replica, a full checkpoint is stored.
+    """
+
+    def __init__(self, max_threads: int):
+        self.max_threads = max_threads
+        self._entries: OrderedDict[tuple[str, str], CachedCheckpoint] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_parent(
+        self, thread_id: str, checkpoint_ns: str, parent_checkpoint_id: str | None
+    ) -> CachedCheckpoint | None:
+        """Return the cached checkpoint of the thread if it is the given parent checkpoint."""
+        with self._lock:
+            entry = self._entries.get((thread_id, checkpoint_ns))
+            if entry is None or entry.checkpoint_id != parent_checkpoint_id:
+                return None
+            self._entries.move_to_end((thread_id, checkpoint_ns))
+            return entry
+
+    def put(self, thread_id: str, checkpoint_ns: str, entry: CachedCheckpoint) -> None:
+        """Cache the last stored checkpoint of the thread."""
+        with self._lock:
+            self._entries[(thread_id, checkpoint_ns)] = entry
+            self._entries.move_to_end((thread_id, checkpoint_ns))
+            while len(self._entries) > self.max_threads:
+                self._entries.popitem(last=False)
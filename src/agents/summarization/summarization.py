@@ -1,21 +1,22 @@
-import copy
+from collections import OrderedDict
+from collections.abc import Sequence
+from enum import StrEnum
 from typing import Any
 
 from langchain_core.embeddings import Embeddings
 from langchain_core.messages import (
     BaseMessage,
+    HumanMessage,
     RemoveMessage,
     SystemMessage,
     ToolMessage,
 )
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableConfig
-from langgraph.graph.message import Messages
 from pydantic import BaseModel
 
 from agents.common.constants import ERROR, NEXT
 from agents.common.utils import (
-    compute_messages_token_count,
     compute_string_token_count,
     filter_valid_messages,
 )
@@ -23,10 +24,29 @@ from agents.summarization.prompts import MESSAGES_SUMMARIZATION_PROMPT
 from agents.supervisor.agent import SUPERVISOR
 from utils import logging
 from utils.chain import ainvoke_chain
+from utils.chain_registry import get_chain_registry
 from utils.models.factory import IModel
+from utils.settings import SUMMARIZATION_MODE
 
 logger = logging.get_logger(__name__)
 
+# Maximum number of cached message token counts.
+_TOKEN_COUNT_CACHE_MAX_ENTRIES = 10_000
+
+SUMMARIZATION_CHAIN_ID = "summarization"
+
+
+class SummarizationMode(StrEnum):
+    """How the summarization node selects the messages to summarize."""
+
+    # Fold only the newly evicted messages into the running summary.
+    ROLLING = "rolling"
+    # Re-summarize the running summary together with all messages outside the token limit.
+    FULL = "full"
+
+
+DEFAULT_SUMMARIZATION_MODE = SummarizationMode(SUMMARIZATION_MODE)
+
 
 class MessageSummarizer:
     """Summarization helper class."""
@@ -39,6 +59,7 @@ class MessageSummarizer:
         token_upper_limit: int,
         messages_key: str = "messages",
         messages_summary_key: str = "messages_summary",
+        mode: SummarizationMode = DEFAULT_SUMMARIZATION_MODE,
     ) -> None:
         self._model = model
         self._tokenizer_model_name = tokenizer_model_name
@@ -46,7 +67,14 @@ class MessageSummarizer:
         self._token_upper_limit = token_upper_limit
         self._messages_key = messages_key
         self._messages_summary_key = messages_summary_key
+        self._mode = mode
+        # token counts of messages, keyed by message id and content hash, so that the history
+        # is not re-tokenized every time the summarization node runs.
+        self._token_counts: OrderedDict[tuple[str, int], int] = OrderedDict()
 
+        self._chain = get_chain_registry().get_or_create(SUMMARIZATION_CHAIN_ID, self._model, self._create_chain)
+
+    def _create_chain(self) -> Any:
         # create a chat prompt template for summarization.
         llm_prompt = ChatPromptTemplate.from_messages(
             [
@@ -55,7 +83,7 @@ class MessageSummarizer:
             ]
         )
         # get the summarization model.
-        self._chain = llm_prompt | self._model.llm
+        return llm_prompt | self._model.llm
 
     def get_token_upper_limit(self) -> int:
         """Returns the token upper limit."""
@@ -65,27 +93,54 @@ class MessageSummarizer:
         """Returns the token lower limit."""
         return self._token_lower_limit
 
-    def get_messages_token_count(self, messages: Messages) -> int:
+    def get_messages_token_count(self, messages: Sequence[BaseMessage]) -> int:
         """Returns the token count of the messages."""
-        return compute_messages_token_count(messages, self._tokenizer_model_name)
-
-    def filter_messages_by_token_limit(self, messages: list[BaseMessage]) -> list[BaseMessage]:
-        """Returns the messages that can be kept within the token limit."""
-        filtered_messages: list[BaseMessage] = []
+        return sum(self._get_message_token_count(msg) for msg in messages)
+
+    def _get_message_token_count(self, msg: BaseMessage) -> int:
+        """Returns the token count of the message, tokenizing each message only once."""
+        content = str(msg.content)
+        key = (msg.id or "", hash(content))
+        token_count = self._token_counts.get(key)
+        if token_count is None:
+            token_count = compute_string_token_count(content, self._tokenizer_model_name)
+            self._token_counts[key] = token_count
+            if len(self._token_counts) > _TOKEN_COUNT_CACHE_MAX_ENTRIES:
+                self._token_counts.popitem(last=False)
+        return token_count
+
+    def filter_messages_by_token_limit(
+        self, messages: list[BaseMessage], token_limit: int | None = None
+    ) -> list[BaseMessage]:
+        """Returns the latest messages that can be kept within the token limit (default: the lower limit)."""
+        if token_limit is None:
+            token_limit = self._token_lower_limit
         # iterate the messages in reverse order and keep message if token limit is not exceeded.
         tokens = 0
-        for msg in reversed(messages):
-            tokens += compute_string_token_count(str(msg.content), self._tokenizer_model_name)
-            if tokens > self._token_lower_limit:
+        start = len(messages)
+        for i in range(len(messages) - 1, -1, -1):
+            tokens += self._get_message_token_count(messages[i])
+            if tokens > token_limit:
                 break
-            filtered_messages.insert(0, copy.deepcopy(msg))
+            start = i
 
         # remove the tool messages from head of the list,
         # because a tool message must be preceded by a system message.
-        for i, message in enumerate(filtered_messages):
-            if not isinstance(message, ToolMessage):
-                return filtered_messages[i:]
-        return filtered_messages
+        while start < len(messages) and isinstance(messages[start], ToolMessage):
+            start += 1
+        return messages[start:]
+
+    def _filter_latest_messages(self, messages: list[BaseMessage], token_limit: int | None = None) -> list[BaseMessage]:
+        """
+        Returns the latest messages within the token limit, but at least the messages from the last user
+        message on, so that the current query is never folded into the summary.
+        """
+        latest_messages = self.filter_messages_by_token_limit(messages, token_limit)
+        start = len(messages) - len(latest_messages)
+        for i in range(len(messages) - 1, -1, -1):
+            if isinstance(messages[i], HumanMessage):
+                return messages[min(i, start) :]
+        return latest_messages
 
     async def get_summary(self, messages: list[BaseMessage], config: RunnableConfig) -> str:
         """Returns the summary of the messages."""
@@ -108,29 +163,44 @@ class MessageSummarizer:
 
         state_messages_summary = getattr(state, self._messages_summary_key)
 
-        all_messages = state_messages
-        if state_messages_summary != "":
-            # if there is a summary, prepend it to the messages.
-            all_messages = [SystemMessage(content=state_messages_summary)] + state_messages
-
-        token_count = self.get_messages_token_count(all_messages)
+        summary_messages = [SystemMessage(content=state_messages_summary)] if state_messages_summary != "" else []
+        summary_token_count = self.get_messages_token_count(summary_messages)
+        token_count = summary_token_count + self.get_messages_token_count(state_messages)
         if token_count <= self.get_token_upper_limit():
             return {
                 ERROR: None,
                 self._messages_key: [],
             }
 
-        # filter out messages that can be kept within the token limit.
-        latest_messages_within_token_limit = self.filter_messages_by_token_limit(all_messages)
-
-        if len(latest_messages_within_token_limit) == len(all_messages):
-            return {
-                ERROR: None,
-                self._messages_key: [],
-            }
+        if self._mode == SummarizationMode.ROLLING:
+            # keep the latest messages next to the running summary within the lower limit,
+            # and fold only the evicted messages into the summary. The summary counts at most half of
+            # the lower limit, so the latest messages are kept even if the summary has grown; it is
+            # re-summarized together with the evicted messages.
+            summary_token_budget = min(summary_token_count, self.get_token_lower_limit() // 2)
+            latest_messages_within_token_limit = self._filter_latest_messages(
+                state_messages, self.get_token_lower_limit() - summary_token_budget
+            )
+            if len(latest_messages_within_token_limit) == len(state_messages):
+                return {
+                    ERROR: None,
+                    self._messages_key: [],
+                }
+            evicted_messages = state_messages[: len(state_messages) - len(latest_messages_within_token_limit)]
+            old_msgs_to_summarize = summary_messages + evicted_messages
+        else:
+            # if there is a summary, prepend it to the messages.
+            all_messages = summary_messages + state_messages
+            # filter out messages that can be kept within the token limit.
+            latest_messages_within_token_limit = self._filter_latest_messages(all_messages)
+            if len(latest_messages_within_token_limit) == len(all_messages):
+                return {
+                    ERROR: None,
+                    self._messages_key: [],
+                }
+            # summarize the remaining old messages
+            old_msgs_to_summarize = all_messages[: len(all_messages) - len(latest_messages_within_token_limit)]
 
-        # summarize the remaining old messages
-        old_msgs_to_summarize = all_messages[: -len(latest_messages_within_token_limit)]
         try:
             logger.debug("Getting summary for messages")
             summary = await self.get_summary(old_msgs_to_summarize, config)
@@ -140,7 +210,7 @@ class MessageSummarizer:
                 ERROR: "Unexpected error while processing the request. Please try again later.",
             }
         # remove excluded messages from state.
-        msgs_to_remove = state_messages[: -len(latest_messages_within_token_limit)]
+        msgs_to_remove = state_messages[: len(state_messages) - len(latest_messages_within_token_limit)]
         delete_messages = [RemoveMessage(id=m.id) for m in msgs_to_remove]
 
         return {
@@ -1,7 +1,8 @@
+import time
 from typing import Any, Literal, cast
 
 from langchain_core.embeddings import Embeddings
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableSequence
@@ -28,6 +29,7 @@ from agents.common.utils import (
     filter_messages,
     filter_valid_messages,
 )
+from agents.supervisor.plan_cache import PlanCache
 from agents.supervisor.prompts import (
     FINALIZER_PROMPT,
     FINALIZER_PROMPT_FOLLOW_UP,
@@ -36,6 +38,7 @@ from agents.supervisor.prompts import (
 )
 from agents.supervisor.state import SupervisorState
 from utils.chain import ainvoke_chain
+from utils.chain_registry import get_chain_registry
 from utils.filter_messages import (
     filter_messages_via_checks,
     is_ai_message,
@@ -45,10 +48,12 @@ from utils.filter_messages import (
 )
 from utils.logging import get_logger
 from utils.models.factory import IModel
-from utils.settings import MAIN_MODEL_MINI_NAME
+from utils.settings import MAIN_MODEL_MINI_NAME, PLANNER_CACHE_ENABLED
 
 SUPERVISOR = "Supervisor"
 ROUTER = "Router"
+PLANNER_CHAIN_ID = "supervisor_planner"
+FINALIZER_CHAIN_ID = "supervisor_finalizer"
 
 logger = get_logger(__name__)
 
@@ -102,6 +107,7 @@ class SupervisorAgent:
         self.members = members
         self.parser = self._route_create_parser()
         self._planner_chain = self._create_planner_chain(self.model)
+        self._plan_cache = PlanCache() if PLANNER_CACHE_ENABLED else None
         self._graph = self._build_graph()
 
     def _get_members_str(self) -> str:
@@ -143,14 +149,19 @@ class SupervisorAgent:
         }
 
     def _create_planner_chain(self, model: IModel) -> RunnableSequence:
-        self.planner_prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", PLANNER_SYSTEM_PROMPT),
-                MessagesPlaceholder(variable_name="messages"),
-                ("system", PLANNER_STEP_INSTRUCTIONS),
-            ]
-        ).partial(kyma_agent=KYMA_AGENT, kubernetes_agent=K8S_AGENT, common_agent=COMMON)
-        return self.planner_prompt | model.llm.with_structured_output(Plan, method="function_calling")  # type: ignore
+        def create() -> RunnableSequence:
+            planner_prompt = ChatPromptTemplate.from_messages(
+                [
+                    ("system", PLANNER_SYSTEM_PROMPT),
+                    MessagesPlaceholder(variable_name="messages"),
+                    ("system", PLANNER_STEP_INSTRUCTIONS),
+                ]
+            ).partial(kyma_agent=KYMA_AGENT, kubernetes_agent=K8S_AGENT, common_agent=COMMON)
+            return planner_prompt | model.llm.with_structured_output(Plan, method="function_calling")  # type: ignore
+
+        chain = get_chain_registry().get_or_create(PLANNER_CHAIN_ID, model, create)
+        self.planner_prompt = chain.first
+        return chain
 
     async def _invoke_planner(self, state: SupervisorState) -> Plan:
         """Invoke the planner with retry logic using tenacity."""
@@ -174,6 +185,24 @@ class SupervisorAgent:
         )
         return plan
 
+    async def _get_plan(self, state: SupervisorState) -> Plan:
+        """Return a cached plan for the user query, or invoke the planner and cache its plan."""
+        # follow-up queries are planned with the conversation history, so only first queries are cached.
+        if self._plan_cache is None or state.input is None or not state.is_first_turn():
+            return await self._invoke_planner(state)
+
+        cluster = state.get_cluster()
+        cached_subtasks = self._plan_cache.lookup(state.input, self.members, cluster)
+        if cached_subtasks is not None:
+            logger.debug("Using the cached plan for the query.")
+            return Plan(subtasks=cached_subtasks)
+
+        start_time = time.perf_counter()
+        plan = await self._invoke_planner(state)
+        if plan.subtasks:
+            self._plan_cache.store(state.input, plan.subtasks, time.perf_counter() - start_time, cluster)
+        return plan
+
     async def _plan(self, state: SupervisorState) -> dict[str, Any]:
         """
         Breaks down the given user query into sub-tasks if the query is related to Kyma and K8s.
@@ -182,7 +211,7 @@ class SupervisorAgent:
         state.error = None
 
         try:
-            plan = await self._invoke_planner(
+            plan = await self._get_plan(
                 state,  # last message is the user query
             )
 
@@ -209,24 +238,20 @@ class SupervisorAgent:
                 error="Unexpected error while processing the request. Please try again later.",
             )
 
-    def _final_response_chain(self, state: SupervisorState) -> RunnableSequence:
-        # last human message must be the query
-        if not state.input or not state.input.query:
-            raise ValueError("Input query is missing in the finalizer state.")
-        last_human_message = HumanMessage(content=state.input.query)
+    def _final_response_chain(self) -> RunnableSequence:
+        """Return the finalizer chain. The members and the query are inputs of the chain."""
 
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", FINALIZER_PROMPT),
-                MessagesPlaceholder(variable_name="messages"),
-                ("system", FINALIZER_PROMPT_FOLLOW_UP),
-            ]
-        ).partial(
-            members=self._get_members_str(),
-            query=last_human_message.content,
-            joule_context_info=JOULE_CONTEXT_INFORMATION,
-        )
-        return prompt | self.model.llm  # type: ignore
+        def create() -> RunnableSequence:
+            prompt = ChatPromptTemplate.from_messages(
+                [
+                    ("system", FINALIZER_PROMPT),
+                    MessagesPlaceholder(variable_name="messages"),
+                    ("system", FINALIZER_PROMPT_FOLLOW_UP),
+                ]
+            ).partial(joule_context_info=JOULE_CONTEXT_INFORMATION)
+            return prompt | self.model.llm  # type: ignore
+
+        return get_chain_registry().get_or_create(FINALIZER_CHAIN_ID, self.model, create)
 
     async def _generate_final_response(self, state: SupervisorState) -> dict[str, Any]:
         """Generate the final response."""
@@ -244,11 +269,17 @@ class SupervisorAgent:
                 NEXT: END,
             }
 
-        final_response_chain = self._final_response_chain(state)
+        # last human message must be the query
+        if not state.input or not state.input.query:
+            raise ValueError("Input query is missing in the finalizer state.")
 
         final_response = await ainvoke_chain(
-            final_response_chain,
-            {"messages": filter_valid_messages(state.messages)},
+            self._final_response_chain(),
+            {
+                "messages": filter_valid_messages(state.messages),
+                "members": self._get_members_str(),
+                "query": state.input.query,
+            },
         )
         logger.debug("Final response generated")
         return {
@@ -0,0 +1,245 @@
+"""
+Cache for the plans of the supervisor planner.
+
+Many user queries are near-duplicates, like "why is my pod crashing" or "list my functions", and
+the planner LLM produces the same subtasks for them. The cache keys a plan by the normalized query,
+the cluster and a coarse resource context (kind, API group and scope of the resource the user is
+looking at), and serves it again for queries that are similar enough and negate the same words, so
+"which pods are not ready" never gets the plan of "which pods are ready". A cached plan is only
+served if it still applies to the current request: all its agents must exist, and it must not
+mention words or resource names of the original query that are not part of the current one.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from enum import StrEnum
+
+from pydantic import BaseModel, ConfigDict
+
+from agents.common.state import SubTask, SubTaskStatus, UserInput
+from services.metrics import CustomMetrics
+from utils.logging import get_logger
+from utils.settings import (
+    PLANNER_CACHE_MAX_ENTRIES,
+    PLANNER_CACHE_SIMILARITY_THRESHOLD,
+    PLANNER_CACHE_TTL_SECONDS,
+)
+
+logger = get_logger(__name__)
+
+# Words, including Kubernetes resource names like "nginx-7d4b9" or "my.domain.com".
+_WORD_PATTERN = re.compile(r"[a-z0-9](?:[a-z0-9\-.]*[a-z0-9])?")
+_CONTRACTION_PATTERN = re.compile(r"([a-z]+)n['’]t\b")
+_CONTRACTION_STEMS = {"ca": "can", "wo": "will", "sha": "shall"}
+
+NEGATION_WORDS = frozenset(
+    {"not", "no", "never", "none", "nothing", "neither", "nor", "without", "except", "excluding"}
+)
+
+
+class PlanCacheResult(StrEnum):
+    """Outcome of a plan cache lookup."""
+
+    HIT = "hit"
+    MISS = "miss"
+    REJECTED = "rejected"
+
+
+class PlanCacheContext(BaseModel):
+    """Coarse resource context of a request. Resource and namespace names are not part of it."""
+
+    model_config = ConfigDict(frozen=True)
+
+    cluster: str = ""
+    resource_kind: str = ""
+    api_group: str = ""
+    resource_scope: str = ""
+
+    @classmethod
+    def from_input(cls, user_input: UserInput, cluster: str = "") -> "PlanCacheContext":
+        """Build the context of the user input in the cluster."""
+        api_version = user_input.resource_api_version or ""
+        return cls(
+            cluster=cluster,
+            resource_kind=(user_input.resource_kind or "").lower(),
+            api_group=api_version.rpartition("/")[0].lower(),
+            resource_scope=(user_input.resource_scope or "").lower(),
+        )
+
+
+def query_words(text: str) -> list[str]:
+    """Return the lowercase words of a text, with the negated contractions expanded, e.g. "isn't" to "is not"."""
+    expanded = _CONTRACTION_PATTERN.sub(
+        lambda match: f"{_CONTRACTION_STEMS.get(match.group(1), match.group(1))} not", text.lower()
+    )
+    return _WORD_PATTERN.findall(expanded)
+
+
+def negations(words: list[str]) -> frozenset[str]:
+    """Return the negations of a query, each with the word it negates, e.g. "not ready"."""
+    return frozenset(
+        f"{word} {words[index + 1] if index + 1 < len(words) else ''}".strip()
+        for index, word in enumerate(words)
+        if word in NEGATION_WORDS
+    )
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query, ignoring case, punctuation and whitespace."""
+    return " ".join(query_words(query))
+
+
+def similarity(words: frozenset[str], other_words: frozenset[str]) -> float:
+    """Jaccard similarity of two word sets."""
+    if not words and not other_words:
+        return 1.0
+    return len(words & other_words) / len(words | other_words)
+
+
+class _PlanCacheEntry:
+    """A cached plan with the request it was created for."""
+
+    __slots__ = (
+        "subtasks",
+        "query_words",
+        "negations",
+        "plan_words",
+        "resource_name_words",
+        "planner_latency",
+        "expires_at",
+    )
+
+    def __init__(
+        self,
+        subtasks: list[dict],
+        query_words: frozenset[str],
+        negations: frozenset[str],
+        plan_words: frozenset[str],
+        resource_name_words: frozenset[str],
+        planner_latency: float,
+        expires_at: float,
+    ):
+        self.subtasks = subtasks
+        self.query_words = query_words
+        self.negations = negations
+        self.plan_words = plan_words
+        self.resource_name_words = resource_name_words
+        self.planner_latency = planner_latency
+        self.expires_at = expires_at
+
+
+def _resource_name_words(user_input: UserInput) -> frozenset[str]:
+    """Return the words of the resource and namespace names of the user input."""
+    return frozenset(
+        word for name in (user_input.resource_name, user_input.namespace) if name for word in query_words(name)
+    )
+
+
+class PlanCache:
+    """
+    Cache of planner results, shared by all conversations of the process.
+
+    Plans are stored as plain data and a fresh list of pending subtasks is built on every hit,
+    because the agents update the subtasks of a plan in place.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = PLANNER_CACHE_TTL_SECONDS,
+        similarity_threshold: float = PLANNER_CACHE_SIMILARITY_THRESHOLD,
+        max_entries: int = PLANNER_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._similarity_threshold = similarity_threshold
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[PlanCacheContext, str], _PlanCacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, user_input: UserInput, members: list[str], cluster: str = "") -> list[SubTask] | None:
+        """Return the pending subtasks of a cached plan for the user input in the cluster, or None."""
+        context = PlanCacheContext.from_input(user_input, cluster)
+        words = query_words(user_input.query)
+        with self._lock:
+            entry = self._find(context, normalize_query(user_input.query), frozenset(words), negations(words))
+
+        if entry is None:
+            CustomMetrics().record_planner_cache_lookup(PlanCacheResult.MISS)
+            return None
+        if not self._is_applicable(entry, user_input, frozenset(words), members):
+            logger.debug("Cached plan does not apply to the current request.")
+            CustomMetrics().record_planner_cache_lookup(PlanCacheResult.REJECTED)
+            return None
+
+        CustomMetrics().record_planner_cache_lookup(PlanCacheResult.HIT, entry.planner_latency)
+        return [SubTask.model_validate({**subtask, "status": SubTaskStatus.PENDING}) for subtask in entry.subtasks]
+
+    def store(self, user_input: UserInput, subtasks: list[SubTask], planner_latency: float, cluster: str = "") -> None:
+        """Store the plan created for the user input in the cluster."""
+        key = (PlanCacheContext.from_input(user_input, cluster), normalize_query(user_input.query))
+        words = query_words(user_input.query)
+        entry = _PlanCacheEntry(
+            subtasks=[subtask.model_dump() for subtask in subtasks],
+            query_words=frozenset(words),
+            negations=negations(words),
+            plan_words=frozenset(word for subtask in subtasks for word in query_words(subtask.description)),
+            resource_name_words=_resource_name_words(user_input),
+            planner_latency=planner_latency,
+            expires_at=self._clock() + self._ttl_seconds,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached plans."""
+        with self._lock:
+            self._entries.clear()
+
+    def _find(
+        self,
+        context: PlanCacheContext,
+        normalized_query: str,
+        words: frozenset[str],
+        query_negations: frozenset[str],
+    ) -> _PlanCacheEntry | None:
+        """Return the exact or the most similar fresh entry in the same context with the same negations."""
+        now = self._clock()
+        entry = self._entries.get((context, normalized_query))
+        if entry is not None and now < entry.expires_at:
+            self._entries.move_to_end((context, normalized_query))
+            return entry
+
+        best_key, best_similarity = None, self._similarity_threshold
+        for key, candidate in self._entries.items():
+            if key[0] != context or now >= candidate.expires_at or candidate.negations != query_negations:
+                continue
+            candidate_similarity = similarity(words, candidate.query_words)
+            if candidate_similarity >= best_similarity:
+                best_key, best_similarity = key, candidate_similarity
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key]
+
+    @staticmethod
+    def _is_applicable(
+        entry: _PlanCacheEntry, user_input: UserInput, words: frozenset[str], members: list[str]
+    ) -> bool:
+        """Check that a cached plan only references agents and resources of the current request."""
+        if any(subtask["assigned_to"] not in members for subtask in entry.subtasks):
+            return False
+        # words that only the original query had, e.g. a different pod name, must not be in the plan.
+        if entry.plan_words & (entry.query_words - words):
+            return False
+        # the resource the user was looking at must not be mentioned if it is not the current one.
+        return not entry.plan_words & (entry.resource_name_words - _resource_name_words(user_input))
@@ -1,7 +1,7 @@
 from collections.abc import Sequence
 from typing import Annotated, Any
 
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langgraph.graph import add_messages
 from pydantic import BaseModel, Field
 
@@ -22,4 +22,26 @@ class SupervisorState(BaseModel):
             default=None,
         ),
     ]
+    messages_summary: str = ""
     k8s_client: Annotated[Any, Field(default=None, exclude=True)]
+
+    def is_first_turn(self) -> bool:
+        """
+        Check if the user query is the first one of the conversation: there is no summary of earlier
+        messages, and only system messages, like the resource context, precede the user query.
+        """
+        if self.messages_summary:
+            return False
+        user_query_indexes = [index for index, message in enumerate(self.messages) if isinstance(message, HumanMessage)]
+        if not user_query_indexes:
+            return False
+        return all(isinstance(message, SystemMessage) for message in self.messages[: user_query_indexes[-1]])
+
+    def get_cluster(self) -> str:
+        """Return the API server of the K8s client, if any."""
+        if self.k8s_client is None:
+            return ""
+        try:
+            return str(self.k8s_client.get_api_server())
+        except Exception:
+            return ""
@@ -14,6 +14,7 @@ from followup_questions.constants import (
 from followup_questions.prompts import FOLLOW_UP_QUESTIONS_PROMPT
 from initial_questions.inital_questions import IEncoding
 from initial_questions.output_parser import QuestionOutputParser
+from utils.chain_registry import get_chain_registry, prompt_chain_id
 from utils.logging import get_logger
 from utils.models.factory import IModel
 
@@ -45,12 +46,9 @@ class FollowUpQuestionsHandler:
     ) -> None:
         self._model = model
         self._template = template or FOLLOW_UP_QUESTIONS_PROMPT
-        prompt = PromptTemplate(
-            template=self._template,
-            input_variables=["history"],
+        self._chain = get_chain_registry().get_or_create(
+            prompt_chain_id("followup_questions", self._template), model, self._create_chain
         )
-        output_parser = QuestionOutputParser()
-        self._chain = prompt | model.llm | output_parser
         # Handle custom model names that tiktoken doesn't recognize
         try:
             self._tokenizer = tokenizer or tiktoken.encoding_for_model(self._model.name)
@@ -59,6 +57,14 @@ class FollowUpQuestionsHandler:
             logger.warning(f"Model '{self._model.name}' not recognized by tiktoken, using cl100k_base encoding")
             self._tokenizer = tokenizer or tiktoken.get_encoding("cl100k_base")
 
+    def _create_chain(self) -> typing.Any:
+        prompt = PromptTemplate(
+            template=self._template,
+            input_variables=["history"],
+        )
+        output_parser = QuestionOutputParser()
+        return prompt | self._model.llm | output_parser
+
     def generate_questions(self, messages: list[BaseMessage]) -> list[str]:
         """Generates follow-up questions given the conversation history."""
         if len(messages) == 0:
@@ -9,6 +9,7 @@ from agents.common.utils import get_relevant_context_from_k8s_cluster
 from initial_questions.output_parser import QuestionOutputParser
 from initial_questions.prompts import INITIAL_QUESTIONS_PROMPT
 from services.k8s import IK8sClient
+from utils.chain_registry import get_chain_registry, prompt_chain_id
 from utils.logging import get_logger
 from utils.models.factory import IModel
 
@@ -55,12 +56,9 @@ class InitialQuestionsHandler:
     ) -> None:
         self._model = model
         self._template = template or INITIAL_QUESTIONS_PROMPT
-        prompt = PromptTemplate(
-            template=self._template,
-            input_variables=["context"],
+        self._chain = get_chain_registry().get_or_create(
+            prompt_chain_id("initial_questions", self._template), model, self._create_chain
         )
-        output_parser = QuestionOutputParser()
-        self._chain = prompt | model.llm | output_parser
         # Handle custom model names that tiktoken doesn't recognize
         try:
             self._tokenizer = tokenizer or tiktoken.encoding_for_model(self._model.name)
@@ -69,6 +67,14 @@ class InitialQuestionsHandler:
             logger.warning(f"Model '{self._model.name}' not recognized by tiktoken, using cl100k_base encoding")
             self._tokenizer = tokenizer or tiktoken.get_encoding("cl100k_base")
 
+    def _create_chain(self) -> typing.Any:
+        prompt = PromptTemplate(
+            template=self._template,
+            input_variables=["context"],
+        )
+        output_parser = QuestionOutputParser()
+        return prompt | self._model.llm | output_parser
+
     def apply_token_limit(self, text: str, token_limit: int) -> str:
         """Reduces the amount of tokens of a string by truncating exceeding tokens.
         Takes the template into account."""
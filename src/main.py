@@ -20,7 +20,9 @@ from routers.kyma_agent_a2a import build_kyma_a2a_app
 from routers.kyma_tools_api import router as kyma_tools_router
 from routers.probes import router as probes_router
 from routers.public_key import router as public_key_router
+from services.health_monitor import get_health_monitor
 from services.metrics import CustomMetrics
+from services.startup import get_startup_phase
 from utils.exceptions import K8sClientError
 from utils.logging import get_logger, reconfigure_logging
 from utils.settings import HOST, KYMA_A2A_BASE_URL, PORT
@@ -31,13 +33,21 @@ access_logger = get_logger("access")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
-    """Lifespan event handler to reconfigure logging after uvicorn starts."""
+    """Lifespan event handler to reconfigure logging and run the startup phase after uvicorn starts."""
+    startup_task = None
     # Only reconfigure logging when NOT running tests
     # During tests, logging is already configured by utils.logging on import
     if "pytest" not in sys.modules:
         # Reconfigure logging after uvicorn has applied its config
         reconfigure_logging()
+        # Build the components in the background, so that the liveness probe answers in the meantime.
+        startup_task = get_startup_phase().start()
+        # Refresh the health of the dependencies in the background, the health probe serves the results.
+        get_health_monitor().start()
     yield
+    if startup_task is not None and not startup_task.done():
+        startup_task.cancel()
+    await get_health_monitor().stop()
 
 
 # Paths that log at DEBUG on 200 and WARNING on non-200, instead of INFO
@@ -1,4 +1,5 @@
 import time
+from functools import partial
 from typing import Protocol
 
 from hdbcli import dbapi
@@ -9,9 +10,12 @@ from langchain_hana import HanaDB
 
 from services.metrics import CustomMetrics
 from utils.logging import get_logger
+from utils.settings import DATABASE_USER, DOCS_TABLE_POINTER_REFRESH_SECONDS, DOCS_TABLE_POINTER_TABLE
 
 logger = get_logger(__name__)
 
+ERR_SQL_INV_TABLE = 259  # HANA error code for invalid/missing table name
+
 
 class HanaVectorDB(HanaDB):
     """HANA DB Vector Store."""
@@ -60,17 +64,75 @@ class IRetriever(Protocol):
 
 
 class HanaDBRetriever:
-    """HANA DB Retriever."""
+    """
+    HANA DB Retriever.
+
+    The table name is an alias if the doc indexer publishes blue/green generation tables. The
+    retriever then searches the active table of the pointer table, and checks for a newly
+    published table every pointer_refresh_seconds. The pointer table is read from the schema of
+    the database user, where the doc indexer publishes it.
+    """
 
-    def __init__(self, embedding: Embeddings, connection: dbapi.Connection, table_name: str):
+    def __init__(
+        self,
+        embedding: Embeddings,
+        connection: dbapi.Connection,
+        table_name: str,
+        pointer_table: str = DOCS_TABLE_POINTER_TABLE,
+        pointer_refresh_seconds: float = DOCS_TABLE_POINTER_REFRESH_SECONDS,
+        schema: str | None = DATABASE_USER,
+    ):
+        self.embedding = embedding
+        self.connection = connection
+        self.alias = table_name
+        self.pointer_table = pointer_table
+        self.pointer_table_ref = f'"{schema}"."{pointer_table}"' if schema else f'"{pointer_table}"'
+        self.pointer_refresh_seconds = pointer_refresh_seconds
+        self.active_table = table_name
+        self._pointer_checked_at = float("-inf")
         self.db = HanaVectorDB(
             connection=connection,
             embedding=embedding,
             table_name=table_name,
         )
 
+    def _read_active_table(self) -> str:
+        """Read the active table of the alias from the pointer table."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SELECT ACTIVE_TABLE FROM {self.pointer_table_ref} WHERE ALIAS = ?", (self.alias,))
+            row = cursor.fetchone()
+        except dbapi.ProgrammingError as e:
+            # the doc indexer never published blue/green, the alias is the table.
+            if e.errorcode == ERR_SQL_INV_TABLE:
+                return self.alias
+            raise
+        finally:
+            cursor.close()
+        return str(row[0]) if row else self.alias
+
+    async def _refresh_active_table(self) -> None:
+        """Switch to the active table of the pointer table, if it changed."""
+        now = time.monotonic()
+        if now - self._pointer_checked_at < self.pointer_refresh_seconds:
+            return
+        self._pointer_checked_at = now
+        try:
+            active_table = await run_in_executor(None, self._read_active_table)
+        except Exception:
+            logger.warning(f"Failed to read the active table of {self.alias}, keep using {self.active_table}.")
+            return
+        if active_table != self.active_table:
+            self.db = await run_in_executor(
+                None,
+                partial(HanaVectorDB, connection=self.connection, embedding=self.embedding, table_name=active_table),
+            )
+            logger.info(f"Switched the documents table {self.alias} from {self.active_table} to {active_table}.")
+            self.active_table = active_table
+
     async def aretrieve(self, query: str, top_k: int = 5) -> list[Document]:
         """Retrieve relevant documents based on the query."""
+        await self._refresh_active_table()
         start_time = time.perf_counter()
         try:
             docs = await self.db.asimilarity_search(query, k=top_k)
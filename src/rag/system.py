@@ -5,9 +5,9 @@ from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from pydantic import BaseModel
 
-from rag.query_generator import QueryGenerator
-from rag.reranker.reranker import LLMReranker
-from rag.retriever import HanaDBRetriever
+from rag.query_generator import IQueryGenerator, QueryGenerator
+from rag.reranker.reranker import IReranker, LLMReranker
+from rag.retriever import HanaDBRetriever, IRetriever
 from services.hana import Hana
 from utils.logging import get_logger
 from utils.models.factory import IModel
@@ -36,18 +36,28 @@ class IRAGSystem(Protocol):
 class RAGSystem:
     """A system that can be used to generate queries and retrieve documents."""
 
-    def __init__(self, models: dict[str, IModel | Embeddings]):
+    def __init__(
+        self,
+        models: dict[str, IModel | Embeddings],
+        query_generator: IQueryGenerator | None = None,
+        retriever: IRetriever | None = None,
+        reranker: IReranker | None = None,
+    ):
+        """
+        Initialize the RAG system. The query generator, retriever and reranker are created from
+        the models unless given, e.g. to run the system against a local vector store.
+        """
         # setup query generator
-        self.query_generator = QueryGenerator(cast(IModel, cast(IModel, models[MAIN_MODEL_MINI_NAME])))
+        self.query_generator = query_generator or QueryGenerator(cast(IModel, models[MAIN_MODEL_MINI_NAME]))
         # setup retriever
-        self.retriever = HanaDBRetriever(
+        self.retriever = retriever or HanaDBRetriever(
             embedding=cast(Embeddings, models[MAIN_EMBEDDING_MODEL_NAME]),
             connection=Hana().get_connction(),
             table_name=DOCS_TABLE_NAME,
         )
 
         # setup reranker
-        self.reranker = LLMReranker(cast(IModel, models[MAIN_MODEL_MINI_NAME]))
+        self.reranker = reranker or LLMReranker(cast(IModel, models[MAIN_MODEL_MINI_NAME]))
 
         logger.info("RAG system initialized.")
         logger.debug(f"Hana DB table name: {DOCS_TABLE_NAME}")
@@ -15,10 +15,12 @@ from agents.kyma.tools.search import SearchKymaDocTool
 from services.data_sanitizer import DataSanitizer, IDataSanitizer
 from services.encryption import Encryption
 from services.encryption_cache import EncryptionCache, get_encryption_cache
+from services.health_monitor import HealthCheckResult
 from services.k8s import IK8sClient, K8sAuthHeaders, K8sClient
 from services.k8s_models import PodLogs, PodLogsDiagnosticContext
 from services.key_store import KeyStore
 from services.redis import Redis
+from services.startup import ComponentStatus
 from utils.config import Config, get_config
 from utils.logging import get_logger
 from utils.models.factory import IModel, ModelFactory
@@ -75,6 +77,8 @@ class ReadinessModel(BaseModel):
     is_hana_initialized: bool
     are_models_initialized: bool
     is_key_store_initialized: bool
+    is_startup_complete: bool = True
+    startup_components: dict[str, ComponentStatus] = {}
 
 
 class HealthModel(BaseModel):
@@ -85,6 +89,7 @@ class HealthModel(BaseModel):
     is_usage_tracker_healthy: bool
     is_key_store_healthy: bool
     llms: dict[str, bool]
+    checks: dict[str, HealthCheckResult] = {}
 
 
 # ============================================================================
@@ -1,5 +1,7 @@
+from collections.abc import AsyncIterator
 from functools import lru_cache
 from http import HTTPStatus
+from logging import DEBUG
 from typing import Annotated
 from uuid import UUID
 
@@ -20,6 +22,7 @@ from routers.common import (
 from services.conversation import ConversationService, IService
 from services.data_sanitizer import DataSanitizer, IDataSanitizer
 from services.k8s import IK8sClient, K8sAuthHeaders, K8sClient
+from services.k8s_read_cache import get_k8s_read_cache
 from services.k8s_resource_discovery import K8sResourceDiscovery
 from utils.config import Config, get_config
 from utils.logging import get_logger
@@ -90,7 +93,9 @@ async def init_conversation(
 ) -> JSONResponse:
     """Endpoint to initialize a conversation with Kyma Companion and generates initial questions."""
 
-    logger.info(f"Initializing new conversation. Request data: {message.model_dump_json()}")
+    logger.info("Initializing new conversation.")
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"Request data: {message.model_dump_json()}")
 
     # Validate if all the required K8s headers are provided.
     k8s_auth_headers = K8sAuthHeaders(
@@ -211,7 +216,9 @@ async def messages(
 ) -> StreamingResponse:
     """Endpoint to send a message to the Kyma companion"""
 
-    logger.info(f"Handling conversation: {str(conversation_id)}. Request data: {message.model_dump_json()}")
+    logger.info(f"Handling conversation: {str(conversation_id)}.")
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"Request data: {message.model_dump_json()}")
 
     # Validate if all the required K8s headers are provided.
     k8s_auth_headers = K8sAuthHeaders(
@@ -233,11 +240,13 @@ async def messages(
     # Check rate limitation
     await check_token_usage(x_cluster_url, conversation_service)
 
-    # Initialize k8s client for the request.
+    # Initialize k8s client for the request. Reads are cached per conversation.
+    read_cache = get_k8s_read_cache(str(conversation_id))
     try:
         k8s_client: IK8sClient = K8sClient.new(
             k8s_auth_headers=k8s_auth_headers,
             data_sanitizer=data_sanitizer,
+            read_cache=read_cache,
         )
     except Exception as e:
         raise HTTPException(
@@ -261,15 +270,19 @@ async def messages(
         # mark the message as a cluster overview query
         message.resource_scope = CLUSTER
 
-    return StreamingResponse(
-        (
-            chunk_response + b"\n"
-            async for chunk in conversation_service.handle_request(str(conversation_id), message, k8s_client)
-            for chunk_response in (prepare_chunk_response(chunk),)
-            if chunk_response is not None
-        ),
-        media_type="text/event-stream",
-    )
+    read_cache_turn_start = read_cache.start_turn() if read_cache is not None else None
+
+    async def stream_response() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in conversation_service.handle_request(str(conversation_id), message, k8s_client):
+                chunk_response = prepare_chunk_response(chunk)
+                if chunk_response is not None:
+                    yield chunk_response + b"\n"
+        finally:
+            if read_cache is not None and read_cache_turn_start is not None:
+                read_cache.record_turn_metrics(read_cache_turn_start)
+
+    return StreamingResponse(stream_response(), media_type="text/event-stream")
 
 
 async def check_token_usage(x_cluster_url: str, conversation_service: IService) -> None:
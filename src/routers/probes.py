@@ -8,13 +8,20 @@ from starlette.status import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
 
 from routers.common import HealthModel, ReadinessModel
 from services.hana import get_hana
+from services.health_monitor import (
+    HEALTH_CHECK_HANA,
+    HEALTH_CHECK_KEY_STORE,
+    HEALTH_CHECK_LLMS,
+    HEALTH_CHECK_REDIS,
+    HEALTH_CHECK_USAGE_TRACKER,
+    HealthCheckResult,
+    get_health_monitor,
+)
 from services.k8s_resource_discovery import K8sResourceDiscovery
 from services.key_store import KeyStore
-from services.probes import (
-    get_llm_probe,
-    get_usage_tracker_probe,
-)
+from services.probes import get_llm_probe
 from services.redis import get_redis
+from services.startup import ComponentStatus, get_startup_phase
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -90,6 +97,29 @@ class IRedis(Protocol):
         """Check if a connection exists."""
 
 
+class IStartupPhase(Protocol):
+    """Protocol for the startup phase of the application."""
+
+    def is_ready(self) -> bool:
+        """Check if the required components are built."""
+
+    def get_statuses(self) -> dict[str, ComponentStatus]:
+        """Return the status of every component."""
+
+
+class IHealthMonitor(Protocol):
+    """Protocol for the background health monitor."""
+
+    def get_result(self, name: str) -> HealthCheckResult:
+        """Return the cached result of a health check."""
+
+    def get_results(self) -> dict[str, HealthCheckResult]:
+        """Return the cached results of all health checks."""
+
+    def is_healthy(self, name: str) -> bool:
+        """Check if the cached result of a health check is healthy and not stale, or if the check is pending."""
+
+
 class ILLMProbe(Protocol):
     """
     Protocol for probing the readiness of LLMs (Large Language Models).
@@ -115,22 +145,19 @@ class ILLMProbe(Protocol):
 
 @router.get("/healthz")
 async def healthz(
-    hana: IHana = Depends(get_hana),  # noqa: B008
-    redis: IRedis = Depends(get_redis),  # noqa: B008
-    usage_tracker_probe: IUsageTrackerProbe = Depends(  # noqa: B008
-        get_usage_tracker_probe
-    ),
-    llm_probe: ILLMProbe = Depends(get_llm_probe),  # noqa: B008
+    health_monitor: IHealthMonitor = Depends(get_health_monitor),  # noqa: B008
 ) -> JSONResponse:
-    """The endpoint for the Health Probe."""
+    """The endpoint for the Health Probe. It serves the cached results of the background health monitor."""
 
     logger.debug("Health probe called.")
+    llms = health_monitor.get_result(HEALTH_CHECK_LLMS)
     response = HealthModel(
-        is_hana_healthy=hana.is_connection_operational(),
-        is_redis_healthy=await redis.is_connection_operational(),
-        is_usage_tracker_healthy=usage_tracker_probe.is_healthy(),
-        is_key_store_healthy=KeyStore().is_healthy(),
-        llms=llm_probe.get_llms_states(),
+        is_hana_healthy=health_monitor.is_healthy(HEALTH_CHECK_HANA),
+        is_redis_healthy=health_monitor.is_healthy(HEALTH_CHECK_REDIS),
+        is_usage_tracker_healthy=health_monitor.is_healthy(HEALTH_CHECK_USAGE_TRACKER),
+        is_key_store_healthy=health_monitor.is_healthy(HEALTH_CHECK_KEY_STORE),
+        llms={name: is_ready and not llms.is_stale for name, is_ready in llms.details.items()},
+        checks=health_monitor.get_results(),
     )
 
     status = HTTP_503_SERVICE_UNAVAILABLE
@@ -153,6 +180,7 @@ async def readyz(
     hana: IHana = Depends(get_hana),  # noqa: B008
     redis: IRedis = Depends(get_redis),  # noqa: B008
     llm_probe: ILLMProbe = Depends(get_llm_probe),  # noqa: B008
+    startup_phase: IStartupPhase = Depends(get_startup_phase),  # noqa: B008
 ) -> JSONResponse:
     """The endpoint for the Ready Probe."""
 
@@ -167,6 +195,8 @@ async def readyz(
         is_redis_initialized=redis.has_connection(),
         are_models_initialized=llm_probe.has_models(),
         is_key_store_initialized=KeyStore().is_healthy(),
+        is_startup_complete=startup_phase.is_ready(),
+        startup_components=startup_phase.get_statuses(),
     )
     status = HTTP_503_SERVICE_UNAVAILABLE
     if all_ready(response):
@@ -185,13 +215,15 @@ def all_ready(response: HealthModel | ReadinessModel) -> bool:
     Check if all components are ready.
     """
     if isinstance(response, HealthModel):
+        # the models are only known after the first check of the LLMs.
+        llms_check = response.checks.get(HEALTH_CHECK_LLMS)
+        are_llms_pending = llms_check is not None and llms_check.is_pending
         return (
             response.is_redis_healthy
             and response.is_hana_healthy
             and response.is_usage_tracker_healthy
             and response.is_key_store_healthy
-            and bool(response.llms)
-            and all(response.llms.values())
+            and (are_llms_pending or (bool(response.llms) and all(response.llms.values())))
         )
     if isinstance(response, ReadinessModel):
         return (
@@ -199,5 +231,6 @@ def all_ready(response: HealthModel | ReadinessModel) -> bool:
             and response.is_hana_initialized
             and response.are_models_initialized
             and response.is_key_store_initialized
+            and response.is_startup_complete
         )
     return False
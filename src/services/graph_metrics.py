@@ -0,0 +1,179 @@
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+from services.metrics import GRAPH_NODE_OTHER, CustomMetrics, graph_node_label
+from services.usage import _parse_usage
+
+LANGGRAPH_NODE_KEY = "langgraph_node"
+LANGGRAPH_CHECKPOINT_NS_KEY = "langgraph_checkpoint_ns"
+
+
+def _node_of(metadata: dict[str, Any] | None) -> str:
+    """Return the label of the graph node that a run belongs to."""
+    return graph_node_label((metadata or {}).get(LANGGRAPH_CHECKPOINT_NS_KEY))
+
+
+class GraphMetricsCallback(AsyncCallbackHandler):
+    """
+    LangChain callback handler to record the duration of the graph nodes, the tool calls and the
+    conversation turn, and the LLM tokens per graph node.
+
+    A turn is the root run of the graph. A node run is the run that LangGraph starts for a node,
+    whose name is the node name. The runs within a node, e.g. its chains and LLM calls, are
+    attributed to the node.
+    """
+
+    def __init__(self) -> None:
+        self.turn_start_times: dict[UUID, float] = {}
+        self.node_runs: dict[UUID, tuple[str, float]] = {}
+        self.tool_runs: dict[UUID, tuple[str, float]] = {}
+        self.llm_nodes: dict[UUID, str] = {}
+
+    async def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Overridden callback method to record the start of a turn or a node."""
+        if parent_run_id is None:
+            self.turn_start_times[run_id] = time.perf_counter()
+            return
+        node_name = (metadata or {}).get(LANGGRAPH_NODE_KEY)
+        if node_name is not None and kwargs.get("name") == node_name:
+            self.node_runs[run_id] = (_node_of(metadata), time.perf_counter())
+
+    async def on_chain_end(
+        self,
+        outputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Overridden callback method to record the duration of a turn or a node."""
+        self._end_chain(run_id, is_success=True)
+
+    async def on_chain_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Overridden callback method to record the duration of a failed turn or node."""
+        self._end_chain(run_id, is_success=False)
+
+    def _end_chain(self, run_id: UUID, is_success: bool) -> None:
+        if run_id in self.turn_start_times:
+            duration = time.perf_counter() - self.turn_start_times.pop(run_id)
+            CustomMetrics().record_graph_turn_latency(duration, is_success)
+        elif run_id in self.node_runs:
+            node, start_time = self.node_runs.pop(run_id)
+            CustomMetrics().record_graph_node_latency(node, time.perf_counter() - start_time, is_success)
+
+    async def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Overridden callback method to record the start of a tool call."""
+        tool = kwargs.get("name") or (serialized or {}).get("name") or GRAPH_NODE_OTHER
+        self.tool_runs[run_id] = (tool, time.perf_counter())
+
+    async def on_tool_end(
+        self,
+        output: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Overridden callback method to record the duration of a tool call."""
+        self._end_tool(run_id, is_success=True)
+
+    async def on_tool_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Overridden callback method to record the duration of a failed tool call."""
+        self._end_tool(run_id, is_success=False)
+
+    def _end_tool(self, run_id: UUID, is_success: bool) -> None:
+        if run_id in self.tool_runs:
+            tool, start_time = self.tool_runs.pop(run_id)
+            CustomMetrics().record_graph_tool_latency(tool, time.perf_counter() - start_time, is_success)
+
+    async def on_llm_start(
+        self,
+        serialized: dict[str, Any],
+        prompts: list[str],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Overridden callback method to record the node of an LLM call."""
+        self.llm_nodes[run_id] = _node_of(metadata)
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[BaseMessage]],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Overridden callback method to record the node of a chat model call."""
+        self.llm_nodes[run_id] = _node_of(metadata)
+
+    async def on_llm_end(
+        self,
+        response: LLMResult,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Overridden callback method to record the tokens of an LLM call per node."""
+        node = self.llm_nodes.pop(run_id, GRAPH_NODE_OTHER)
+        usage = _parse_usage(response)
+        if usage is not None:
+            CustomMetrics().record_graph_node_tokens(node, int(usage.get("input", 0)), int(usage.get("output", 0)))
+
+    async def on_llm_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Overridden callback method to forget the node of a failed LLM call."""
+        self.llm_nodes.pop(run_id, None)
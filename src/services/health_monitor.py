@@ -0,0 +1,213 @@
+"""
+Background health monitor of the dependencies of the application.
+
+Every dependency is checked by its own background task on its own interval, with a timeout. The health
+probe only serves the cached results, so a probe neither waits for a dependency nor costs LLM tokens.
+A result that was not refreshed within HEALTH_CHECK_STALENESS_FACTOR intervals, e.g. because the check
+hangs, is stale and reported as unhealthy. A check that did not complete yet since the monitor was
+started is pending within the same window, and is not reported as unhealthy, so the health probe does
+not fail while the application starts.
+"""
+
+import asyncio
+import inspect
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel
+
+from services.hana import get_hana
+from services.key_store import KeyStore
+from services.metrics import CustomMetrics
+from services.probes import get_llm_probe, get_usage_tracker_probe
+from services.redis import get_redis
+from utils.logging import get_logger
+from utils.settings import (
+    HEALTH_CHECK_INTERVAL_SECONDS,
+    HEALTH_CHECK_LLM_INTERVAL_SECONDS,
+    HEALTH_CHECK_LLM_TIMEOUT_SECONDS,
+    HEALTH_CHECK_STALENESS_FACTOR,
+    HEALTH_CHECK_TIMEOUT_SECONDS,
+)
+from utils.singleton_meta import SingletonMeta
+
+logger = get_logger(__name__)
+
+HEALTH_CHECK_REDIS = "redis"
+HEALTH_CHECK_HANA = "hana"
+HEALTH_CHECK_USAGE_TRACKER = "usage_tracker"
+HEALTH_CHECK_KEY_STORE = "key_store"
+HEALTH_CHECK_LLMS = "llms"
+
+
+class HealthCheck(BaseModel):
+    """
+    A health check of a dependency. The check function returns whether the dependency is healthy, or the
+    health per item, e.g. per model. A synchronous check function runs in a worker thread.
+    """
+
+    name: str
+    check: Callable[[], Any]
+    interval_seconds: float = HEALTH_CHECK_INTERVAL_SECONDS
+    timeout_seconds: float = HEALTH_CHECK_TIMEOUT_SECONDS
+
+
+class HealthCheckResult(BaseModel):
+    """Cached result of a health check."""
+
+    is_healthy: bool = False
+    # the health per item, e.g. per model.
+    details: dict[str, bool] = {}
+    error: str | None = None
+    checked_at: float | None = None
+    duration_ms: float | None = None
+    age_seconds: float | None = None
+    is_stale: bool = True
+    # the check did not complete yet since the monitor was started.
+    is_pending: bool = False
+
+
+async def _check_redis() -> bool:
+    return await get_redis().is_connection_operational()
+
+
+def _check_hana() -> bool:
+    return get_hana().is_connection_operational()
+
+
+def _check_usage_tracker() -> bool:
+    return get_usage_tracker_probe().is_healthy()
+
+
+def _check_key_store() -> bool:
+    return KeyStore().is_healthy()
+
+
+async def _check_llms() -> dict[str, bool]:
+    # the first call creates the models, which must not block the event loop.
+    llm_probe = await asyncio.to_thread(get_llm_probe)
+    return await llm_probe.aget_llms_states()
+
+
+def default_health_checks() -> list[HealthCheck]:
+    """Return the health checks of the dependencies of the application."""
+    return [
+        HealthCheck(name=HEALTH_CHECK_REDIS, check=_check_redis),
+        HealthCheck(name=HEALTH_CHECK_HANA, check=_check_hana),
+        HealthCheck(name=HEALTH_CHECK_USAGE_TRACKER, check=_check_usage_tracker),
+        HealthCheck(name=HEALTH_CHECK_KEY_STORE, check=_check_key_store),
+        HealthCheck(
+            name=HEALTH_CHECK_LLMS,
+            check=_check_llms,
+            interval_seconds=HEALTH_CHECK_LLM_INTERVAL_SECONDS,
+            timeout_seconds=HEALTH_CHECK_LLM_TIMEOUT_SECONDS,
+        ),
+    ]
+
+
+class HealthMonitor(metaclass=SingletonMeta):
+    """Refreshes the health checks in the background, and serves their cached results."""
+
+    def __init__(
+        self,
+        checks: list[HealthCheck] | None = None,
+        staleness_factor: float = HEALTH_CHECK_STALENESS_FACTOR,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._checks = {check.name: check for check in (checks if checks is not None else default_health_checks())}
+        self._staleness_factor = staleness_factor
+        self._clock = clock
+        self._results = {name: HealthCheckResult() for name in self._checks}
+        # worker threads of synchronous checks that did not finish within the timeout.
+        self._running_threads: dict[str, asyncio.Future] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._started_at: float | None = None
+
+    def start(self) -> None:
+        """Start a background task per health check on the running event loop."""
+        if self._tasks:
+            return
+        self._started_at = self._clock()
+        logger.info(f"Starting the health monitor with the checks: {list(self._checks)}")
+        self._tasks = [asyncio.create_task(self._run_periodically(check)) for check in self._checks.values()]
+
+    async def stop(self) -> None:
+        """Stop the background tasks."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run_periodically(self, check: HealthCheck) -> None:
+        while True:
+            await self.refresh(check.name)
+            await asyncio.sleep(check.interval_seconds)
+
+    async def refresh(self, name: str) -> HealthCheckResult:
+        """Run a health check once, and cache its result."""
+        check = self._checks[name]
+        result = HealthCheckResult()
+        start_time = time.perf_counter()
+        try:
+            outcome = await self._run_check(check)
+            if isinstance(outcome, dict):
+                result.details = outcome
+                result.is_healthy = bool(outcome) and all(outcome.values())
+            else:
+                result.is_healthy = bool(outcome)
+        except TimeoutError:
+            logger.warning(f"Health check {name} timed out after {check.timeout_seconds} seconds")
+            result.error = f"timed out after {check.timeout_seconds} seconds"
+        except Exception as e:
+            logger.exception(f"Health check {name} failed")
+            result.error = str(e)
+        duration = time.perf_counter() - start_time
+        result.duration_ms = round(duration * 1000, 1)
+        result.checked_at = self._clock()
+        self._results[name] = result
+        CustomMetrics().record_health_check(name, duration, result.is_healthy)
+        return result
+
+    async def _run_check(self, check: HealthCheck) -> Any:
+        if inspect.iscoroutinefunction(check.check):
+            return await asyncio.wait_for(check.check(), check.timeout_seconds)
+
+        # a worker thread cannot be cancelled, so a hanging check is not started again until it returns.
+        running_thread = self._running_threads.get(check.name)
+        if running_thread is not None and not running_thread.done():
+            raise TimeoutError()
+        thread = asyncio.ensure_future(asyncio.to_thread(check.check))
+        self._running_threads[check.name] = thread
+        return await asyncio.wait_for(asyncio.shield(thread), check.timeout_seconds)
+
+    def get_result(self, name: str) -> HealthCheckResult:
+        """Return the cached result of a health check, with its age and staleness."""
+        result = self._results[name].model_copy()
+        max_age = self._checks[name].interval_seconds * self._staleness_factor
+        if result.checked_at is not None:
+            result.age_seconds = round(self._clock() - result.checked_at, 3)
+            result.is_stale = result.age_seconds > max_age
+        elif self._started_at is not None:
+            result.is_stale = self._clock() - self._started_at > max_age
+            result.is_pending = not result.is_stale
+        return result
+
+    def get_results(self) -> dict[str, HealthCheckResult]:
+        """Return the cached results of all health checks."""
+        return {name: self.get_result(name) for name in self._checks}
+
+    def is_healthy(self, name: str) -> bool:
+        """Check if the cached result of a health check is healthy and not stale, or if the check is pending."""
+        result = self.get_result(name)
+        return result.is_pending or (result.is_healthy and not result.is_stale)
+
+    @classmethod
+    def _reset_for_tests(cls) -> None:
+        """Reset the singleton instance. Only use for testing purpose."""
+        SingletonMeta.reset_instance(cls)
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Return the health monitor of the application."""
+    return HealthMonitor()
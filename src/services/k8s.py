@@ -21,6 +21,7 @@ from services.k8s_constants import (
     K8sResourceKind,
     PodPhase,
 )
+from services.k8s_logs import PodLogsBudget, extract_error_focused_lines, omitted_lines_marker, read_log_tail
 from services.k8s_models import (
     ContainerStatus,
     InitContainerStatus,
@@ -28,18 +29,32 @@ from services.k8s_models import (
     PodLogsDiagnosticContext,
     PodLogsResult,
 )
+from services.k8s_projection import DescribeProjector
+from services.k8s_read_cache import K8sReadCache, K8sReadCacheKey, K8sReadOperation, get_resource_version
 from utils import logging
 from utils.exceptions import K8sClientError, NoLogsAvailableError, parse_k8s_error_response
 from utils.settings import (
     ALLOWED_K8S_DOMAINS,
     K8S_API_PAGINATION_LIMIT,
     K8S_API_PAGINATION_MAX_PAGE,
+    K8S_DESCRIBE_FIELD_ALLOWLISTS,
+    K8S_DESCRIBE_MODE,
+    K8S_READ_CACHE_LOGS_TTL_SECONDS,
 )
 
 logger = logging.get_logger(__name__)
 
 GROUP_VERSION_SEPARATOR = "/"
 GROUP_VERSION_PARTS_COUNT = 2
+# Accept header to fetch only the metadata of an object (used for cheap resourceVersion checks).
+PARTIAL_OBJECT_METADATA_ACCEPT = "application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1"
+
+
+class DescribeMode(StrEnum):
+    """How describe_resource builds its output."""
+
+    PROJECTION = "projection"
+    FULL = "full"
 
 
 class AuthType(StrEnum):
@@ -237,20 +252,30 @@ class K8sClient:
     client_key_temp_filename: str = ""
     _dynamic_client: dynamic.DynamicClient | None
     data_sanitizer: IDataSanitizer | None
+    read_cache: K8sReadCache | None = None
+    describe_mode: DescribeMode
+    describe_projector: DescribeProjector
+    pod_logs_budget: PodLogsBudget = PodLogsBudget()
     api_client: Any
 
     @staticmethod
-    def new(k8s_auth_headers: K8sAuthHeaders, data_sanitizer: IDataSanitizer | None = None) -> IK8sClient:
+    def new(
+        k8s_auth_headers: K8sAuthHeaders,
+        data_sanitizer: IDataSanitizer | None = None,
+        read_cache: K8sReadCache | None = None,
+    ) -> IK8sClient:
         """Create a new instance of the K8sClient class."""
         return K8sClient(
             k8s_auth_headers=k8s_auth_headers,
             data_sanitizer=data_sanitizer,
+            read_cache=read_cache,
         )
 
     def __init__(
         self,
         k8s_auth_headers: K8sAuthHeaders,
         data_sanitizer: IDataSanitizer | None = None,
+        read_cache: K8sReadCache | None = None,
     ):
         """Initialize the K8sClient object."""
         self.k8s_auth_headers = k8s_auth_headers
@@ -279,6 +304,11 @@ class K8sClient:
         self._dynamic_client = None
 
         self.data_sanitizer = data_sanitizer
+        # Optional conversation-scoped cache for read requests.
+        self.read_cache = read_cache
+        # The describe mode and the allowlists are read when the client is built, not when the module is imported.
+        self.describe_mode = DescribeMode(K8S_DESCRIBE_MODE)
+        self.describe_projector = DescribeProjector(K8S_DESCRIBE_FIELD_ALLOWLISTS)
 
     def __del__(self) -> None:
         """Destructor to remove the temporary file containing certificates data."""
@@ -400,8 +430,37 @@ class K8sClient:
                             return {"kind": response_kind, "items": all_items}
                         return all_items
 
+    def _read_cache_key(self, operation: K8sReadOperation, **kwargs: str) -> K8sReadCacheKey:
+        """Build the read cache key for a request against this cluster."""
+        return K8sReadCacheKey(cluster=self.get_api_server(), operation=operation, **kwargs)
+
+    async def _fetch_resource_version(self, uri: str) -> str | None:
+        """Fetch only the metadata of a single object and return its resourceVersion."""
+        headers = self._get_auth_headers()
+        headers["Accept"] = PARTIAL_OBJECT_METADATA_ACCEPT
+        async with (
+            aiohttp.ClientSession(headers=headers) as session,
+            session.get(url=f"{self.get_api_server()}/{uri.lstrip('/')}", ssl=self.client_ssl_context) as response,
+        ):
+            if response.status != HTTPStatus.OK:
+                return None
+            return get_resource_version(await response.json())
+
     async def execute_get_api_request(self, uri: str) -> dict | list[dict]:
         """Execute a GET request to the Kubernetes API"""
+        if self.read_cache is None:
+            return await self._execute_get_api_request(uri)
+        return cast(
+            dict | list[dict],
+            await self.read_cache.aget_or_load(
+                self._read_cache_key(K8sReadOperation.API_REQUEST, query=uri),
+                loader=lambda: self._execute_get_api_request(uri),
+                revalidator=lambda: self._fetch_resource_version(uri),
+            ),
+        )
+
+    async def _execute_get_api_request(self, uri: str) -> dict | list[dict]:
+        """Execute a GET request to the Kubernetes API without consulting the read cache."""
         base_url = f"{self.get_api_server()}/{uri.lstrip('/')}"
         logger.debug(f"Executing GET request to {base_url}")
         result = await self._paginated_api_request(base_url)
@@ -427,6 +486,20 @@ class K8sClient:
     def list_resources(self, api_version: str, kind: str, namespace: str) -> list[dict]:
         """List resources of a specific kind in a namespace.
         Provide empty string for namespace to list resources in all namespaces."""
+        if self.read_cache is None:
+            return self._list_resources(api_version, kind, namespace)
+        return cast(
+            list[dict],
+            self.read_cache.get_or_load(
+                self._read_cache_key(
+                    K8sReadOperation.LIST_RESOURCES, api_version=api_version, kind=kind, namespace=namespace
+                ),
+                loader=lambda: self._list_resources(api_version, kind, namespace),
+            ),
+        )
+
+    def _list_resources(self, api_version: str, kind: str, namespace: str) -> list[dict]:
+        """List resources of a specific kind in a namespace without consulting the read cache."""
         result = self.dynamic_client.resources.get(api_version=api_version, kind=kind).get(namespace=namespace)
 
         # convert objects to dictionaries.
@@ -443,6 +516,27 @@ class K8sClient:
         namespace: str,
     ) -> dict:
         """Get a specific resource by name in a namespace."""
+        if self.read_cache is None:
+            return self._get_resource(api_version, kind, name, namespace)
+        return cast(
+            dict,
+            self.read_cache.get_or_load(
+                self._read_cache_key(
+                    K8sReadOperation.GET_RESOURCE, api_version=api_version, kind=kind, namespace=namespace, name=name
+                ),
+                loader=lambda: self._get_resource(api_version, kind, name, namespace),
+                revalidator=lambda: self._get_resource_version_from_server(api_version, kind, name, namespace),
+            ),
+        )
+
+    def _get_resource(
+        self,
+        api_version: str,
+        kind: str,
+        name: str,
+        namespace: str,
+    ) -> dict:
+        """Get a specific resource by name in a namespace without consulting the read cache."""
         resource = (
             self.dynamic_client.resources.get(api_version=api_version, kind=kind)
             .get(name=name, namespace=namespace)
@@ -452,6 +546,15 @@ class K8sClient:
             return cast(dict, self.data_sanitizer.sanitize(resource))
         return resource  # type: ignore
 
+    def _get_resource_version_from_server(self, api_version: str, kind: str, name: str, namespace: str) -> str | None:
+        """Fetch only the metadata of a specific resource and return its resourceVersion."""
+        metadata = (
+            self.dynamic_client.resources.get(api_version=api_version, kind=kind)
+            .get(name=name, namespace=namespace, header_params={"Accept": PARTIAL_OBJECT_METADATA_ACCEPT})
+            .to_dict()
+        )
+        return get_resource_version(metadata)
+
     def get_resource_version(self, kind: str) -> str:
         """Get the resource version for a given kind.
 
@@ -491,6 +594,60 @@ class K8sClient:
         namespace: str,
     ) -> dict:
         """Describe a specific resource by name in a namespace. This includes the resource and its events."""
+        if self.describe_mode == DescribeMode.FULL:
+            return self._describe_resource_full(api_version, kind, name, namespace)
+        if self.read_cache is None:
+            return self._describe_resource_projected(api_version, kind, name, namespace)
+        return cast(
+            dict,
+            self.read_cache.get_or_load(
+                self._read_cache_key(
+                    K8sReadOperation.DESCRIBE_RESOURCE,
+                    api_version=api_version,
+                    kind=kind,
+                    namespace=namespace,
+                    name=name,
+                ),
+                loader=lambda: self._describe_resource_projected(api_version, kind, name, namespace),
+            ),
+        )
+
+    def _describe_resource_projected(
+        self,
+        api_version: str,
+        kind: str,
+        name: str,
+        namespace: str,
+    ) -> dict:
+        """Describe a resource by projecting the allowlisted fields of the raw object.
+
+        Only the projected fields are sanitized, and nothing is deep-copied: the projection shares
+        values with the freshly fetched raw object, and the events are projected into new dicts.
+        """
+        raw_resource = (
+            self.dynamic_client.resources.get(api_version=api_version, kind=kind)
+            .get(name=name, namespace=namespace)
+            .to_dict()
+        )
+        result = self.describe_projector.project_resource(kind, raw_resource)
+        if self.data_sanitizer:
+            result = cast(dict, self.data_sanitizer.sanitize(result))
+
+        # events are already sanitized by list_k8s_events.
+        result[K8sApiFields.EVENTS] = [
+            self.describe_projector.project_event(event)
+            for event in self.list_k8s_events_for_resource(kind, name, namespace)
+        ]
+        return result
+
+    def _describe_resource_full(
+        self,
+        api_version: str,
+        kind: str,
+        name: str,
+        namespace: str,
+    ) -> dict:
+        """Describe a resource by deep-copying the whole sanitized object."""
         resource = self.get_resource(api_version, kind, name, namespace)
 
         # clone the object because we cannot modify the original object.
@@ -531,7 +688,18 @@ class K8sClient:
 
     def list_k8s_events(self, namespace: str) -> list[dict]:
         """List all Kubernetes events. Provide empty string for namespace to list all events."""
+        if self.read_cache is None:
+            return self._list_k8s_events(namespace)
+        return cast(
+            list[dict],
+            self.read_cache.get_or_load(
+                self._read_cache_key(K8sReadOperation.LIST_EVENTS, namespace=namespace),
+                loader=lambda: self._list_k8s_events(namespace),
+            ),
+        )
 
+    def _list_k8s_events(self, namespace: str) -> list[dict]:
+        """List all Kubernetes events without consulting the read cache."""
         result = self.dynamic_client.resources.get(api_version="v1", kind=K8sResourceKind.EVENT).get(
             namespace=namespace
         )
@@ -579,6 +747,30 @@ class K8sClient:
         Raises:
             K8sClientError: For authentication (401) or authorization (403) errors
         """
+        if self.read_cache is None:
+            return await self._fetch_pod_logs(name, namespace, container_name, tail_limit)
+        return cast(
+            PodLogsResult,
+            await self.read_cache.aget_or_load(
+                self._read_cache_key(
+                    K8sReadOperation.POD_LOGS,
+                    namespace=namespace,
+                    name=name,
+                    query=f"container={container_name}&tailLines={tail_limit}",
+                ),
+                loader=lambda: self._fetch_pod_logs(name, namespace, container_name, tail_limit),
+                ttl_seconds=K8S_READ_CACHE_LOGS_TTL_SECONDS,
+            ),
+        )
+
+    async def _fetch_pod_logs(
+        self,
+        name: str,
+        namespace: str,
+        container_name: str,
+        tail_limit: int,
+    ) -> PodLogsResult:
+        """Fetch logs of Kubernetes Pod without consulting the read cache."""
         # Step 1: Try fetching both current and previous logs in parallel
         current_task = asyncio.create_task(
             self._try_fetch_logs(name, namespace, container_name, previous=False, tail_limit=tail_limit)
@@ -952,6 +1144,7 @@ class K8sClient:
         # if previous is true, then fetch the logs of previous container instance.
         if previous:
             uri += "&previous=true"
+        uri += self.pod_logs_budget.query_params()
 
         async with (
             aiohttp.ClientSession() as session,
@@ -972,15 +1165,18 @@ class K8sClient:
                     uri=uri,
                 )
 
-            logs = []
-            async for line_bytes in response.content:
-                # Decode each line (assuming utf-8 encoding)
-                line = line_bytes.decode("utf-8").strip()
-                logs.append(line)
+            # stream the logs, keeping only a byte-bounded tail in memory.
+            tail = await read_log_tail(response.content, self.pod_logs_budget.max_bytes)
 
-            if self.data_sanitizer:
-                return self.data_sanitizer.sanitize(logs)  # type: ignore
-            return logs
+        logs = tail.lines
+        if self.data_sanitizer:
+            logs = cast(list[str], self.data_sanitizer.sanitize(logs))  # type: ignore
+        logs = extract_error_focused_lines(
+            logs, self.pod_logs_budget.max_tokens, self.pod_logs_budget.error_context_lines
+        )
+        if tail.omitted_lines:
+            logs.insert(0, omitted_lines_marker(tail.omitted_lines))
+        return logs
 
     async def get_namespace(self, name: str) -> dict:
         """
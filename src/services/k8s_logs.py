@@ -0,0 +1,170 @@
+"""
+Budgeted reading of Kubernetes pod logs.
+
+Pod logs are streamed line by line into a tail buffer that is bounded in bytes, so the memory
+used by a log read does not depend on the size of the log. Before the logs are handed to the
+LLM, an error-focused extraction keeps them within a token budget: when the tail does not fit,
+the lines around errors and stack traces are preferred over ordinary output.
+"""
+
+import re
+from collections import deque
+from collections.abc import AsyncIterable
+
+from pydantic import BaseModel
+
+from utils.settings import (
+    K8S_POD_LOGS_ERROR_CONTEXT_LINES,
+    K8S_POD_LOGS_LIMIT_BYTES,
+    K8S_POD_LOGS_MAX_BYTES,
+    K8S_POD_LOGS_MAX_TOKENS,
+    K8S_POD_LOGS_SINCE_SECONDS,
+)
+
+# Rough number of bytes per token, used to estimate the token count without tokenizing.
+_BYTES_PER_TOKEN = 4
+
+_ANOMALY_PATTERN = re.compile(
+    r"\b(error|exception|fatal|panic|critical|traceback|failed|failure|oomkilled|crashloopbackoff)\b"
+    r"|\blevel=(error|fatal)\b"
+    r"|\w(Error|Exception)\b",
+    re.IGNORECASE,
+)
+# Continuation lines of stack traces (Python, Java, Go, Node.js).
+_STACK_TRACE_PATTERN = re.compile(r"^(\s+\S|at \S|File \"|goroutine \d+|Caused by:|\.\.\. \d+ more)")
+
+
+class PodLogsBudget(BaseModel):
+    """Limits applied while reading and returning pod logs."""
+
+    # Maximum bytes of the log tail kept in memory while streaming.
+    max_bytes: int = K8S_POD_LOGS_MAX_BYTES
+    # Maximum estimated tokens of the returned logs.
+    max_tokens: int = K8S_POD_LOGS_MAX_TOKENS
+    # Number of lines kept before and after an error line.
+    error_context_lines: int = K8S_POD_LOGS_ERROR_CONTEXT_LINES
+    # Server-side filters pushed down to the Kubernetes API. 0 disables the filter.
+    since_seconds: int = K8S_POD_LOGS_SINCE_SECONDS
+    limit_bytes: int = K8S_POD_LOGS_LIMIT_BYTES
+
+    def query_params(self) -> str:
+        """Return the server-side filters as URI query parameters."""
+        params = ""
+        if self.since_seconds > 0:
+            params += f"&sinceSeconds={self.since_seconds}"
+        if self.limit_bytes > 0:
+            params += f"&limitBytes={self.limit_bytes}"
+        return params
+
+
+class LogTail(BaseModel):
+    """The tail of a log stream."""
+
+    lines: list[str]
+    omitted_lines: int = 0
+
+
+def estimate_tokens(line: str) -> int:
+    """Estimate the token count of a log line, including its line break."""
+    return len(line) // _BYTES_PER_TOKEN + 1
+
+
+def omitted_lines_marker(count: int) -> str:
+    """Return the marker that replaces omitted log lines."""
+    return f"... {count} lines omitted ..."
+
+
+async def read_log_tail(stream: AsyncIterable[bytes], max_bytes: int) -> LogTail:
+    """Read a log stream and keep only its last max_bytes bytes of complete lines."""
+    # Keep the lines with their encoded sizes, so that multi-byte characters are counted in bytes.
+    tail: deque[tuple[str, int]] = deque()
+    tail_bytes = 0
+    omitted_lines = 0
+    async for line_bytes in stream:
+        # Decode each line (assuming utf-8 encoding)
+        line = line_bytes[:max_bytes].decode("utf-8", errors="replace").strip()
+        line_size = len(line.encode()) + 1
+        tail.append((line, line_size))
+        tail_bytes += line_size
+        while tail_bytes > max_bytes and len(tail) > 1:
+            tail_bytes -= tail.popleft()[1]
+            omitted_lines += 1
+    return LogTail(lines=[line for line, _ in tail], omitted_lines=omitted_lines)
+
+
+def is_anomaly_line(line: str) -> bool:
+    """Check whether a log line reports an error."""
+    return _ANOMALY_PATTERN.search(line) is not None
+
+
+def _anomaly_windows(lines: list[str], context_lines: int) -> list[tuple[int, int]]:
+    """Return the merged [start, end) windows around error lines, extended over stack traces."""
+    windows: list[tuple[int, int]] = []
+    for index, line in enumerate(lines):
+        if not is_anomaly_line(line):
+            continue
+        end = index + 1
+        while end < len(lines) and _STACK_TRACE_PATTERN.match(lines[end]):
+            end += 1
+        start, end = max(0, index - context_lines), min(len(lines), end + context_lines)
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+    return windows
+
+
+def extract_error_focused_lines(lines: list[str], max_tokens: int, context_lines: int) -> list[str]:
+    """
+    Fit log lines into a token budget.
+
+    Lines are returned unchanged if they fit. Otherwise half of the budget goes to the newest
+    lines and the rest to the windows around errors, newest first. Omitted ranges are replaced
+    by a marker line.
+    """
+    costs = [estimate_tokens(line) for line in lines]
+    if sum(costs) <= max_tokens:
+        return lines
+
+    windows = _anomaly_windows(lines, context_lines)
+    # Without errors, the whole budget goes to the newest lines.
+    tail_budget = max_tokens // 2 if windows else max_tokens
+    keep = [False] * len(lines)
+    remaining = tail_budget
+
+    def take(start: int, end: int) -> bool:
+        """Keep lines[start:end] from the newest line backwards while the budget allows it."""
+        nonlocal remaining
+        for index in range(end - 1, start - 1, -1):
+            if keep[index]:
+                continue
+            if costs[index] > remaining:
+                return False
+            keep[index] = True
+            remaining -= costs[index]
+        return True
+
+    take(0, len(lines))
+    remaining += max_tokens - tail_budget
+    for start, end in reversed(windows):
+        if not take(start, end):
+            break
+
+    return _render_kept_lines(lines, keep)
+
+
+def _render_kept_lines(lines: list[str], keep: list[bool]) -> list[str]:
+    """Return the kept lines, replacing each omitted range by a marker line."""
+    result: list[str] = []
+    omitted = 0
+    for line, is_kept in zip(lines, keep, strict=True):
+        if not is_kept:
+            omitted += 1
+            continue
+        if omitted:
+            result.append(omitted_lines_marker(omitted))
+            omitted = 0
+        result.append(line)
+    if omitted:
+        result.append(omitted_lines_marker(omitted))
+    return result
@@ -0,0 +1,188 @@
+"""
+Field projection for Kubernetes objects.
+
+A projection copies only the allowlisted fields of an object into a new dictionary. Selected
+values are shared with the source object instead of being copied, so projecting a large object
+(e.g. a CRD or a Deployment with many managedFields) costs time proportional to the output, not
+to the input.
+
+Field paths use dots to descend into dictionaries. A ``[]`` suffix applies the rest of the path
+to every item of a list, e.g. ``spec.containers[].name``. The path ``*`` keeps all keys of a level
+that are not listed explicitly.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+LAST_APPLIED_CONFIGURATION_ANNOTATION = "kubectl.kubernetes.io/last-applied-configuration"
+_LIST_SUFFIX = "[]"
+_WILDCARD = "*"
+
+_COMMON_FIELDS: tuple[str, ...] = (
+    "apiVersion",
+    "kind",
+    "metadata.name",
+    "metadata.namespace",
+    "metadata.labels",
+    "metadata.annotations",
+    "metadata.ownerReferences",
+    "metadata.finalizers",
+    "metadata.generation",
+    "metadata.creationTimestamp",
+    "metadata.deletionTimestamp",
+)
+
+# Fields kept for every kind that has no specific allowlist (e.g. custom resources):
+# all top-level fields, but only the useful part of the metadata (no managedFields, uid, etc.).
+DEFAULT_DESCRIBE_FIELDS: tuple[str, ...] = (_WILDCARD, *_COMMON_FIELDS)
+
+_WORKLOAD_TEMPLATE_FIELDS: tuple[str, ...] = (
+    "spec.selector",
+    "spec.template.metadata.labels",
+    "spec.template.metadata.annotations",
+    "spec.template.spec",
+    "status",
+)
+
+# Kind specific allowlists. Keep fields the agents use for troubleshooting and drop the rest.
+DESCRIBE_FIELD_ALLOWLISTS: dict[str, tuple[str, ...]] = {
+    "Pod": (
+        *_COMMON_FIELDS,
+        "spec.containers",
+        "spec.initContainers",
+        "spec.volumes",
+        "spec.nodeName",
+        "spec.nodeSelector",
+        "spec.affinity",
+        "spec.tolerations",
+        "spec.serviceAccountName",
+        "spec.restartPolicy",
+        "spec.securityContext",
+        "status.phase",
+        "status.reason",
+        "status.message",
+        "status.conditions",
+        "status.containerStatuses",
+        "status.initContainerStatuses",
+        "status.podIP",
+        "status.hostIP",
+        "status.startTime",
+        "status.qosClass",
+    ),
+    "Deployment": (
+        *_COMMON_FIELDS,
+        "spec.replicas",
+        "spec.strategy",
+        "spec.paused",
+        "spec.progressDeadlineSeconds",
+        *_WORKLOAD_TEMPLATE_FIELDS,
+    ),
+    "StatefulSet": (
+        *_COMMON_FIELDS,
+        "spec.replicas",
+        "spec.serviceName",
+        "spec.updateStrategy",
+        "spec.podManagementPolicy",
+        "spec.volumeClaimTemplates",
+        *_WORKLOAD_TEMPLATE_FIELDS,
+    ),
+    "DaemonSet": (
+        *_COMMON_FIELDS,
+        "spec.updateStrategy",
+        *_WORKLOAD_TEMPLATE_FIELDS,
+    ),
+    "ReplicaSet": (
+        *_COMMON_FIELDS,
+        "spec.replicas",
+        *_WORKLOAD_TEMPLATE_FIELDS,
+    ),
+}
+
+# Fields kept for events attached to a described resource. The involvedObject is the described
+# resource itself and is therefore dropped.
+EVENT_DESCRIBE_FIELDS: tuple[str, ...] = (
+    "type",
+    "reason",
+    "message",
+    "count",
+    "firstTimestamp",
+    "lastTimestamp",
+    "eventTime",
+    "source",
+    "reportingComponent",
+    "action",
+    "series",
+)
+
+# A compiled projection maps a key to None (keep the whole value) or to a nested projection.
+# The boolean marks whether the nested projection applies to list items.
+Projection = dict[str, tuple[bool, "Projection | None"]]
+
+
+def compile_projection(fields: Iterable[str]) -> Projection:
+    """Compile field paths into a projection tree. Shorter paths win over longer ones."""
+    projection: Projection = {}
+    for field in sorted(fields, key=lambda path: path.count(".")):
+        node: Projection | None = projection
+        parts = field.split(".")
+        for index, part in enumerate(parts):
+            if node is None:
+                # A parent path already selects the whole value.
+                break
+            is_list = part.endswith(_LIST_SUFFIX)
+            key = part.removesuffix(_LIST_SUFFIX)
+            is_leaf = index == len(parts) - 1
+            if key not in node:
+                node[key] = (is_list, None if is_leaf else {})
+            node = node[key][1]
+    return projection
+
+
+def project(obj: dict[str, Any], projection: Projection) -> dict[str, Any]:
+    """Return a new dictionary with only the projected fields of obj. Selected values are shared, not copied."""
+    result: dict[str, Any] = {}
+    if _WILDCARD in projection:
+        result = {key: value for key, value in obj.items() if key not in projection}
+    for key, (is_list, children) in projection.items():
+        if key not in obj:
+            continue
+        value = obj[key]
+        if children is None:
+            result[key] = value
+        elif is_list and isinstance(value, list):
+            result[key] = [project(item, children) if isinstance(item, dict) else item for item in value]
+        elif isinstance(value, dict):
+            result[key] = project(value, children)
+    return result
+
+
+def without_last_applied_configuration(obj: dict[str, Any]) -> dict[str, Any]:
+    """Drop the last-applied-configuration annotation without mutating the (possibly shared) annotations."""
+    annotations = obj.get("metadata", {}).get("annotations")
+    if not annotations or LAST_APPLIED_CONFIGURATION_ANNOTATION not in annotations:
+        return obj
+    remaining = {key: value for key, value in annotations.items() if key != LAST_APPLIED_CONFIGURATION_ANNOTATION}
+    metadata = {key: value for key, value in obj["metadata"].items() if key != "annotations"}
+    if remaining:
+        metadata["annotations"] = remaining
+    return {**obj, "metadata": metadata}
+
+
+class DescribeProjector:
+    """Projects described resources and their events using per-kind allowlists."""
+
+    def __init__(self, allowlists: dict[str, list[str]] | None = None):
+        """Compile the default allowlists, extended or overridden per kind by the given allowlists."""
+        merged: dict[str, Iterable[str]] = {**DESCRIBE_FIELD_ALLOWLISTS, **(allowlists or {})}
+        self._projections = {kind: compile_projection(fields) for kind, fields in merged.items()}
+        self._default_projection = compile_projection(DEFAULT_DESCRIBE_FIELDS)
+        self._event_projection = compile_projection(EVENT_DESCRIBE_FIELDS)
+
+    def project_resource(self, kind: str, obj: dict[str, Any]) -> dict[str, Any]:
+        """Project a resource using the allowlist of its kind."""
+        projected = project(obj, self._projections.get(kind, self._default_projection))
+        return without_last_applied_configuration(projected)
+
+    def project_event(self, event: dict[str, Any]) -> dict[str, Any]:
+        """Project an event of a described resource."""
+        return project(event, self._event_projection)
@@ -0,0 +1,302 @@
+"""
+Conversation-scoped read-through cache for Kubernetes API reads.
+
+During a single conversation the supervisor, the agents and the summarization nodes often
+read the same resources, events and logs. The cache keeps the sanitized result of such reads
+for a short TTL. Single-object entries that carry a ``resourceVersion`` can additionally be
+revalidated after the TTL by a cheap metadata-only request instead of a full re-read.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+from services.metrics import CustomMetrics
+from utils.logging import get_logger
+from utils.settings import (
+    K8S_READ_CACHE_ENABLED,
+    K8S_READ_CACHE_MAX_CONVERSATIONS,
+    K8S_READ_CACHE_MAX_ENTRIES,
+    K8S_READ_CACHE_REVALIDATION_WINDOW_SECONDS,
+    K8S_READ_CACHE_TTL_SECONDS,
+)
+from utils.singleton_meta import SingletonMeta
+
+logger = get_logger(__name__)
+
+
+class K8sReadOperation(StrEnum):
+    """Kubernetes read operations served through the cache."""
+
+    API_REQUEST = "api_request"
+    LIST_RESOURCES = "list_resources"
+    GET_RESOURCE = "get_resource"
+    DESCRIBE_RESOURCE = "describe_resource"
+    LIST_EVENTS = "list_events"
+    POD_LOGS = "pod_logs"
+
+
+class K8sReadCacheResult(StrEnum):
+    """Outcome of a cache lookup."""
+
+    HIT = "hit"
+    MISS = "miss"
+    REVALIDATED = "revalidated"
+
+
+class K8sReadCacheKey(BaseModel):
+    """Identifies a single Kubernetes read."""
+
+    model_config = ConfigDict(frozen=True)
+
+    cluster: str
+    operation: K8sReadOperation
+    api_version: str = ""
+    kind: str = ""
+    namespace: str = ""
+    name: str = ""
+    query: str = ""
+
+
+class K8sReadCacheStats(BaseModel):
+    """Lookup statistics of a single conversation cache."""
+
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+
+    @property
+    def lookups(self) -> int:
+        """Total number of lookups."""
+        return self.hits + self.misses + self.revalidations
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio of lookups served without a full read. Revalidated entries count as hits."""
+        if self.lookups == 0:
+            return 0.0
+        return (self.hits + self.revalidations) / self.lookups
+
+    def since(self, start: "K8sReadCacheStats") -> "K8sReadCacheStats":
+        """Return the lookups after the start snapshot."""
+        return K8sReadCacheStats(
+            hits=self.hits - start.hits,
+            misses=self.misses - start.misses,
+            revalidations=self.revalidations - start.revalidations,
+        )
+
+
+class _CacheEntry:
+    """A cached, already sanitized value."""
+
+    __slots__ = ("value", "resource_version", "expires_at")
+
+    def __init__(self, value: Any, resource_version: str | None, expires_at: float):
+        self.value = value
+        self.resource_version = resource_version
+        self.expires_at = expires_at
+
+
+def get_resource_version(value: Any) -> str | None:
+    """Return the resourceVersion of a single Kubernetes object, or None for lists and other values."""
+    if not isinstance(value, dict):
+        return None
+    if str(value.get("kind", "")).endswith("List"):
+        return None
+    metadata = value.get("metadata")
+    if not isinstance(metadata, dict):
+        return None
+    resource_version = metadata.get("resourceVersion")
+    return str(resource_version) if resource_version else None
+
+
+class K8sReadCache:
+    """
+    Read-through cache for the Kubernetes reads of one conversation.
+
+    Values are stored once, after sanitization, and a deep copy is handed out on every
+    lookup so that callers can mutate their result without corrupting the cache.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = K8S_READ_CACHE_TTL_SECONDS,
+        revalidation_window_seconds: float = K8S_READ_CACHE_REVALIDATION_WINDOW_SECONDS,
+        max_entries: int = K8S_READ_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._revalidation_window_seconds = revalidation_window_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[K8sReadCacheKey, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = K8sReadCacheStats()
+
+    def get_or_load(
+        self,
+        key: K8sReadCacheKey,
+        loader: Callable[[], Any],
+        revalidator: Callable[[], str | None] | None = None,
+        ttl_seconds: float | None = None,
+    ) -> Any:
+        """Return the cached value for the key, or load, store and return it."""
+        entry = self._lookup(key)
+        if entry is not None:
+            return copy.deepcopy(entry.value)
+
+        stale_entry = self._get_revalidation_candidate(key, revalidator is not None)
+        if stale_entry is not None and revalidator is not None:
+            try:
+                current_version = revalidator()
+            except Exception:
+                logger.debug(f"Failed to revalidate cached {key.operation} entry. Falling back to a full read.")
+                current_version = None
+            if current_version == stale_entry.resource_version:
+                self._refresh(key, stale_entry, ttl_seconds)
+                return copy.deepcopy(stale_entry.value)
+
+        value = loader()
+        self._store(key, value, ttl_seconds)
+        return value
+
+    async def aget_or_load(
+        self,
+        key: K8sReadCacheKey,
+        loader: Callable[[], Awaitable[Any]],
+        revalidator: Callable[[], Awaitable[str | None]] | None = None,
+        ttl_seconds: float | None = None,
+    ) -> Any:
+        """Async variant of get_or_load."""
+        entry = self._lookup(key)
+        if entry is not None:
+            return copy.deepcopy(entry.value)
+
+        stale_entry = self._get_revalidation_candidate(key, revalidator is not None)
+        if stale_entry is not None and revalidator is not None:
+            try:
+                current_version = await revalidator()
+            except Exception:
+                logger.debug(f"Failed to revalidate cached {key.operation} entry. Falling back to a full read.")
+                current_version = None
+            if current_version == stale_entry.resource_version:
+                self._refresh(key, stale_entry, ttl_seconds)
+                return copy.deepcopy(stale_entry.value)
+
+        value = await loader()
+        self._store(key, value, ttl_seconds)
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: K8sReadCacheKey) -> _CacheEntry | None:
+        """Return a fresh entry for the key and record a hit, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._clock() >= entry.expires_at:
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+        CustomMetrics().record_k8s_read_cache_lookup(key.operation, K8sReadCacheResult.HIT)
+        return entry
+
+    def _get_revalidation_candidate(self, key: K8sReadCacheKey, can_revalidate: bool) -> _CacheEntry | None:
+        """Return an expired entry that can still be revalidated by its resourceVersion, or None."""
+        if not can_revalidate or self._revalidation_window_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.resource_version is None:
+            return None
+        if self._clock() >= entry.expires_at + self._revalidation_window_seconds:
+            return None
+        return entry
+
+    def _refresh(self, key: K8sReadCacheKey, entry: _CacheEntry, ttl_seconds: float | None) -> None:
+        """Extend the lifetime of a revalidated entry and record the revalidation."""
+        with self._lock:
+            entry.expires_at = self._clock() + (self._ttl_seconds if ttl_seconds is None else ttl_seconds)
+            self.stats.revalidations += 1
+        CustomMetrics().record_k8s_read_cache_lookup(key.operation, K8sReadCacheResult.REVALIDATED)
+
+    def _store(self, key: K8sReadCacheKey, value: Any, ttl_seconds: float | None) -> None:
+        """Store a deep copy of a freshly loaded value and record the miss."""
+        entry = _CacheEntry(
+            value=copy.deepcopy(value),
+            resource_version=get_resource_version(value),
+            expires_at=self._clock() + (self._ttl_seconds if ttl_seconds is None else ttl_seconds),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self.stats.misses += 1
+        CustomMetrics().record_k8s_read_cache_lookup(key.operation, K8sReadCacheResult.MISS)
+
+    def start_turn(self) -> K8sReadCacheStats:
+        """Return a snapshot of the stats at the start of a turn, for record_turn_metrics."""
+        with self._lock:
+            return self.stats.model_copy()
+
+    def record_turn_metrics(self, turn_start: K8sReadCacheStats) -> None:
+        """Export the hit ratio of the lookups of the turn that started with the snapshot."""
+        with self._lock:
+            turn_stats = self.stats.since(turn_start)
+        if turn_stats.lookups == 0:
+            return
+        CustomMetrics().record_k8s_read_cache_conversation_hit_ratio(turn_stats.hit_ratio)
+        logger.debug(
+            f"K8s read cache turn stats: hits={turn_stats.hits}, misses={turn_stats.misses}, "
+            f"revalidations={turn_stats.revalidations}, hit_ratio={turn_stats.hit_ratio:.2f}"
+        )
+
+
+class K8sReadCacheRegistry(metaclass=SingletonMeta):
+    """Keeps one K8sReadCache per conversation, evicting the least recently used conversations."""
+
+    def __init__(self, max_conversations: int = K8S_READ_CACHE_MAX_CONVERSATIONS):
+        self._max_conversations = max_conversations
+        self._caches: OrderedDict[str, K8sReadCache] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_cache(self, conversation_id: str) -> K8sReadCache:
+        """Return the cache of the conversation, creating it if needed."""
+        with self._lock:
+            cache = self._caches.get(conversation_id)
+            if cache is None:
+                cache = K8sReadCache()
+                self._caches[conversation_id] = cache
+            self._caches.move_to_end(conversation_id)
+            while len(self._caches) > self._max_conversations:
+                self._caches.popitem(last=False)
+            return cache
+
+    def remove(self, conversation_id: str) -> None:
+        """Drop the cache of the conversation."""
+        with self._lock:
+            self._caches.pop(conversation_id, None)
+
+    @classmethod
+    def _reset_for_tests(cls) -> None:
+        """Reset the singleton instance. Only use this for testing purpose."""
+        SingletonMeta.reset_instance(cls)
+
+
+def get_k8s_read_cache(conversation_id: str) -> K8sReadCache | None:
+    """Return the read cache of the conversation, or None if the cache is disabled."""
+    if not K8S_READ_CACHE_ENABLED:
+        return None
+    return K8sReadCacheRegistry().get_cache(conversation_id)
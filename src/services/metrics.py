@@ -1,5 +1,6 @@
 import time
 from collections import deque
+from collections.abc import Iterable
 from enum import Enum
 from http import HTTPStatus
 from typing import Any
@@ -9,11 +10,16 @@ from prometheus_client import (
     CONTENT_TYPE_LATEST,
     CollectorRegistry,
     Counter,
+    Gauge,
     Histogram,
     generate_latest,
 )
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.metrics_core import Metric
+from prometheus_client.registry import Collector
 from starlette.routing import Match
 
+from utils.logging import logging_queue_size, logging_stats
 from utils.singleton_meta import SingletonMeta
 
 METRICS_KEY_PREFIX = "kyma_companion"
@@ -22,6 +28,41 @@ USAGE_TRACKER_PUBLISH_FAILURE_METRIC_KEY = f"{METRICS_KEY_PREFIX}_usage_tracker_
 LANGGRAPH_ERROR_METRIC_KEY = f"{METRICS_KEY_PREFIX}_langgraph_error_count"
 HANADB_LATENCY_METRIC_KEY = f"{METRICS_KEY_PREFIX}_tcp_hanadb_latency_seconds"
 LLM_LATENCY_METRIC_KEY = f"{METRICS_KEY_PREFIX}_llm_latency_seconds"
+K8S_READ_CACHE_LOOKUP_METRIC_KEY = f"{METRICS_KEY_PREFIX}_k8s_read_cache_lookup_count"
+K8S_READ_CACHE_HIT_RATIO_METRIC_KEY = f"{METRICS_KEY_PREFIX}_k8s_read_cache_conversation_hit_ratio"
+GATEKEEPER_FAST_PATH_METRIC_KEY = f"{METRICS_KEY_PREFIX}_gatekeeper_fast_path_count"
+PLANNER_CACHE_LOOKUP_METRIC_KEY = f"{METRICS_KEY_PREFIX}_planner_cache_lookup_count"
+PLANNER_CACHE_LATENCY_SAVED_METRIC_KEY = f"{METRICS_KEY_PREFIX}_planner_cache_latency_saved_seconds"
+GRAPH_NODE_LATENCY_METRIC_KEY = f"{METRICS_KEY_PREFIX}_graph_node_latency_seconds"
+GRAPH_NODE_TOKEN_METRIC_KEY = f"{METRICS_KEY_PREFIX}_graph_node_token_count"
+GRAPH_NODE_RETRY_METRIC_KEY = f"{METRICS_KEY_PREFIX}_graph_node_retry_count"
+GRAPH_TOOL_LATENCY_METRIC_KEY = f"{METRICS_KEY_PREFIX}_graph_tool_latency_seconds"
+GRAPH_TURN_LATENCY_METRIC_KEY = f"{METRICS_KEY_PREFIX}_graph_turn_latency_seconds"
+REDIS_COMMAND_LATENCY_METRIC_KEY = f"{METRICS_KEY_PREFIX}_redis_command_latency_seconds"
+REDIS_POOL_WAIT_METRIC_KEY = f"{METRICS_KEY_PREFIX}_redis_pool_wait_seconds"
+REDIS_POOL_CONNECTIONS_IN_USE_METRIC_KEY = f"{METRICS_KEY_PREFIX}_redis_pool_connections_in_use"
+REDIS_CIRCUIT_BREAKER_OPEN_METRIC_KEY = f"{METRICS_KEY_PREFIX}_redis_circuit_breaker_open"
+REDIS_CIRCUIT_BREAKER_REJECTED_METRIC_KEY = f"{METRICS_KEY_PREFIX}_redis_circuit_breaker_rejected_count"
+HEALTH_CHECK_LATENCY_METRIC_KEY = f"{METRICS_KEY_PREFIX}_health_check_latency_seconds"
+HEALTH_CHECK_LLM_INVOCATION_METRIC_KEY = f"{METRICS_KEY_PREFIX}_health_check_llm_invocation_count"
+LOG_RECORDS_DROPPED_METRIC_KEY = f"{METRICS_KEY_PREFIX}_log_records_dropped_count"
+LOG_QUEUE_OVERFLOW_METRIC_KEY = f"{METRICS_KEY_PREFIX}_log_queue_overflow_count"
+LOG_QUEUE_SIZE_METRIC_KEY = f"{METRICS_KEY_PREFIX}_log_queue_size"
+USER_IDENTIFIER_CACHE_LOOKUP_METRIC_KEY = f"{METRICS_KEY_PREFIX}_user_identifier_cache_lookup_count"
+USER_IDENTIFIER_CACHE_SIZE_METRIC_KEY = f"{METRICS_KEY_PREFIX}_user_identifier_cache_size"
+CHAIN_CONSTRUCTION_METRIC_KEY = f"{METRICS_KEY_PREFIX}_chain_construction_count"
+CHAIN_SIZE_METRIC_KEY = f"{METRICS_KEY_PREFIX}_chain_size_bytes"
+TOOL_MEMO_LOOKUP_METRIC_KEY = f"{METRICS_KEY_PREFIX}_tool_memo_lookup_count"
+TOOL_MEMO_HIT_RATIO_METRIC_KEY = f"{METRICS_KEY_PREFIX}_tool_memo_hit_ratio"
+TOOL_RESPONSE_REDUCED_TOKENS_METRIC_KEY = f"{METRICS_KEY_PREFIX}_tool_response_reduced_token_count"
+
+# Redis commands take well below the default buckets of a histogram.
+REDIS_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# label of the graph nodes and tools outside of a graph run.
+GRAPH_NODE_OTHER = "other"
+# nodes of nested subgraphs are labeled with their parent node, e.g. "Supervisor:Planner".
+GRAPH_NODE_LABEL_MAX_DEPTH = 2
 
 
 class LangGraphErrorType(Enum):
@@ -33,6 +74,39 @@ class LangGraphErrorType(Enum):
     CHAIN_ERROR = "chain_error"
 
 
+def graph_node_label(checkpoint_ns: str | None) -> str:
+    """
+    Return the metric label of a graph node from its LangGraph checkpoint namespace,
+    e.g. "Supervisor:<task id>|Planner:<task id>" -> "Supervisor:Planner".
+
+    The label only contains the static node names of the graph up to a fixed depth, so that the
+    number of label values is bounded.
+    """
+    if not checkpoint_ns:
+        return GRAPH_NODE_OTHER
+    names = [part.split(":")[0] for part in checkpoint_ns.split("|")]
+    return ":".join(names[:GRAPH_NODE_LABEL_MAX_DEPTH])
+
+
+class LoggingCollector(Collector):
+    """Collects the counters of the log queue and of the dropped log records, which are kept by utils.logging."""
+
+    def collect(self) -> Iterable[Metric]:
+        """Return the current values of the logging metrics."""
+        dropped = CounterMetricFamily(
+            LOG_RECORDS_DROPPED_METRIC_KEY, "Log records that were dropped instead of written", labels=["reason"]
+        )
+        for reason, count in logging_stats.dropped_records.items():
+            dropped.add_metric([reason], count)
+        yield dropped
+        yield CounterMetricFamily(
+            LOG_QUEUE_OVERFLOW_METRIC_KEY, "Number of times the log queue ran full", value=logging_stats.queue_overflows
+        )
+        yield GaugeMetricFamily(
+            LOG_QUEUE_SIZE_METRIC_KEY, "Log records waiting to be written", value=logging_queue_size()
+        )
+
+
 class CustomMetrics(metaclass=SingletonMeta):
     """A class to handle custom metrics."""
 
@@ -68,6 +142,148 @@ class CustomMetrics(metaclass=SingletonMeta):
             ["is_success"],
             registry=self.registry,
         )
+        self.k8s_read_cache_lookup_count = Counter(
+            K8S_READ_CACHE_LOOKUP_METRIC_KEY,
+            "Kubernetes Read Cache Lookup Count",
+            ["operation", "result"],
+            registry=self.registry,
+        )
+        self.k8s_read_cache_conversation_hit_ratio = Histogram(
+            K8S_READ_CACHE_HIT_RATIO_METRIC_KEY,
+            "Kubernetes Read Cache Hit Ratio per Conversation Turn",
+            buckets=(0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0),
+            registry=self.registry,
+        )
+        self.gatekeeper_fast_path_count = Counter(
+            GATEKEEPER_FAST_PATH_METRIC_KEY,
+            "Gatekeeper Fast Path Decision Count",
+            ["decision"],
+            registry=self.registry,
+        )
+        self.planner_cache_lookup_count = Counter(
+            PLANNER_CACHE_LOOKUP_METRIC_KEY,
+            "Planner Cache Lookup Count",
+            ["result"],
+            registry=self.registry,
+        )
+        self.planner_cache_latency_saved_seconds = Counter(
+            PLANNER_CACHE_LATENCY_SAVED_METRIC_KEY,
+            "Planner Latency Saved by Planner Cache Hits",
+            registry=self.registry,
+        )
+        self.graph_node_latency_seconds = Histogram(
+            GRAPH_NODE_LATENCY_METRIC_KEY,
+            "LangGraph Node Duration",
+            ["node", "is_success"],
+            registry=self.registry,
+        )
+        self.graph_node_token_count = Counter(
+            GRAPH_NODE_TOKEN_METRIC_KEY,
+            "LLM Tokens per LangGraph Node",
+            ["node", "token_type"],
+            registry=self.registry,
+        )
+        self.graph_node_retry_count = Counter(
+            GRAPH_NODE_RETRY_METRIC_KEY,
+            "LLM Chain Retries per LangGraph Node",
+            ["node"],
+            registry=self.registry,
+        )
+        self.graph_tool_latency_seconds = Histogram(
+            GRAPH_TOOL_LATENCY_METRIC_KEY,
+            "Tool Call Duration",
+            ["tool", "is_success"],
+            registry=self.registry,
+        )
+        self.graph_turn_latency_seconds = Histogram(
+            GRAPH_TURN_LATENCY_METRIC_KEY,
+            "Conversation Turn Duration of the LangGraph",
+            ["is_success"],
+            registry=self.registry,
+        )
+        self.redis_command_latency_seconds = Histogram(
+            REDIS_COMMAND_LATENCY_METRIC_KEY,
+            "Redis Command Duration",
+            ["command", "is_success"],
+            buckets=REDIS_LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.redis_pool_wait_seconds = Histogram(
+            REDIS_POOL_WAIT_METRIC_KEY,
+            "Wait Duration for a Connection of the Redis Connection Pool",
+            ["is_success"],
+            buckets=REDIS_LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.redis_pool_connections_in_use = Gauge(
+            REDIS_POOL_CONNECTIONS_IN_USE_METRIC_KEY,
+            "Connections in Use of the Redis Connection Pool",
+            registry=self.registry,
+        )
+        self.redis_circuit_breaker_open = Gauge(
+            REDIS_CIRCUIT_BREAKER_OPEN_METRIC_KEY,
+            "Whether the Redis Circuit Breaker is Open",
+            registry=self.registry,
+        )
+        self.redis_circuit_breaker_rejected_count = Counter(
+            REDIS_CIRCUIT_BREAKER_REJECTED_METRIC_KEY,
+            "Redis Commands Rejected by the Open Circuit Breaker",
+            registry=self.registry,
+        )
+        self.health_check_latency_seconds = Histogram(
+            HEALTH_CHECK_LATENCY_METRIC_KEY,
+            "Duration of the Health Checks of the Background Health Monitor",
+            ["check", "is_healthy"],
+            registry=self.registry,
+        )
+        self.health_check_llm_invocation_count = Counter(
+            HEALTH_CHECK_LLM_INVOCATION_METRIC_KEY,
+            "LLM Invocations of the Health Checks",
+            ["model"],
+            registry=self.registry,
+        )
+        self.user_identifier_cache_lookup_count = Counter(
+            USER_IDENTIFIER_CACHE_LOOKUP_METRIC_KEY,
+            "User Identifier Cache Lookup Count",
+            ["credential_type", "result"],
+            registry=self.registry,
+        )
+        self.user_identifier_cache_size = Gauge(
+            USER_IDENTIFIER_CACHE_SIZE_METRIC_KEY,
+            "Number of Entries of the User Identifier Cache",
+            ["credential_type"],
+            registry=self.registry,
+        )
+        self.chain_construction_count = Counter(
+            CHAIN_CONSTRUCTION_METRIC_KEY,
+            "Constructions of the Prompt Chains of the Chain Registry",
+            ["prompt_id", "model"],
+            registry=self.registry,
+        )
+        self.chain_size_bytes = Gauge(
+            CHAIN_SIZE_METRIC_KEY,
+            "Estimated Memory of the Prompt Chains of the Chain Registry",
+            ["prompt_id", "model"],
+            registry=self.registry,
+        )
+        self.tool_memo_lookup_count = Counter(
+            TOOL_MEMO_LOOKUP_METRIC_KEY,
+            "Lookups of the Tool Result Memo",
+            ["tool", "result"],
+            registry=self.registry,
+        )
+        self.tool_memo_hit_ratio = Gauge(
+            TOOL_MEMO_HIT_RATIO_METRIC_KEY,
+            "Hit Ratio of the Tool Result Memo",
+            ["tool"],
+            registry=self.registry,
+        )
+        self.tool_response_reduced_token_count = Counter(
+            TOOL_RESPONSE_REDUCED_TOKENS_METRIC_KEY,
+            "Tokens Removed from the Tool Responses by the Structural Reduction",
+            registry=self.registry,
+        )
+        self.registry.register(LoggingCollector())
 
     def generate_http_response(self) -> Response:
         """Generate the HTTP response for the metrics."""
@@ -89,6 +305,93 @@ class CustomMetrics(metaclass=SingletonMeta):
         """Record the LLM latency."""
         self.llm_latency.observe(duration)
 
+    def record_k8s_read_cache_lookup(self, operation: str, result: str) -> None:
+        """Record a Kubernetes read cache lookup. Sync because the cache is also used from sync K8s calls."""
+        self.k8s_read_cache_lookup_count.labels(operation=operation, result=result).inc()
+
+    def record_k8s_read_cache_conversation_hit_ratio(self, hit_ratio: float) -> None:
+        """Record the Kubernetes read cache hit ratio of a conversation turn."""
+        self.k8s_read_cache_conversation_hit_ratio.observe(hit_ratio)
+
+    def record_gatekeeper_fast_path_decision(self, decision: str) -> None:
+        """Record a gatekeeper fast path decision: the classified category or a fallback to the LLM."""
+        self.gatekeeper_fast_path_count.labels(decision=decision).inc()
+
+    def record_planner_cache_lookup(self, result: str, latency_saved: float = 0.0) -> None:
+        """Record a planner cache lookup and the planner latency saved by a hit."""
+        self.planner_cache_lookup_count.labels(result=result).inc()
+        if latency_saved > 0:
+            self.planner_cache_latency_saved_seconds.inc(latency_saved)
+
+    def record_graph_node_latency(self, node: str, duration: float, is_success: bool) -> None:
+        """Record the duration of a graph node."""
+        self.graph_node_latency_seconds.labels(node=node, is_success=str(is_success)).observe(duration)
+
+    def record_graph_node_tokens(self, node: str, prompt_tokens: int, completion_tokens: int) -> None:
+        """Record the prompt and completion tokens of an LLM call of a graph node."""
+        self.graph_node_token_count.labels(node=node, token_type="prompt").inc(prompt_tokens)
+        self.graph_node_token_count.labels(node=node, token_type="completion").inc(completion_tokens)
+
+    def record_graph_node_retry(self, node: str) -> None:
+        """Record a retry of an LLM chain of a graph node."""
+        self.graph_node_retry_count.labels(node=node).inc()
+
+    def record_graph_tool_latency(self, tool: str, duration: float, is_success: bool) -> None:
+        """Record the duration of a tool call."""
+        self.graph_tool_latency_seconds.labels(tool=tool, is_success=str(is_success)).observe(duration)
+
+    def record_graph_turn_latency(self, duration: float, is_success: bool) -> None:
+        """Record the duration of a conversation turn of the graph."""
+        self.graph_turn_latency_seconds.labels(is_success=str(is_success)).observe(duration)
+
+    def record_redis_command_latency(self, command: str, duration: float, is_success: bool) -> None:
+        """Record the duration of a Redis command. Sync to keep the overhead per command low."""
+        self.redis_command_latency_seconds.labels(command=command, is_success=str(is_success)).observe(duration)
+
+    def record_redis_pool_wait(self, duration: float, is_success: bool, connections_in_use: int) -> None:
+        """Record the wait for a connection of the Redis connection pool, and the connections in use."""
+        self.redis_pool_wait_seconds.labels(is_success=str(is_success)).observe(duration)
+        self.redis_pool_connections_in_use.set(connections_in_use)
+
+    def record_redis_pool_release(self, connections_in_use: int) -> None:
+        """Record the connections in use after a connection was released to the Redis connection pool."""
+        self.redis_pool_connections_in_use.set(connections_in_use)
+
+    def record_redis_circuit_breaker_state(self, is_open: bool) -> None:
+        """Record whether the Redis circuit breaker is open."""
+        self.redis_circuit_breaker_open.set(int(is_open))
+
+    def record_redis_circuit_breaker_rejection(self) -> None:
+        """Record a Redis command that was rejected by the open circuit breaker."""
+        self.redis_circuit_breaker_rejected_count.inc()
+
+    def record_health_check(self, check: str, duration: float, is_healthy: bool) -> None:
+        """Record the duration and the result of a health check."""
+        self.health_check_latency_seconds.labels(check=check, is_healthy=str(is_healthy)).observe(duration)
+
+    def record_health_check_llm_invocation(self, model: str) -> None:
+        """Record an LLM invocation of a health check, which costs tokens."""
+        self.health_check_llm_invocation_count.labels(model=model).inc()
+
+    def record_user_identifier_cache_lookup(self, credential_type: str, result: str, size: int) -> None:
+        """Record a lookup of the user identifier cache and its size. Sync because it is used by sync callers."""
+        self.user_identifier_cache_lookup_count.labels(credential_type=credential_type, result=result).inc()
+        self.user_identifier_cache_size.labels(credential_type=credential_type).set(size)
+
+    def record_chain_construction(self, prompt_id: str, model: str, size_bytes: int) -> None:
+        """Record a construction of a prompt chain of the chain registry and its estimated memory."""
+        self.chain_construction_count.labels(prompt_id=prompt_id, model=model).inc()
+        self.chain_size_bytes.labels(prompt_id=prompt_id, model=model).set(size_bytes)
+
+    def record_tool_memo_lookup(self, tool: str, result: str, hit_ratio: float) -> None:
+        """Record a lookup of the tool result memo and the hit ratio of the tool."""
+        self.tool_memo_lookup_count.labels(tool=tool, result=result).inc()
+        self.tool_memo_hit_ratio.labels(tool=tool).set(hit_ratio)
+
+    def record_tool_response_reduction(self, reduced_tokens: int) -> None:
+        """Record the tokens removed from a tool response by the structural reduction."""
+        self.tool_response_reduced_token_count.inc(reduced_tokens)
+
     async def monitor_http_requests(self, req: Request, call_next: Any) -> Any:
         """A middleware to monitor HTTP requests."""
         method = req.method
@@ -1,7 +1,10 @@
+import asyncio
 from collections.abc import Callable
+from typing import Any
 
 from langchain_core.embeddings import Embeddings
 
+from services.metrics import CustomMetrics
 from utils.config import get_config
 from utils.logging import get_logger
 from utils.models.factory import IModel, ModelFactory
@@ -81,6 +84,7 @@ class LLMProbe(metaclass=SingletonMeta):
                     f"times, please open a bug report."
                 )
                 response = model.invoke("Test.") if isinstance(model, IModel) else model.embed_query("Test.")
+                CustomMetrics().record_health_check_llm_invocation(name)
                 # If we got a response, we will store the state of the corresponding model.
                 self._model_states[name] = bool(response)
                 if response:
@@ -96,6 +100,46 @@ class LLMProbe(metaclass=SingletonMeta):
 
         return all_ready
 
+    async def aget_llms_states(self) -> dict[str, bool]:
+        """
+        Check the LLMs that are not ready yet concurrently, without blocking the event loop.
+        Like are_llms_ready, a model is not checked again once it is ready.
+
+        Returns:
+            dict[str, bool]: A dictionary where keys are LLM names and values
+            are their readiness states.
+        """
+        await asyncio.gather(
+            *(
+                self._acheck_model(name, model)
+                for name, model in self._models.items()
+                if not self._model_states.get(name, False)
+            )
+        )
+        return self._model_states or {}
+
+    @staticmethod
+    async def _ainvoke_model(model: IModel | Embeddings) -> Any:
+        """Invoke the model with a test input, without blocking the event loop."""
+        if not isinstance(model, IModel):
+            return await model.aembed_query("Test.")
+        if hasattr(model.llm, "ainvoke"):
+            return await model.llm.ainvoke("Test.")
+        # models without an async client, like the Gemini models, are invoked in a worker thread.
+        return await asyncio.to_thread(model.invoke, "Test.")
+
+    async def _acheck_model(self, name: str, model: IModel | Embeddings) -> None:
+        try:
+            logger.info(f"Invoking the model: {name} to check its accessibility.")
+            response = await self._ainvoke_model(model)
+            CustomMetrics().record_health_check_llm_invocation(name)
+            self._model_states[name] = bool(response)
+            if not response:
+                logger.warning(f"{name} connection is not working.")
+        except Exception:
+            logger.exception(f"{name} connection has an error")
+            self._model_states[name] = False
+
     def get_llms_states(self) -> dict[str, bool]:
         """
         Get the readiness states of all LLMs.
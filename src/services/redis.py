@@ -1,13 +1,28 @@
 import ssl
-from collections.abc import Callable
+import time
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+from typing import Any
 
+from redis.asyncio import BlockingConnectionPool, SSLConnection
 from redis.asyncio import Redis as AsyncRedis
+from redis.asyncio.client import Pipeline
+from redis.asyncio.connection import AbstractConnection
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
+from services.metrics import CustomMetrics
 from utils.logging import get_logger
 from utils.settings import (
+    REDIS_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    REDIS_CIRCUIT_BREAKER_RESET_SECONDS,
+    REDIS_COMMAND_TIMEOUT_SECONDS,
+    REDIS_CONNECT_TIMEOUT_SECONDS,
     REDIS_DB_NUMBER,
     REDIS_HOST,
+    REDIS_MAX_CONNECTIONS,
     REDIS_PASSWORD,
+    REDIS_POOL_TIMEOUT_SECONDS,
     REDIS_PORT,
     REDIS_SSL_ENABLED,
 )
@@ -16,6 +31,193 @@ from utils.singleton_meta import SingletonMeta
 logger = get_logger(__name__)
 
 
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class RedisCircuitOpenError(RedisConnectionError):
+    """Raised instead of sending a command to Redis while the circuit breaker is open."""
+
+
+class RedisPoolExhaustedError(RedisConnectionError):
+    """Raised if no connection of the pool became free within the timeout of the pool."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that opens after failure_threshold consecutive failures.
+
+    While the circuit is open, requests are rejected. After reset_seconds, a single trial request is allowed
+    (half open): if it succeeds, the circuit closes, otherwise it stays open for another reset_seconds.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_started = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state of the circuit."""
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        return CircuitState.HALF_OPEN if self._trial_started else CircuitState.OPEN
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent."""
+        if self._opened_at is None:
+            return True
+        if self._clock() - self._opened_at < self.reset_seconds:
+            return False
+        # let a single trial request through, the next one after another reset_seconds
+        # in case the trial never reports its result, e.g. when it is cancelled.
+        self._opened_at = self._clock()
+        self._trial_started = True
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request, which closes the circuit."""
+        if self._opened_at is not None:
+            logger.info("Redis is available again, closing the circuit breaker.")
+        self._failures = 0
+        self._opened_at = None
+        self._trial_started = False
+
+    def record_failure(self) -> None:
+        """Record a failed request, which opens the circuit after failure_threshold consecutive failures."""
+        self._failures += 1
+        if self._trial_started or (self._opened_at is None and self._failures >= self.failure_threshold):
+            if self._opened_at is None:
+                logger.warning(
+                    f"Opening the circuit breaker of Redis for {self.reset_seconds}s "
+                    f"after {self._failures} consecutive failures."
+                )
+            self._opened_at = self._clock()
+            self._trial_started = False
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """
+    Bounded Redis connection pool that records the wait for a free connection and the connections in use.
+    """
+
+    async def get_connection(self, *args: Any, **kwargs: Any) -> AbstractConnection:
+        """Get a connection from the pool, waiting up to the timeout of the pool for a free connection."""
+        start_time = time.perf_counter()
+        try:
+            connection: AbstractConnection = await super().get_connection(*args, **kwargs)
+        except RedisConnectionError as error:
+            CustomMetrics().record_redis_pool_wait(
+                time.perf_counter() - start_time, False, len(self._in_use_connections)
+            )
+            # the pool raises a connection error if the wait for a free connection timed out.
+            if isinstance(error.__cause__, TimeoutError):
+                raise RedisPoolExhaustedError(str(error)) from error
+            raise
+        CustomMetrics().record_redis_pool_wait(time.perf_counter() - start_time, True, len(self._in_use_connections))
+        return connection
+
+    async def release(self, connection: AbstractConnection) -> None:
+        """Release the connection back to the pool."""
+        await super().release(connection)
+        CustomMetrics().record_redis_pool_release(len(self._in_use_connections))
+
+
+async def _execute_with_circuit_breaker(
+    circuit_breaker: CircuitBreaker, command: str, execute: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Execute a command, unless the circuit breaker is open, and record its latency.
+
+    Connection errors and timeouts count as failures of the circuit breaker. Errors returned by Redis,
+    e.g. a wrong type of a key, show that Redis is available. An exhausted connection pool shows that
+    the process is busy, not that Redis is unavailable, so it is neither a failure nor a success.
+    """
+    metrics = CustomMetrics()
+    if not circuit_breaker.allow_request():
+        metrics.record_redis_circuit_breaker_rejection()
+        raise RedisCircuitOpenError(f"Redis is unavailable, the circuit breaker rejected {command}.")
+
+    start_time = time.perf_counter()
+    try:
+        result = await execute()
+    except RedisPoolExhaustedError:
+        metrics.record_redis_command_latency(command, time.perf_counter() - start_time, False)
+        raise
+    except (RedisConnectionError, RedisTimeoutError):
+        circuit_breaker.record_failure()
+        metrics.record_redis_command_latency(command, time.perf_counter() - start_time, False)
+        metrics.record_redis_circuit_breaker_state(circuit_breaker.state != CircuitState.CLOSED)
+        raise
+    except Exception:
+        circuit_breaker.record_success()
+        metrics.record_redis_command_latency(command, time.perf_counter() - start_time, False)
+        raise
+    circuit_breaker.record_success()
+    metrics.record_redis_command_latency(command, time.perf_counter() - start_time, True)
+    metrics.record_redis_circuit_breaker_state(False)
+    return result
+
+
+class HealthAwarePipeline(Pipeline):
+    """
+    Pipeline of a HealthAwareRedis client. The queued commands are sent with the circuit breaker of
+    the client, and the latency of the pipeline is recorded as a single MULTI or PIPELINE command.
+    """
+
+    def __init__(self, *args: Any, circuit_breaker: CircuitBreaker, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.circuit_breaker = circuit_breaker
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        """Execute the queued commands, unless the circuit breaker is open."""
+        execute = super().execute
+        if not self.command_stack and not self.watching:
+            return await execute(raise_on_error)
+        command = "MULTI" if self.is_transaction or self.explicit_transaction else "PIPELINE"
+        result: list[Any] = await _execute_with_circuit_breaker(
+            self.circuit_breaker, command, lambda: execute(raise_on_error)
+        )
+        return result
+
+
+class HealthAwareRedis(AsyncRedis):
+    """
+    AsyncRedis client that records the latency of every command and pipeline, and stops sending
+    commands while Redis is unavailable.
+    """
+
+    def __init__(self, *args: Any, circuit_breaker: CircuitBreaker | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            REDIS_CIRCUIT_BREAKER_FAILURE_THRESHOLD, REDIS_CIRCUIT_BREAKER_RESET_SECONDS
+        )
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        """Execute a command, unless the circuit breaker is open."""
+        execute_command = super().execute_command
+        return await _execute_with_circuit_breaker(
+            self.circuit_breaker, str(args[0]).upper(), lambda: execute_command(*args, **options)
+        )
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> HealthAwarePipeline:
+        """Return a pipeline whose execution is guarded by the circuit breaker of the client."""
+        return HealthAwarePipeline(
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+            circuit_breaker=self.circuit_breaker,
+        )
+
+
 class Redis(metaclass=SingletonMeta):
     """
     Manages a singleton connection to the Redis database.
@@ -78,17 +280,27 @@ class Redis(metaclass=SingletonMeta):
 
 
 def _get_redis_connection() -> AsyncRedis:
-    return AsyncRedis(
+    ssl_kwargs: dict[str, Any] = {}
+    if REDIS_SSL_ENABLED:
+        ssl_kwargs = {
+            "connection_class": SSLConnection,
+            "ssl_ca_certs": "/etc/secret/ca.crt",
+            "ssl_include_verify_flags": [ssl.VERIFY_DEFAULT],
+            "ssl_exclude_verify_flags": [ssl.VERIFY_X509_STRICT],
+            "ssl_min_version": ssl.TLSVersion.TLSv1_3,
+        }
+    pool = InstrumentedConnectionPool(
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT_SECONDS,
         host=str(REDIS_HOST),
         port=REDIS_PORT,
         db=REDIS_DB_NUMBER,
         password=str(REDIS_PASSWORD),
-        ssl=REDIS_SSL_ENABLED,
-        ssl_ca_certs="/etc/secret/ca.crt" if REDIS_SSL_ENABLED else None,
-        ssl_include_verify_flags=([ssl.VERIFY_DEFAULT] if REDIS_SSL_ENABLED else None),
-        ssl_exclude_verify_flags=([ssl.VERIFY_X509_STRICT] if REDIS_SSL_ENABLED else None),
-        ssl_min_version=ssl.TLSVersion.TLSv1_3 if REDIS_SSL_ENABLED else None,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT_SECONDS,
+        socket_timeout=REDIS_COMMAND_TIMEOUT_SECONDS,
+        **ssl_kwargs,
     )
+    return HealthAwareRedis(connection_pool=pool)
 
 
 def get_redis() -> Redis:
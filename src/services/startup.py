@@ -0,0 +1,258 @@
+"""
+Startup phase of the application.
+
+The components that are expensive to build, like the models and the compiled graph of the conversation
+service, the Kubernetes API resources, the key store and the database connections, are built concurrently
+when the application starts, instead of on the first request that needs them. The optional warm-up primes
+the tokenizers, the regular expressions and the connection pools.
+
+The liveness probe does not depend on the startup phase. The readiness probe reports the state and the
+duration of every component, and is not ready until the required components are built. A failed required
+component is retried with exponential backoff, and a component that timed out in its worker thread becomes
+ready if the thread completes later.
+"""
+
+import asyncio
+import inspect
+import time
+from collections.abc import Callable
+from enum import StrEnum
+from functools import partial
+from typing import Any
+
+from pydantic import BaseModel
+
+from agents.common.utils import compute_string_token_count
+from services.data_sanitizer import DataSanitizer
+from services.hana import get_hana
+from services.k8s_resource_discovery import K8sResourceDiscovery
+from services.key_store import KeyStore
+from services.probes import get_llm_probe
+from services.redis import get_redis
+from utils.config import get_config
+from utils.logging import get_logger
+from utils.settings import (
+    MAIN_MODEL_MINI_NAME,
+    MAIN_MODEL_NAME,
+    STARTUP_COMPONENT_RETRIES,
+    STARTUP_COMPONENT_RETRY_BACKOFF_SECONDS,
+    STARTUP_COMPONENT_TIMEOUT_SECONDS,
+    STARTUP_WARM_UP_ENABLED,
+)
+from utils.singleton_meta import SingletonMeta
+
+logger = get_logger(__name__)
+
+WARM_UP_TEXT = "Why is the pod nginx in the namespace default failing? Contact: admin@example.com"
+
+
+class ComponentState(StrEnum):
+    """State of a component of the startup phase."""
+
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class ComponentStatus(BaseModel):
+    """Status of a component of the startup phase."""
+
+    state: ComponentState = ComponentState.PENDING
+    duration_ms: float | None = None
+    error: str | None = None
+    attempts: int = 0
+    # the failure of an optional component, e.g. of the warm-up, does not fail the readiness.
+    required: bool = True
+
+
+class StartupComponent(BaseModel):
+    """
+    A component that is built in the startup phase. A synchronous initialize function runs in a
+    worker thread, so that the components are built concurrently.
+    """
+
+    name: str
+    initialize: Callable[[], Any]
+    required: bool = True
+
+
+def _build_conversation_service() -> None:
+    """Create the models and compile the graph of the conversation service."""
+    # imported here, because the conversation service imports the routers, which import the startup phase.
+    from services.conversation import ConversationService
+
+    ConversationService(config=get_config())
+
+
+def _warm_up_tokenizers() -> None:
+    """Load the tiktoken encodings of the main models."""
+    for model_name in (MAIN_MODEL_NAME, MAIN_MODEL_MINI_NAME):
+        compute_string_token_count(WARM_UP_TEXT, model_name)
+
+
+def _warm_up_regex() -> None:
+    """Compile the regular expressions of the data sanitizer and the resource relations."""
+    DataSanitizer(get_config().sanitization_config).sanitize(WARM_UP_TEXT)
+    K8sResourceDiscovery.get_resource_related_to("v1", "Pod")
+
+
+async def _warm_up_redis_pool() -> None:
+    """Open a connection of the Redis connection pool."""
+    if not await get_redis().is_connection_operational():
+        raise ConnectionError("Redis is not reachable")
+
+
+def _warm_up_hana() -> None:
+    """Check the Hana connection, which caches its health state."""
+    if not get_hana().is_connection_operational():
+        raise ConnectionError("Hana is not reachable")
+
+
+def default_components() -> list[StartupComponent]:
+    """Return the components of the application that are built in the startup phase."""
+    return [
+        StartupComponent(name="conversation_service", initialize=_build_conversation_service),
+        StartupComponent(name="llm_probe", initialize=get_llm_probe),
+        StartupComponent(name="k8s_resource_discovery", initialize=K8sResourceDiscovery.initialize),
+        StartupComponent(name="key_store", initialize=KeyStore),
+        StartupComponent(name="redis", initialize=get_redis),
+        StartupComponent(name="hana", initialize=get_hana),
+    ]
+
+
+def default_warm_up_components() -> list[StartupComponent]:
+    """Return the optional warm-up of the application."""
+    return [
+        StartupComponent(name="warm_up_tokenizers", initialize=_warm_up_tokenizers, required=False),
+        StartupComponent(name="warm_up_regex", initialize=_warm_up_regex, required=False),
+        StartupComponent(name="warm_up_redis_pool", initialize=_warm_up_redis_pool, required=False),
+        StartupComponent(name="warm_up_hana", initialize=_warm_up_hana, required=False),
+    ]
+
+
+class StartupPhase(metaclass=SingletonMeta):
+    """
+    Builds the components concurrently, and then runs the warm-up concurrently.
+
+    Until the startup phase is started, e.g. if the application is not run by uvicorn, it is ready,
+    and the components are built on the first request that needs them.
+    """
+
+    def __init__(
+        self,
+        components: list[StartupComponent] | None = None,
+        warm_up_components: list[StartupComponent] | None = None,
+        timeout_seconds: float = STARTUP_COMPONENT_TIMEOUT_SECONDS,
+        retries: int = STARTUP_COMPONENT_RETRIES,
+        retry_backoff_seconds: float = STARTUP_COMPONENT_RETRY_BACKOFF_SECONDS,
+    ) -> None:
+        self._components = components if components is not None else default_components()
+        if warm_up_components is None:
+            warm_up_components = default_warm_up_components() if STARTUP_WARM_UP_ENABLED else []
+        self._warm_up_components = warm_up_components
+        self._timeout_seconds = timeout_seconds
+        self._retries = retries
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self.statuses = {
+            component.name: ComponentStatus(required=component.required)
+            for component in [*self._components, *self._warm_up_components]
+        }
+        self.is_started = False
+        self.duration_ms: float | None = None
+
+    def start(self) -> "asyncio.Task[None]":
+        """
+        Run the startup phase in a background task on the running event loop. The startup phase is started
+        when the task is created, so it is not ready before the task runs.
+        """
+        self.is_started = True
+        return asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        """Run the startup phase."""
+        self.is_started = True
+        start_time = time.perf_counter()
+        await asyncio.gather(*(self._run_component(component) for component in self._components))
+        await asyncio.gather(*(self._run_component(component) for component in self._warm_up_components))
+        self.duration_ms = round((time.perf_counter() - start_time) * 1000, 1)
+        failed = [name for name, status in self.statuses.items() if status.state == ComponentState.FAILED]
+        logger.info(f"Startup phase finished in {self.duration_ms} ms, failed components: {failed}")
+
+    async def _run_component(self, component: StartupComponent) -> None:
+        """Build the component, and retry a failed required component with exponential backoff."""
+        status = self.statuses[component.name]
+        start_time = time.perf_counter()
+        retries = self._retries if component.required else 0
+        for attempt in range(retries + 1):
+            status.attempts = attempt + 1
+            retriable = await self._initialize_component(component, start_time)
+            status.duration_ms = round((time.perf_counter() - start_time) * 1000, 1)
+            if status.state == ComponentState.READY or not retriable or attempt == retries:
+                return
+            backoff_seconds = self._retry_backoff_seconds * 2**attempt
+            logger.warning(f"Retrying the startup of {component.name} in {backoff_seconds} seconds")
+            await asyncio.sleep(backoff_seconds)
+
+    async def _initialize_component(self, component: StartupComponent, start_time: float) -> bool:
+        """Build the component once, and return whether a failure can be retried."""
+        status = self.statuses[component.name]
+        try:
+            if inspect.iscoroutinefunction(component.initialize):
+                await asyncio.wait_for(component.initialize(), self._timeout_seconds)
+            else:
+                thread = asyncio.ensure_future(asyncio.to_thread(component.initialize))
+                try:
+                    await asyncio.wait_for(asyncio.shield(thread), self._timeout_seconds)
+                except TimeoutError:
+                    # the worker thread keeps running after a timeout, the component is ready once it completes.
+                    thread.add_done_callback(partial(self._complete_late, component.name, start_time))
+                    raise
+            status.state = ComponentState.READY
+            status.error = None
+            return False
+        except TimeoutError:
+            logger.error(f"Startup of {component.name} timed out after {self._timeout_seconds} seconds")
+            status.state = ComponentState.FAILED
+            status.error = f"timed out after {self._timeout_seconds} seconds"
+            # a worker thread cannot be cancelled, so it is not started again while it is running.
+            return inspect.iscoroutinefunction(component.initialize)
+        except Exception as e:
+            logger.exception(f"Startup of {component.name} failed")
+            status.state = ComponentState.FAILED
+            status.error = str(e)
+            return True
+
+    def _complete_late(self, name: str, start_time: float, thread: "asyncio.Future[Any]") -> None:
+        """Update the status of a component whose worker thread completed after the timeout."""
+        status = self.statuses[name]
+        if thread.cancelled():
+            return
+        error = thread.exception()
+        if error is not None:
+            logger.error(f"Startup of {name} failed after the timeout: {error}")
+            status.error = str(error)
+            return
+        logger.info(f"Startup of {name} completed after the timeout")
+        status.state = ComponentState.READY
+        status.error = None
+        status.duration_ms = round((time.perf_counter() - start_time) * 1000, 1)
+
+    def is_ready(self) -> bool:
+        """Check if the required components are built, or the startup phase is not started."""
+        if not self.is_started:
+            return True
+        return all(status.state == ComponentState.READY for status in self.statuses.values() if status.required)
+
+    def get_statuses(self) -> dict[str, ComponentStatus]:
+        """Return the status of every component."""
+        return self.statuses
+
+    @classmethod
+    def _reset_for_tests(cls) -> None:
+        """Reset the singleton instance. Only use for testing purpose."""
+        SingletonMeta.reset_instance(cls)
+
+
+def get_startup_phase() -> StartupPhase:
+    """Return the startup phase of the application."""
+    return StartupPhase()
@@ -1,21 +1,34 @@
 from typing import Any
 
-from langchain_core.runnables import RunnableConfig, RunnableSequence
+from langchain_core.runnables import RunnableConfig, RunnableSequence, ensure_config
 from tenacity import (
+    RetryCallState,
     retry,
     stop_after_attempt,
     wait_incrementing,
 )
 
+from services.metrics import CustomMetrics, graph_node_label
 from utils import logging
+from utils.settings import GRAPH_METRICS_ENABLED
 
 logger = logging.getLogger(__name__)
 
 
+def record_retry(retry_state: RetryCallState) -> None:
+    """Record the retry of a chain for the graph node that invokes it, if the graph metrics are enabled."""
+    if not GRAPH_METRICS_ENABLED:
+        return
+    # inside a graph node, the config of the node run is the current config.
+    node = graph_node_label(ensure_config().get("metadata", {}).get("langgraph_checkpoint_ns"))
+    CustomMetrics().record_graph_node_retry(node)
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_incrementing(start=2, increment=3),
     after=logging.after_log,
+    before_sleep=record_retry,
     reraise=True,
 )
 async def ainvoke_chain(
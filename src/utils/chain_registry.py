@@ -0,0 +1,151 @@
+"""
+Process-wide registry of the compiled prompt chains.
+
+The prompt chains of the agents, the supervisor, the summarizers and the question handlers only depend
+on their prompt and their model, so every chain is built once per process, keyed by its prompt id and
+model name, and shared by all instances and requests. Request specific values, like the query of the
+user, are inputs of the chains instead of partial variables of their prompts. The prompt id of a chain
+whose prompt or tools are configurable depends on them, see prompt_chain_id and bound_tools_chain_id.
+
+A chain is rebuilt if it is requested with another instance of the model, e.g. after the models were
+recreated, so a chain never refers to an outdated model.
+"""
+
+import hashlib
+import sys
+import threading
+import types
+from collections.abc import Callable, Sequence
+from typing import Any, TypeVar
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseLanguageModel
+from pydantic import BaseModel
+
+from services.metrics import CustomMetrics
+from utils.logging import get_logger
+from utils.singleton_meta import SingletonMeta
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# objects that are shared with other chains, and not part of the memory of a chain.
+_SHARED_TYPES = (
+    BaseLanguageModel,
+    Embeddings,
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.MethodType,
+    types.BuiltinFunctionType,
+)
+_CONTAINER_TYPES = (list, tuple, set, frozenset)
+# bounds the estimation of chains that refer to large object graphs.
+ESTIMATE_SIZE_MAX_OBJECTS = 100_000
+
+
+def estimate_size(obj: Any, max_objects: int = ESTIMATE_SIZE_MAX_OBJECTS) -> int:
+    """
+    Estimate the memory of an object and the objects it refers to in bytes, without the models and
+    the classes and functions, which are shared. Only the sizes of the builtin types are used, so no
+    custom __sizeof__ is called.
+    """
+    size = 0
+    seen: set[int] = set()
+    stack = [obj]
+    while stack and len(seen) < max_objects:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SHARED_TYPES):
+            continue
+        seen.add(id(current))
+        if isinstance(current, dict):
+            size += dict.__sizeof__(current)
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, list | tuple | set | frozenset):
+            size += (
+                type(current).__sizeof__(current) if type(current) in _CONTAINER_TYPES else object.__sizeof__(current)
+            )
+            stack.extend(current)
+        elif isinstance(current, str | bytes | int | float):
+            size += sys.getsizeof(current)
+        else:
+            size += object.__sizeof__(current)
+            instance_dict = getattr(current, "__dict__", None)
+            if isinstance(instance_dict, dict):
+                stack.append(instance_dict)
+    return size
+
+
+def prompt_chain_id(name: str, template: str) -> str:
+    """Return the prompt id of a chain whose prompt template is configurable."""
+    return f"{name}_{hashlib.sha256(template.encode()).hexdigest()[:12]}"
+
+
+def bound_tools_chain_id(name: str, prompt: Any, tools: Sequence[Any]) -> str:
+    """Return the prompt id of a chain that binds tools to its model, which depends on the prompt and the tools."""
+    tool_names = [str(getattr(tool, "name", None) or getattr(tool, "__name__", type(tool).__name__)) for tool in tools]
+    return prompt_chain_id(name, "\n".join([repr(prompt), *tool_names]))
+
+
+class ChainStats(BaseModel):
+    """Instantiation count and memory of a registered chain."""
+
+    prompt_id: str
+    model_name: str
+    constructions: int = 0
+    lookups: int = 0
+    size_bytes: int = 0
+
+
+class _RegisteredChain:
+    def __init__(self, chain: Any, model: Any, stats: ChainStats):
+        self.chain = chain
+        self.model = model
+        self.stats = stats
+
+
+class ChainRegistry(metaclass=SingletonMeta):
+    """Registry of the compiled prompt chains, keyed by prompt id and model name."""
+
+    def __init__(self) -> None:
+        self._chains: dict[tuple[str, str], _RegisteredChain] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, prompt_id: str, model: Any, create: Callable[[], T]) -> T:
+        """Return the chain of the prompt and the model, and build it with create if it is not registered."""
+        model_name = str(getattr(model, "name", type(model).__name__))
+        key = (prompt_id, model_name)
+        with self._lock:
+            registered = self._chains.get(key)
+            if registered is None or registered.model is not model:
+                stats = (
+                    registered.stats
+                    if registered is not None
+                    else ChainStats(prompt_id=prompt_id, model_name=model_name)
+                )
+                chain = create()
+                stats.constructions += 1
+                stats.size_bytes = estimate_size(chain)
+                registered = _RegisteredChain(chain, model, stats)
+                self._chains[key] = registered
+                logger.debug(f"Built the chain {prompt_id} of model {model_name} ({stats.size_bytes} bytes)")
+                CustomMetrics().record_chain_construction(prompt_id, model_name, stats.size_bytes)
+            registered.stats.lookups += 1
+            return registered.chain  # type: ignore[no-any-return]
+
+    def get_stats(self) -> list[ChainStats]:
+        """Return the instantiation count and the memory of every registered chain."""
+        with self._lock:
+            return [registered.stats.model_copy() for registered in self._chains.values()]
+
+    @classmethod
+    def _reset_for_tests(cls) -> None:
+        """Reset the singleton instance. Only use for testing purpose."""
+        SingletonMeta.reset_instance(cls)
+
+
+def get_chain_registry() -> ChainRegistry:
+    """Return the chain registry of the process."""
+    return ChainRegistry()
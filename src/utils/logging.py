@@ -1,22 +1,44 @@
+import atexit
+import copy
 import json
+import random
 import sys
 from logging import (
     CRITICAL,
+    WARNING,
+    Filter,
     Formatter,
+    Handler,
     Logger,
     LogRecord,
     StreamHandler,
     getLogger,
 )
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+from threading import Lock
 
 from tenacity import RetryCallState
 
-from utils.settings import LOG_FORMAT, LOG_LEVEL
+from utils.settings import (
+    LOG_ASYNC,
+    LOG_FORMAT,
+    LOG_LEVEL,
+    LOG_MAX_MESSAGE_LENGTH,
+    LOG_QUEUE_SIZE,
+    LOG_SAMPLING_RATES,
+)
+
+DROP_REASON_QUEUE_FULL = "queue_full"
+DROP_REASON_SAMPLED = "sampled"
 
 
 class PrettyJSONFormatter(Formatter):
     """Custom formatter that outputs pretty-printed JSON for development."""
 
+    indent: int | None = 2
+    separators: tuple[str, str] | None = None
+
     def format(self, record: LogRecord) -> str:
         """Format log record as pretty-printed JSON."""
         log_data = {
@@ -44,11 +66,164 @@ class PrettyJSONFormatter(Formatter):
             log_data["stack"] = self.formatStack(record.stack_info)
 
         # Pretty print with indentation and colors for readability
-        return json.dumps(log_data, indent=2, sort_keys=False)
+        return json.dumps(log_data, indent=self.indent, separators=self.separators, sort_keys=False)
+
+
+class CompactJSONFormatter(PrettyJSONFormatter):
+    """Formatter that outputs the fields of PrettyJSONFormatter as single-line JSON."""
+
+    indent = None
+    separators = (",", ":")
+
+
+class LoggingStats:
+    """Counters of the log records that were dropped instead of written."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._overflowing = False
+        self.dropped_records = dict.fromkeys([DROP_REASON_QUEUE_FULL, DROP_REASON_SAMPLED], 0)
+        # number of times the queue ran full, i.e. of consecutive drops because of a full queue.
+        self.queue_overflows = 0
+
+    def record_dropped(self, reason: str) -> None:
+        """Record a dropped log record."""
+        with self._lock:
+            self.dropped_records[reason] += 1
+            if reason == DROP_REASON_QUEUE_FULL and not self._overflowing:
+                self._overflowing = True
+                self.queue_overflows += 1
+
+    def record_queued(self) -> None:
+        """Record a log record that was put on the queue, which ends an overflow."""
+        self._overflowing = False
+
+
+logging_stats = LoggingStats()
+
+
+class SamplingFilter(Filter):
+    """Logs only a fraction of the DEBUG and INFO records of the given loggers and their child loggers."""
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._logger_rates: dict[str, float] = {}
+
+    def rate_of(self, logger_name: str) -> float:
+        """Return the sampling rate of a logger, which is the rate of its closest configured ancestor."""
+        rate = self._logger_rates.get(logger_name)
+        if rate is None:
+            name = logger_name
+            while name not in self.rates and "." in name:
+                name = name.rsplit(".", 1)[0]
+            rate = float(self.rates.get(name, 1.0))
+            self._logger_rates[logger_name] = rate
+        return rate
+
+    def filter(self, record: LogRecord) -> bool:
+        """Return whether the record is logged."""
+        if record.levelno >= WARNING:
+            return True
+        rate = self.rate_of(record.name)
+        if rate >= 1 or random.random() < rate:
+            return True
+        logging_stats.record_dropped(DROP_REASON_SAMPLED)
+        return False
+
+
+class MessageTruncationFilter(Filter):
+    """Truncates log messages that are longer than max_length, e.g. logged request payloads."""
+
+    def __init__(self, max_length: int):
+        super().__init__()
+        self.max_length = max_length
+
+    def filter(self, record: LogRecord) -> bool:
+        """Truncate the message of the record."""
+        message = record.getMessage()
+        if len(message) > self.max_length:
+            message = f"{message[: self.max_length]}... [truncated {len(message) - self.max_length} chars]"
+        record.msg = message
+        record.args = None
+        return True
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Handler that puts the log records on a bounded queue without blocking. The records are formatted
+    and written by the handlers of a QueueListener in its background thread.
+    Records are dropped when the queue is full.
+    """
+
+    def __init__(self, queue_size: int):
+        self.log_queue: Queue[LogRecord | None] = Queue(maxsize=queue_size)
+        super().__init__(self.log_queue)
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        """Merge the arguments into the message, as they might change before the record is written."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: LogRecord) -> None:
+        """Put the record on the queue, or drop it if the queue is full."""
+        try:
+            self.log_queue.put_nowait(record)
+        except Full:
+            logging_stats.record_dropped(DROP_REASON_QUEUE_FULL)
+        else:
+            logging_stats.record_queued()
+
+
+class LogQueueListener(QueueListener):
+    """QueueListener that writes all queued records before it stops, even if the queue is full."""
+
+    def __init__(self, log_queue: Queue[LogRecord | None], *handlers: Handler):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.log_queue = log_queue
+
+    def enqueue_sentinel(self) -> None:
+        """Wait for space on the queue for the stop signal, which is None."""
+        self.log_queue.put(None)
 
 
 # Configure logging programmatically
 _logging_configured: list[bool] = [False]
+# The listener that writes the queued records, if LOG_ASYNC is enabled.
+_queue_listeners: list[LogQueueListener] = []
+
+
+def _stop_queue_listeners() -> None:
+    """Write the queued records and stop the background threads."""
+    while _queue_listeners:
+        _queue_listeners.pop().stop()
+
+
+def logging_queue_size() -> int:
+    """Return the number of log records that wait to be written."""
+    return sum(listener.log_queue.qsize() for listener in _queue_listeners)
+
+
+def _create_handler(console_handler: Handler) -> Handler:
+    """Create the handler of the loggers, which writes to the console handler.
+
+    With LOG_ASYNC, the handler only puts the records on a queue,
+    and the console handler writes them in a background thread.
+    """
+    handler = console_handler
+    if LOG_ASYNC:
+        handler = AsyncQueueHandler(LOG_QUEUE_SIZE)
+        listener = LogQueueListener(handler.log_queue, console_handler)
+        listener.start()
+        _queue_listeners.append(listener)
+    # Sample before truncating, so that dropped records are not formatted.
+    if LOG_SAMPLING_RATES:
+        handler.addFilter(SamplingFilter(LOG_SAMPLING_RATES))
+    if LOG_MAX_MESSAGE_LENGTH > 0:
+        handler.addFilter(MessageTruncationFilter(LOG_MAX_MESSAGE_LENGTH))
+    return handler
 
 
 def _configure_logging() -> None:
@@ -81,6 +256,8 @@ def _configure_logging() -> None:
     elif format_type == "pretty":
         # Pretty-printed JSON for development (no external deps needed)
         formatter = PrettyJSONFormatter()
+    elif format_type == "compact":
+        formatter = CompactJSONFormatter()
     else:
         # Standard human-readable format
         formatter = Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -89,12 +266,16 @@ def _configure_logging() -> None:
     console_handler = StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
 
+    previous_listeners = list(_queue_listeners)
+    _queue_listeners.clear()
+    handler = _create_handler(console_handler)
+
     # Configure root logger
     root_logger = getLogger()
     root_logger.setLevel(LOG_LEVEL)
     # Clear existing handlers to prevent duplicates when reconfiguring
     root_logger.handlers.clear()
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(handler)
 
     # Disable uvicorn.access logger (handled by middleware)
     uvicorn_access = getLogger("uvicorn.access")
@@ -105,12 +286,17 @@ def _configure_logging() -> None:
     # Configure other uvicorn loggers to use our handler
     for logger_name in ["uvicorn", "uvicorn.error"]:
         uvicorn_logger = getLogger(logger_name)
-        uvicorn_logger.handlers = [console_handler]
+        uvicorn_logger.handlers = [handler]
         uvicorn_logger.propagate = False
 
+    # Write the records of the previous configuration, which are still queued.
+    for previous_listener in previous_listeners:
+        previous_listener.stop()
+
 
 # Initialize logging when module is imported
 _configure_logging()
+atexit.register(_stop_queue_listeners)
 
 
 def get_logger(name: str) -> Logger:
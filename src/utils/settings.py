@@ -68,9 +68,20 @@ config_path = load_env_from_json()
 # Read the configs.
 # Logging configuration - can be set in config.json or via environment variables
 # LOG_LEVEL: "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL" (default: INFO)
-# LOG_FORMAT: "json" (structured, production), "pretty" (formatted JSON, dev), or "standard" (human-readable)
+# LOG_FORMAT: "json" (structured, production), "pretty" (formatted JSON, dev), "compact" (single-line JSON),
+#   or "standard" (human-readable)
 LOG_LEVEL = config("LOG_LEVEL", default="INFO")
 LOG_FORMAT = config("LOG_FORMAT", default="json")
+# LOG_ASYNC: put the log records on a bounded queue, which is written to stdout by a background thread,
+#   so that formatting and writing the logs does not block the event loop.
+#   Records are dropped when the queue is full, e.g. when stdout is slower than the logging.
+LOG_ASYNC = config("LOG_ASYNC", default=False, cast=bool)
+LOG_QUEUE_SIZE = config("LOG_QUEUE_SIZE", default=10000, cast=int)
+# LOG_MAX_MESSAGE_LENGTH: truncate longer log messages, e.g. logged request payloads. 0 disables the truncation.
+LOG_MAX_MESSAGE_LENGTH = config("LOG_MAX_MESSAGE_LENGTH", default=0, cast=int)
+# LOG_SAMPLING_RATES: fraction of the DEBUG and INFO records that are logged per logger, e.g. {"access": 0.1}.
+#   The rate of a logger also applies to its child loggers. WARNING and above are always logged.
+LOG_SAMPLING_RATES = config("LOG_SAMPLING_RATES", default="{}", cast=json.loads)
 DEEPEVAL_TESTCASE_VERBOSE = config("DEEPEVAL_TESTCASE_VERBOSE", default="False")
 
 # Server configuration - host and port for uvicorn
@@ -97,7 +108,27 @@ auth_part = f"{user_part}:{REDIS_PASSWORD}@" if REDIS_USER or REDIS_PASSWORD els
 REDIS_URL = f"redis://{auth_part}{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB_NUMBER}"
 REDIS_TTL = config("REDIS_TTL", default=43200, cast=int)  # Default 12 Hours
 KYMA_AGENT_CONVERSATION_TTL = config("KYMA_AGENT_CONVERSATION_TTL", default=604800, cast=int)  # Default 7 Days
+# Checkpoint compaction: store only the changes of a checkpoint to its parent, e.g. the new messages,
+# with a full checkpoint every CHECKPOINT_FULL_INTERVAL checkpoints of a thread.
+CHECKPOINT_COMPACTION_ENABLED = config("CHECKPOINT_COMPACTION_ENABLED", default=False, cast=bool)
+CHECKPOINT_FULL_INTERVAL = config("CHECKPOINT_FULL_INTERVAL", default=20, cast=int)
+# Number of full checkpoints, with the checkpoints based on them, that are kept per thread. 0 keeps all checkpoints.
+CHECKPOINT_KEEP_FULL = config("CHECKPOINT_KEEP_FULL", default=2, cast=int)
+CHECKPOINT_COMPRESSION_ENABLED = config("CHECKPOINT_COMPRESSION_ENABLED", default=True, cast=bool)
+# Number of threads whose last checkpoint is kept in memory to compute the delta of the next checkpoint.
+CHECKPOINT_COMPACTION_CACHE_MAX_THREADS = config("CHECKPOINT_COMPACTION_CACHE_MAX_THREADS", default=500, cast=int)
 REDIS_SSL_ENABLED = config("REDIS_SSL_ENABLED", default=False)
+# Connection pool shared by all Redis clients: a command waits up to REDIS_POOL_TIMEOUT_SECONDS for a free
+# connection when REDIS_MAX_CONNECTIONS connections are in use.
+REDIS_MAX_CONNECTIONS = config("REDIS_MAX_CONNECTIONS", default=50, cast=int)
+REDIS_POOL_TIMEOUT_SECONDS = config("REDIS_POOL_TIMEOUT_SECONDS", default=5, cast=float)
+REDIS_CONNECT_TIMEOUT_SECONDS = config("REDIS_CONNECT_TIMEOUT_SECONDS", default=5, cast=float)
+# Maximum time to wait for the response of a command.
+REDIS_COMMAND_TIMEOUT_SECONDS = config("REDIS_COMMAND_TIMEOUT_SECONDS", default=10, cast=float)
+# After REDIS_CIRCUIT_BREAKER_FAILURE_THRESHOLD consecutive connection errors or timeouts, the Redis commands
+# fail fast for REDIS_CIRCUIT_BREAKER_RESET_SECONDS, before a single command tries Redis again.
+REDIS_CIRCUIT_BREAKER_FAILURE_THRESHOLD = config("REDIS_CIRCUIT_BREAKER_FAILURE_THRESHOLD", default=5, cast=int)
+REDIS_CIRCUIT_BREAKER_RESET_SECONDS = config("REDIS_CIRCUIT_BREAKER_RESET_SECONDS", default=30, cast=float)
 
 # Langfuse
 LANGFUSE_SECRET_KEY = config("LANGFUSE_SECRET_KEY", default="dummy")
@@ -109,9 +140,35 @@ LANGFUSE_MASKING_MODE = config("LANGFUSE_MASKING_MODE", default="REDACTED", cast
 # Summarization
 SUMMARIZATION_TOKEN_UPPER_LIMIT = config("SUMMARIZATION_TOKEN_UPPER_LIMIT", default=3000, cast=int)
 SUMMARIZATION_TOKEN_LOWER_LIMIT = config("SUMMARIZATION_TOKEN_LOWER_LIMIT", default=2000, cast=int)
+# "rolling" folds only the newly evicted messages into the running summary,
+# "full" re-summarizes the running summary together with all messages outside the lower limit.
+SUMMARIZATION_MODE = config("SUMMARIZATION_MODE", default="rolling")
 
 MAX_TOKEN_LIMIT_INPUT_QUERY = config("MAX_TOKEN_LIMIT_INPUT_QUERY", default=8000, cast=int)
 
+# Local fast path in front of the LLM gatekeeper. It only decides the scope of the query, the security
+# classification is still done by an LLM. Queries classified below the confidence threshold (or longer
+# than the maximum length) fall back to the LLM gatekeeper.
+GATEKEEPER_FAST_PATH_ENABLED = config("GATEKEEPER_FAST_PATH_ENABLED", default=False, cast=bool)
+GATEKEEPER_FAST_PATH_CONFIDENCE_THRESHOLD = config(
+    "GATEKEEPER_FAST_PATH_CONFIDENCE_THRESHOLD", default=0.85, cast=float
+)
+GATEKEEPER_FAST_PATH_MAX_QUERY_LENGTH = config("GATEKEEPER_FAST_PATH_MAX_QUERY_LENGTH", default=300, cast=int)
+
+# "sequential" runs the planned subtasks one agent at a time, "parallel" dispatches the agents
+# with pending subtasks concurrently and merges their results before the finalizer.
+AGENT_DISPATCH_MODE = config("AGENT_DISPATCH_MODE", default="sequential")
+
+# Cache of the supervisor planner results. Plans are reused for queries in the same cluster and resource
+# context whose word similarity to the original query is at least the threshold.
+PLANNER_CACHE_ENABLED = config("PLANNER_CACHE_ENABLED", default=False, cast=bool)
+PLANNER_CACHE_TTL_SECONDS = config("PLANNER_CACHE_TTL_SECONDS", default=3600, cast=int)
+PLANNER_CACHE_SIMILARITY_THRESHOLD = config("PLANNER_CACHE_SIMILARITY_THRESHOLD", default=0.9, cast=float)
+PLANNER_CACHE_MAX_ENTRIES = config("PLANNER_CACHE_MAX_ENTRIES", default=1000, cast=int)
+
+# Prometheus metrics per graph node (duration, LLM tokens and retries), per tool call and per turn.
+GRAPH_METRICS_ENABLED = config("GRAPH_METRICS_ENABLED", default=True, cast=bool)
+
 # RAG
 RAG_RELEVANCY_SCORE_THRESHOLD = config("RAG_RELEVANCY_SCORE_THRESHOLD", default=0.5, cast=float)
 
@@ -121,6 +178,9 @@ DATABASE_PORT = config("DATABASE_PORT", cast=int, default=443)
 DATABASE_USER = config("DATABASE_USER", None)
 DATABASE_PASSWORD = config("DATABASE_PASSWORD", None)
 DOCS_TABLE_NAME = config("DOCS_TABLE_NAME", default="kyma_docs")
+# Pointer table of the blue/green publish mode of the doc indexer, which maps DOCS_TABLE_NAME to its active table.
+DOCS_TABLE_POINTER_TABLE = config("DOCS_TABLE_POINTER_TABLE", default="docs_table_pointers")
+DOCS_TABLE_POINTER_REFRESH_SECONDS = config("DOCS_TABLE_POINTER_REFRESH_SECONDS", default=60, cast=int)
 HANA_HEALTH_CHECK_CACHE_TTL_SECONDS = config(
     "HANA_HEALTH_CHECK_CACHE_TTL_SECONDS", default=300, cast=int
 )  # Default 5 minutes
@@ -139,10 +199,66 @@ K8S_API_PAGINATION_LIMIT = config("K8S_API_PAGINATION_LIMIT", 40, cast=int)
 
 K8S_API_PAGINATION_MAX_PAGE = config("K8S_API_PAGINATION_MAX_PAGE", 1, cast=int)
 
+# Conversation-scoped cache for Kubernetes API reads.
+K8S_READ_CACHE_ENABLED = config("K8S_READ_CACHE_ENABLED", default=True, cast=bool)
+K8S_READ_CACHE_TTL_SECONDS = config("K8S_READ_CACHE_TTL_SECONDS", default=15, cast=float)
+K8S_READ_CACHE_LOGS_TTL_SECONDS = config("K8S_READ_CACHE_LOGS_TTL_SECONDS", default=5, cast=float)
+# Expired single-object entries are revalidated by resourceVersion within this window. Set to 0 to disable.
+K8S_READ_CACHE_REVALIDATION_WINDOW_SECONDS = config(
+    "K8S_READ_CACHE_REVALIDATION_WINDOW_SECONDS", default=300, cast=float
+)
+K8S_READ_CACHE_MAX_ENTRIES = config("K8S_READ_CACHE_MAX_ENTRIES", default=256, cast=int)
+K8S_READ_CACHE_MAX_CONVERSATIONS = config("K8S_READ_CACHE_MAX_CONVERSATIONS", default=1000, cast=int)
+
+# Memo of the tool results of the ReAct loops, scoped to a turn of a conversation. Identical tool calls
+# within the turn and the TTL return the memoized result. Only the read-only tools in TOOL_MEMO_TOOLS are memoized.
+TOOL_MEMO_ENABLED = config("TOOL_MEMO_ENABLED", default=True, cast=bool)
+TOOL_MEMO_TTL_SECONDS = config("TOOL_MEMO_TTL_SECONDS", default=60, cast=float)
+TOOL_MEMO_MAX_ENTRIES = config("TOOL_MEMO_MAX_ENTRIES", default=2000, cast=int)
+TOOL_MEMO_TOOLS = config(
+    "TOOL_MEMO_TOOLS",
+    default='["kyma_query_tool", "k8s_query_tool", "fetch_pod_logs_tool", "search_kyma_doc"]',
+    cast=json.loads,
+)
+
+# Cache of the user identifiers derived from the tokens and client certificates.
+# Entries also expire with the token. Set the TTL to 0 to disable the cache.
+USER_IDENTIFIER_CACHE_TTL_SECONDS = config("USER_IDENTIFIER_CACHE_TTL_SECONDS", default=300, cast=float)
+USER_IDENTIFIER_CACHE_MAX_ENTRIES = config("USER_IDENTIFIER_CACHE_MAX_ENTRIES", default=10000, cast=int)
+
+# Time budget of the namespace checks of the resource links of a response.
+RESPONSE_CONVERTER_TIMEOUT_SECONDS = config("RESPONSE_CONVERTER_TIMEOUT_SECONDS", default=5, cast=float)
+
+# How K8sClient.describe_resource builds its output:
+# "full" deep-copies the whole resource, "projection" copies only the allowlisted fields per kind, see
+# services.k8s_projection.DESCRIBE_FIELD_ALLOWLISTS. The projection drops the other fields, e.g. the
+# managedFields and the Pod spec fields outside the allowlist, so it is opt-in.
+K8S_DESCRIBE_MODE = config("K8S_DESCRIBE_MODE", default="full")
+# Per-kind field allowlists for the projection mode, e.g. {"Service": ["apiVersion", "kind", "metadata.name", "spec"]}.
+K8S_DESCRIBE_FIELD_ALLOWLISTS = config("K8S_DESCRIBE_FIELD_ALLOWLISTS", default="{}", cast=json.loads)
+
+# Budgets for reading pod logs.
+# The log tail kept in memory while streaming is bounded by K8S_POD_LOGS_MAX_BYTES, and the returned
+# logs by K8S_POD_LOGS_MAX_TOKENS, preferring lines around errors when the tail does not fit.
+K8S_POD_LOGS_MAX_BYTES = config("K8S_POD_LOGS_MAX_BYTES", default=256 * 1024, cast=int)
+K8S_POD_LOGS_MAX_TOKENS = config("K8S_POD_LOGS_MAX_TOKENS", default=2000, cast=int)
+K8S_POD_LOGS_ERROR_CONTEXT_LINES = config("K8S_POD_LOGS_ERROR_CONTEXT_LINES", default=3, cast=int)
+# Server-side filters (sinceSeconds, limitBytes) pushed down to the Kubernetes API. 0 disables the filter.
+# Note that limitBytes keeps the beginning of the selected range, so it may cut off the newest lines.
+K8S_POD_LOGS_SINCE_SECONDS = config("K8S_POD_LOGS_SINCE_SECONDS", default=0, cast=int)
+K8S_POD_LOGS_LIMIT_BYTES = config("K8S_POD_LOGS_LIMIT_BYTES", default=0, cast=int)
+
 TOTAL_CHUNKS_LIMIT = config("TOTAL_CHUNKS_LIMIT", 2, cast=int)  # Limit the number of allowed chunking of tool response
 
 TOOL_RESPONSE_TOKEN_COUNT_LIMIT = config("TOOL_RESPONSE_TOKEN_COUNT_LIMIT", 10000, cast=int)
 
+# Structural reduction of the tool responses that exceed TOOL_RESPONSE_TOKEN_COUNT_LIMIT, before they are
+# summarized by the LLM. Lists with at least TOOL_RESPONSE_COLLAPSE_MIN_ITEMS items keep
+# TOOL_RESPONSE_EXEMPLARS healthy items per kind, and all anomalous items.
+TOOL_RESPONSE_REDUCTION_ENABLED = config("TOOL_RESPONSE_REDUCTION_ENABLED", default=True, cast=bool)
+TOOL_RESPONSE_COLLAPSE_MIN_ITEMS = config("TOOL_RESPONSE_COLLAPSE_MIN_ITEMS", default=5, cast=int)
+TOOL_RESPONSE_EXEMPLARS = config("TOOL_RESPONSE_EXEMPLARS", default=2, cast=int)
+
 K8S_API_RESOURCES_JSON_FILE = config(
     "K8S_API_RESOURCES_JSON_FILE",
     default=f"{Path(__file__).parent.parent.parent}/config/api_resources.json",
@@ -155,6 +271,24 @@ K8S_RESOURCE_RELATIONS_JSON_FILE = config(
 # set ALLOWED_K8S_DOMAINS to [] if all domains are allowed.
 ALLOWED_K8S_DOMAINS = config("ALLOWED_K8S_DOMAINS", default="[]", cast=json.loads)
 
+# Startup phase, which builds the components concurrently when the application starts.
+# A component that is not built within the timeout fails the readiness until it completes. A failed
+# required component is retried with exponential backoff. The optional warm-up primes the tokenizers,
+# the regular expressions and the connection pools.
+STARTUP_COMPONENT_TIMEOUT_SECONDS = config("STARTUP_COMPONENT_TIMEOUT_SECONDS", default=120, cast=float)
+STARTUP_COMPONENT_RETRIES = config("STARTUP_COMPONENT_RETRIES", default=5, cast=int)
+STARTUP_COMPONENT_RETRY_BACKOFF_SECONDS = config("STARTUP_COMPONENT_RETRY_BACKOFF_SECONDS", default=2, cast=float)
+STARTUP_WARM_UP_ENABLED = config("STARTUP_WARM_UP_ENABLED", default=True, cast=bool)
+
+# Background health monitor, which refreshes the health of every dependency on its own interval.
+# The health probe only serves the cached results. A result older than HEALTH_CHECK_STALENESS_FACTOR
+# intervals is stale and unhealthy. The LLMs are checked rarely, because every check costs tokens.
+HEALTH_CHECK_INTERVAL_SECONDS = config("HEALTH_CHECK_INTERVAL_SECONDS", default=10, cast=float)
+HEALTH_CHECK_LLM_INTERVAL_SECONDS = config("HEALTH_CHECK_LLM_INTERVAL_SECONDS", default=300, cast=float)
+HEALTH_CHECK_TIMEOUT_SECONDS = config("HEALTH_CHECK_TIMEOUT_SECONDS", default=5, cast=float)
+HEALTH_CHECK_LLM_TIMEOUT_SECONDS = config("HEALTH_CHECK_LLM_TIMEOUT_SECONDS", default=30, cast=float)
+HEALTH_CHECK_STALENESS_FACTOR = config("HEALTH_CHECK_STALENESS_FACTOR", default=3, cast=float)
+
 if "pytest" in sys.modules:
     TEST_CLUSTER_URL = config("TEST_CLUSTER_URL", default="")
     TEST_CLUSTER_CA_DATA = config("TEST_CLUSTER_CA_DATA", default="")
@@ -1,7 +1,17 @@
+import threading
+
+
 class SingletonMeta(type):
-    """Singleton metaclass."""
+    """Singleton metaclass.
+
+    The instances may be created concurrently, e.g. by the startup phase, which builds the
+    components in worker threads. Every class has its own lock, so that different singletons
+    are still created concurrently.
+    """
 
     _instances: dict[type, object] = {}
+    _locks: dict[type, threading.RLock] = {}
+    _locks_lock = threading.Lock()
 
     def __call__(cls, *args, **kwargs):  # noqa A002
         """
@@ -9,8 +19,12 @@ class SingletonMeta(type):
         the returned instance.
         """
         if cls not in cls._instances:
-            instance = super().__call__(*args, **kwargs)
-            cls._instances[cls] = instance
+            with SingletonMeta._locks_lock:
+                lock = cls._locks.setdefault(cls, threading.RLock())
+            with lock:
+                if cls not in cls._instances:
+                    instance = super().__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
         return cls._instances[cls]
 
     @classmethod
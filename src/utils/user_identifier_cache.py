@@ -0,0 +1,106 @@
+"""
+Cache of the user identifiers derived from the K8s auth headers.
+
+The same clients send the same token or client certificate with every request, so the identifier is
+cached per credential instead of decoding the token or parsing the certificate on every request. The
+entries are keyed by the SHA-256 digest of the credential, so the cache does not keep the credentials.
+An entry expires after USER_IDENTIFIER_CACHE_TTL_SECONDS, or when the credential expires, whichever is
+earlier. Failures are not cached.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from services.metrics import CustomMetrics
+from utils.settings import USER_IDENTIFIER_CACHE_MAX_ENTRIES, USER_IDENTIFIER_CACHE_TTL_SECONDS
+
+CREDENTIAL_TOKEN = "token"
+CREDENTIAL_CLIENT_CERTIFICATE = "client_certificate"
+
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_EXPIRED = "expired"
+
+
+def credential_digest(credential: str | bytes) -> bytes:
+    """Return the SHA-256 digest of a token or a client certificate."""
+    if isinstance(credential, str):
+        credential = credential.encode()
+    return hashlib.sha256(credential).digest()
+
+
+class UserIdentifierCache:
+    """Bounded LRU cache of user identifiers with a TTL per entry. A TTL or a size of 0 disables the cache."""
+
+    def __init__(
+        self,
+        credential_type: str,
+        max_entries: int = USER_IDENTIFIER_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = USER_IDENTIFIER_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.credential_type = credential_type
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # wall clock time, because the expiry of the credentials is a UNIX timestamp.
+        self._clock = clock
+        # digest of the credential -> (user identifier, expiry timestamp).
+        self._entries: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def is_enabled(self) -> bool:
+        """Check if the cache stores entries."""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, credential: str | bytes) -> str | None:
+        """Return the cached user identifier of the credential, or None if it is not cached or expired."""
+        if not self.is_enabled:
+            return None
+        digest = credential_digest(credential)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                result = CACHE_MISS
+            elif entry[1] <= self._clock():
+                del self._entries[digest]
+                result = CACHE_EXPIRED
+                entry = None
+            else:
+                self._entries.move_to_end(digest)
+                result = CACHE_HIT
+            size = len(self._entries)
+        CustomMetrics().record_user_identifier_cache_lookup(self.credential_type, result, size)
+        return entry[0] if entry is not None else None
+
+    def put(self, credential: str | bytes, user_identifier: str, expires_at: float | None = None) -> None:
+        """Cache the user identifier of the credential until the TTL or the expiry of the credential."""
+        if not self.is_enabled:
+            return
+        expiry = self._clock() + self.ttl_seconds
+        if expires_at is not None:
+            expiry = min(expiry, expires_at)
+        if expiry <= self._clock():
+            return
+        digest = credential_digest(credential)
+        with self._lock:
+            self._entries[digest] = (user_identifier, expiry)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+token_identifier_cache = UserIdentifierCache(CREDENTIAL_TOKEN)
+client_certificate_identifier_cache = UserIdentifierCache(CREDENTIAL_CLIENT_CERTIFICATE)
@@ -9,9 +9,12 @@ from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 from langchain_core.messages import BaseMessage
 
+from utils.user_identifier_cache import client_certificate_identifier_cache, token_identifier_cache
+
 JWT_TOKEN_SUB = "sub"
 JWT_TOKEN_EMAIL = "email"
 JWT_TOKEN_SERVICE_ACCOUNT = "kubernetes.io/serviceaccount/service-account.name"
+JWT_TOKEN_EXP = "exp"
 CN_KEYS = ["common_name", "commonName"]
 
 
@@ -111,30 +114,53 @@ def generate_sha384_hash(data: str) -> str:
 
 
 def get_user_identifier_from_token(token: str) -> str:
-    """Get the user identifier from the token. The output is a SHA384 hash of the user identifier."""
+    """
+    Get the user identifier from the token. The output is a SHA384 hash of the user identifier.
+    It is cached per token until the token expires.
+    """
+    cached_user_identifier = token_identifier_cache.get(token)
+    if cached_user_identifier is not None:
+        return cached_user_identifier
     try:
         payload = parse_k8s_token(token)
-        if JWT_TOKEN_SUB in payload and payload[JWT_TOKEN_SUB] != "":
-            return generate_sha384_hash(str(payload[JWT_TOKEN_SUB]))
-        elif JWT_TOKEN_EMAIL in payload and payload[JWT_TOKEN_EMAIL] != "":
-            return generate_sha384_hash(str(payload[JWT_TOKEN_EMAIL]))
-        elif JWT_TOKEN_SERVICE_ACCOUNT in payload and payload[JWT_TOKEN_SERVICE_ACCOUNT] != "":
-            return generate_sha384_hash(str(payload[JWT_TOKEN_SERVICE_ACCOUNT]))
-        raise ValueError("Invalid token: User identifier not found in token")
+        user_identifier = ""
+        for key in (JWT_TOKEN_SUB, JWT_TOKEN_EMAIL, JWT_TOKEN_SERVICE_ACCOUNT):
+            if key in payload and payload[key] != "":
+                user_identifier = generate_sha384_hash(str(payload[key]))
+                break
+        if user_identifier == "":
+            raise ValueError("Invalid token: User identifier not found in token")
+        expires_at = payload.get(JWT_TOKEN_EXP)
     except Exception as e:
         raise ValueError("Failed to get user identifier from token") from e
+    token_identifier_cache.put(
+        token, user_identifier, float(expires_at) if isinstance(expires_at, int | float) else None
+    )
+    return user_identifier
 
 
 def get_user_identifier_from_client_certificate(client_certificate_data: bytes) -> str:
-    """Get the user identifier from the client certificate. The output is a SHA384 hash of the user identifier."""
+    """
+    Get the user identifier from the client certificate. The output is a SHA384 hash of the user identifier.
+    It is cached per certificate until the certificate expires.
+    """
+    cached_user_identifier = client_certificate_identifier_cache.get(client_certificate_data)
+    if cached_user_identifier is not None:
+        return cached_user_identifier
     try:
         cert = x509.load_pem_x509_certificate(client_certificate_data, default_backend())
+        user_identifier = ""
         # check if the Common Name (CN) is present in the subject.
         for name in cert.subject:
             if name.oid._name in CN_KEYS and name.value != "":
-                return generate_sha384_hash(str(name.value))
-        if str(cert.serial_number) != "":
-            return generate_sha384_hash(str(cert.serial_number))
-        raise ValueError("Invalid client certificate: User identifier not found in certificate")
+                user_identifier = generate_sha384_hash(str(name.value))
+                break
+        if user_identifier == "" and str(cert.serial_number) != "":
+            user_identifier = generate_sha384_hash(str(cert.serial_number))
+        if user_identifier == "":
+            raise ValueError("Invalid client certificate: User identifier not found in certificate")
+        expires_at = cert.not_valid_after_utc.timestamp()
     except Exception as e:
         raise ValueError("Failed to get user identifier from client certificate") from e
+    client_certificate_identifier_cache.put(client_certificate_data, user_identifier, expires_at)
+    return user_identifier
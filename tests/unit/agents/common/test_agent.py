@@ -1,3 +1,4 @@
+import json
 from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
@@ -108,6 +109,59 @@ class TestBaseAgent:
         # check step 2: model
         assert isinstance(chain.steps[1], RunnableLambda)
 
+    @pytest.mark.parametrize(
+        "test_description, second_tools, second_prompt, expected_bound_tools",
+        [
+            (
+                "agents with the same prompt and tools share the chain",
+                [k8s_query_tool],
+                mock_agent_prompt,
+                [[k8s_query_tool]],
+            ),
+            (
+                "agents with other tools bind their own tools",
+                [k8s_query_tool, fetch_pod_logs_tool],
+                mock_agent_prompt,
+                [[k8s_query_tool], [k8s_query_tool, fetch_pod_logs_tool]],
+            ),
+            (
+                "agents with another prompt build their own chain",
+                [k8s_query_tool],
+                ChatPromptTemplate.from_messages([("system", "You are another test agent"), ("human", "{query}")]),
+                [[k8s_query_tool], [k8s_query_tool]],
+            ),
+        ],
+    )
+    def test_create_chain_per_prompt_and_tools(
+        self, test_description, second_tools, second_prompt, expected_bound_tools
+    ):
+        # Given
+        model = MagicMock(spec=IModel)
+        model.name = MAIN_MODEL_NAME
+        model.llm.bind_tools.side_effect = lambda tools: RunnableLambda(lambda _: tools)
+        first_agent = BaseAgent(
+            name="KubernetesAgent",
+            model=model,
+            tools=[k8s_query_tool],
+            agent_prompt=mock_agent_prompt,
+            state_class=BaseAgentState,
+        )
+
+        # When
+        second_agent = BaseAgent(
+            name="KubernetesAgent",
+            model=model,
+            tools=second_tools,
+            agent_prompt=second_prompt,
+            state_class=BaseAgentState,
+        )
+
+        # Then
+        assert [call.args[0] for call in model.llm.bind_tools.call_args_list] == expected_bound_tools, test_description
+        assert first_agent.chain.steps[1].invoke(None) == [k8s_query_tool], test_description
+        assert second_agent.chain.steps[1].invoke(None) == second_tools, test_description
+        assert second_agent.chain.steps[0] == second_prompt, test_description
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
         "test_case, given_state, expected_inputs",
@@ -414,6 +468,46 @@ class TestBaseAgent:
         with pytest.raises(Exception, match="Total number of chunks exceeds TOTAL_CHUNKS_LIMIT"):
             await agent._summarize_tool_response(given_state, {})
 
+    @pytest.mark.asyncio
+    async def test_summarize_tool_response_reduces_before_summarization(self, monkeypatch):
+        # Given: a list of identical pods that only fits the token limit after the structural reduction.
+        agent = mock_agent()
+        agent.tool_response_summarization = Mock()
+        agent.tool_response_summarization.summarize_tool_response = AsyncMock()
+        pods = [
+            {
+                "kind": "Pod",
+                "metadata": {"name": f"app-{index}", "managedFields": [{"manager": "kubectl"}] * 10},
+                "status": {"phase": "Running"},
+            }
+            for index in range(50)
+        ]
+        given_state = BaseAgentState(
+            is_last_step=False,
+            messages=[],
+            remaining_steps=25,
+            agent_messages=[
+                AIMessage(content="Hello"),
+                ToolMessage(content=json.dumps(pods), name="query_tool", tool_call_id="tool_call_id_1"),
+            ],
+            my_task=SubTask(description="test task", task_title="test", assigned_to="KubernetesAgent"),
+        )
+        monkeypatch.setattr(
+            "agents.common.agent.compute_string_token_count",
+            lambda content, model_type: len(content) // 4,
+        )
+        monkeypatch.setattr("agents.common.agent.TOOL_RESPONSE_TOKEN_COUNT_LIMIT", 1000)
+
+        # When
+        result = await agent._summarize_tool_response(given_state, {})
+
+        # Then: the reduced response is used without the LLM summarization.
+        agent.tool_response_summarization.summarize_tool_response.assert_not_called()
+        reduced = json.loads(result)
+        assert [item["metadata"]["name"] for item in reduced if "metadata" in item] == ["app-0", "app-1"]
+        assert "managedFields" not in reduced[0]["metadata"]
+        assert given_state.agent_messages[-1].content == "Summarized"
+
     def test_build_graph(self):
         # Given
         agent = mock_agent()
@@ -28,17 +28,18 @@ class TestToolResponseSummarizer:
     @patch("agents.common.chunk_summarizer.PromptTemplate")
     def test_create_chain(self, mock_prompt_template, summarizer):
         # given
-        user_query = "sample query"
         mock_chain = Mock()
         mock_prompt_template.return_value.__or__.return_value = mock_chain
 
         # when
-        summarizer._create_chain(user_query)
+        summarizer._create_chain()
+        summarizer._create_chain()
 
+        # then
+        # the chain is built once, and the query is an input of the chain.
         mock_prompt_template.assert_called_once_with(
             template=CHUNK_SUMMARIZER_PROMPT,
-            input_variables=["tool_response_chunk"],
-            partial_variables={"query": user_query},
+            input_variables=["tool_response_chunk", "query"],
         )
 
     @pytest.mark.parametrize(
@@ -133,14 +134,14 @@ class TestToolResponseSummarizer:
         # Check first ainvoke_chain call
         mock_ainvoke_chain.assert_any_call(
             mock_chain,
-            {"tool_response_chunk": "Chunk 1"},
+            {"tool_response_chunk": "Chunk 1", "query": user_query},
             config=config,
         )
 
         # Check second ainvoke_chain call
         mock_ainvoke_chain.assert_any_call(
             mock_chain,
-            {"tool_response_chunk": "Chunk 2"},
+            {"tool_response_chunk": "Chunk 2", "query": user_query},
             config=config,
         )
 
@@ -1,6 +1,9 @@
+import asyncio
+import time
 from unittest.mock import Mock
 
 import pytest
+import yaml
 from langchain_core.messages import AIMessage
 
 from agents.common.constants import FINALIZER, MESSAGES, NEW_YAML, UPDATE_YAML
@@ -325,9 +328,15 @@ def test_parse_yamls(response_converter, description, yaml_content, expected_res
     ],
 )
 @pytest.mark.asyncio
-async def test_generate_resource_link(response_converter, description, yaml_config, link_type, expected_link):
-    result = await response_converter._generate_resource_link(yaml_config, link_type)
-    assert result == expected_link
+async def test_resource_link(response_converter, description, yaml_config, link_type, expected_link):
+    yaml_list = [yaml.safe_dump(yaml_config)]
+    metadata_list = response_converter._parse_link_metadata(yaml_list)
+    namespace_states = await response_converter._resolve_namespaces(metadata_list)
+    result = response_converter._build_replacement_list(yaml_list, metadata_list, link_type, namespace_states)
+    if expected_link is None:
+        assert result == yaml_list, description
+    else:
+        assert f"[Apply]({expected_link})" in result[0], description
 
 
 @pytest.mark.parametrize(
@@ -529,8 +538,10 @@ def test_replace_yaml_with_html(response_converter, finalizer_response, replacem
     ids=["single_valid_yaml", "mixed_valid_invalid", "empty_list"],
 )
 @pytest.mark.asyncio
-async def test_create_replacement_list(response_converter, yaml_list, yaml_type, expected):
-    result = await response_converter._create_replacement_list(yaml_list, yaml_type)
+async def test_build_replacement_list(response_converter, yaml_list, yaml_type, expected):
+    metadata_list = response_converter._parse_link_metadata(yaml_list)
+    namespace_states = await response_converter._resolve_namespaces(metadata_list)
+    result = response_converter._build_replacement_list(yaml_list, metadata_list, yaml_type, namespace_states)
 
     # Compare lengths
     assert len(result) == len(expected)
@@ -711,3 +722,79 @@ async def test_convert_final_response(response_converter, state_content, expecte
     state = {"messages": [AIMessage(content=state_content, name=FINALIZER)]}
     result = await response_converter.convert_final_response(state)
     assert " ".join(result[MESSAGES][0].content.split()) == " ".join(expected_content.split())
+
+
+def yaml_block(tag: str, name: str, namespace: str) -> str:
+    return f"""<{tag}>
+apiVersion: v1
+kind: Pod
+metadata:
+  name: {name}
+  namespace: {namespace}
+</{tag}>"""
+
+
+@pytest.mark.asyncio
+async def test_convert_final_response_checks_every_namespace_once_concurrently():
+    # given
+    latency_seconds = 0.2
+    requested_namespaces = []
+
+    async def get_namespace(name):
+        requested_namespaces.append(name)
+        await asyncio.sleep(latency_seconds)
+        return {"metadata": {"name": name}}
+
+    k8s_client = Mock(IK8sClient)
+    k8s_client.get_namespace.side_effect = get_namespace
+    converter = ResponseConverter(k8s_client=k8s_client)
+    blocks = [yaml_block("YAML-NEW", f"pod-{i}", f"ns-{i % 3}") for i in range(6)]
+    blocks += [yaml_block("YAML-UPDATE", f"pod-{i}", f"ns-{i}") for i in range(4)]
+    state = {"messages": [AIMessage(content="\n".join(blocks), name=FINALIZER)]}
+
+    # when
+    start = time.perf_counter()
+    result = await converter.convert_final_response(state)
+    duration = time.perf_counter() - start
+
+    # then
+    assert sorted(requested_namespaces) == ["ns-0", "ns-1", "ns-2", "ns-3"]
+    # the checks run concurrently, so the response takes about one check, not four.
+    assert duration < latency_seconds * len(requested_namespaces)
+    content = result[MESSAGES][0].content
+    assert content.count("[Apply](") == len(blocks)
+    assert "[Apply](/namespaces/ns-3/Pod/pod-3)" in content
+
+
+@pytest.mark.asyncio
+async def test_convert_final_response_within_time_budget():
+    # given
+    async def get_namespace(name):
+        if name == "slow":
+            await asyncio.sleep(10)
+        return {"metadata": {"name": name}}
+
+    k8s_client = Mock(IK8sClient)
+    k8s_client.get_namespace.side_effect = get_namespace
+    timeout_seconds = 0.1
+    converter = ResponseConverter(k8s_client=k8s_client, timeout_seconds=timeout_seconds)
+    blocks = [
+        yaml_block("YAML-NEW", "pod-1", "slow"),
+        yaml_block("YAML-UPDATE", "pod-2", "slow"),
+        yaml_block("YAML-UPDATE", "pod-3", "fast"),
+    ]
+    state = {"messages": [AIMessage(content="\n".join(blocks), name=FINALIZER)]}
+
+    # when
+    start = time.perf_counter()
+    result = await converter.convert_final_response(state)
+    duration = time.perf_counter() - start
+
+    # then
+    # namespaces that are not checked in time are treated as not existing.
+    assert duration < 1
+    content = result[MESSAGES][0].content
+    assert "[Apply](/namespaces/default/Pod)" in content
+    assert "[Apply](/namespaces/slow/Pod/pod-2)" not in content
+    assert "name: pod-2" in content
+    assert "[Apply](/namespaces/fast/Pod/pod-3)" in content
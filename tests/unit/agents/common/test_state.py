@@ -12,6 +12,7 @@ from agents.common.state import (
     SubTask,
     SubTaskStatus,
     UserInput,
+    merge_subtasks,
 )
 from services.k8s import IK8sClient
 
@@ -51,6 +52,46 @@ class TestSubTask:
         assert subtask.status == expected_status
 
 
+def subtask(description: str, assigned_to: str, status: str = SubTaskStatus.PENDING) -> SubTask:
+    return SubTask(description=description, task_title=description, assigned_to=assigned_to, status=status)
+
+
+@pytest.mark.parametrize(
+    "test_description, current, update, expected",
+    [
+        (
+            "should replace an empty plan",
+            [],
+            [subtask("a", "KymaAgent")],
+            [subtask("a", "KymaAgent")],
+        ),
+        (
+            "should reset the plan",
+            [subtask("a", "KymaAgent")],
+            [],
+            [],
+        ),
+        (
+            "should replace a different plan",
+            [subtask("a", "KymaAgent", SubTaskStatus.COMPLETED)],
+            [subtask("b", "KymaAgent")],
+            [subtask("b", "KymaAgent")],
+        ),
+        (
+            "should keep the most advanced status of parallel updates",
+            [subtask("a", "KymaAgent", SubTaskStatus.COMPLETED), subtask("b", "KubernetesAgent")],
+            [subtask("a", "KymaAgent"), subtask("b", "KubernetesAgent", SubTaskStatus.ERROR)],
+            [
+                subtask("a", "KymaAgent", SubTaskStatus.COMPLETED),
+                subtask("b", "KubernetesAgent", SubTaskStatus.ERROR),
+            ],
+        ),
+    ],
+)
+def test_merge_subtasks(test_description, current, update, expected):
+    assert merge_subtasks(current, update) == expected, test_description
+
+
 class TestCompanionState:
     @pytest.mark.parametrize(
         "messages, messages_summary, expected",
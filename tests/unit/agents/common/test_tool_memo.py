@@ -0,0 +1,212 @@
+from typing import Any, TypedDict
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+from langgraph.prebuilt import ToolNode
+
+from agents.common.tool_memo import TOOL_MEMO_HIT, TOOL_MEMO_SCOPE, ToolResultMemo, new_tool_memo_scope
+
+CLUSTER = "https://api.cluster.example.com"
+
+
+class ToolTestState(TypedDict):
+    messages: list[BaseMessage]
+    k8s_client: Any
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingTool:
+    """Fake read-only tool that counts its invocations."""
+
+    def __init__(self):
+        self.invocations = 0
+        self.fail = False
+
+        @tool
+        async def k8s_query_tool(uri: str) -> str:
+            """Query the K8s API."""
+            self.invocations += 1
+            if self.fail:
+                raise ValueError("API server unavailable")
+            return f'{{"uri": "{uri}", "invocation": {self.invocations}}}'
+
+        @tool
+        async def write_tool(uri: str) -> str:
+            """A tool that is not memoized."""
+            self.invocations += 1
+            return uri
+
+        self.tools = [k8s_query_tool, write_tool]
+
+
+def create_tool_graph(memo: ToolResultMemo, tools: list) -> Any:
+    graph = StateGraph(ToolTestState)
+    graph.add_node(
+        "tools",
+        ToolNode(
+            tools,
+            handle_tool_errors=True,
+            wrap_tool_call=memo.wrap_tool_call,
+            awrap_tool_call=memo.awrap_tool_call,
+        ),
+    )
+    graph.add_edge(START, "tools")
+    graph.add_edge("tools", END)
+    return graph.compile()
+
+
+async def call_tool(
+    graph: Any, name: str = "k8s_query_tool", uri: str = "/api/v1/pods", scope: str | None = "turn-1"
+) -> ToolMessage:
+    k8s_client = Mock()
+    k8s_client.get_api_server.return_value = CLUSTER
+    configurable = {"thread_id": "conv-1", TOOL_MEMO_SCOPE: scope} if scope else {"thread_id": "conv-1"}
+    config = {"configurable": configurable}
+    result = await graph.ainvoke(
+        {
+            "k8s_client": k8s_client,
+            "messages": [
+                AIMessage(
+                    content="",
+                    tool_calls=[{"name": name, "args": {"uri": uri}, "id": "call-1", "type": "tool_call"}],
+                )
+            ],
+        },
+        config=config,
+    )
+    return result["messages"][-1]
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def memo(clock):
+    return ToolResultMemo(enabled=True, ttl_seconds=60, max_entries=10, tools=["k8s_query_tool"], clock=clock)
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_are_memoized(memo):
+    # given
+    counting_tool = CountingTool()
+    graph = create_tool_graph(memo, counting_tool.tools)
+
+    # when
+    first = await call_tool(graph)
+    second = await call_tool(graph)
+
+    # then
+    assert counting_tool.invocations == 1
+    assert second.content == first.content
+    assert TOOL_MEMO_HIT not in first.response_metadata
+    assert second.response_metadata[TOOL_MEMO_HIT] is True
+    assert second.tool_call_id == "call-1"
+    assert memo.get_hit_rates() == {"k8s_query_tool": 0.5}
+
+
+@pytest.mark.parametrize(
+    "test_description, second_call, elapsed_seconds, expected_invocations",
+    [
+        ("identical call within the window", {}, 59, 1),
+        ("identical call after the window", {}, 60, 2),
+        ("other arguments", {"uri": "/api/v1/services"}, 0, 2),
+        ("next turn of the conversation", {"scope": "turn-2"}, 0, 2),
+        ("tool that is not memoized", {"name": "write_tool"}, 0, 2),
+    ],
+)
+@pytest.mark.asyncio
+async def test_memo_window_and_key(memo, clock, test_description, second_call, elapsed_seconds, expected_invocations):
+    # given
+    counting_tool = CountingTool()
+    graph = create_tool_graph(memo, counting_tool.tools)
+    await call_tool(graph)
+
+    # when
+    clock.now += elapsed_seconds
+    await call_tool(graph, **second_call)
+
+    # then
+    assert counting_tool.invocations == expected_invocations, test_description
+
+
+@pytest.mark.parametrize(
+    "test_description, memo_kwargs, scope",
+    [
+        ("disabled", {"enabled": False}, "turn-1"),
+        ("TTL of 0", {"ttl_seconds": 0}, "turn-1"),
+        ("call without the memo scope of a turn", {}, None),
+    ],
+)
+@pytest.mark.asyncio
+async def test_calls_are_not_memoized(clock, test_description, memo_kwargs, scope):
+    # given
+    memo = ToolResultMemo(**{"tools": ["k8s_query_tool"], "clock": clock, **memo_kwargs})
+    counting_tool = CountingTool()
+    graph = create_tool_graph(memo, counting_tool.tools)
+
+    # when
+    await call_tool(graph, scope=scope)
+    await call_tool(graph, scope=scope)
+
+    # then
+    expected_invocations = 2
+    assert counting_tool.invocations == expected_invocations, test_description
+    assert len(memo) == 0, test_description
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_are_not_memoized(memo):
+    # given
+    counting_tool = CountingTool()
+    counting_tool.fail = True
+    graph = create_tool_graph(memo, counting_tool.tools)
+
+    # when
+    first = await call_tool(graph)
+    counting_tool.fail = False
+    second = await call_tool(graph)
+
+    # then
+    assert first.status == "error"
+    assert second.status == "success"
+    expected_invocations = 2
+    assert counting_tool.invocations == expected_invocations
+
+
+def test_new_tool_memo_scope():
+    # when
+    scopes = {new_tool_memo_scope() for _ in range(3)}
+
+    # then
+    # every turn has its own scope.
+    expected_scopes = 3
+    assert len(scopes) == expected_scopes
+
+
+@pytest.mark.asyncio
+async def test_memo_evicts_least_recently_used(clock):
+    # given
+    memo = ToolResultMemo(ttl_seconds=60, max_entries=2, tools=["k8s_query_tool"], clock=clock)
+    counting_tool = CountingTool()
+    graph = create_tool_graph(memo, counting_tool.tools)
+
+    # when
+    for uri in ("/a", "/b", "/c", "/a"):
+        await call_tool(graph, uri=uri)
+
+    # then
+    expected_invocations = 4
+    assert counting_tool.invocations == expected_invocations
+    assert len(memo) == memo._max_entries
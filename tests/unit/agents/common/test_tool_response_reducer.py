@@ -0,0 +1,106 @@
+import pytest
+
+from agents.common.tool_response_reducer import COLLAPSED_ITEMS_KEY, is_anomalous, reduce_tool_response
+
+
+def pod(name: str, phase: str = "Running", ready: bool = True, restart_count: int = 0, waiting: bool = False) -> dict:
+    state = {"waiting": {"reason": "CrashLoopBackOff"}} if waiting else {"running": {"startedAt": "2025-01-01"}}
+    return {
+        "kind": "Pod",
+        "metadata": {
+            "name": name,
+            "namespace": "default",
+            "annotations": {"kubectl.kubernetes.io/last-applied-configuration": "{}"},
+            "managedFields": [{"manager": "kubectl", "operation": "Update"}],
+        },
+        "spec": {"containers": [{"name": "app", "image": "nginx"}]},
+        "status": {
+            "phase": phase,
+            "startTime": "2025-01-01T00:00:00Z",
+            "conditions": [{"type": "Ready", "status": str(ready), "lastTransitionTime": "2025-01-01T00:00:00Z"}],
+            "containerStatuses": [{"name": "app", "ready": ready, "restartCount": restart_count, "state": state}],
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    "test_description, item, expected",
+    [
+        ("running and ready pod", pod("a"), False),
+        ("pending pod", pod("a", phase="Pending"), True),
+        ("pod with a restarted container", pod("a", restart_count=3), True),
+        ("pod with a waiting container", pod("a", waiting=True), True),
+        ("pod that is not ready", pod("a", ready=False), True),
+        ("warning event", {"type": "Warning", "reason": "BackOff"}, True),
+        ("normal event", {"type": "Normal", "reason": "Pulled"}, False),
+        ("available deployment", {"spec": {"replicas": 2}, "status": {"readyReplicas": 2}}, False),
+        ("deployment with missing replicas", {"spec": {"replicas": 2}, "status": {"readyReplicas": 1}}, True),
+        ("deployment without ready replicas", {"spec": {"replicas": 2}, "status": {}}, True),
+        ("Kyma resource in error state", {"status": {"state": "Error"}}, True),
+        ("node without pressure", {"status": {"conditions": [{"type": "DiskPressure", "status": "False"}]}}, False),
+        ("node with pressure", {"status": {"conditions": [{"type": "DiskPressure", "status": "True"}]}}, True),
+        ("not an object", "text", False),
+    ],
+)
+def test_is_anomalous(test_description, item, expected):
+    assert is_anomalous(item) == expected, test_description
+
+
+def test_reduce_tool_response_collapses_homogeneous_list():
+    # given
+    pods = [pod(f"app-{index}") for index in range(100)]
+    pods[42] = pod("app-42", waiting=True, restart_count=5)
+
+    # when
+    reduced = reduce_tool_response(pods, min_items=5, exemplars=2)
+
+    # then: the anomalous pod, two exemplars and the summary of the collapsed pods are kept.
+    names = [item["metadata"]["name"] for item in reduced if "metadata" in item]
+    assert names == ["app-0", "app-1", "app-42"]
+    summary = reduced[-1][COLLAPSED_ITEMS_KEY]
+    assert summary["kind"] == "Pod"
+    expected_collapsed = 97
+    assert summary["count"] == expected_collapsed
+    assert "default/app-2" in summary["names"]
+    assert "default/app-42" not in summary["names"]
+    anomalous_pod = next(item for item in reduced if item.get("metadata", {}).get("name") == "app-42")
+    assert anomalous_pod["status"]["containerStatuses"][0]["state"] == {"waiting": {"reason": "CrashLoopBackOff"}}
+
+
+def test_reduce_tool_response_drops_noisy_fields():
+    # given
+    response = {"kind": "PodList", "items": [pod("app-0")]}
+
+    # when
+    reduced = reduce_tool_response(response)
+
+    # then
+    item = reduced["items"][0]
+    assert "managedFields" not in item["metadata"]
+    assert "annotations" not in item["metadata"]
+    assert "startTime" not in item["status"]
+    assert "lastTransitionTime" not in item["status"]["conditions"][0]
+    assert item["status"]["containerStatuses"][0]["state"] == {"running": {"startedAt": "2025-01-01"}}
+    # the response itself is not changed.
+    assert "managedFields" in response["items"][0]["metadata"]
+
+
+@pytest.mark.parametrize(
+    "test_description, items, expected_length",
+    [
+        ("short list is not collapsed", [pod(f"app-{index}") for index in range(4)], 4),
+        ("list of scalars is not collapsed", list(range(50)), 50),
+        ("anomalous items are not collapsed", [pod(f"app-{index}", phase="Failed") for index in range(10)], 10),
+        (
+            "events are collapsed per reason",
+            [{"type": "Normal", "reason": reason, "involvedObject": {}} for reason in ["Pulled"] * 5 + ["Created"] * 5],
+            6,
+        ),
+    ],
+)
+def test_reduce_tool_response_keeps(test_description, items, expected_length):
+    # when
+    reduced = reduce_tool_response(items, min_items=5, exemplars=2)
+
+    # then
+    assert len(reduced) == expected_length, test_description
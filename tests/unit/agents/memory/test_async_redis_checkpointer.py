@@ -3,21 +3,28 @@ import json
 import time
 from collections import defaultdict
 from datetime import UTC, datetime
+from typing import Annotated, TypedDict
 
 import fakeredis
 import pytest
 import pytest_asyncio
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, RemoveMessage, ToolMessage
 from langgraph.checkpoint.base import Checkpoint
 from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph import END, MessagesState, StateGraph
+from langgraph.graph.message import add_messages
 
+from agents.common.state import SubTask
 from agents.memory.async_redis_checkpointer import (
     AsyncRedisSaver,
     _extract_time_from_llm_usage_key,
     _get_llm_usage_key_filter,
     _get_llm_usage_key_prefix,
     _make_llm_usage_key,
+    _make_redis_checkpoint_ids_key,
     _make_redis_checkpoint_key,
     _make_redis_checkpoint_writes_key,
+    _make_redis_full_checkpoints_key,
     _parse_redis_checkpoint_key,
     _parse_redis_checkpoint_writes_key,
     _safe_decode,
@@ -40,6 +47,84 @@ def create_metadata(step: int) -> dict:
     return {"source": "input", "step": step, "writes": {}, "score": 1}
 
 
+def build_conversation_graph(saver: AsyncRedisSaver):
+    """Graph of two nodes that answer a question, and remove the oldest messages of long conversations."""
+
+    def agent(state: MessagesState) -> dict:
+        question = state["messages"][-1]
+        return {"messages": [AIMessage(content=f"answer to {question.content}" * 20, id=f"answer-{question.id}")]}
+
+    def summarizer(state: MessagesState) -> dict:
+        if len(state["messages"]) > 10:  # noqa: PLR2004
+            return {"messages": [RemoveMessage(id=message.id) for message in state["messages"][:2]]}
+        return {}
+
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("agent", agent)
+    workflow.add_node("summarizer", summarizer)
+    workflow.set_entry_point("agent")
+    workflow.add_edge("agent", "summarizer")
+    workflow.add_edge("summarizer", END)
+    return workflow.compile(checkpointer=saver)
+
+
+class PlanState(TypedDict):
+    messages: Annotated[list[AnyMessage], add_messages]
+    subtasks: list[SubTask]
+
+
+def build_plan_graph(saver: AsyncRedisSaver):
+    """Graph whose nodes update the sub-tasks and the messages in place, like the agents do."""
+
+    def planner(state: PlanState) -> dict:
+        return {
+            "subtasks": [
+                SubTask(description=f"task {index}", task_title=f"Checking {index}", assigned_to="KubernetesAgent")
+                for index in range(2)
+            ],
+            "messages": [ToolMessage(content="the tool response", tool_call_id="call-1", id="tool-1")],
+        }
+
+    def first_agent(state: PlanState) -> dict:
+        state["subtasks"][0].complete()
+        return {"messages": [AIMessage(content="first task done", id="answer-1")]}
+
+    def second_agent(state: PlanState) -> dict:
+        state["subtasks"][1].complete()
+        state["messages"][1].content = "Summarized"
+        return {"messages": [AIMessage(content="second task done", id="answer-2")]}
+
+    workflow = StateGraph(PlanState)
+    workflow.add_node("planner", planner)
+    workflow.add_node("first_agent", first_agent)
+    workflow.add_node("second_agent", second_agent)
+    workflow.set_entry_point("planner")
+    workflow.add_edge("planner", "first_agent")
+    workflow.add_edge("first_agent", "second_agent")
+    workflow.add_edge("second_agent", END)
+    return workflow.compile(checkpointer=saver)
+
+
+async def run_conversation(saver: AsyncRedisSaver, thread_id: str, turns: int, first_turn: int = 0) -> list[list]:
+    """Run the turns of a conversation, and return the messages of the checkpoints from the oldest."""
+    graph = build_conversation_graph(saver)
+    config = {"configurable": {"thread_id": thread_id}}
+    for turn in range(first_turn, first_turn + turns):
+        await graph.ainvoke({"messages": [HumanMessage(content=f"question {turn}", id=f"question-{turn}")]}, config)
+    return [
+        checkpoint.checkpoint["channel_values"].get("messages")
+        async for checkpoint in saver.alist({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+    ][::-1]
+
+
+async def stored_checkpoints_size(redis, thread_id: str) -> int:
+    """Return the size of the stored checkpoints of a thread in bytes."""
+    size = 0
+    for key in await redis.keys(_make_redis_checkpoint_key(thread_id, "", "*")):
+        size += len((await redis.hgetall(key))[b"checkpoint"])
+    return size
+
+
 @pytest.mark.asyncio
 class TestAsyncRedisSaver:
     serde = JsonPlusSerializer()
@@ -602,6 +687,148 @@ class TestAsyncRedisSaver:
         for record in records:
             assert record["epoch"] > time.time() - ttl
 
+    @pytest.mark.parametrize(
+        "test_description, full_interval, compression",
+        [
+            ("should reconstruct delta checkpoints", 20, False),
+            ("should reconstruct compressed delta checkpoints", 20, True),
+            ("should reconstruct checkpoints with short chains", 3, True),
+        ],
+    )
+    async def test_compaction_is_lossless(self, fake_async_redis, test_description, full_interval, compression):
+        # given
+        plain_saver = AsyncRedisSaver(conn=fake_async_redis)
+        compacted_saver = AsyncRedisSaver(
+            conn=fake_async_redis,
+            compaction=True,
+            full_interval=full_interval,
+            keep_full=0,
+            compression=compression,
+        )
+
+        # when
+        expected_messages = await run_conversation(plain_saver, "plain-thread", 12)
+        messages = await run_conversation(compacted_saver, "compacted-thread", 12)
+
+        # then
+        assert messages == expected_messages, test_description
+        latest = await compacted_saver.aget_tuple({"configurable": {"thread_id": "compacted-thread"}})
+        assert latest.checkpoint["channel_values"]["messages"] == expected_messages[-1], test_description
+        # the messages of a checkpoint are only stored once.
+        compacted_size = await stored_checkpoints_size(fake_async_redis, "compacted-thread")
+        plain_size = await stored_checkpoints_size(fake_async_redis, "plain-thread")
+        assert compacted_size < plain_size / 2, test_description
+
+    async def test_compaction_of_values_updated_in_place(self, fake_async_redis):
+        # given
+        plain_saver = AsyncRedisSaver(conn=fake_async_redis)
+        compacted_saver = AsyncRedisSaver(conn=fake_async_redis, compaction=True, keep_full=0)
+        question = {"messages": [HumanMessage(content="check my pods", id="question-1")]}
+
+        def channel_values(checkpoints):
+            return [
+                (
+                    [subtask.status for subtask in checkpoint.checkpoint["channel_values"].get("subtasks", [])],
+                    [message.content for message in checkpoint.checkpoint["channel_values"].get("messages", [])],
+                )
+                for checkpoint in checkpoints
+            ]
+
+        # when
+        for saver, thread_id in ((plain_saver, "plain-thread"), (compacted_saver, "compacted-thread")):
+            await build_plan_graph(saver).ainvoke(
+                question, {"configurable": {"thread_id": thread_id}}, durability="sync"
+            )
+
+        # then
+        expected = [
+            checkpoint async for checkpoint in plain_saver.alist({"configurable": {"thread_id": "plain-thread"}})
+        ]
+        checkpoints = [
+            checkpoint
+            async for checkpoint in compacted_saver.alist({"configurable": {"thread_id": "compacted-thread"}})
+        ]
+        assert channel_values(checkpoints) == channel_values(expected)
+        latest = await compacted_saver.aget_tuple({"configurable": {"thread_id": "compacted-thread"}})
+        assert channel_values([latest]) == [
+            (["completed", "completed"], ["check my pods", "Summarized", "first task done", "second task done"])
+        ]
+
+    async def test_compaction_keeps_the_last_full_checkpoints(self, fake_async_redis):
+        # given
+        keep_full = 2
+        full_interval = 4
+        saver = AsyncRedisSaver(
+            conn=fake_async_redis, compaction=True, full_interval=full_interval, keep_full=keep_full
+        )
+
+        # when
+        await run_conversation(saver, "thread-1", 10)
+
+        # then
+        full_checkpoint_ids = [
+            _safe_decode(checkpoint_id)
+            for checkpoint_id in await fake_async_redis.lrange(_make_redis_full_checkpoints_key("thread-1", ""), 0, -1)
+        ]
+        assert len(full_checkpoint_ids) == keep_full
+        checkpoint_ids = [
+            _safe_decode(checkpoint_id)
+            for checkpoint_id in await fake_async_redis.lrange(_make_redis_checkpoint_ids_key("thread-1", ""), 0, -1)
+        ]
+        stored_checkpoint_ids = {
+            _parse_redis_checkpoint_key(_safe_decode(key))["checkpoint_id"]
+            for key in await fake_async_redis.keys(_make_redis_checkpoint_key("thread-1", "", "*"))
+        }
+        # the checkpoints stored before the oldest kept full checkpoint are deleted, with their writes.
+        assert checkpoint_ids[0] == full_checkpoint_ids[0]
+        assert stored_checkpoint_ids == set(checkpoint_ids)
+        assert len(checkpoint_ids) < keep_full * full_interval + full_interval
+        writes_keys = await fake_async_redis.keys(_make_redis_checkpoint_writes_key("thread-1", "", "*", "*", None))
+        assert {
+            _parse_redis_checkpoint_writes_key(_safe_decode(key))["checkpoint_id"] for key in writes_keys
+        } <= stored_checkpoint_ids
+        # the remaining checkpoints can be reconstructed.
+        checkpoints = [checkpoint async for checkpoint in saver.alist({"configurable": {"thread_id": "thread-1"}})]
+        assert len(checkpoints) == len(checkpoint_ids)
+
+    async def test_compaction_without_cached_parent(self, fake_async_redis):
+        # given
+        saver = AsyncRedisSaver(conn=fake_async_redis, compaction=True)
+        await run_conversation(saver, "thread-1", 2)
+        # e.g. the next turn of the conversation is handled by another replica.
+        other_saver = AsyncRedisSaver(conn=fake_async_redis, compaction=True)
+
+        # when
+        messages = await run_conversation(other_saver, "thread-1", 1, first_turn=2)
+
+        # then
+        # the first checkpoint of the other saver is a full checkpoint.
+        full_checkpoints_key = _make_redis_full_checkpoints_key("thread-1", "")
+        assert await fake_async_redis.llen(full_checkpoints_key) == 2  # noqa: PLR2004
+        full_checkpoint_id = _safe_decode(await fake_async_redis.lindex(full_checkpoints_key, -1))
+        full_checkpoint = await fake_async_redis.hgetall(_make_redis_checkpoint_key("thread-1", "", full_checkpoint_id))
+        assert b"deltas" not in full_checkpoint
+        assert [message.content for message in messages[-1] if isinstance(message, HumanMessage)] == [
+            "question 0",
+            "question 1",
+            "question 2",
+        ]
+
+    async def test_compaction_with_missing_chain(self, fake_async_redis):
+        # given
+        saver = AsyncRedisSaver(conn=fake_async_redis, compaction=True, keep_full=0)
+        await run_conversation(saver, "thread-1", 1)
+        full_checkpoint_id = _safe_decode(
+            await fake_async_redis.lindex(_make_redis_full_checkpoints_key("thread-1", ""), 0)
+        )
+        await fake_async_redis.delete(_make_redis_checkpoint_key("thread-1", "", full_checkpoint_id))
+
+        # when
+        latest = await saver.aget_tuple({"configurable": {"thread_id": "thread-1"}})
+
+        # then
+        assert latest is None
+
 
 class TestUtilityFunctions:
     def test_make_redis_checkpoint_key(self):
@@ -0,0 +1,126 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from agents.common.state import SubTask, SubTaskStatus
+from agents.memory.checkpoint_compaction import (
+    CachedCheckpoint,
+    ChannelDeltas,
+    CompactionCache,
+    apply_channel_deltas,
+    compress,
+    compute_channel_deltas,
+    decompress,
+    snapshot_channel_values,
+)
+
+HUMAN = HumanMessage(content="why is my pod failing?", id="1")
+AI = AIMessage(content="the image cannot be pulled", id="2")
+FOLLOW_UP = HumanMessage(content="how do I fix it?", id="3")
+
+serde = JsonPlusSerializer()
+
+
+@pytest.mark.parametrize(
+    "test_description, parent_values, values, expected_stored, expected_deltas",
+    [
+        (
+            "should store only the appended messages",
+            {"messages": [HUMAN, AI]},
+            {"messages": [HUMAN, AI, FOLLOW_UP]},
+            {},
+            ChannelDeltas(appended={"messages": (2, [FOLLOW_UP])}),
+        ),
+        (
+            "should not store channels whose values did not change",
+            {"messages": [HUMAN], "subtasks": ["a"]},
+            {"messages": [HUMAN], "subtasks": ["a"]},
+            {},
+            ChannelDeltas(unchanged=["messages", "subtasks"]),
+        ),
+        (
+            "should store a replaced message after the common prefix",
+            {"messages": [HUMAN, AI]},
+            {"messages": [HUMAN, FOLLOW_UP]},
+            {},
+            ChannelDeltas(appended={"messages": (1, [FOLLOW_UP])}),
+        ),
+        (
+            "should store a list without common prefix",
+            {"messages": [HUMAN, AI]},
+            {"messages": [FOLLOW_UP]},
+            {"messages": [FOLLOW_UP]},
+            ChannelDeltas(),
+        ),
+        (
+            "should store updated values that are not lists and new channels",
+            {"next": "Supervisor"},
+            {"next": "KymaAgent", "error": None},
+            {"next": "KymaAgent", "error": None},
+            ChannelDeltas(),
+        ),
+    ],
+)
+def test_compute_and_apply_channel_deltas(test_description, parent_values, values, expected_stored, expected_deltas):
+    # when
+    stored_values, deltas = compute_channel_deltas(
+        values,
+        snapshot_channel_values(values, serde.dumps_typed),
+        snapshot_channel_values(parent_values, serde.dumps_typed),
+    )
+
+    # then
+    assert stored_values == expected_stored, test_description
+    assert deltas == expected_deltas, test_description
+    # the channel values are reconstructed losslessly.
+    assert apply_channel_deltas(parent_values, stored_values, deltas) == values, test_description
+
+
+def test_compute_channel_deltas_of_objects_updated_in_place():
+    # given
+    subtask = SubTask(description="check the pod", task_title="Checking the pod", assigned_to="KubernetesAgent")
+    message = AIMessage(content="the tool response", id="4")
+    values = {"subtasks": [subtask], "messages": [HUMAN, message]}
+    parent_snapshot = snapshot_channel_values(values, serde.dumps_typed)
+    parent_values = {"subtasks": [subtask.model_copy()], "messages": [HUMAN, message.model_copy()]}
+
+    # when
+    # the nodes update the objects of the parent checkpoint in place.
+    subtask.complete()
+    message.content = "Summarized"
+    stored_values, deltas = compute_channel_deltas(
+        values, snapshot_channel_values(values, serde.dumps_typed), parent_snapshot
+    )
+
+    # then
+    assert stored_values == {"subtasks": [subtask]}
+    assert deltas == ChannelDeltas(appended={"messages": (1, [message])})
+    channel_values = apply_channel_deltas(parent_values, stored_values, deltas)
+    assert channel_values["subtasks"][0].status == SubTaskStatus.COMPLETED
+    assert channel_values["messages"][-1].content == "Summarized"
+
+
+def test_compress():
+    data = b"the message history compresses well " * 100
+    compressed = compress(data)
+    assert len(compressed) < len(data)
+    assert decompress(compressed) == data
+
+
+def test_compaction_cache():
+    # given
+    cache = CompactionCache(max_threads=2)
+    cache.put("thread-1", "", CachedCheckpoint(checkpoint_id="1", snapshot={}, chain=["1"]))
+    cache.put("thread-2", "", CachedCheckpoint(checkpoint_id="1", snapshot={}, chain=["1"]))
+
+    # when
+    # thread-1 is used, so thread-2 is evicted.
+    assert cache.get_parent("thread-1", "", "1") is not None
+    cache.put("thread-3", "", CachedCheckpoint(checkpoint_id="1", snapshot={}, chain=["1"]))
+
+    # then
+    assert cache.get_parent("thread-1", "", "1") is not None
+    assert cache.get_parent("thread-2", "", "1") is None
+    # the cached checkpoint is only returned if it is the parent.
+    assert cache.get_parent("thread-1", "", "0") is None
+    assert cache.get_parent("thread-1", "ns", "1") is None
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from langchain_core.messages import (
@@ -11,7 +11,7 @@ from langchain_core.messages import (
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel
 
-from agents.summarization.summarization import MessageSummarizer
+from agents.summarization.summarization import MessageSummarizer, SummarizationMode
 from agents.supervisor.agent import SUPERVISOR
 from utils.models.factory import IModel
 from utils.settings import MAIN_MODEL_NAME
@@ -334,3 +334,137 @@ class TestSummarization:
 
         result = await summarization.summarization_node(state, {})
         assert result == expected_result
+
+
+def count_words(text: str, model_type: str) -> int:
+    return len(text.split())
+
+
+class TestRollingSummarization:
+    @pytest.fixture(autouse=True)
+    def word_tokenizer(self):
+        with patch(
+            "agents.summarization.summarization.compute_string_token_count", side_effect=count_words
+        ) as tokenizer:
+            yield tokenizer
+
+    def new_summarizer(self, mode: SummarizationMode) -> MessageSummarizer:
+        model = Mock(spec=IModel)
+        model.llm = Mock()
+        summarization = MessageSummarizer(
+            model=model,
+            tokenizer_model_name=MAIN_MODEL_NAME,
+            token_lower_limit=12,
+            token_upper_limit=20,
+            mode=mode,
+        )
+        summarization._chain = Mock()
+        summarization._chain.ainvoke = AsyncMock(return_value=AIMessage(content="new summary"))
+        return summarization
+
+    def test_get_messages_token_count_tokenizes_each_message_once(self, word_tokenizer):
+        # given
+        summarization = self.new_summarizer(SummarizationMode.ROLLING)
+        messages = [HumanMessage(id="1", content="one two"), AIMessage(id="2", content="three")]
+
+        # when
+        counts = [summarization.get_messages_token_count(messages) for _ in range(3)]
+        messages[1].content = "three four"
+        updated_count = summarization.get_messages_token_count(messages)
+
+        # then: only new or changed messages are tokenized again.
+        assert counts == [3, 3, 3]
+        assert updated_count == sum(count_words(str(m.content), MAIN_MODEL_NAME) for m in messages)
+        assert word_tokenizer.call_count == len(messages) + 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "test_description, mode, expected_summarized, expected_removed_ids",
+        [
+            (
+                "rolling mode should fold only the evicted messages into the summary",
+                SummarizationMode.ROLLING,
+                ["old summary a b c d e", "m1 a b c d", "m2 a b c d", "m3 a b c d"],
+                ["1", "2", "3"],
+            ),
+            (
+                "full mode should count the summary into the kept messages",
+                SummarizationMode.FULL,
+                ["old summary a b c d e", "m1 a b c d", "m2 a b c d"],
+                ["1", "2"],
+            ),
+        ],
+    )
+    async def test_summarization_node(self, test_description, mode, expected_summarized, expected_removed_ids):
+        # given
+        summarization = self.new_summarizer(mode)
+
+        class TestState(BaseModel):
+            messages: list
+            messages_summary: str
+
+        state = TestState(
+            messages=[HumanMessage(id=str(i), content=f"m{i} a b c d") for i in range(1, 5)],
+            messages_summary="old summary a b c d e",
+        )
+
+        # when
+        result = await summarization.summarization_node(state, {})
+
+        # then
+        summarized = summarization._chain.ainvoke.call_args.kwargs["input"]["messages"]
+        assert [m.content for m in summarized] == expected_summarized, test_description
+        assert result["messages"] == [RemoveMessage(id=i) for i in expected_removed_ids], test_description
+        assert result["messages_summary"] == "Summary of previous chat:\n new summary"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "test_description, mode, summary, expected_kept",
+        [
+            (
+                "rolling mode should keep the latest messages next to a summary above the lower limit",
+                SummarizationMode.ROLLING,
+                "old summary " + "word " * 20,
+                ["m4 a b c d"],
+            ),
+            (
+                "rolling mode should keep the last user turn even if it exceeds the lower limit",
+                SummarizationMode.ROLLING,
+                "old summary",
+                ["query a b c d", "tool result " + "word " * 12, "answer a b c"],
+            ),
+            (
+                "full mode should keep the last user turn even if it exceeds the lower limit",
+                SummarizationMode.FULL,
+                "old summary",
+                ["query a b c d", "tool result " + "word " * 12, "answer a b c"],
+            ),
+        ],
+    )
+    async def test_summarization_node_keeps_the_current_query(self, test_description, mode, summary, expected_kept):
+        # given
+        summarization = self.new_summarizer(mode)
+
+        class TestState(BaseModel):
+            messages: list
+            messages_summary: str
+
+        if summary.startswith("old summary word"):
+            messages = [HumanMessage(id=str(i), content=f"m{i} a b c d") for i in range(1, 5)]
+        else:
+            messages = [
+                HumanMessage(id="1", content="m1 a b c d"),
+                AIMessage(id="2", content="m2 a b c d"),
+                HumanMessage(id="3", content="query a b c d"),
+                AIMessage(id="4", content="tool result " + "word " * 12),
+                AIMessage(id="5", content="answer a b c"),
+            ]
+        state = TestState(messages=messages, messages_summary=summary)
+
+        # when
+        result = await summarization.summarization_node(state, {})
+
+        # then
+        removed_ids = {message.id for message in result["messages"]}
+        kept = [message.content for message in messages if message.id not in removed_ids]
+        assert kept == expected_kept, test_description
@@ -0,0 +1,213 @@
+from unittest.mock import patch
+
+import pytest
+
+from agents.common.constants import COMMON, K8S_AGENT, KYMA_AGENT
+from agents.common.state import SubTask, SubTaskStatus, UserInput
+from agents.supervisor.plan_cache import PlanCache, PlanCacheResult, normalize_query
+
+MEMBERS = [KYMA_AGENT, K8S_AGENT, COMMON]
+MAX_ENTRIES = 2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def pod_input(query: str, name: str = "", namespace: str = "") -> UserInput:
+    return UserInput(
+        query=query,
+        resource_kind="Pod",
+        resource_api_version="v1",
+        resource_name=name,
+        namespace=namespace,
+        resource_scope="namespaced",
+    )
+
+
+def subtasks(description: str, assigned_to: str = K8S_AGENT) -> list[SubTask]:
+    return [SubTask(description=description, task_title="Checking the pod", assigned_to=assigned_to)]
+
+
+@pytest.fixture
+def mock_metrics():
+    with patch("agents.supervisor.plan_cache.CustomMetrics") as mock:
+        yield mock.return_value
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return PlanCache(ttl_seconds=60, similarity_threshold=0.8, max_entries=MAX_ENTRIES, clock=clock)
+
+
+@pytest.mark.parametrize(
+    "test_description, query, expected",
+    [
+        ("should ignore case and punctuation", "Why is my Pod crashing?!", "why is my pod crashing"),
+        ("should keep resource names", "Check pod nginx-7d4b9 in my.ns", "check pod nginx-7d4b9 in my.ns"),
+        (
+            "should expand negated contractions",
+            "Why isn't my pod ready? I can't see it",
+            "why is not my pod ready i can not see it",
+        ),
+    ],
+)
+def test_normalize_query(test_description, query, expected):
+    assert normalize_query(query) == expected, test_description
+
+
+class TestPlanCache:
+    def test_lookup_returns_fresh_pending_subtasks(self, cache, mock_metrics):
+        # given
+        cache.store(pod_input("Why is my pod crashing?"), subtasks("why is my pod crashing"), planner_latency=1.5)
+
+        # when
+        first = cache.lookup(pod_input("why is my pod crashing"), MEMBERS)
+        first[0].complete()
+        second = cache.lookup(pod_input("why is my pod crashing"), MEMBERS)
+
+        # then
+        assert second == subtasks("why is my pod crashing")
+        assert second[0].status == SubTaskStatus.PENDING
+        mock_metrics.record_planner_cache_lookup.assert_called_with(PlanCacheResult.HIT, 1.5)
+
+    @pytest.mark.parametrize(
+        "test_description, user_input, members, expected_result",
+        [
+            (
+                "should serve a similar query",
+                pod_input("why is my pod crashing again and again"),
+                MEMBERS,
+                PlanCacheResult.HIT,
+            ),
+            (
+                "should not serve a dissimilar query",
+                pod_input("how do I scale my deployment"),
+                MEMBERS,
+                PlanCacheResult.MISS,
+            ),
+            (
+                "should not serve a query of another resource context",
+                UserInput(query="why is my pod crashing again", resource_kind="Function"),
+                MEMBERS,
+                PlanCacheResult.MISS,
+            ),
+            (
+                "should not serve a similar query with another negation",
+                pod_input("why is my pod not crashing again"),
+                MEMBERS,
+                PlanCacheResult.MISS,
+            ),
+            (
+                "should reject a plan with agents that are not available",
+                pod_input("why is my pod crashing again"),
+                [KYMA_AGENT, COMMON],
+                PlanCacheResult.REJECTED,
+            ),
+        ],
+    )
+    def test_lookup(self, cache, mock_metrics, test_description, user_input, members, expected_result):
+        # given
+        cache.store(pod_input("why is my pod crashing again"), subtasks("why is my pod crashing again"), 1.0)
+
+        # when
+        result = cache.lookup(user_input, members)
+
+        # then
+        assert (result is not None) == (expected_result == PlanCacheResult.HIT), test_description
+        assert mock_metrics.record_planner_cache_lookup.call_args.args[0] == expected_result, test_description
+
+    @pytest.mark.parametrize(
+        "test_description, original, current",
+        [
+            (
+                "should reject a plan mentioning a word that only the original query had",
+                pod_input("why is pod nginx-1 in my namespace crashing"),
+                pod_input("why is pod redis-1 in my namespace crashing"),
+            ),
+            (
+                "should reject a plan mentioning the resource of the original request",
+                pod_input("why is this pod crashing", name="nginx-1", namespace="shop"),
+                pod_input("why is this pod crashing", name="redis-1", namespace="shop"),
+            ),
+        ],
+    )
+    def test_lookup_rejects_plans_of_other_resources(self, mock_metrics, test_description, original, current):
+        # given
+        cache = PlanCache(ttl_seconds=60, similarity_threshold=0.7)
+        cache.store(original, subtasks(f"{original.query} {original.resource_name}"), 1.0)
+
+        # when
+        result = cache.lookup(current, MEMBERS)
+
+        # then
+        assert result is None, test_description
+        mock_metrics.record_planner_cache_lookup.assert_called_once_with(PlanCacheResult.REJECTED)
+
+    @pytest.mark.parametrize(
+        "test_description, original, current",
+        [
+            (
+                "should not serve the plan of a positive query to a negated query",
+                "which pods in my namespace are ready",
+                "which pods in my namespace aren't ready",
+            ),
+            (
+                "should not serve the plan of a negated query to a positive query",
+                "list the pods without resource limits",
+                "list the pods with resource limits",
+            ),
+        ],
+    )
+    def test_lookup_is_negation_aware(self, mock_metrics, test_description, original, current):
+        # given
+        cache = PlanCache(ttl_seconds=60, similarity_threshold=0.5)
+        cache.store(pod_input(original), subtasks(original), 1.0)
+
+        # when
+        result = cache.lookup(pod_input(current), MEMBERS)
+
+        # then
+        assert result is None, test_description
+        mock_metrics.record_planner_cache_lookup.assert_called_once_with(PlanCacheResult.MISS)
+
+    def test_lookup_is_scoped_to_the_cluster(self, cache, mock_metrics):
+        # given
+        cache.store(pod_input("why is my pod crashing"), subtasks("why is my pod crashing"), 1.0, cluster="api.a")
+
+        # when
+        other_cluster = cache.lookup(pod_input("why is my pod crashing"), MEMBERS, cluster="api.b")
+        same_cluster = cache.lookup(pod_input("why is my pod crashing"), MEMBERS, cluster="api.a")
+
+        # then
+        assert other_cluster is None
+        assert same_cluster is not None
+
+    def test_lookup_ignores_expired_plans(self, cache, clock, mock_metrics):
+        cache.store(pod_input("why is my pod crashing"), subtasks("why is my pod crashing"), 1.0)
+        clock.now = 61
+
+        assert cache.lookup(pod_input("why is my pod crashing"), MEMBERS) is None
+
+    def test_store_evicts_least_recently_used_plans(self, cache, mock_metrics):
+        # given
+        cache.store(pod_input("first query"), subtasks("first query"), 1.0)
+        cache.store(pod_input("second query"), subtasks("second query"), 1.0)
+        cache.lookup(pod_input("first query"), MEMBERS)
+
+        # when
+        cache.store(pod_input("third query"), subtasks("third query"), 1.0)
+
+        # then
+        assert len(cache) == MAX_ENTRIES
+        assert cache.lookup(pod_input("first query"), MEMBERS) is not None
+        assert cache.lookup(pod_input("second query"), MEMBERS) is None
@@ -2,14 +2,15 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from langchain_core.embeddings import Embeddings
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langgraph.constants import END
 
 from agents.common.constants import COMMON, ERROR, PLANNER
-from agents.common.state import CompanionState, Plan, SubTask
+from agents.common.state import CompanionState, Plan, SubTask, UserInput
 from agents.k8s.agent import K8S_AGENT
 from agents.kyma.agent import KYMA_AGENT
 from agents.supervisor.agent import FINALIZER, ROUTER, SupervisorAgent
+from agents.supervisor.plan_cache import PlanCache
 from agents.supervisor.state import SupervisorState
 from utils.models.factory import IModel
 from utils.settings import (
@@ -260,7 +261,7 @@ class TestSupervisorAgent:
         expected_error,
     ):
         # Given
-        state = SupervisorState(messages=conversation_messages, subtasks=subtasks)
+        state = SupervisorState(messages=conversation_messages, subtasks=subtasks, input=UserInput(query=input_query))
 
         mock_final_response_chain = AsyncMock()
         if final_response_content is not None:
@@ -279,7 +280,12 @@ class TestSupervisorAgent:
 
             if final_response_content is not None:
                 mock_final_response_chain.ainvoke.assert_called_once_with(
-                    config=None, input={"messages": conversation_messages}
+                    config=None,
+                    input={
+                        "messages": conversation_messages,
+                        "members": supervisor_agent._get_members_str(),
+                        "query": input_query,
+                    },
                 )
 
     @pytest.mark.asyncio
@@ -395,3 +401,81 @@ class TestSupervisorAgent:
             assert result["messages"][-1].name == "Planner", "Last message name should be 'Planner'"
             assert result == expected_output, test_case
             mock_invoke_planner.assert_called_once_with(state)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "test_description, messages, messages_summary, expected_planner_calls",
+        [
+            (
+                "should reuse the plan of a first query",
+                [HumanMessage(content="Why is my pod crashing?")],
+                "",
+                1,
+            ),
+            (
+                "should reuse the plan of a first query with a resource context",
+                [SystemMessage(content="{'resource_kind': 'Pod'}"), HumanMessage(content="Why is my pod crashing?")],
+                "",
+                1,
+            ),
+            (
+                "should always plan queries of a conversation with a summary",
+                [HumanMessage(content="Why is my pod crashing?")],
+                "The user asked about the pods.",
+                2,
+            ),
+            (
+                "should always plan follow-up queries with the conversation history",
+                [
+                    HumanMessage(content="Show my pods."),
+                    AIMessage(content="There is one pod."),
+                    HumanMessage(content="Why is my pod crashing?"),
+                ],
+                "",
+                2,
+            ),
+        ],
+    )
+    async def test_get_plan_uses_plan_cache(
+        self, supervisor_agent, test_description, messages, messages_summary, expected_planner_calls
+    ):
+        # Given
+        supervisor_agent._plan_cache = PlanCache()
+        plan = Plan(subtasks=[SubTask(description="Why is my pod crashing?", task_title="t", assigned_to=K8S_AGENT)])
+        state = SupervisorState(
+            messages=messages, messages_summary=messages_summary, input=UserInput(query="Why is my pod crashing?")
+        )
+
+        with patch.object(supervisor_agent, "_invoke_planner", new_callable=AsyncMock, return_value=plan) as mock:
+            # When
+            first = await supervisor_agent._get_plan(state)
+            first.subtasks[0].complete()
+            second = await supervisor_agent._get_plan(state)
+
+        # Then
+        assert mock.await_count == expected_planner_calls, test_description
+        assert second.subtasks[0].description == "Why is my pod crashing?", test_description
+        if expected_planner_calls == 1:
+            assert second.subtasks[0].is_pending(), test_description
+
+    @pytest.mark.asyncio
+    async def test_get_plan_caches_plans_per_cluster(self, supervisor_agent):
+        # Given
+        supervisor_agent._plan_cache = PlanCache()
+        plan = Plan(subtasks=[SubTask(description="Why is my pod crashing?", task_title="t", assigned_to=K8S_AGENT)])
+        states = [
+            SupervisorState(
+                messages=[HumanMessage(content="Why is my pod crashing?")],
+                input=UserInput(query="Why is my pod crashing?"),
+                k8s_client=MagicMock(get_api_server=MagicMock(return_value=api_server)),
+            )
+            for api_server in ("https://api.a.kyma.ondemand.com", "https://api.b.kyma.ondemand.com")
+        ]
+
+        with patch.object(supervisor_agent, "_invoke_planner", new_callable=AsyncMock, return_value=plan) as mock:
+            # When
+            for state in states:
+                await supervisor_agent._get_plan(state)
+
+        # Then
+        assert mock.await_count == len(states)
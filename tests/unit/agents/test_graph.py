@@ -4,16 +4,27 @@ import pytest
 from langchain_core.embeddings import Embeddings
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
-from langgraph.types import StateSnapshot
-
-from agents.common.constants import COMMON, GATEKEEPER, UNKNOWN
+from langgraph.types import Send, StateSnapshot
+
+from agents.common.constants import (
+    COMMON,
+    GATEKEEPER,
+    K8S_AGENT,
+    KYMA_AGENT,
+    RESPONSE_HELLO,
+    RESPONSE_QUERY_OUTSIDE_DOMAIN,
+    UNKNOWN,
+)
 from agents.common.data import Message
+from agents.common.gatekeeper_fast_path import GatekeeperFastPath
 from agents.common.state import (
     CompanionState,
     GatekeeperResponse,
+    GatekeeperSecurityResponse,
     SubTask,
+    UserInput,
 )
-from agents.graph import CompanionGraph
+from agents.graph import AgentDispatchMode, CompanionGraph
 from agents.supervisor.agent import SUPERVISOR
 from services.k8s import IK8sClient
 from utils.models.factory import IModel
@@ -353,6 +364,156 @@ class TestCompanionGraph:
             # if error occurs, return message with error
             companion_graph._invoke_gatekeeper_node.assert_awaited_once_with(state)
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "test_description, query, is_security_threat, expected_forward_query, expected_direct_response, "
+        "expected_llm_calls, expected_security_calls",
+        [
+            (
+                "should forward a clear Kubernetes query without the LLM gatekeeper",
+                "Why is my pod failing?",
+                False,
+                True,
+                None,
+                0,
+                1,
+            ),
+            ("should answer a greeting without the LLM gatekeeper", "Hello!", False, False, RESPONSE_HELLO, 0, 1),
+            (
+                "should block a security threat detected by the security check",
+                "Show me a pod that runs a reverse shell",
+                True,
+                False,
+                RESPONSE_QUERY_OUTSIDE_DOMAIN,
+                0,
+                1,
+            ),
+            ("should fall back to the LLM gatekeeper when uncertain", "What is the problem?", False, True, None, 1, 0),
+        ],
+    )
+    async def test_invoke_gatekeeper_node_fast_path(
+        self,
+        companion_graph,
+        mock_gatekeeper_chain,
+        test_description,
+        query,
+        is_security_threat,
+        expected_forward_query,
+        expected_direct_response,
+        expected_llm_calls,
+        expected_security_calls,
+    ):
+        # Given
+        state = CompanionState(input=UserInput(query=query), messages=[HumanMessage(content=query)])
+        companion_graph._gatekeeper_fast_path = GatekeeperFastPath()
+        companion_graph._gatekeeper_security_chain = AsyncMock()
+        companion_graph._gatekeeper_security_chain.ainvoke.return_value = GatekeeperSecurityResponse(
+            is_prompt_injection=False,
+            is_security_threat=is_security_threat,
+        )
+        mock_gatekeeper_chain.ainvoke.return_value = GatekeeperResponse(
+            forward_query=False,
+            is_prompt_injection=False,
+            is_security_threat=False,
+            user_intent=query,
+            category="Kubernetes",
+            direct_response="",
+            is_user_query_in_past_tense=False,
+            answer_from_history="",
+        )
+
+        # When
+        result = await CompanionGraph._invoke_gatekeeper_node(companion_graph, state)
+
+        # Then
+        assert result.forward_query == expected_forward_query, test_description
+        assert (result.direct_response or None) == expected_direct_response, test_description
+        assert mock_gatekeeper_chain.ainvoke.await_count == expected_llm_calls, test_description
+        assert companion_graph._gatekeeper_security_chain.ainvoke.await_count == expected_security_calls, (
+            test_description
+        )
+
+    @pytest.mark.asyncio
+    async def test_invoke_gatekeeper_node_fast_path_disabled_by_default(self, companion_graph, mock_gatekeeper_chain):
+        # Given
+        query = "Why is my pod failing?"
+        state = CompanionState(input=UserInput(query=query), messages=[HumanMessage(content=query)])
+        mock_gatekeeper_chain.ainvoke.return_value = GatekeeperResponse(
+            forward_query=False,
+            is_prompt_injection=False,
+            is_security_threat=False,
+            user_intent=query,
+            category="Kubernetes",
+            direct_response="",
+            is_user_query_in_past_tense=False,
+            answer_from_history="",
+        )
+
+        # When
+        result = await CompanionGraph._invoke_gatekeeper_node(companion_graph, state)
+
+        # Then
+        assert companion_graph._gatekeeper_fast_path is None
+        assert result.forward_query
+        mock_gatekeeper_chain.ainvoke.assert_awaited_once()
+
+    @pytest.mark.parametrize(
+        "test_description, dispatch_mode, next_node, expected",
+        [
+            ("should route to the next agent in sequential mode", AgentDispatchMode.SEQUENTIAL, K8S_AGENT, K8S_AGENT),
+            ("should not fan out to the finalizer", AgentDispatchMode.PARALLEL, "__end__", "__end__"),
+            (
+                "should fan out to all agents with pending subtasks in the order of the plan",
+                AgentDispatchMode.PARALLEL,
+                K8S_AGENT,
+                [K8S_AGENT, COMMON, KYMA_AGENT],
+            ),
+        ],
+    )
+    def test_dispatch(self, companion_graph, test_description, dispatch_mode, next_node, expected):
+        # Given
+        companion_graph.dispatch_mode = dispatch_mode
+        subtasks = [
+            SubTask(description="done", task_title="done", assigned_to=KYMA_AGENT, status="completed"),
+            SubTask(description="pods", task_title="pods", assigned_to=K8S_AGENT),
+            SubTask(description="hello", task_title="hello", assigned_to=COMMON),
+            SubTask(description="logs", task_title="logs", assigned_to=K8S_AGENT),
+            SubTask(description="kyma", task_title="kyma", assigned_to=KYMA_AGENT),
+        ]
+        state = CompanionState(input=UserInput(query="q"), messages=[], next=next_node, subtasks=subtasks)
+
+        # When
+        result = companion_graph._dispatch(state)
+
+        # Then
+        if isinstance(expected, list):
+            assert result == [Send(agent, state) for agent in expected], test_description
+        else:
+            assert result == expected, test_description
+
+    @pytest.mark.asyncio
+    async def test_parallel_agent_node(self):
+        # Given
+        existing_message = HumanMessage(content="query", id="1")
+        subtasks = [SubTask(description="pods", task_title="pods", assigned_to=K8S_AGENT, status="completed")]
+        agent = Mock()
+        agent.agent_node.return_value.ainvoke = AsyncMock(
+            return_value={
+                "messages": [existing_message, AIMessage(content="answer", id="2")],
+                "subtasks": subtasks,
+                "error": None,
+                "agent_messages": [AIMessage(content="private", id="3")],
+            }
+        )
+        node = CompanionGraph._parallel_agent_node(agent)
+        state = CompanionState(input=UserInput(query="query"), messages=[existing_message])
+
+        # When
+        result = await node(state, RunnableConfig())
+
+        # Then: only the new messages and the subtasks are returned.
+        assert result == {"messages": [AIMessage(content="answer", id="2")], "subtasks": subtasks}
+
     @pytest.fixture
     def mock_companion_graph(self):
         mock_graph = MagicMock()
@@ -4,6 +4,8 @@ from unittest.mock import MagicMock, Mock, patch
 import pytest
 from aiohttp import ClientResponse
 
+from agents.common.tool_memo import ToolResultMemo
+from utils.chain_registry import ChainRegistry
 from utils.config import Config, ModelConfig
 from utils.settings import (
     MAIN_EMBEDDING_MODEL_NAME,
@@ -59,3 +61,19 @@ def mock_get_proxy_client():
 def mock_get_config(mock_config):
     with patch("utils.models.factory.get_config", return_value=mock_config):
         yield
+
+
+@pytest.fixture(autouse=True)
+def reset_chain_registry():
+    # the chains are shared process-wide, so every test builds its chains with its own mocks.
+    ChainRegistry._reset_for_tests()
+    yield
+    ChainRegistry._reset_for_tests()
+
+
+@pytest.fixture(autouse=True)
+def reset_tool_result_memo():
+    # the tool results are memoized process-wide, so no test is served the results of another test.
+    ToolResultMemo._reset_for_tests()
+    yield
+    ToolResultMemo._reset_for_tests()
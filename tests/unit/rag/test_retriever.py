@@ -142,3 +142,92 @@ class TestHanaDBRetriever:
             # check metric.
             after_success_metric_value = CustomMetrics().registry.get_sample_value(metric_name, {"is_success": "True"})
             assert after_success_metric_value > before_success_metric_value
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "test_description, pointer_rows, expected_table",
+        [
+            ("should search the published table", [("test_table_20260101120000",)], "test_table_20260101120000"),
+            ("should search the alias without a pointer", [None], "test_table"),
+            (
+                "should keep the table if the pointer table is missing",
+                [dbapi.ProgrammingError(259, "invalid table name")],
+                "test_table",
+            ),
+            ("should keep the table on errors", [dbapi.Error(-10709, "connection failed")], "test_table"),
+        ],
+    )
+    async def test_aretrieve_resolves_active_table(
+        self, mock_embeddings, mock_hanavectordb, test_description, pointer_rows, expected_table
+    ):
+        # Given
+        connection = Mock(spec=dbapi.Connection)
+        connection.cursor.return_value.fetchone.side_effect = pointer_rows
+        dbs = {}
+
+        def create_db(connection, embedding, table_name):
+            dbs[table_name] = Mock(asimilarity_search=AsyncMock(return_value=[Document(page_content=table_name)]))
+            return dbs[table_name]
+
+        mock_hanavectordb.side_effect = create_db
+        retriever = HanaDBRetriever(embedding=mock_embeddings, connection=connection, table_name="test_table")
+
+        # When
+        result = await retriever.aretrieve("test query")
+
+        # Then
+        assert result == [Document(page_content=expected_table)], test_description
+        assert retriever.active_table == expected_table, test_description
+        connection.cursor.return_value.close.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "test_description, schema, expected_pointer_table_ref",
+        [
+            ("should read the pointer table of the schema", "DBADMIN", '"DBADMIN"."DOCS_TABLE_POINTERS"'),
+            ("should read the pointer table of the current schema", None, '"DOCS_TABLE_POINTERS"'),
+        ],
+    )
+    def test_read_active_table_qualifies_pointer_table(
+        self, mock_embeddings, mock_hanavectordb, test_description, schema, expected_pointer_table_ref
+    ):
+        # Given
+        connection = Mock(spec=dbapi.Connection)
+        connection.cursor.return_value.fetchone.return_value = ("test_table_1",)
+        retriever = HanaDBRetriever(
+            embedding=mock_embeddings,
+            connection=connection,
+            table_name="test_table",
+            pointer_table="DOCS_TABLE_POINTERS",
+            schema=schema,
+        )
+
+        # When
+        active_table = retriever._read_active_table()
+
+        # Then
+        assert active_table == "test_table_1", test_description
+        connection.cursor.return_value.execute.assert_called_once_with(
+            f"SELECT ACTIVE_TABLE FROM {expected_pointer_table_ref} WHERE ALIAS = ?", ("test_table",)
+        )
+
+    @pytest.mark.asyncio
+    async def test_aretrieve_refreshes_pointer_after_interval(self, mock_embeddings, mock_hanavectordb):
+        # Given
+        connection = Mock(spec=dbapi.Connection)
+        connection.cursor.return_value.fetchone.side_effect = [("test_table_1",), ("test_table_2",)]
+        retriever = HanaDBRetriever(
+            embedding=mock_embeddings, connection=connection, table_name="test_table", pointer_refresh_seconds=60
+        )
+
+        # When
+        await retriever.aretrieve("first query")
+        await retriever.aretrieve("second query")
+        table_before_refresh = retriever.active_table
+        # the refresh interval passed.
+        retriever._pointer_checked_at -= 60
+        await retriever.aretrieve("third query")
+
+        # Then
+        assert table_before_refresh == "test_table_1"
+        assert retriever.active_table == "test_table_2"
+        assert connection.cursor.return_value.execute.call_count == 2  # noqa: PLR2004
@@ -0,0 +1,32 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from langchain_core.documents import Document
+
+from rag.query_generator import Queries
+from rag.system import Query, RAGSystem
+
+
+@pytest.mark.asyncio
+async def test_aretrieve_with_given_components():
+    # Given
+    query_generator = Mock(agenerate_queries=AsyncMock(return_value=Queries(queries=["alternative", "", "query"])))
+    retriever = Mock(aretrieve=AsyncMock(return_value=[Document(page_content="doc")]))
+    reranker = Mock(arerank=AsyncMock(return_value=[Document(page_content="doc")]))
+
+    # When
+    with patch("rag.system.Hana") as mock_hana:
+        rag_system = RAGSystem({}, query_generator=query_generator, retriever=retriever, reranker=reranker)
+        docs = await rag_system.aretrieve(Query(text="query"), top_k=3)
+
+    # Then
+    # no HANA connection is created for a given retriever.
+    mock_hana.assert_not_called()
+    assert docs == [Document(page_content="doc")]
+    assert [call.args[0] for call in retriever.aretrieve.call_args_list] == ["query", "alternative"]
+    reranker.arerank.assert_called_once_with(
+        [[Document(page_content="doc")], [Document(page_content="doc")]],
+        ["query", "alternative"],
+        input_limit=1000,
+        output_limit=3,
+    )
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -5,11 +6,36 @@ from fastapi.testclient import TestClient
 from starlette.status import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
 
 from main import app
-from routers.probes import IHana, ILLMProbe, IRedis, IUsageTrackerProbe
+from routers.probes import IHana, ILLMProbe, IRedis
 from services.hana import get_hana
-from services.probes import get_llm_probe, get_usage_tracker_probe
+from services.health_monitor import (
+    HEALTH_CHECK_HANA,
+    HEALTH_CHECK_KEY_STORE,
+    HEALTH_CHECK_LLMS,
+    HEALTH_CHECK_REDIS,
+    HEALTH_CHECK_USAGE_TRACKER,
+    HealthCheck,
+    HealthMonitor,
+    get_health_monitor,
+)
+from services.probes import get_llm_probe
 from services.redis import get_redis
 
+ALL_HEALTH_CHECKS = [
+    HEALTH_CHECK_HANA,
+    HEALTH_CHECK_REDIS,
+    HEALTH_CHECK_USAGE_TRACKER,
+    HEALTH_CHECK_KEY_STORE,
+    HEALTH_CHECK_LLMS,
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_health_monitor():
+    HealthMonitor._reset_for_tests()
+    yield
+    HealthMonitor._reset_for_tests()
+
 
 @pytest.mark.parametrize(
     "test_case, hana_ready, redis_ready, usage_tracker_ready, llm_states, key_store_ready, expected_status",
@@ -76,33 +102,109 @@ def test_healthz_probe(
     Test the health probe endpoint. This test ensures that the endpoint returns the correct status code.
     """
     # Given:
-    mock_hana_conn = MagicMock(spec=IHana)
-    mock_hana_conn.is_connection_operational = MagicMock(return_value=hana_ready)
-    app.dependency_overrides[get_hana] = lambda: mock_hana_conn
+    health_monitor = HealthMonitor(
+        checks=[
+            HealthCheck(name=HEALTH_CHECK_HANA, check=lambda: hana_ready),
+            HealthCheck(name=HEALTH_CHECK_REDIS, check=AsyncMock(return_value=redis_ready)),
+            HealthCheck(name=HEALTH_CHECK_USAGE_TRACKER, check=lambda: usage_tracker_ready),
+            HealthCheck(name=HEALTH_CHECK_KEY_STORE, check=lambda: key_store_ready),
+            HealthCheck(name=HEALTH_CHECK_LLMS, check=AsyncMock(return_value=llm_states)),
+        ]
+    )
+    for name in health_monitor.get_results():
+        asyncio.run(health_monitor.refresh(name))
+    app.dependency_overrides[get_health_monitor] = lambda: health_monitor
 
-    mock_redis = MagicMock(spec=IRedis)
-    mock_redis.is_connection_operational = AsyncMock(return_value=redis_ready)
-    app.dependency_overrides[get_redis] = lambda: mock_redis
+    # When:
+    client = TestClient(app)
+    response = client.get("/healthz")
+
+    # Then:
+    assert response.status_code == expected_status, test_case
+    assert response.json()["is_key_store_healthy"] == key_store_ready, test_case
+    assert response.json()["llms"] == llm_states, test_case
+    assert response.json()["checks"][HEALTH_CHECK_REDIS]["is_healthy"] == redis_ready, test_case
 
-    usage_tracker_probe = MagicMock(spec=IUsageTrackerProbe)
-    usage_tracker_probe.is_healthy = MagicMock(return_value=usage_tracker_ready)
-    app.dependency_overrides[get_usage_tracker_probe] = lambda: usage_tracker_probe
+    # Clean up.
+    app.dependency_overrides = {}
 
-    mock_llm_probe = MagicMock(spec=ILLMProbe)
-    mock_llm_probe.get_llms_states.return_value = llm_states
-    app.dependency_overrides[get_llm_probe] = lambda: mock_llm_probe
 
-    mock_key_store = MagicMock()
-    mock_key_store.is_healthy.return_value = key_store_ready
+def test_healthz_probe_does_not_run_checks():
+    """
+    Test that the health probe serves the cached results, and reports stale results as unhealthy.
+    """
+    # Given:
+    now = [1000.0]
+    dependency_check = AsyncMock(return_value=True)
+    health_monitor = HealthMonitor(
+        checks=[
+            HealthCheck(
+                name=name,
+                check=AsyncMock(return_value={"model1": True}) if name == HEALTH_CHECK_LLMS else dependency_check,
+                interval_seconds=10,
+            )
+            for name in ALL_HEALTH_CHECKS
+        ],
+        clock=lambda: now[0],
+    )
+    for name in ALL_HEALTH_CHECKS:
+        asyncio.run(health_monitor.refresh(name))
+    app.dependency_overrides[get_health_monitor] = lambda: health_monitor
+    client = TestClient(app)
+    checks_before_probes = dependency_check.await_count
 
     # When:
-    with patch("routers.probes.KeyStore", return_value=mock_key_store):
-        client = TestClient(app)
-        response = client.get("/healthz")
+    fresh_response = client.get("/healthz")
+    # the results are not refreshed for more than three intervals.
+    now[0] += 31
+    stale_response = client.get("/healthz")
 
     # Then:
-    assert response.status_code == expected_status, test_case
-    assert response.json()["is_key_store_healthy"] == key_store_ready, test_case
+    assert dependency_check.await_count == checks_before_probes
+    assert fresh_response.status_code == HTTP_200_OK
+    assert stale_response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+    assert stale_response.json()["checks"][HEALTH_CHECK_REDIS]["is_stale"]
+    assert stale_response.json()["checks"][HEALTH_CHECK_REDIS]["age_seconds"] == 31  # noqa: PLR2004
+
+    # Clean up.
+    app.dependency_overrides = {}
+
+
+def test_healthz_probe_before_first_refresh():
+    """
+    Test that the health probe reports the pending checks as healthy after the start of the health monitor,
+    and as unhealthy if they did not complete within the staleness window.
+    """
+    # Given:
+    now = [1000.0]
+    health_monitor = HealthMonitor(
+        checks=[
+            HealthCheck(name=name, check=AsyncMock(return_value=True), interval_seconds=10)
+            for name in ALL_HEALTH_CHECKS
+        ],
+        clock=lambda: now[0],
+    )
+
+    async def start_without_refresh():
+        # the background tasks are cancelled before their first refresh.
+        health_monitor.start()
+        await health_monitor.stop()
+
+    asyncio.run(start_without_refresh())
+    app.dependency_overrides[get_health_monitor] = lambda: health_monitor
+    client = TestClient(app)
+
+    # When:
+    pending_response = client.get("/healthz")
+    now[0] += 31
+    stale_response = client.get("/healthz")
+
+    # Then:
+    assert pending_response.status_code == HTTP_200_OK
+    assert pending_response.json()["checks"][HEALTH_CHECK_REDIS]["is_pending"]
+    assert pending_response.json()["llms"] == {}
+    assert stale_response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+    assert stale_response.json()["checks"][HEALTH_CHECK_REDIS]["is_stale"]
 
     # Clean up.
     app.dependency_overrides = {}
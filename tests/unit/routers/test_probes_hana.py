@@ -1,5 +1,6 @@
 """Tests for probe endpoints interaction with Hana query execution."""
 
+import asyncio
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -8,10 +9,18 @@ from hdbcli import dbapi
 from starlette.status import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
 
 from main import app
-from routers.probes import ILLMProbe, IRedis, IUsageTrackerProbe
 from services.hana import Hana
-from services.probes import get_llm_probe, get_usage_tracker_probe
-from services.redis import get_redis
+from services.health_monitor import (
+    HEALTH_CHECK_HANA,
+    HEALTH_CHECK_KEY_STORE,
+    HEALTH_CHECK_LLMS,
+    HEALTH_CHECK_REDIS,
+    HEALTH_CHECK_USAGE_TRACKER,
+    HealthCheck,
+    HealthMonitor,
+    _check_hana,
+    get_health_monitor,
+)
 
 
 class TestProbesHana:
@@ -21,27 +30,27 @@ class TestProbesHana:
         """Clean up after each test."""
         app.dependency_overrides = {}
         Hana._reset_for_tests()
-        if hasattr(self, "_key_store_patcher"):
-            self._key_store_patcher.stop()
+        HealthMonitor._reset_for_tests()
 
     def _setup_healthy_dependencies(self):
-        """Set up all non-Hana dependencies as healthy."""
-        mock_redis = MagicMock(spec=IRedis)
-        mock_redis.is_connection_operational = AsyncMock(return_value=True)
-        app.dependency_overrides[get_redis] = lambda: mock_redis
-
-        usage_tracker_probe = MagicMock(spec=IUsageTrackerProbe)
-        usage_tracker_probe.is_healthy = MagicMock(return_value=True)
-        app.dependency_overrides[get_usage_tracker_probe] = lambda: usage_tracker_probe
-
-        mock_llm_probe = MagicMock(spec=ILLMProbe)
-        mock_llm_probe.get_llms_states.return_value = {"model1": True}
-        app.dependency_overrides[get_llm_probe] = lambda: mock_llm_probe
-
-        self._mock_key_store = MagicMock()
-        self._mock_key_store.is_healthy.return_value = True
-        self._key_store_patcher = patch("routers.probes.KeyStore", return_value=self._mock_key_store)
-        self._key_store_patcher.start()
+        """Set up the health monitor with the Hana check, and all non-Hana dependencies as healthy."""
+        HealthMonitor._reset_for_tests()
+        self._health_monitor = HealthMonitor(
+            checks=[
+                HealthCheck(name=HEALTH_CHECK_HANA, check=_check_hana),
+                HealthCheck(name=HEALTH_CHECK_REDIS, check=AsyncMock(return_value=True)),
+                HealthCheck(name=HEALTH_CHECK_USAGE_TRACKER, check=MagicMock(return_value=True)),
+                HealthCheck(name=HEALTH_CHECK_KEY_STORE, check=MagicMock(return_value=True)),
+                HealthCheck(name=HEALTH_CHECK_LLMS, check=AsyncMock(return_value={"model1": True})),
+            ]
+        )
+        app.dependency_overrides[get_health_monitor] = lambda: self._health_monitor
+
+    def _get_healthz(self, client: TestClient):
+        """Refresh the health checks like the background health monitor does, and call the health probe."""
+        for name in self._health_monitor.get_results():
+            asyncio.run(self._health_monitor.refresh(name))
+        return client.get("/healthz")
 
     def test_healthz_returns_200_when_query_succeeds(self):
         """Test that the healthz probe returns HTTP 200 when the database is fully operational.
@@ -66,7 +75,7 @@ class TestProbesHana:
         client = TestClient(app)
 
         # When: Call health probe
-        response = client.get("/healthz")
+        response = self._get_healthz(client)
 
         # Then: Returns 200 and query was executed
         assert response.status_code == HTTP_200_OK
@@ -97,7 +106,7 @@ class TestProbesHana:
         client = TestClient(app)
 
         # When: Call health probe
-        response = client.get("/healthz")
+        response = self._get_healthz(client)
 
         # Then: Returns 503
         assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
@@ -126,7 +135,7 @@ class TestProbesHana:
         client = TestClient(app)
 
         # When: Call health probe
-        response = client.get("/healthz")
+        response = self._get_healthz(client)
 
         # Then: Returns 503 and detects password error
         assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
@@ -147,7 +156,7 @@ class TestProbesHana:
         client = TestClient(app)
 
         # When: Call health probe
-        response = client.get("/healthz")
+        response = self._get_healthz(client)
 
         # Then: Returns 503
         assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
@@ -181,19 +190,19 @@ class TestProbesHana:
         with patch("services.hana.datetime") as mock_datetime:
             # First call - should execute query
             mock_datetime.now.return_value = base_time
-            response1 = client.get("/healthz")
+            response1 = self._get_healthz(client)
             assert response1.status_code == HTTP_200_OK
             assert mock_cursor.execute.call_count == 1
 
             # Second call within TTL - should use cache
             mock_datetime.now.return_value = base_time + timedelta(seconds=60)
-            response2 = client.get("/healthz")
+            response2 = self._get_healthz(client)
             assert response2.status_code == HTTP_200_OK
             assert mock_cursor.execute.call_count == 1  # Still 1, cache was used
 
             # Third call after TTL expires - should execute query again
             mock_datetime.now.return_value = base_time + timedelta(seconds=301)
-            response3 = client.get("/healthz")
+            response3 = self._get_healthz(client)
             assert response3.status_code == HTTP_200_OK
             assert mock_cursor.execute.call_count == expected_query_count_after_cache_expiry
 
@@ -220,7 +229,7 @@ class TestProbesHana:
         client = TestClient(app)
 
         # When: Call health probe
-        response = client.get("/healthz")
+        response = self._get_healthz(client)
 
         # Then: Cursor context manager exited despite error
         assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
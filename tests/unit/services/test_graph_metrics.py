@@ -0,0 +1,178 @@
+import contextlib
+from typing import TypedDict
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.tools import tool
+from langgraph.constants import END
+from langgraph.graph import StateGraph
+from tenacity import wait_none
+
+from services.graph_metrics import GraphMetricsCallback
+from services.metrics import (
+    GRAPH_NODE_LATENCY_METRIC_KEY,
+    GRAPH_NODE_RETRY_METRIC_KEY,
+    GRAPH_NODE_TOKEN_METRIC_KEY,
+    GRAPH_TOOL_LATENCY_METRIC_KEY,
+    GRAPH_TURN_LATENCY_METRIC_KEY,
+    CustomMetrics,
+    graph_node_label,
+)
+from utils.chain import ainvoke_chain
+
+
+class FakeState(TypedDict):
+    query: str
+    answer: str
+
+
+@tool
+async def fake_query_tool(uri: str) -> str:
+    """Query a fake cluster."""
+    return f"result of {uri}"
+
+
+@tool
+async def failing_tool(uri: str) -> str:
+    """Fail to query a fake cluster."""
+    raise ValueError("cluster not reachable")
+
+
+def build_fake_graph(fail_agent: bool = False):
+    """Graph with a gatekeeper that calls an LLM, a supervisor subgraph whose planner is retried once,
+    and an agent that calls tools."""
+    llm = GenericFakeChatModel(
+        messages=iter(
+            [AIMessage(content="forward", usage_metadata=dict(input_tokens=10, output_tokens=5, total_tokens=15))]
+        )
+    )
+    gatekeeper_chain = ChatPromptTemplate.from_messages([("human", "{query}")]) | llm
+    planner_calls = []
+
+    def flaky_planner(inputs: dict) -> str:
+        planner_calls.append(inputs)
+        if len(planner_calls) == 1:
+            raise ValueError("rate limited")
+        return "plan"
+
+    async def gatekeeper(state: FakeState) -> dict:
+        response = await ainvoke_chain(gatekeeper_chain, {"query": state["query"]})
+        return {"answer": response.content}
+
+    async def planner(state: FakeState) -> dict:
+        return {"answer": await ainvoke_chain(RunnableLambda(flaky_planner), {"query": state["query"]})}
+
+    async def agent(state: FakeState, config: RunnableConfig) -> dict:
+        result = await fake_query_tool.ainvoke({"uri": "/api/v1/pods"}, config)
+        with contextlib.suppress(ValueError):
+            await failing_tool.ainvoke({"uri": "/api/v1/nodes"}, config)
+        if fail_agent:
+            raise RuntimeError("agent failed")
+        return {"answer": result}
+
+    supervisor = StateGraph(FakeState)
+    supervisor.add_node("Planner", planner)
+    supervisor.set_entry_point("Planner")
+    supervisor.add_edge("Planner", END)
+
+    workflow = StateGraph(FakeState)
+    workflow.add_node("Gatekeeper", gatekeeper)
+    workflow.add_node("Supervisor", supervisor.compile())
+    workflow.add_node("KubernetesAgent", agent)
+    workflow.set_entry_point("Gatekeeper")
+    workflow.add_edge("Gatekeeper", "Supervisor")
+    workflow.add_edge("Supervisor", "KubernetesAgent")
+    workflow.add_edge("KubernetesAgent", END)
+    return workflow.compile()
+
+
+@pytest.fixture
+def metrics():
+    CustomMetrics._reset_for_tests()
+    yield CustomMetrics()
+    CustomMetrics._reset_for_tests()
+
+
+def label_values(metrics: CustomMetrics, metric_name: str, label: str) -> set[str]:
+    return {
+        sample.labels[label]
+        for metric in metrics.registry.collect()
+        if metric.name == metric_name
+        for sample in metric.samples
+        if label in sample.labels
+    }
+
+
+@pytest.mark.parametrize(
+    "test_description, checkpoint_ns, expected_label",
+    [
+        ("should use the node name", "Gatekeeper:1f0e1c2a", "Gatekeeper"),
+        ("should join subgraph nodes", "Supervisor:1f0e1c2a|Planner:9b7d", "Supervisor:Planner"),
+        ("should limit the depth", "KymaAgent:1|agent:2|tools:3", "KymaAgent:agent"),
+        ("should label runs outside of a graph", "", "other"),
+        ("should label runs without namespace", None, "other"),
+    ],
+)
+def test_graph_node_label(test_description, checkpoint_ns, expected_label):
+    assert graph_node_label(checkpoint_ns) == expected_label, test_description
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "test_description, fail_agent",
+    [
+        ("should record a successful turn", False),
+        ("should record a failed turn", True),
+    ],
+)
+async def test_graph_metrics_of_fake_graph(metrics, test_description, fail_agent):
+    # given
+    graph = build_fake_graph(fail_agent=fail_agent)
+    callback = GraphMetricsCallback()
+
+    # when
+    with patch.object(ainvoke_chain.retry, "wait", wait_none()):
+        try:
+            async for _ in graph.astream({"query": "why is my pod failing?", "answer": ""}, {"callbacks": [callback]}):
+                pass
+        except RuntimeError:
+            assert fail_agent, test_description
+
+    # then
+    def sample(name: str, **labels: str) -> float | None:
+        return metrics.registry.get_sample_value(name, labels)
+
+    node_count = f"{GRAPH_NODE_LATENCY_METRIC_KEY}_count"
+    agent_success = str(not fail_agent)
+    assert sample(node_count, node="Gatekeeper", is_success="True") == 1, test_description
+    assert sample(node_count, node="Supervisor", is_success="True") == 1, test_description
+    assert sample(node_count, node="Supervisor:Planner", is_success="True") == 1, test_description
+    assert sample(node_count, node="KubernetesAgent", is_success=agent_success) == 1, test_description
+    # the label values are the static node names, not the run ids of LangGraph.
+    assert label_values(metrics, GRAPH_NODE_LATENCY_METRIC_KEY, "node") == {
+        "Gatekeeper",
+        "Supervisor",
+        "Supervisor:Planner",
+        "KubernetesAgent",
+    }
+
+    token_count = f"{GRAPH_NODE_TOKEN_METRIC_KEY}_total"
+    assert sample(token_count, node="Gatekeeper", token_type="prompt") == 10  # noqa: PLR2004
+    assert sample(token_count, node="Gatekeeper", token_type="completion") == 5  # noqa: PLR2004
+    assert sample(f"{GRAPH_NODE_RETRY_METRIC_KEY}_total", node="Supervisor:Planner") == 1
+    assert label_values(metrics, GRAPH_NODE_RETRY_METRIC_KEY, "node") == {"Supervisor:Planner"}
+
+    tool_count = f"{GRAPH_TOOL_LATENCY_METRIC_KEY}_count"
+    assert sample(tool_count, tool="fake_query_tool", is_success="True") == 1
+    assert sample(tool_count, tool="failing_tool", is_success="False") == 1
+
+    assert sample(f"{GRAPH_TURN_LATENCY_METRIC_KEY}_count", is_success=agent_success) == 1, test_description
+    # all runs are finished.
+    assert not callback.turn_start_times
+    assert not callback.node_runs
+    assert not callback.tool_runs
+    assert not callback.llm_nodes
@@ -0,0 +1,227 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.health_monitor import HealthCheck, HealthMonitor
+from services.metrics import HEALTH_CHECK_LATENCY_METRIC_KEY, HEALTH_CHECK_LLM_INVOCATION_METRIC_KEY, CustomMetrics
+from services.probes import LLMProbe
+
+
+@pytest.fixture(autouse=True)
+def reset_singletons():
+    HealthMonitor._reset_for_tests()
+    LLMProbe._reset_for_tests()
+    CustomMetrics._reset_for_tests()
+    yield
+    HealthMonitor._reset_for_tests()
+    LLMProbe._reset_for_tests()
+    CustomMetrics._reset_for_tests()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def hanging_async_check() -> bool:
+    await asyncio.sleep(60)
+    return True
+
+
+def failing_check() -> bool:
+    raise ConnectionError("connection refused")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "test_description, check, expected_healthy, expected_details, expected_error",
+    [
+        ("should cache a healthy result", AsyncMock(return_value=True), True, {}, None),
+        ("should cache an unhealthy result", lambda: False, False, {}, None),
+        (
+            "should cache the health per item",
+            AsyncMock(return_value={"a": True, "b": False}),
+            False,
+            {"a": True, "b": False},
+            None,
+        ),
+        ("should time out a hanging check", hanging_async_check, False, {}, "timed out after 0.05 seconds"),
+        ("should cache a failing check", failing_check, False, {}, "connection refused"),
+    ],
+)
+async def test_refresh(test_description, check, expected_healthy, expected_details, expected_error):
+    # given
+    monitor = HealthMonitor(checks=[HealthCheck(name="dependency", check=check, timeout_seconds=0.05)])
+
+    # when
+    await monitor.refresh("dependency")
+
+    # then
+    result = monitor.get_result("dependency")
+    assert result.is_healthy == expected_healthy, test_description
+    assert monitor.is_healthy("dependency") == expected_healthy, test_description
+    assert result.details == expected_details, test_description
+    assert result.error == expected_error, test_description
+    assert not result.is_stale, test_description
+    assert result.duration_ms < 1000, test_description  # noqa: PLR2004
+    assert (
+        CustomMetrics().registry.get_sample_value(
+            f"{HEALTH_CHECK_LATENCY_METRIC_KEY}_count", {"check": "dependency", "is_healthy": str(expected_healthy)}
+        )
+        == 1
+    ), test_description
+
+
+@pytest.mark.asyncio
+async def test_hanging_sync_check_is_not_started_again():
+    # given
+    release = threading.Event()
+    calls = []
+
+    def hanging_check() -> bool:
+        calls.append(1)
+        release.wait(5)
+        return True
+
+    monitor = HealthMonitor(checks=[HealthCheck(name="hana", check=hanging_check, timeout_seconds=0.05)])
+
+    # when
+    await monitor.refresh("hana")
+    await monitor.refresh("hana")
+    release.set()
+    await asyncio.sleep(0.1)
+    await monitor.refresh("hana")
+
+    # then
+    # the second refresh did not start another thread, while the first one was hanging.
+    assert len(calls) == 2  # noqa: PLR2004
+    assert monitor.is_healthy("hana")
+
+
+@pytest.mark.asyncio
+async def test_stale_result_is_unhealthy():
+    # given
+    clock = FakeClock()
+    monitor = HealthMonitor(
+        checks=[HealthCheck(name="redis", check=AsyncMock(return_value=True), interval_seconds=10)],
+        staleness_factor=3,
+        clock=clock,
+    )
+    assert not monitor.is_healthy("redis")
+    await monitor.refresh("redis")
+
+    # when
+    clock.now += 30
+    is_healthy_within_staleness = monitor.is_healthy("redis")
+    clock.now += 1
+
+    # then
+    assert is_healthy_within_staleness
+    assert not monitor.is_healthy("redis")
+    assert monitor.get_result("redis").is_stale
+
+
+@pytest.mark.asyncio
+async def test_checks_are_refreshed_on_their_own_interval():
+    # given
+    fast_check = AsyncMock(return_value=True)
+    slow_check = AsyncMock(return_value=True)
+    monitor = HealthMonitor(
+        checks=[
+            HealthCheck(name="redis", check=fast_check, interval_seconds=0.02),
+            HealthCheck(name="llms", check=slow_check, interval_seconds=60),
+            HealthCheck(name="hana", check=hanging_async_check, interval_seconds=0.02, timeout_seconds=0.02),
+        ]
+    )
+
+    # when
+    monitor.start()
+    await asyncio.sleep(0.2)
+    await monitor.stop()
+
+    # then
+    assert fast_check.await_count > 3  # noqa: PLR2004
+    assert slow_check.await_count == 1
+    # a hanging dependency does not delay the other checks.
+    assert monitor.is_healthy("redis")
+    assert not monitor.is_healthy("hana")
+
+
+@pytest.mark.asyncio
+async def test_llm_probe_checks_models_asynchronously():
+    # given
+    embedding = MagicMock()
+    embedding.aembed_query = AsyncMock(return_value=[0.1])
+    failing_embedding = MagicMock()
+    failing_embedding.aembed_query = AsyncMock(side_effect=TimeoutError())
+    probe = LLMProbe(model_factory=lambda: {"embedding": embedding, "failing": failing_embedding})
+
+    # when
+    start_time = time.perf_counter()
+    states = await probe.aget_llms_states()
+    await probe.aget_llms_states()
+
+    # then
+    assert time.perf_counter() - start_time < 1
+    assert states == {"embedding": True, "failing": False}
+    # a ready model is not checked again, because every check costs tokens.
+    assert embedding.aembed_query.await_count == 1
+    assert failing_embedding.aembed_query.await_count == 2  # noqa: PLR2004
+    assert (
+        CustomMetrics().registry.get_sample_value(
+            f"{HEALTH_CHECK_LLM_INVOCATION_METRIC_KEY}_total", {"model": "embedding"}
+        )
+        == 1
+    )
+
+
+class FakeGeminiClient:
+    """Client of a Gemini model, which has no async invoke."""
+
+
+class FakeGeminiModel:
+    """Model with the shape of GeminiModel: only the model itself can be invoked, synchronously."""
+
+    def __init__(self, response: object):
+        self.response = response
+        self.invocations: list[tuple[str, bool]] = []
+
+    def invoke(self, content: str) -> object:
+        self.invocations.append((content, threading.current_thread() is threading.main_thread()))
+        return self.response
+
+    @property
+    def name(self) -> str:
+        return "gemini-2.5-flash"
+
+    @property
+    def llm(self) -> FakeGeminiClient:
+        return FakeGeminiClient()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "test_description, response, expected_state",
+    [
+        ("should be ready if the model responds", "Test response.", True),
+        ("should not be ready if the model does not respond", None, False),
+    ],
+)
+async def test_llm_probe_checks_models_without_async_client(test_description, response, expected_state):
+    # given
+    gemini = FakeGeminiModel(response=response)
+    probe = LLMProbe(model_factory=lambda: {"gemini-2.5-flash": gemini})
+
+    # when
+    states = await probe.aget_llms_states()
+
+    # then
+    assert states == {"gemini-2.5-flash": expected_state}, test_description
+    # the model is invoked once, in a worker thread, so it does not block the event loop.
+    assert gemini.invocations == [("Test.", False)], test_description
@@ -7,12 +7,15 @@ from aioresponses import aioresponses
 from services.data_sanitizer import DataSanitizer
 from services.k8s import (
     AuthType,
+    DescribeMode,
     K8sAuthHeaders,
     K8sClient,
     K8sClientError,
     get_url_for_paged_request,
 )
+from services.k8s_logs import PodLogsBudget, omitted_lines_marker
 from services.k8s_models import PodLogsDiagnosticContext
+from services.k8s_projection import DescribeProjector
 from utils.settings import K8S_API_PAGINATION_MAX_PAGE
 
 
@@ -1031,6 +1034,7 @@ class TestK8sClient:
     ):
         # given
         k8s_client.data_sanitizer = data_sanitizer
+        k8s_client.describe_mode = DescribeMode.FULL
 
         # Mock get_resource and list_k8s_events_for_resource
         with (
@@ -1048,6 +1052,83 @@ class TestK8sClient:
             data_sanitizer.sanitize.assert_called_once()
         assert result == expected_result
 
+    @pytest.mark.parametrize(
+        "test_description, describe_mode, expected_mode",
+        [
+            ("should describe the full resource", "full", DescribeMode.FULL),
+            ("should project the resource if configured", "projection", DescribeMode.PROJECTION),
+        ],
+    )
+    def test_describe_mode_is_read_when_client_is_built(self, test_description, describe_mode, expected_mode):
+        # given
+        k8s_headers = K8sAuthHeaders(
+            x_cluster_url="https://api.example.com",
+            x_cluster_certificate_authority_data="YWJj",
+            x_k8s_authorization="token",
+        )
+
+        # when
+        with (
+            patch("services.k8s.ssl.create_default_context"),
+            patch("services.k8s.K8S_DESCRIBE_MODE", describe_mode),
+        ):
+            k8s_client = K8sClient(k8s_headers)
+
+        # then
+        assert k8s_client.describe_mode == expected_mode, test_description
+        assert isinstance(k8s_client.describe_projector, DescribeProjector), test_description
+
+    def test_describe_resource_projection(self, k8s_client):
+        # given
+        k8s_client.data_sanitizer = DataSanitizer()
+        k8s_client.describe_mode = DescribeMode.PROJECTION
+        k8s_client.describe_projector = DescribeProjector()
+        raw_deployment = {
+            "apiVersion": "apps/v1",
+            "kind": "Deployment",
+            "metadata": {
+                "name": "my-deployment",
+                "namespace": "default",
+                "uid": "1234",
+                "annotations": {
+                    "kubectl.kubernetes.io/last-applied-configuration": "{}",
+                    "team": "a",
+                },
+                "managedFields": [{"manager": "kubectl", "fieldsV1": {"f:spec": {}}}],
+            },
+            "spec": {
+                "replicas": 1,
+                "revisionHistoryLimit": 10,
+                "template": {"spec": {"containers": [{"name": "app", "image": "nginx"}]}},
+            },
+            "status": {"readyReplicas": 0},
+        }
+        raw_events = [{"involvedObject": {"kind": "Deployment"}, "type": "Warning", "metadata": {"uid": "1"}}]
+        mock_dynamic_client = Mock()
+        mock_dynamic_client.resources.get.return_value.get.return_value.to_dict.return_value = raw_deployment
+        k8s_client._dynamic_client = mock_dynamic_client
+
+        # when
+        with patch.object(k8s_client, "list_k8s_events_for_resource", return_value=raw_events):
+            result = k8s_client.describe_resource("apps/v1", "Deployment", "my-deployment", "default")
+
+        # then
+        assert result == {
+            "apiVersion": "apps/v1",
+            "kind": "Deployment",
+            "metadata": {"name": "my-deployment", "namespace": "default", "annotations": {"team": "a"}},
+            "spec": {
+                "replicas": 1,
+                "template": {"spec": {"containers": [{"name": "app", "image": "nginx"}]}},
+            },
+            "status": {"readyReplicas": 0},
+            "events": [{"type": "Warning"}],
+        }
+        # the raw object and the events are not modified.
+        assert "managedFields" in raw_deployment["metadata"]
+        assert "kubectl.kubernetes.io/last-applied-configuration" in raw_deployment["metadata"]["annotations"]
+        assert "involvedObject" in raw_events[0]
+
     @pytest.mark.parametrize(
         "test_description, data_sanitizer, raw_data, expected_result",
         [
@@ -1286,6 +1367,43 @@ class TestK8sClient:
             previous_logs = result.logs.previously_terminated_container
             assert "not found" in previous_logs.lower() or "not available" in previous_logs.lower()
 
+    @pytest.mark.asyncio
+    async def test_fetch_pod_logs_with_budget(self, k8s_client):
+        # given
+        k8s_client.api_server = "https://api.example.com"
+        k8s_client.k8s_auth_headers = K8sAuthHeaders(
+            x_cluster_url=k8s_client.api_server,
+            x_cluster_certificate_authority_data="abc",
+            x_k8s_authorization="test-token",
+        )
+        k8s_client.data_sanitizer = None
+        k8s_client.pod_logs_budget = PodLogsBudget(max_bytes=30, since_seconds=600, limit_bytes=4096)
+        log_lines = [f"INFO line {i}" for i in range(10)]
+
+        with aioresponses() as aio_mock_response:
+            log_url = f"{k8s_client.api_server}/api/v1/namespaces/default/pods/test-pod/log?container=app&tailLines=100"
+            aio_mock_response.get(
+                f"{log_url}&sinceSeconds=600&limitBytes=4096",
+                body="\n".join(log_lines),
+                status=HTTPStatus.OK,
+            )
+            aio_mock_response.get(
+                f"{log_url}&previous=true&sinceSeconds=600&limitBytes=4096",
+                body='{"message": "previous terminated container \\"app\\" in pod \\"test-pod\\" not found"}',
+                status=HTTPStatus.BAD_REQUEST,
+            )
+
+            # when
+            result = await k8s_client.fetch_pod_logs(
+                name="test-pod",
+                namespace="default",
+                container_name="app",
+                tail_limit=100,
+            )
+
+        # then: the filters are pushed down and only the byte-bounded tail is returned.
+        assert result.logs.current_container == "\n".join([omitted_lines_marker(8), *log_lines[-2:]])
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
         "first_call_error_status, first_call_error_msg, second_call_logs, expected_logs",
@@ -0,0 +1,100 @@
+import pytest
+
+from services.k8s_logs import (
+    PodLogsBudget,
+    estimate_tokens,
+    extract_error_focused_lines,
+    is_anomaly_line,
+    omitted_lines_marker,
+    read_log_tail,
+)
+
+
+async def stream(lines: list[str]):
+    for line in lines:
+        yield f"{line}\n".encode()
+
+
+@pytest.mark.parametrize(
+    "test_description, budget, expected",
+    [
+        ("should not add filters by default", PodLogsBudget(since_seconds=0, limit_bytes=0), ""),
+        ("should add sinceSeconds", PodLogsBudget(since_seconds=600, limit_bytes=0), "&sinceSeconds=600"),
+        (
+            "should add sinceSeconds and limitBytes",
+            PodLogsBudget(since_seconds=600, limit_bytes=1024),
+            "&sinceSeconds=600&limitBytes=1024",
+        ),
+    ],
+)
+def test_pod_logs_budget_query_params(test_description, budget, expected):
+    assert budget.query_params() == expected, test_description
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "test_description, lines, max_bytes, expected_lines, expected_omitted",
+    [
+        ("should keep all lines within the budget", ["a", "b", "c"], 100, ["a", "b", "c"], 0),
+        ("should keep only the newest lines", ["aaaa", "bbbb", "cccc"], 10, ["bbbb", "cccc"], 1),
+        ("should keep the newest line even if it exceeds the budget", ["a", "b" * 20], 10, ["b" * 10], 1),
+        ("should handle empty streams", [], 10, [], 0),
+        ("should count multi-byte characters in bytes", ["ääää", "üüüü"], 10, ["üüüü"], 1),
+    ],
+)
+async def test_read_log_tail(test_description, lines, max_bytes, expected_lines, expected_omitted):
+    tail = await read_log_tail(stream(lines), max_bytes)
+
+    assert tail.lines == expected_lines, test_description
+    assert tail.omitted_lines == expected_omitted, test_description
+
+
+@pytest.mark.parametrize(
+    "test_description, line, expected",
+    [
+        ("should detect errors", "2025-01-01 ERROR failed to connect", True),
+        ("should detect exception class names", "java.lang.NullPointerException: boom", True),
+        ("should detect tracebacks", "Traceback (most recent call last):", True),
+        ("should detect structured error levels", 'time=now level=error msg="boom"', True),
+        ("should ignore ordinary lines", "2025-01-01 INFO request served", False),
+    ],
+)
+def test_is_anomaly_line(test_description, line, expected):
+    assert is_anomaly_line(line) == expected, test_description
+
+
+class TestExtractErrorFocusedLines:
+    def test_returns_lines_unchanged_within_budget(self):
+        lines = ["INFO a", "ERROR b", "INFO c"]
+
+        assert extract_error_focused_lines(lines, max_tokens=100, context_lines=1) is lines
+
+    def test_keeps_newest_lines_without_errors(self):
+        lines = [f"INFO line {i:03d}" for i in range(100)]
+        max_tokens = estimate_tokens(lines[0]) * 3
+
+        assert extract_error_focused_lines(lines, max_tokens, context_lines=1) == [
+            omitted_lines_marker(97),
+            *lines[-3:],
+        ]
+
+    def test_keeps_errors_with_context_and_stack_traces(self):
+        # given
+        lines = [f"INFO line {i:03d}" for i in range(100)]
+        lines[40:40] = [
+            "ERROR request failed",
+            "Traceback (most recent call last):",
+            '  File "app.py", line 1, in <module>',
+            "ValueError: boom",
+        ]
+        max_tokens = sum(estimate_tokens(line) for line in lines[39:45]) * 2
+
+        # when
+        result = extract_error_focused_lines(lines, max_tokens, context_lines=1)
+
+        # then: the error, the stack trace and one line of context on each side are kept.
+        assert result[0] == omitted_lines_marker(39)
+        assert result[1:7] == lines[39:45]
+        assert result[7].startswith("... ")
+        assert result[-1] == lines[-1]
+        assert sum(estimate_tokens(line) for line in result if not line.startswith("... ")) <= max_tokens
@@ -0,0 +1,119 @@
+import pytest
+
+from services.k8s_projection import (
+    DescribeProjector,
+    compile_projection,
+    project,
+    without_last_applied_configuration,
+)
+
+
+@pytest.mark.parametrize(
+    "test_description, fields, obj, expected",
+    [
+        (
+            "should keep only the listed top-level fields",
+            ["kind", "spec"],
+            {"kind": "Pod", "spec": {"a": 1}, "status": {"b": 2}},
+            {"kind": "Pod", "spec": {"a": 1}},
+        ),
+        (
+            "should keep nested fields",
+            ["metadata.name"],
+            {"metadata": {"name": "x", "managedFields": [{}]}},
+            {"metadata": {"name": "x"}},
+        ),
+        (
+            "should let a parent path win over a child path",
+            ["spec.replicas", "spec"],
+            {"spec": {"replicas": 1, "paused": False}},
+            {"spec": {"replicas": 1, "paused": False}},
+        ),
+        (
+            "should apply the rest of the path to list items",
+            ["spec.containers[].name"],
+            {"spec": {"containers": [{"name": "a", "image": "x"}, {"name": "b", "image": "y"}]}},
+            {"spec": {"containers": [{"name": "a"}, {"name": "b"}]}},
+        ),
+        (
+            "should keep all unlisted keys with the wildcard",
+            ["*", "metadata.name"],
+            {"kind": "Foo", "rules": [1], "metadata": {"name": "x", "uid": "1"}},
+            {"kind": "Foo", "rules": [1], "metadata": {"name": "x"}},
+        ),
+        (
+            "should skip missing fields and type mismatches",
+            ["spec.template.spec", "status.phase"],
+            {"spec": {"template": "not-a-dict"}},
+            {"spec": {}},
+        ),
+    ],
+)
+def test_project(test_description, fields, obj, expected):
+    assert project(obj, compile_projection(fields)) == expected, test_description
+
+
+def test_project_shares_values_instead_of_copying():
+    spec = {"containers": [{"name": "a"}]}
+    result = project({"spec": spec, "status": {}}, compile_projection(["spec"]))
+
+    assert result["spec"] is spec
+
+
+@pytest.mark.parametrize(
+    "test_description, obj, expected",
+    [
+        (
+            "should drop the annotation and keep the others",
+            {"metadata": {"annotations": {"kubectl.kubernetes.io/last-applied-configuration": "{}", "a": "b"}}},
+            {"metadata": {"annotations": {"a": "b"}}},
+        ),
+        (
+            "should drop the annotations when nothing else is left",
+            {"metadata": {"name": "x", "annotations": {"kubectl.kubernetes.io/last-applied-configuration": "{}"}}},
+            {"metadata": {"name": "x"}},
+        ),
+        (
+            "should return objects without the annotation unchanged",
+            {"metadata": {"annotations": {"a": "b"}}},
+            {"metadata": {"annotations": {"a": "b"}}},
+        ),
+    ],
+)
+def test_without_last_applied_configuration(test_description, obj, expected):
+    original_annotations = dict(obj["metadata"]["annotations"])
+
+    assert without_last_applied_configuration(obj) == expected, test_description
+    assert obj["metadata"]["annotations"] == original_annotations
+
+
+class TestDescribeProjector:
+    def test_project_resource_uses_default_allowlist_for_unknown_kinds(self):
+        projector = DescribeProjector()
+        function = {
+            "apiVersion": "serverless.kyma-project.io/v1alpha2",
+            "kind": "Function",
+            "metadata": {"name": "fn", "resourceVersion": "1", "managedFields": [{}]},
+            "spec": {"runtime": "nodejs20"},
+            "status": {"conditions": []},
+        }
+
+        assert projector.project_resource("Function", function) == {
+            "apiVersion": "serverless.kyma-project.io/v1alpha2",
+            "kind": "Function",
+            "metadata": {"name": "fn"},
+            "spec": {"runtime": "nodejs20"},
+            "status": {"conditions": []},
+        }
+
+    def test_project_resource_uses_configured_allowlist(self):
+        projector = DescribeProjector({"Service": ["kind", "spec.ports"]})
+        service = {"kind": "Service", "metadata": {"name": "svc"}, "spec": {"ports": [80], "clusterIP": "10.0.0.1"}}
+
+        assert projector.project_resource("Service", service) == {"kind": "Service", "spec": {"ports": [80]}}
+
+    def test_project_event_drops_involved_object(self):
+        projector = DescribeProjector()
+        event = {"involvedObject": {"kind": "Pod"}, "reason": "BackOff", "metadata": {"name": "e"}}
+
+        assert projector.project_event(event) == {"reason": "BackOff"}
@@ -0,0 +1,349 @@
+from collections import Counter
+from unittest.mock import Mock, patch
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.k8s import PARTIAL_OBJECT_METADATA_ACCEPT, DescribeMode, K8sAuthHeaders, K8sClient
+from services.k8s_projection import DescribeProjector
+from services.k8s_read_cache import (
+    K8sReadCache,
+    K8sReadCacheKey,
+    K8sReadCacheRegistry,
+    K8sReadOperation,
+    get_resource_version,
+)
+
+_TWO_READS = 2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def sample_pod(resource_version: str = "1"):
+    return {
+        "kind": "Pod",
+        "apiVersion": "v1",
+        "metadata": {"name": "my-pod", "namespace": "default", "resourceVersion": resource_version},
+        "status": {"phase": "Running"},
+    }
+
+
+class FakeK8sApiServer:
+    """A fake Kubernetes API server that counts the requests it serves."""
+
+    def __init__(self):
+        self.requests: Counter[str] = Counter()
+        self.metadata_requests: Counter[str] = Counter()
+        self.pod = sample_pod()
+        app = web.Application()
+        app.router.add_get("/api/v1/namespaces/default/pods/my-pod", self._get_pod)
+        app.router.add_get("/api/v1/namespaces/default/pods", self._list_pods)
+        self.server = TestServer(app)
+
+    async def _get_pod(self, request: web.Request) -> web.Response:
+        if request.headers.get("Accept") == PARTIAL_OBJECT_METADATA_ACCEPT:
+            self.metadata_requests[request.path] += 1
+            return web.json_response({"kind": "PartialObjectMetadata", "metadata": self.pod["metadata"]})
+        self.requests[request.path] += 1
+        return web.json_response(self.pod)
+
+    async def _list_pods(self, request: web.Request) -> web.Response:
+        self.requests[request.path] += 1
+        return web.json_response({"kind": "PodList", "metadata": {"resourceVersion": "42"}, "items": [self.pod]})
+
+    def new_client(self, read_cache: K8sReadCache | None) -> K8sClient:
+        with patch("services.k8s.K8sClient.__init__", return_value=None):
+            k8s_client = K8sClient(Mock())
+        k8s_client.k8s_auth_headers = K8sAuthHeaders(
+            x_cluster_url=str(self.server.make_url("")).rstrip("/"),
+            x_cluster_certificate_authority_data="abc",
+            x_k8s_authorization="test-token",
+        )
+        k8s_client.client_ssl_context = None
+        k8s_client.data_sanitizer = None
+        k8s_client.read_cache = read_cache
+        return k8s_client
+
+
+@pytest_asyncio.fixture
+async def fake_api_server():
+    fake_server = FakeK8sApiServer()
+    await fake_server.server.start_server()
+    yield fake_server
+    await fake_server.server.close()
+
+
+class TestK8sReadCache:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def key(self):
+        return K8sReadCacheKey(
+            cluster="https://api.example.com",
+            operation=K8sReadOperation.GET_RESOURCE,
+            api_version="v1",
+            kind="Pod",
+            namespace="default",
+            name="my-pod",
+        )
+
+    def test_get_or_load_serves_hits_within_ttl(self, clock, key):
+        # given
+        cache = K8sReadCache(ttl_seconds=10, revalidation_window_seconds=0, clock=clock)
+        loader = Mock(return_value=sample_pod())
+
+        # when
+        first = cache.get_or_load(key, loader)
+        clock.now = 5
+        second = cache.get_or_load(key, loader)
+
+        # then
+        assert first == second == sample_pod()
+        loader.assert_called_once()
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_ratio == 1 / 2
+
+    def test_record_turn_metrics_records_only_the_turn(self, clock, key):
+        # given: a first turn with a miss and a hit.
+        cache = K8sReadCache(ttl_seconds=10, revalidation_window_seconds=0, clock=clock)
+        loader = Mock(return_value=sample_pod())
+        cache.get_or_load(key, loader)
+        cache.get_or_load(key, loader)
+
+        with patch("services.k8s_read_cache.CustomMetrics") as mock_metrics:
+            # when: the second turn only has hits.
+            turn_start = cache.start_turn()
+            cache.get_or_load(key, loader)
+            cache.get_or_load(key, loader)
+            cache.record_turn_metrics(turn_start)
+
+            # and a turn without lookups.
+            cache.record_turn_metrics(cache.start_turn())
+
+        # then
+        mock_metrics.return_value.record_k8s_read_cache_conversation_hit_ratio.assert_called_once_with(1.0)
+        assert cache.stats.hit_ratio == 3 / 4
+
+    def test_get_or_load_reloads_after_ttl(self, clock, key):
+        # given
+        cache = K8sReadCache(ttl_seconds=10, revalidation_window_seconds=0, clock=clock)
+        loader = Mock(side_effect=[sample_pod("1"), sample_pod("2")])
+
+        # when
+        cache.get_or_load(key, loader)
+        clock.now = 10
+        result = cache.get_or_load(key, loader)
+
+        # then
+        assert result == sample_pod("2")
+        assert loader.call_count == _TWO_READS
+
+    def test_hits_are_isolated_from_caller_mutations(self, clock, key):
+        # given
+        cache = K8sReadCache(ttl_seconds=10, clock=clock)
+        first = cache.get_or_load(key, Mock(return_value=sample_pod()))
+
+        # when
+        del first["metadata"]
+        second = cache.get_or_load(key, Mock())
+        del second["status"]
+
+        # then
+        assert cache.get_or_load(key, Mock()) == sample_pod()
+
+    @pytest.mark.parametrize(
+        "test_description, server_version, expected_loader_calls, expected_revalidations",
+        [
+            ("should reuse the cached value when resourceVersion is unchanged", "1", 1, 1),
+            ("should reload the value when resourceVersion has changed", "2", 2, 0),
+            ("should reload the value when revalidation fails", None, 2, 0),
+        ],
+    )
+    def test_get_or_load_revalidates_expired_entries(
+        self, clock, key, test_description, server_version, expected_loader_calls, expected_revalidations
+    ):
+        # given
+        cache = K8sReadCache(ttl_seconds=10, revalidation_window_seconds=60, clock=clock)
+        loader = Mock(return_value=sample_pod())
+        revalidator = Mock(return_value=server_version)
+
+        # when
+        cache.get_or_load(key, loader, revalidator)
+        clock.now = 30
+        cache.get_or_load(key, loader, revalidator)
+
+        # then
+        revalidator.assert_called_once()
+        assert loader.call_count == expected_loader_calls, test_description
+        assert cache.stats.revalidations == expected_revalidations, test_description
+
+    def test_get_or_load_skips_revalidation_outside_window(self, clock, key):
+        # given
+        cache = K8sReadCache(ttl_seconds=10, revalidation_window_seconds=60, clock=clock)
+        loader = Mock(return_value=sample_pod())
+        revalidator = Mock(return_value="1")
+
+        # when
+        cache.get_or_load(key, loader, revalidator)
+        clock.now = 100
+        cache.get_or_load(key, loader, revalidator)
+
+        # then
+        revalidator.assert_not_called()
+        assert loader.call_count == _TWO_READS
+
+    def test_get_or_load_does_not_cache_errors(self, clock, key):
+        # given
+        cache = K8sReadCache(ttl_seconds=10, clock=clock)
+        loader = Mock(side_effect=[ValueError("boom"), sample_pod()])
+
+        # when / then
+        with pytest.raises(ValueError):
+            cache.get_or_load(key, loader)
+        assert cache.get_or_load(key, loader) == sample_pod()
+        assert len(cache) == 1
+
+    def test_get_or_load_evicts_least_recently_used_entries(self, clock, key):
+        # given
+        max_entries = 2
+        cache = K8sReadCache(ttl_seconds=10, max_entries=max_entries, clock=clock)
+        keys = [key.model_copy(update={"name": f"pod-{i}"}) for i in range(3)]
+
+        # when
+        for k in keys:
+            cache.get_or_load(k, Mock(return_value=sample_pod()))
+
+        # then
+        assert len(cache) == max_entries
+        loader = Mock(return_value=sample_pod())
+        cache.get_or_load(keys[0], loader)
+        loader.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "test_description, value, expected",
+        [
+            ("should return resourceVersion of a single object", sample_pod("7"), "7"),
+            ("should ignore list results", {"kind": "PodList", "metadata": {"resourceVersion": "7"}}, None),
+            ("should ignore values without metadata", {"kind": "Pod"}, None),
+            ("should ignore non-dict values", [sample_pod("7")], None),
+        ],
+    )
+    def test_get_resource_version(self, test_description, value, expected):
+        assert get_resource_version(value) == expected, test_description
+
+
+class TestK8sReadCacheRegistry:
+    @pytest.fixture(autouse=True)
+    def reset_registry(self):
+        K8sReadCacheRegistry._reset_for_tests()
+        yield
+        K8sReadCacheRegistry._reset_for_tests()
+
+    def test_get_cache_returns_one_cache_per_conversation(self):
+        registry = K8sReadCacheRegistry()
+
+        assert registry.get_cache("conv-1") is registry.get_cache("conv-1")
+        assert registry.get_cache("conv-1") is not registry.get_cache("conv-2")
+
+    def test_get_cache_evicts_least_recently_used_conversations(self):
+        registry = K8sReadCacheRegistry(max_conversations=2)
+        first = registry.get_cache("conv-1")
+        registry.get_cache("conv-2")
+        registry.get_cache("conv-3")
+
+        assert registry.get_cache("conv-1") is not first
+
+
+class TestK8sClientWithReadCache:
+    @pytest.mark.asyncio
+    async def test_execute_get_api_request_hits_api_server_once(self, fake_api_server):
+        # given
+        k8s_client = fake_api_server.new_client(K8sReadCache(ttl_seconds=60))
+
+        # when
+        results = [await k8s_client.execute_get_api_request("api/v1/namespaces/default/pods") for _ in range(5)]
+
+        # then
+        assert all(result == [sample_pod()] for result in results)
+        assert fake_api_server.requests["/api/v1/namespaces/default/pods"] == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_get_api_request_without_cache_hits_api_server_every_time(self, fake_api_server):
+        # given
+        k8s_client = fake_api_server.new_client(None)
+
+        request_count = 3
+
+        # when
+        for _ in range(request_count):
+            await k8s_client.execute_get_api_request("api/v1/namespaces/default/pods")
+
+        # then
+        assert fake_api_server.requests["/api/v1/namespaces/default/pods"] == request_count
+
+    @pytest.mark.asyncio
+    async def test_execute_get_api_request_revalidates_with_metadata_request(self, fake_api_server):
+        # given
+        clock = FakeClock()
+        k8s_client = fake_api_server.new_client(
+            K8sReadCache(ttl_seconds=10, revalidation_window_seconds=60, clock=clock)
+        )
+        uri = "api/v1/namespaces/default/pods/my-pod"
+        path = f"/{uri}"
+
+        # when: the entry expires but the object is unchanged.
+        await k8s_client.execute_get_api_request(uri)
+        clock.now = 20
+        unchanged = await k8s_client.execute_get_api_request(uri)
+
+        # then: only a metadata request is sent.
+        assert unchanged == sample_pod("1")
+        assert fake_api_server.requests[path] == 1
+        assert fake_api_server.metadata_requests[path] == 1
+
+        # when: the entry expires and the object has changed.
+        fake_api_server.pod = sample_pod("2")
+        clock.now = 40
+        changed = await k8s_client.execute_get_api_request(uri)
+
+        # then: the object is read again.
+        assert changed == sample_pod("2")
+        assert fake_api_server.requests[path] == _TWO_READS
+        assert fake_api_server.metadata_requests[path] == _TWO_READS
+
+    def test_describe_resource_reuses_cached_resource_and_events(self):
+        # given
+        with patch("services.k8s.K8sClient.__init__", return_value=None):
+            k8s_client = K8sClient(Mock())
+        k8s_client.k8s_auth_headers = K8sAuthHeaders(x_cluster_url="https://api.example.com")
+        k8s_client.data_sanitizer = None
+        k8s_client.read_cache = K8sReadCache(ttl_seconds=60)
+        k8s_client.describe_mode = DescribeMode.PROJECTION
+        k8s_client.describe_projector = DescribeProjector()
+        event = {"involvedObject": {"kind": "Pod", "name": "my-pod"}, "type": "Warning"}
+        mock_dynamic_client = Mock()
+        mock_dynamic_client.resources.get.return_value.get.side_effect = lambda **kwargs: (
+            Mock(to_dict=Mock(return_value=sample_pod()))
+            if "name" in kwargs
+            else Mock(items=[Mock(to_dict=Mock(return_value=event))])
+        )
+        k8s_client._dynamic_client = mock_dynamic_client
+
+        # when
+        results = [k8s_client.describe_resource("v1", "Pod", "my-pod", "default") for _ in range(3)]
+
+        # then: the resource and the event list are each fetched once, and
+        # removing involvedObject from the result does not leak into the cache.
+        assert all(result["events"] == [{"type": "Warning"}] for result in results)
+        assert mock_dynamic_client.resources.get.return_value.get.call_count == _TWO_READS
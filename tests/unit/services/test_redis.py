@@ -1,8 +1,34 @@
+import asyncio
+from collections import defaultdict
+from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeAsyncRedisMixin
+from langgraph.checkpoint.base import Checkpoint
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import ResponseError
 
-from services.redis import Redis, get_redis
+from agents.memory.async_redis_checkpointer import AsyncRedisSaver
+from services.metrics import (
+    REDIS_CIRCUIT_BREAKER_OPEN_METRIC_KEY,
+    REDIS_CIRCUIT_BREAKER_REJECTED_METRIC_KEY,
+    REDIS_COMMAND_LATENCY_METRIC_KEY,
+    REDIS_POOL_CONNECTIONS_IN_USE_METRIC_KEY,
+    REDIS_POOL_WAIT_METRIC_KEY,
+    CustomMetrics,
+)
+from services.redis import (
+    CircuitBreaker,
+    CircuitState,
+    HealthAwareRedis,
+    InstrumentedConnectionPool,
+    Redis,
+    RedisCircuitOpenError,
+    RedisPoolExhaustedError,
+    get_redis,
+)
 
 
 class TestRedis:
@@ -104,3 +130,265 @@ class TestRedis:
 
         # Clean up by resetting the instance.
         redis2._reset_for_tests()
+
+
+class FakeHealthAwareRedis(FakeAsyncRedisMixin, HealthAwareRedis):
+    """HealthAwareRedis with the connections of fakeredis."""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def metrics():
+    CustomMetrics._reset_for_tests()
+    yield CustomMetrics()
+    CustomMetrics._reset_for_tests()
+
+
+def create_fake_redis(
+    server: FakeServer, max_connections: int = 10, pool_timeout: float = 1, failure_threshold: int = 3
+) -> FakeHealthAwareRedis:
+    redis = FakeHealthAwareRedis(
+        server=server,
+        connection_pool_class=InstrumentedConnectionPool,
+        max_connections=max_connections,
+    )
+    # fakeredis does not pass on the timeout of the pool and unknown arguments of the client.
+    redis.connection_pool.timeout = pool_timeout
+    redis.circuit_breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_seconds=30, clock=FakeClock())
+    return redis
+
+
+@pytest.mark.parametrize(
+    "test_description, events, expected_state, expected_allowed",
+    [
+        ("should stay closed without failures", [], CircuitState.CLOSED, True),
+        ("should stay closed below the threshold", ["failure", "failure"], CircuitState.CLOSED, True),
+        (
+            "should reset the failures after a success",
+            ["failure", "failure", "success", "failure", "failure"],
+            CircuitState.CLOSED,
+            True,
+        ),
+        ("should open at the threshold", ["failure", "failure", "failure"], CircuitState.OPEN, False),
+        (
+            "should stay open before the reset time",
+            ["failure", "failure", "failure", "wait 29"],
+            CircuitState.OPEN,
+            False,
+        ),
+        (
+            "should allow a trial after the reset time",
+            ["failure", "failure", "failure", "wait 30"],
+            CircuitState.OPEN,
+            True,
+        ),
+        (
+            "should allow only a single trial",
+            ["failure", "failure", "failure", "wait 30", "request"],
+            CircuitState.HALF_OPEN,
+            False,
+        ),
+        (
+            "should close after a successful trial",
+            ["failure", "failure", "failure", "wait 30", "request", "success"],
+            CircuitState.CLOSED,
+            True,
+        ),
+        (
+            "should reopen after a failed trial",
+            ["failure", "failure", "failure", "wait 30", "request", "failure", "wait 29"],
+            CircuitState.OPEN,
+            False,
+        ),
+        (
+            "should allow another trial if the trial does not report a result",
+            ["failure", "failure", "failure", "wait 30", "request", "wait 30"],
+            CircuitState.HALF_OPEN,
+            True,
+        ),
+    ],
+)
+def test_circuit_breaker(test_description, events, expected_state, expected_allowed):
+    # given
+    clock = FakeClock()
+    circuit_breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30, clock=clock)
+
+    # when
+    for event in events:
+        if event == "failure":
+            circuit_breaker.record_failure()
+        elif event == "success":
+            circuit_breaker.record_success()
+        elif event == "request":
+            circuit_breaker.allow_request()
+        else:
+            clock.now += float(event.split()[1])
+    state = circuit_breaker.state
+    allowed = circuit_breaker.allow_request()
+
+    # then
+    assert state == expected_state, test_description
+    assert allowed == expected_allowed, test_description
+
+
+@pytest.mark.asyncio
+async def test_health_aware_redis_records_command_latency(metrics):
+    # given
+    redis = create_fake_redis(FakeServer())
+
+    # when
+    await redis.set("key", "value")
+    value = await redis.get("key")
+    with pytest.raises(ResponseError):
+        await redis.hget("key", "field")
+
+    # then
+    assert value == b"value"
+    count = f"{REDIS_COMMAND_LATENCY_METRIC_KEY}_count"
+    assert metrics.registry.get_sample_value(count, {"command": "SET", "is_success": "True"}) == 1
+    assert metrics.registry.get_sample_value(count, {"command": "GET", "is_success": "True"}) == 1
+    assert metrics.registry.get_sample_value(count, {"command": "HGET", "is_success": "False"}) == 1
+    # an error returned by Redis does not count as a failure of Redis.
+    assert redis.circuit_breaker.state == CircuitState.CLOSED
+    assert metrics.registry.get_sample_value(f"{REDIS_POOL_WAIT_METRIC_KEY}_count", {"is_success": "True"}) == 3  # noqa: PLR2004
+    assert metrics.registry.get_sample_value(REDIS_POOL_CONNECTIONS_IN_USE_METRIC_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_health_aware_redis_opens_circuit_when_redis_is_unavailable(metrics):
+    # given
+    server = FakeServer()
+    redis = create_fake_redis(server, failure_threshold=3)
+    await redis.set("key", "value")
+    server.connected = False
+
+    # when: Redis fails as often as the threshold.
+    for _ in range(3):
+        with pytest.raises(RedisConnectionError):
+            await redis.get("key")
+
+    # then: the next commands fail fast without trying Redis.
+    server.connected = True
+    with pytest.raises(RedisCircuitOpenError):
+        await redis.get("key")
+    assert redis.circuit_breaker.state == CircuitState.OPEN
+    assert metrics.registry.get_sample_value(f"{REDIS_CIRCUIT_BREAKER_REJECTED_METRIC_KEY}_total") == 1
+    assert metrics.registry.get_sample_value(REDIS_CIRCUIT_BREAKER_OPEN_METRIC_KEY) == 1
+
+    # when: the reset time has passed.
+    redis.circuit_breaker._clock.now += 30
+
+    # then: a trial command closes the circuit.
+    assert await redis.get("key") == b"value"
+    assert redis.circuit_breaker.state == CircuitState.CLOSED
+    assert metrics.registry.get_sample_value(REDIS_CIRCUIT_BREAKER_OPEN_METRIC_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_instrumented_connection_pool_times_out_when_pool_is_exhausted(metrics):
+    # given
+    redis = create_fake_redis(FakeServer(), max_connections=1, pool_timeout=0.05, failure_threshold=1)
+    connection = await redis.connection_pool.get_connection()
+
+    # when
+    with pytest.raises(RedisPoolExhaustedError, match="No connection available"):
+        await redis.get("key")
+
+    # then
+    # an exhausted pool does not show that Redis is unavailable.
+    assert redis.circuit_breaker.state == CircuitState.CLOSED
+    count = f"{REDIS_COMMAND_LATENCY_METRIC_KEY}_count"
+    assert metrics.registry.get_sample_value(count, {"command": "GET", "is_success": "False"}) == 1
+    assert metrics.registry.get_sample_value(f"{REDIS_POOL_WAIT_METRIC_KEY}_count", {"is_success": "False"}) == 1
+    assert metrics.registry.get_sample_value(REDIS_POOL_CONNECTIONS_IN_USE_METRIC_KEY) == 1
+    await redis.connection_pool.release(connection)
+    assert metrics.registry.get_sample_value(REDIS_POOL_CONNECTIONS_IN_USE_METRIC_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_health_aware_redis_guards_pipelines(metrics):
+    # given
+    server = FakeServer()
+    redis = create_fake_redis(server, failure_threshold=1)
+
+    # when
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.set("key", "value")
+        pipe.get("key")
+        result = await pipe.execute()
+
+    # then
+    assert result == [True, b"value"]
+    count = f"{REDIS_COMMAND_LATENCY_METRIC_KEY}_count"
+    assert metrics.registry.get_sample_value(count, {"command": "PIPELINE", "is_success": "True"}) == 1
+
+    # when: Redis is unavailable while a pipeline is executed.
+    server.connected = False
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.get("key")
+        with pytest.raises(RedisConnectionError):
+            await pipe.execute()
+
+    # then: the circuit is open for commands and pipelines.
+    assert redis.circuit_breaker.state == CircuitState.OPEN
+    assert metrics.registry.get_sample_value(count, {"command": "PIPELINE", "is_success": "False"}) == 1
+    server.connected = True
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.get("key")
+        with pytest.raises(RedisCircuitOpenError):
+            await pipe.execute()
+    with pytest.raises(RedisCircuitOpenError):
+        await redis.get("key")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_graph_checkpoints_share_bounded_pool(metrics):
+    """Stress test: hundreds of concurrent graph checkpoints through a small connection pool."""
+    # given
+    sessions = 300
+    max_connections = 8
+    redis = create_fake_redis(FakeServer(), max_connections=max_connections, pool_timeout=10)
+    saver = AsyncRedisSaver(conn=redis)
+    in_use: list[float] = []
+    record_pool_wait = metrics.record_redis_pool_wait
+
+    def record_connections_in_use(duration: float, is_success: bool, connections_in_use: int) -> None:
+        in_use.append(connections_in_use)
+        record_pool_wait(duration, is_success, connections_in_use)
+
+    async def checkpoint(session: int) -> None:
+        config = {"configurable": {"thread_id": f"thread-{session}", "checkpoint_ns": ""}}
+        checkpoint = Checkpoint(
+            v=1,
+            id=f"checkpoint-{session}",
+            ts=datetime.now(UTC).isoformat(),
+            channel_values={"messages": [f"message of session {session}"]},
+            channel_versions={},
+            versions_seen=defaultdict(dict),
+            pending_sends=[],
+        )
+        saved_config = await saver.aput(config, checkpoint, {"source": "loop", "step": 1}, {})
+        await saver.aput_writes(saved_config, [("messages", f"write of session {session}")], f"task-{session}")
+        checkpoint_tuple = await saver.aget_tuple(saved_config)
+        assert checkpoint_tuple is not None
+        assert checkpoint_tuple.checkpoint["id"] == f"checkpoint-{session}"
+        assert checkpoint_tuple.pending_writes == [(f"task-{session}", "messages", f"write of session {session}")]
+
+    # when
+    with patch.object(metrics, "record_redis_pool_wait", record_connections_in_use):
+        await asyncio.gather(*(checkpoint(session) for session in range(sessions)))
+
+    # then
+    assert max(in_use) <= max_connections
+    assert metrics.registry.get_sample_value(f"{REDIS_POOL_WAIT_METRIC_KEY}_count", {"is_success": "False"}) is None
+    # a checkpoint is stored in a single hash.
+    command_count = f"{REDIS_COMMAND_LATENCY_METRIC_KEY}_count"
+    assert metrics.registry.get_sample_value(command_count, {"command": "HSET", "is_success": "True"}) == sessions
+    assert redis.circuit_breaker.state == CircuitState.CLOSED
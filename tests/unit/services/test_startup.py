@@ -0,0 +1,279 @@
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.status import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
+
+from main import app
+from routers.probes import IHana, ILLMProbe, IRedis
+from services.hana import get_hana
+from services.probes import get_llm_probe
+from services.redis import get_redis
+from services.startup import (
+    ComponentState,
+    StartupComponent,
+    StartupPhase,
+    get_startup_phase,
+)
+from utils.singleton_meta import SingletonMeta
+
+# simulated latency of building a component, e.g. creating the models.
+COMPONENT_LATENCY_SECONDS = 0.2
+
+
+@pytest.fixture(autouse=True)
+def reset_startup_phase():
+    StartupPhase._reset_for_tests()
+    yield
+    StartupPhase._reset_for_tests()
+
+
+def slow_component() -> None:
+    time.sleep(COMPONENT_LATENCY_SECONDS)
+
+
+async def slow_async_component() -> None:
+    await asyncio.sleep(COMPONENT_LATENCY_SECONDS)
+
+
+def failing_component() -> None:
+    raise ValueError("config not found")
+
+
+def hanging_component() -> None:
+    time.sleep(COMPONENT_LATENCY_SECONDS * 5)
+
+
+@pytest.mark.asyncio
+async def test_startup_phase_builds_components_concurrently():
+    # given
+    components = [StartupComponent(name=f"component_{i}", initialize=slow_component) for i in range(4)]
+    warm_up = [StartupComponent(name="warm_up", initialize=slow_async_component, required=False)]
+    startup_phase = StartupPhase(components=components, warm_up_components=warm_up)
+    assert startup_phase.is_ready()
+
+    # when
+    task = asyncio.create_task(startup_phase.run())
+    await asyncio.sleep(0)
+    is_ready_while_running = startup_phase.is_ready()
+    await task
+
+    # then
+    assert not is_ready_while_running
+    assert startup_phase.is_ready()
+    assert all(status.state == ComponentState.READY for status in startup_phase.get_statuses().values())
+    assert all(
+        status.duration_ms >= COMPONENT_LATENCY_SECONDS * 1000 for status in startup_phase.get_statuses().values()
+    )
+    # the components are built concurrently, followed by the warm-up, instead of in 5 sequential latencies.
+    assert startup_phase.duration_ms < COMPONENT_LATENCY_SECONDS * 1000 * 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "test_description, component, expected_ready, expected_error, expected_attempts",
+    [
+        (
+            "should fail the readiness if a required component fails after its retries",
+            StartupComponent(name="component", initialize=failing_component),
+            False,
+            "config not found",
+            3,
+        ),
+        (
+            "should fail the readiness if a required component times out, without starting its thread again",
+            StartupComponent(name="component", initialize=hanging_component),
+            False,
+            "timed out after 0.1 seconds",
+            1,
+        ),
+        (
+            "should not retry or fail the readiness if an optional component fails",
+            StartupComponent(name="component", initialize=failing_component, required=False),
+            True,
+            "config not found",
+            1,
+        ),
+    ],
+)
+async def test_startup_phase_with_failing_component(
+    test_description, component, expected_ready, expected_error, expected_attempts
+):
+    # given
+    startup_phase = StartupPhase(
+        components=[component], warm_up_components=[], timeout_seconds=0.1, retries=2, retry_backoff_seconds=0.01
+    )
+
+    # when
+    await startup_phase.run()
+
+    # then
+    status = startup_phase.get_statuses()["component"]
+    assert status.state == ComponentState.FAILED, test_description
+    assert status.error == expected_error, test_description
+    assert status.attempts == expected_attempts, test_description
+    assert startup_phase.is_ready() == expected_ready, test_description
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("test_description, is_async", [("sync component", False), ("async component", True)])
+async def test_startup_phase_retries_component_that_fails_once(test_description, is_async):
+    # given
+    calls = []
+
+    def flaky_component() -> None:
+        calls.append(time.perf_counter())
+        if len(calls) == 1:
+            raise ConnectionError("Redis is not reachable")
+
+    async def async_flaky_component() -> None:
+        flaky_component()
+
+    component = StartupComponent(name="component", initialize=async_flaky_component if is_async else flaky_component)
+    startup_phase = StartupPhase(components=[component], warm_up_components=[], retries=2, retry_backoff_seconds=0.05)
+
+    # when
+    await startup_phase.run()
+
+    # then
+    status = startup_phase.get_statuses()["component"]
+    assert status.state == ComponentState.READY, test_description
+    assert status.error is None, test_description
+    assert status.attempts == 2, test_description  # noqa: PLR2004
+    assert calls[1] - calls[0] >= 0.05, test_description  # noqa: PLR2004
+    assert startup_phase.is_ready(), test_description
+
+
+@pytest.mark.asyncio
+async def test_startup_phase_is_not_ready_after_it_is_scheduled():
+    # given
+    startup_phase = StartupPhase(
+        components=[StartupComponent(name="component", initialize=slow_component)], warm_up_components=[]
+    )
+
+    # when
+    # the task did not run yet.
+    task = startup_phase.start()
+    is_ready_after_scheduling = startup_phase.is_ready()
+    await task
+
+    # then
+    assert not is_ready_after_scheduling
+    assert startup_phase.get_statuses()["component"].state == ComponentState.READY
+    assert startup_phase.is_ready()
+
+
+@pytest.mark.asyncio
+async def test_startup_phase_completes_component_after_timeout():
+    # given
+    component = StartupComponent(name="component", initialize=slow_component)
+    startup_phase = StartupPhase(components=[component], warm_up_components=[], timeout_seconds=0.05)
+
+    # when
+    await startup_phase.run()
+    is_ready_after_timeout = startup_phase.is_ready()
+    await asyncio.sleep(COMPONENT_LATENCY_SECONDS * 2)
+
+    # then
+    assert not is_ready_after_timeout
+    status = startup_phase.get_statuses()["component"]
+    assert status.state == ComponentState.READY
+    assert status.error is None
+    assert status.attempts == 1
+    assert status.duration_ms >= COMPONENT_LATENCY_SECONDS * 1000
+    assert startup_phase.is_ready()
+
+
+def test_cold_start_to_ready():
+    """Measure the time from the start of the application until it is ready, with all external dependencies faked."""
+
+    # given
+    # the external dependencies are replaced by fakes with the same latency.
+    def fake_dependency(*args, **kwargs):
+        time.sleep(COMPONENT_LATENCY_SECONDS)
+        return MagicMock()
+
+    async def fake_ping():
+        await asyncio.sleep(COMPONENT_LATENCY_SECONDS)
+        return True
+
+    fake_redis = MagicMock(spec=IRedis)
+    fake_redis.is_connection_operational = fake_ping
+    fake_hana = MagicMock(spec=IHana)
+    fake_llm_probe = MagicMock(spec=ILLMProbe)
+    with (
+        patch("services.conversation.ConversationService", side_effect=fake_dependency),
+        patch("services.startup.get_llm_probe", side_effect=fake_dependency),
+        patch("services.startup.KeyStore", side_effect=fake_dependency),
+        patch("services.startup.get_redis", return_value=fake_redis),
+        patch("services.startup.get_hana", side_effect=fake_dependency),
+        patch("services.startup.compute_string_token_count", side_effect=fake_dependency),
+        patch("routers.probes.KeyStore"),
+    ):
+        startup_phase = StartupPhase()
+        app.dependency_overrides[get_startup_phase] = lambda: startup_phase
+        app.dependency_overrides[get_redis] = lambda: fake_redis
+        app.dependency_overrides[get_hana] = lambda: fake_hana
+        app.dependency_overrides[get_llm_probe] = lambda: fake_llm_probe
+        client = TestClient(app)
+
+        # when
+        start_time = time.perf_counter()
+        task_response = None
+
+        async def start_and_probe():
+            nonlocal task_response
+            task = asyncio.create_task(startup_phase.run())
+            await asyncio.sleep(0)
+            # the application is not ready while the components are built.
+            task_response = client.get("/readyz")
+            await task
+
+        asyncio.run(start_and_probe())
+        cold_start_seconds = time.perf_counter() - start_time
+        response = client.get("/readyz")
+    app.dependency_overrides = {}
+
+    # then
+    assert task_response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+    assert response.status_code == HTTP_200_OK
+    statuses = response.json()["startup_components"]
+    assert set(statuses) == {
+        "conversation_service",
+        "llm_probe",
+        "k8s_resource_discovery",
+        "key_store",
+        "redis",
+        "hana",
+        "warm_up_tokenizers",
+        "warm_up_regex",
+        "warm_up_redis_pool",
+        "warm_up_hana",
+    }
+    assert all(status["state"] == ComponentState.READY for status in statuses.values())
+    assert statuses["conversation_service"]["duration_ms"] >= COMPONENT_LATENCY_SECONDS * 1000
+    # the components and the warm-ups would take 8 latencies if they were built sequentially.
+    assert cold_start_seconds < COMPONENT_LATENCY_SECONDS * 8
+
+
+def test_singleton_is_created_once_concurrently():
+    # given
+    created = []
+
+    class SlowSingleton(metaclass=SingletonMeta):
+        def __init__(self):
+            time.sleep(0.05)
+            created.append(self)
+
+    # when
+    async def create_concurrently():
+        return await asyncio.gather(*(asyncio.to_thread(SlowSingleton) for _ in range(8)))
+
+    instances = asyncio.run(create_concurrently())
+
+    # then
+    assert len(created) == 1
+    assert all(instance is created[0] for instance in instances)
+    SingletonMeta.reset_instance(SlowSingleton)
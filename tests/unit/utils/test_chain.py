@@ -1,10 +1,10 @@
 from typing import Any
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from langchain_core.runnables import Runnable, RunnableConfig
 
-from utils.chain import ainvoke_chain
+from utils.chain import ainvoke_chain, record_retry
 
 
 @pytest.fixture
@@ -106,3 +106,23 @@ async def test_ainvoke_chain(
 
     # Verify first call arguments
     mock_chain.ainvoke.assert_called_with(input=expected_chain_input, config=config)
+
+
+@pytest.mark.parametrize(
+    "test_description, graph_metrics_enabled, expected_records",
+    [
+        ("should record the retry if the graph metrics are enabled", True, 1),
+        ("should not record the retry if the graph metrics are disabled", False, 0),
+    ],
+)
+def test_record_retry(test_description, graph_metrics_enabled, expected_records):
+    # given
+    with (
+        patch("utils.chain.GRAPH_METRICS_ENABLED", graph_metrics_enabled),
+        patch("utils.chain.CustomMetrics") as mock_metrics,
+    ):
+        # when
+        record_retry(Mock())
+
+    # then
+    assert mock_metrics.return_value.record_graph_node_retry.call_count == expected_records, test_description
@@ -0,0 +1,149 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from agents.common.chunk_summarizer import TOOL_RESPONSE_SUMMARIZER_CHAIN_ID, ToolResponseSummarizer
+from agents.summarization.summarization import SUMMARIZATION_CHAIN_ID, MessageSummarizer
+from followup_questions.followup_questions import FollowUpQuestionsHandler
+from initial_questions.inital_questions import InitialQuestionsHandler
+from utils.chain_registry import ChainRegistry, estimate_size, get_chain_registry, prompt_chain_id
+
+
+class FakeModel:
+    def __init__(self, name: str = "gpt-4.1"):
+        self.name = name
+        self.llm = FakeListChatModel(responses=["response"])
+
+
+def test_get_or_create_builds_chain_once_per_prompt_and_model():
+    # given
+    registry = get_chain_registry()
+    model = FakeModel()
+    create = Mock(side_effect=lambda: {"chain": "a"})
+
+    # when
+    first = registry.get_or_create("prompt", model, create)
+    second = registry.get_or_create("prompt", model, create)
+
+    # then
+    assert first is second
+    assert create.call_count == 1
+    stats = registry.get_stats()
+    assert len(stats) == 1
+    assert (stats[0].prompt_id, stats[0].model_name, stats[0].constructions, stats[0].lookups) == (
+        "prompt",
+        "gpt-4.1",
+        1,
+        2,
+    )
+    assert stats[0].size_bytes > 0
+
+
+@pytest.mark.parametrize(
+    "test_description, first_prompt_id, second_prompt_id, second_model, expected_constructions",
+    [
+        ("same prompt and model is shared", "prompt", "prompt", None, 1),
+        ("another prompt is built", "prompt", "other-prompt", None, 2),
+        ("another model name is built", "prompt", "prompt", FakeModel("gpt-4.1-mini"), 2),
+        ("recreated model with the same name is rebuilt", "prompt", "prompt", FakeModel(), 2),
+    ],
+)
+def test_get_or_create_keys(test_description, first_prompt_id, second_prompt_id, second_model, expected_constructions):
+    # given
+    registry = get_chain_registry()
+    model = FakeModel()
+    create = Mock(side_effect=lambda: object())
+
+    # when
+    registry.get_or_create(first_prompt_id, model, create)
+    registry.get_or_create(second_prompt_id, second_model or model, create)
+
+    # then
+    assert create.call_count == expected_constructions, test_description
+
+
+def test_get_or_create_records_constructions():
+    # given
+    registry = get_chain_registry()
+    model = FakeModel()
+
+    with patch("utils.chain_registry.CustomMetrics") as mock_metrics:
+        # when
+        registry.get_or_create("prompt", model, lambda: ["chain"])
+        registry.get_or_create("prompt", model, lambda: ["chain"])
+
+    # then
+    mock_metrics.return_value.record_chain_construction.assert_called_once()
+    assert mock_metrics.return_value.record_chain_construction.call_args.args[:2] == ("prompt", "gpt-4.1")
+
+
+def test_serving_requests_builds_chains_once():
+    # given
+    requests = 20
+    model = FakeModel()
+    tokenizer = Mock()
+
+    # when: every request creates its handlers and summarizers, like the conversation service does.
+    for _ in range(requests):
+        MessageSummarizer(model=model, tokenizer_model_name="gpt-4.1", token_lower_limit=100, token_upper_limit=200)
+        ToolResponseSummarizer(model=model)._create_chain()
+        InitialQuestionsHandler(model=model, tokenizer=tokenizer)
+        FollowUpQuestionsHandler(model=model, tokenizer=tokenizer)
+
+    # then
+    stats = {stat.prompt_id: stat for stat in ChainRegistry().get_stats()}
+    assert SUMMARIZATION_CHAIN_ID in stats
+    assert TOOL_RESPONSE_SUMMARIZER_CHAIN_ID in stats
+    expected_chains = 4
+    assert len(stats) == expected_chains
+    assert all(stat.constructions == 1 for stat in stats.values())
+    assert all(stat.lookups == requests for stat in stats.values())
+
+
+def test_prompt_chain_id_depends_on_template():
+    # when
+    first = prompt_chain_id("initial_questions", "template")
+    second = prompt_chain_id("initial_questions", "other template")
+
+    # then
+    assert first.startswith("initial_questions_")
+    assert first == prompt_chain_id("initial_questions", "template")
+    assert first != second
+
+
+@pytest.mark.parametrize(
+    "test_description, obj",
+    [
+        ("mock creates no children while it is measured", Mock()),
+        ("self referencing list", (lambda items: items.append(items) or items)([1, "a"])),
+    ],
+)
+def test_estimate_size_terminates(test_description, obj):
+    # when
+    size = estimate_size(obj)
+
+    # then
+    assert size > 0, test_description
+
+
+def test_estimate_size_skips_models():
+    # given
+    model = FakeModel()
+
+    # when
+    size = estimate_size(model.llm)
+
+    # then
+    assert size == 0
+
+
+def test_estimate_size_is_bounded():
+    # given
+    obj = [[index] for index in range(1000)]
+
+    # when
+    bounded = estimate_size(obj, max_objects=10)
+
+    # then
+    assert bounded < estimate_size(obj)
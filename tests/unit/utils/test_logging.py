@@ -1,3 +1,4 @@
+import io
 import json
 import logging
 import sys
@@ -8,7 +9,25 @@ from unittest.mock import Mock, patch
 import pytest
 from tenacity import RetryCallState
 
-from utils.logging import PrettyJSONFormatter, after_log, get_logger
+from services.metrics import (
+    LOG_QUEUE_OVERFLOW_METRIC_KEY,
+    LOG_QUEUE_SIZE_METRIC_KEY,
+    LOG_RECORDS_DROPPED_METRIC_KEY,
+    CustomMetrics,
+)
+from utils.logging import (
+    DROP_REASON_QUEUE_FULL,
+    DROP_REASON_SAMPLED,
+    AsyncQueueHandler,
+    CompactJSONFormatter,
+    LogQueueListener,
+    MessageTruncationFilter,
+    PrettyJSONFormatter,
+    SamplingFilter,
+    after_log,
+    get_logger,
+    logging_stats,
+)
 
 
 def test_get_logger():
@@ -221,3 +240,126 @@ class TestPrettyJSONFormatter:
 
         assert "stack" in log_data
         assert log_data["stack"] == stack_info
+
+
+def make_record(name: str = "test", level: int = logging.INFO, msg: str = "Test message", args: tuple = ()):
+    return logging.LogRecord(name=name, level=level, pathname="test.py", lineno=10, msg=msg, args=args, exc_info=None)
+
+
+def test_compact_json_formatter():
+    # given
+    record = make_record(msg="Request %s", args=("data",))
+    record.path = "/api/test"
+
+    # when
+    result = CompactJSONFormatter().format(record)
+
+    # then
+    assert "\n" not in result
+    assert ", " not in result
+    log_data = json.loads(result)
+    assert log_data["message"] == "Request data"
+    assert log_data["path"] == "/api/test"
+
+
+@pytest.mark.parametrize(
+    "test_description, msg, args, max_length, expected_message",
+    [
+        ("should keep a short message", "short %s", ("payload",), 20, "short payload"),
+        ("should keep a message of max length", "a" * 10, (), 10, "a" * 10),
+        ("should truncate a long message", "payload: %s", ("b" * 20,), 10, "payload: b... [truncated 19 chars]"),
+    ],
+)
+def test_message_truncation_filter(test_description, msg, args, max_length, expected_message):
+    # given
+    record = make_record(msg=msg, args=args)
+
+    # when
+    result = MessageTruncationFilter(max_length).filter(record)
+
+    # then
+    assert result, test_description
+    assert record.getMessage() == expected_message, test_description
+
+
+@pytest.mark.parametrize(
+    "test_description, logger_name, level, random_value, expected_result",
+    [
+        ("should log a sampled record", "access", logging.INFO, 0.05, True),
+        ("should drop a record that is not sampled", "access", logging.INFO, 0.5, False),
+        ("should apply the rate to child loggers", "access.http", logging.DEBUG, 0.5, False),
+        ("should use the rate of the closest logger", "agents.graph", logging.INFO, 0.7, True),
+        ("should drop all records of a logger with rate 0", "agents.common", logging.INFO, 0.0, False),
+        ("should log all records of other loggers", "services", logging.DEBUG, 0.99, True),
+        ("should always log warnings", "access", logging.WARNING, 0.99, True),
+    ],
+)
+def test_sampling_filter(test_description, logger_name, level, random_value, expected_result):
+    # given
+    sampling_filter = SamplingFilter({"access": 0.1, "agents": 0.5, "agents.graph": 0.8, "agents.common": 0})
+    dropped_before = logging_stats.dropped_records[DROP_REASON_SAMPLED]
+
+    # when
+    with patch("utils.logging.random.random", return_value=random_value):
+        result = sampling_filter.filter(make_record(name=logger_name, level=level))
+
+    # then
+    assert result == expected_result, test_description
+    expected_dropped = dropped_before + (0 if expected_result else 1)
+    assert logging_stats.dropped_records[DROP_REASON_SAMPLED] == expected_dropped, test_description
+
+
+def test_async_queue_handler_drops_records_when_queue_is_full():
+    # given
+    handler = AsyncQueueHandler(queue_size=2)
+    dropped_before = logging_stats.dropped_records[DROP_REASON_QUEUE_FULL]
+    overflows_before = logging_stats.queue_overflows
+
+    # when: the queue runs full twice.
+    for _ in range(4):
+        handler.handle(make_record())
+    handler.log_queue.get_nowait()
+    for _ in range(3):
+        handler.handle(make_record())
+
+    # then
+    assert handler.log_queue.qsize() == 2  # noqa: PLR2004
+    assert logging_stats.dropped_records[DROP_REASON_QUEUE_FULL] == dropped_before + 4  # noqa: PLR2004
+    assert logging_stats.queue_overflows == overflows_before + 2  # noqa: PLR2004
+
+
+def test_async_queue_handler_writes_records_in_background_thread():
+    # given
+    stream = io.StringIO()
+    console_handler = logging.StreamHandler(stream)
+    console_handler.setFormatter(CompactJSONFormatter())
+    handler = AsyncQueueHandler(queue_size=100)
+    listener = LogQueueListener(handler.log_queue, console_handler)
+    listener.start()
+    payload = {"query": "why is my pod failing?"}
+
+    # when
+    handler.handle(make_record(msg="Request data: %s", args=(payload,)))
+    # the arguments are formatted when the record is queued.
+    payload["query"] = "changed"
+    listener.stop()
+
+    # then
+    log_data = json.loads(stream.getvalue())
+    assert log_data["message"] == "Request data: {'query': 'why is my pod failing?'}"
+
+
+def test_logging_metrics_are_exposed():
+    # given
+    CustomMetrics._reset_for_tests()
+    logging_stats.record_dropped(DROP_REASON_QUEUE_FULL)
+
+    # when
+    registry = CustomMetrics().registry
+
+    # then
+    dropped = registry.get_sample_value(f"{LOG_RECORDS_DROPPED_METRIC_KEY}_total", {"reason": DROP_REASON_QUEUE_FULL})
+    assert dropped == logging_stats.dropped_records[DROP_REASON_QUEUE_FULL]
+    assert registry.get_sample_value(f"{LOG_QUEUE_OVERFLOW_METRIC_KEY}_total") == logging_stats.queue_overflows
+    assert registry.get_sample_value(LOG_QUEUE_SIZE_METRIC_KEY) == 0
+    CustomMetrics._reset_for_tests()
@@ -0,0 +1,151 @@
+import time
+from unittest.mock import patch
+
+import jwt
+import pytest
+
+from utils import utils
+from utils.user_identifier_cache import (
+    CACHE_EXPIRED,
+    CACHE_HIT,
+    CACHE_MISS,
+    CREDENTIAL_TOKEN,
+    UserIdentifierCache,
+    client_certificate_identifier_cache,
+    token_identifier_cache,
+)
+from utils.utils import JWT_TOKEN_EXP, JWT_TOKEN_SUB, get_user_identifier_from_token
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    token_identifier_cache.clear()
+    client_certificate_identifier_cache.clear()
+    yield
+    token_identifier_cache.clear()
+    client_certificate_identifier_cache.clear()
+
+
+@pytest.mark.parametrize(
+    "test_description, ttl_seconds, expires_in, elapsed_seconds, expected_user_identifier",
+    [
+        ("hit within the TTL", 300, None, 299, "user"),
+        ("expired after the TTL", 300, None, 300, None),
+        ("hit before the credential expires", 300, 60, 59, "user"),
+        ("expired with the credential before the TTL", 300, 60, 60, None),
+        ("credential that is already expired is not cached", 300, 0, 0, None),
+        ("disabled by a TTL of 0", 0, None, 0, None),
+    ],
+)
+def test_user_identifier_cache_expiry(
+    test_description, ttl_seconds, expires_in, elapsed_seconds, expected_user_identifier
+):
+    # given
+    clock = FakeClock()
+    cache = UserIdentifierCache(CREDENTIAL_TOKEN, max_entries=10, ttl_seconds=ttl_seconds, clock=clock)
+    expires_at = clock.now + expires_in if expires_in is not None else None
+
+    # when
+    cache.put("token", "user", expires_at)
+    clock.now += elapsed_seconds
+
+    # then
+    assert cache.get("token") == expected_user_identifier, test_description
+
+
+def test_user_identifier_cache_evicts_least_recently_used():
+    # given
+    max_entries = 2
+    cache = UserIdentifierCache(CREDENTIAL_TOKEN, max_entries=max_entries, ttl_seconds=300, clock=FakeClock())
+    cache.put("token-1", "user-1")
+    cache.put("token-2", "user-2")
+
+    # when
+    cache.get("token-1")
+    cache.put("token-3", "user-3")
+
+    # then
+    assert len(cache) == max_entries
+    assert cache.get("token-1") == "user-1"
+    assert cache.get("token-2") is None
+    assert cache.get("token-3") == "user-3"
+
+
+def test_user_identifier_cache_keys_by_digest():
+    # given
+    cache = UserIdentifierCache(CREDENTIAL_TOKEN, max_entries=10, ttl_seconds=300, clock=FakeClock())
+
+    # when
+    cache.put("secret-token", "user")
+
+    # then
+    assert all(isinstance(key, bytes) and b"secret-token" not in key for key in cache._entries)
+    assert cache.get(b"secret-token") == "user"
+
+
+def test_user_identifier_cache_records_lookups():
+    # given
+    clock = FakeClock()
+    cache = UserIdentifierCache(CREDENTIAL_TOKEN, max_entries=10, ttl_seconds=300, clock=clock)
+
+    with patch("utils.user_identifier_cache.CustomMetrics") as mock_metrics:
+        # when
+        cache.get("token")
+        cache.put("token", "user")
+        cache.get("token")
+        clock.now += 300
+        cache.get("token")
+
+    # then
+    lookups = [call.args for call in mock_metrics.return_value.record_user_identifier_cache_lookup.call_args_list]
+    assert lookups == [
+        (CREDENTIAL_TOKEN, CACHE_MISS, 0),
+        (CREDENTIAL_TOKEN, CACHE_HIT, 1),
+        (CREDENTIAL_TOKEN, CACHE_EXPIRED, 0),
+    ]
+
+
+@pytest.mark.parametrize(
+    "test_description, expires_in, expected_decodes",
+    [
+        ("token without expiry is decoded once", None, 1),
+        ("token that expires in the future is decoded once", 3600, 1),
+        ("expired token is decoded every time", -1, 2),
+    ],
+)
+def test_get_user_identifier_from_token_is_cached(test_description, expires_in, expected_decodes):
+    # given
+    payload: dict = {JWT_TOKEN_SUB: "user123"}
+    if expires_in is not None:
+        payload[JWT_TOKEN_EXP] = int(time.time()) + expires_in
+    token = jwt.encode(payload, "secret", algorithm="HS256")
+
+    with patch.object(utils, "parse_k8s_token", wraps=utils.parse_k8s_token) as mock_parse:
+        # when
+        first = get_user_identifier_from_token(token)
+        second = get_user_identifier_from_token(token)
+
+    # then
+    assert first == second == utils.generate_sha384_hash("user123"), test_description
+    assert mock_parse.call_count == expected_decodes, test_description
+
+
+def test_get_user_identifier_from_token_does_not_cache_failures():
+    # given
+    token = jwt.encode({"foo": "bar"}, "secret", algorithm="HS256")
+
+    # when
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Failed to get user identifier from token"):
+            get_user_identifier_from_token(token)
+
+    # then
+    assert len(token_identifier_cache) == 0